@@ -0,0 +1,114 @@
+"""Move task execution history into an append-only task_events table
+
+tasks.execution_history (a JSONB list rewritten on every event) is replaced by rows in
+task_events keyed by (task_id, seq) plus a materialized tasks.event_summary. Existing
+histories are copied over.
+
+The execution_history column is left in place: during a rolling deploy, replicas still
+on the previous image select it through the ORM. It is no longer read or written and
+is dropped by a follow-up migration shipped once no running image maps it.
+
+Revision ID: 014_add_task_events
+Revises: 013_create_missing_core
+Create Date: 2026-10-16 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.dialects.postgresql import JSONB, UUID
+
+revision: str = "014_add_task_events"
+down_revision: Union[str, None] = "013_create_missing_core"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa_inspect(bind)
+
+    if "task_events" not in inspector.get_table_names():
+        op.create_table(
+            "task_events",
+            sa.Column(
+                "task_id",
+                UUID(as_uuid=True),
+                sa.ForeignKey("tasks.id", ondelete="CASCADE"),
+                primary_key=True,
+            ),
+            sa.Column("seq", sa.Integer(), primary_key=True),
+            sa.Column("event_type", sa.String(20), nullable=False),
+            sa.Column("message", sa.Text(), nullable=False),
+            sa.Column("created_at", sa.DateTime(timezone=True), nullable=False),
+        )
+
+    columns = [c["name"] for c in inspector.get_columns("tasks")]
+    if "event_summary" not in columns:
+        op.add_column("tasks", sa.Column("event_summary", JSONB(), nullable=True))
+
+    if "execution_history" in columns:
+        # Copy existing timelines (seq = position in the list); the orchestrator wrote "level"
+        op.execute(sa.text("""
+            INSERT INTO task_events (task_id, seq, event_type, message, created_at)
+            SELECT t.id,
+                   e.ord::int,
+                   LEFT(COALESCE(e.value->>'type', e.value->>'level', 'info'), 20),
+                   COALESCE(e.value->>'message', ''),
+                   COALESCE((e.value->>'timestamp')::timestamptz, t.updated_at)
+            FROM tasks t
+            CROSS JOIN LATERAL jsonb_array_elements(t.execution_history) WITH ORDINALITY AS e(value, ord)
+            WHERE jsonb_typeof(t.execution_history) = 'array'
+            ON CONFLICT DO NOTHING
+        """))
+        op.execute(sa.text("""
+            WITH counts AS (
+                SELECT task_id, jsonb_object_agg(event_type, n) AS by_type, SUM(n)::int AS total
+                FROM (SELECT task_id, event_type, COUNT(*) AS n FROM task_events GROUP BY task_id, event_type) c
+                GROUP BY task_id
+            ),
+            last_events AS (
+                SELECT DISTINCT ON (task_id) task_id, seq,
+                       jsonb_build_object('seq', seq, 'type', event_type, 'message', message,
+                                          'timestamp', created_at) AS event
+                FROM task_events ORDER BY task_id, seq DESC
+            ),
+            last_errors AS (
+                SELECT DISTINCT ON (task_id) task_id,
+                       jsonb_build_object('seq', seq, 'type', event_type, 'message', message,
+                                          'timestamp', created_at) AS event
+                FROM task_events WHERE event_type = 'error' ORDER BY task_id, seq DESC
+            )
+            UPDATE tasks t SET event_summary = jsonb_build_object(
+                'count', c.total,
+                'last_seq', l.seq,
+                'by_type', c.by_type,
+                'last_event', l.event,
+                'last_error', le.event
+            )
+            FROM counts c
+            JOIN last_events l ON l.task_id = c.task_id
+            LEFT JOIN last_errors le ON le.task_id = c.task_id
+            WHERE t.id = c.task_id
+        """))
+
+
+def downgrade() -> None:
+    columns = [c["name"] for c in sa_inspect(op.get_bind()).get_columns("tasks")]
+    if "execution_history" not in columns:
+        op.add_column("tasks", sa.Column("execution_history", JSONB(), nullable=True))
+    # Events recorded since the upgrade exist only in task_events: rebuild the list from them
+    op.execute(sa.text("""
+        UPDATE tasks t SET execution_history = e.history
+        FROM (
+            SELECT task_id,
+                   jsonb_agg(jsonb_build_object('type', event_type, 'message', message,
+                                                'timestamp', created_at) ORDER BY seq) AS history
+            FROM task_events GROUP BY task_id
+        ) e
+        WHERE t.id = e.task_id
+    """))
+    op.drop_column("tasks", "event_summary")
+    op.drop_table("task_events")
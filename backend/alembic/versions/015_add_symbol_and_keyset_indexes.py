@@ -0,0 +1,62 @@
+"""Denormalize symbol onto tasks and ai_reports; keyset pagination indexes
+
+Listings used to load every task's task_metadata (and every report's linked task) just
+to read the underlying symbol. It is now copied to a column at write time; existing
+rows are backfilled from task_metadata (reports via the producing task's result_ref).
+(user_id, created_at, id) indexes back the keyset-paginated /tasks and /ai/reports.
+
+Revision ID: 015_symbol_keyset
+Revises: 014_add_task_events
+Create Date: 2026-10-16 12:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect as sa_inspect
+
+revision: str = "015_symbol_keyset"
+down_revision: Union[str, None] = "014_add_task_events"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    inspector = sa_inspect(bind)
+
+    if "symbol" not in [c["name"] for c in inspector.get_columns("tasks")]:
+        op.add_column("tasks", sa.Column("symbol", sa.String(20), nullable=True))
+    if "symbol" not in [c["name"] for c in inspector.get_columns("ai_reports")]:
+        op.add_column("ai_reports", sa.Column("symbol", sa.String(20), nullable=True))
+
+    # Same precedence as app.api.endpoints.tasks.symbol_from_metadata
+    op.execute(sa.text("""
+        UPDATE tasks SET symbol = LEFT(UPPER(TRIM(COALESCE(
+            NULLIF(TRIM(task_metadata->'strategy_summary'->>'symbol'), ''),
+            NULLIF(TRIM(task_metadata->'strategy_data'->>'symbol'), ''),
+            NULLIF(TRIM(task_metadata->>'symbol'), '')
+        ))), 20)
+        WHERE symbol IS NULL AND jsonb_typeof(task_metadata) = 'object'
+    """))
+    op.execute(sa.text("""
+        UPDATE ai_reports r SET symbol = t.symbol
+        FROM tasks t
+        WHERE r.symbol IS NULL AND t.symbol IS NOT NULL
+          AND t.user_id = r.user_id AND t.result_ref = r.id::text
+    """))
+
+    task_indexes = [i["name"] for i in inspector.get_indexes("tasks")]
+    if "ix_tasks_user_created_id" not in task_indexes:
+        op.create_index("ix_tasks_user_created_id", "tasks", ["user_id", "created_at", "id"])
+    report_indexes = [i["name"] for i in inspector.get_indexes("ai_reports")]
+    if "ix_ai_reports_user_created_id" not in report_indexes:
+        op.create_index("ix_ai_reports_user_created_id", "ai_reports", ["user_id", "created_at", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_ai_reports_user_created_id", table_name="ai_reports")
+    op.drop_index("ix_tasks_user_created_id", table_name="tasks")
+    op.drop_column("ai_reports", "symbol")
+    op.drop_column("tasks", "symbol")
@@ -0,0 +1,36 @@
+"""Blob references for offloaded prompts and report bodies
+
+Large task prompts and report bodies can now live in content-addressed blob storage
+(app/services/storage/blob_store.py). The column keeps an excerpt and the new *_ref
+column holds the blob digest. Existing rows stay inline (ref NULL) and are read as before.
+
+Revision ID: 016_payload_blob_refs
+Revises: 015_symbol_keyset
+Create Date: 2026-10-16 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+from sqlalchemy import inspect as sa_inspect
+
+revision: str = "016_payload_blob_refs"
+down_revision: Union[str, None] = "015_symbol_keyset"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa_inspect(op.get_bind())
+
+    if "prompt_ref" not in [c["name"] for c in inspector.get_columns("tasks")]:
+        op.add_column("tasks", sa.Column("prompt_ref", sa.String(80), nullable=True))
+    if "content_ref" not in [c["name"] for c in inspector.get_columns("ai_reports")]:
+        op.add_column("ai_reports", sa.Column("content_ref", sa.String(80), nullable=True))
+
+
+def downgrade() -> None:
+    # Offloaded bodies would be reduced to their excerpts; inline them before downgrading
+    op.drop_column("ai_reports", "content_ref")
+    op.drop_column("tasks", "prompt_ref")
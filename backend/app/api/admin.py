@@ -2,7 +2,7 @@
 
 import logging
 from datetime import datetime
-from typing import Annotated
+from typing import Annotated, Any
 from uuid import UUID
 
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -16,7 +16,14 @@ from app.api.endpoints.tasks import TaskResponse
 from app.db.models import SystemConfig, User, Strategy, AIReport
 from app.db.session import AsyncSessionLocal
 from app.core.constants import IMAGE_MODELS, REPORT_MODELS
+from app.services.cache import cache_service
 from app.services.config_service import config_service
+from app.services.executors import executor_stats
+from app.services.quota_counters import current_usage, quota_counters
+from app.services.storage.blob_store import get_blob_store
+from app.services.single_flight import single_flight
+from app.services.tiger_rate_limiter import tiger_rate_limiter
+from app.services.user_context import UserContext, invalidate_user_context
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +63,7 @@ class UserResponse(BaseModel):
     is_superuser: bool = Field(..., description="Superuser status")
     subscription_id: str | None = Field(None, description="Subscription ID")
     plan_expiry_date: datetime | None = Field(None, description="Plan expiry date")
-    daily_ai_usage: int = Field(..., description="Daily AI usage count")
+    daily_ai_usage: int = Field(..., description="Daily AI usage count (today, UTC)")
     created_at: datetime = Field(..., description="Account creation date")
     strategies_count: int = Field(0, description="Number of strategies created by this user")
     ai_reports_count: int = Field(0, description="Number of AI reports generated by this user")
@@ -81,7 +88,7 @@ class UsersListResponse(BaseModel):
 # Configuration endpoints
 @router.get("/configs", response_model=list[ConfigItem])
 async def get_all_configs(
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
 ) -> list[ConfigItem]:
     """
     Get all system configuration items.
@@ -112,7 +119,7 @@ async def get_all_configs(
 @router.get("/configs/{key}", response_model=ConfigItem)
 async def get_config(
     key: str,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
 ) -> ConfigItem:
     """
     Get a specific configuration item.
@@ -141,7 +148,7 @@ async def get_config(
 async def update_config(
     key: str,
     request: ConfigUpdateRequest,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
 ) -> ConfigItem:
     """
     Update a configuration item.
@@ -166,7 +173,7 @@ async def update_config(
 
 @router.get("/ai-models-default", response_model=AIModelsDefaultResponse)
 async def get_ai_models_default(
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
 ) -> AIModelsDefaultResponse:
     """
     Return built-in report and image model lists (for admin UI).
@@ -178,10 +185,28 @@ async def get_ai_models_default(
     )
 
 
+@router.get("/metrics/runtime")
+async def get_runtime_metrics(
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
+) -> dict[str, Any]:
+    """
+    Return in-process runtime metrics of this replica (cache tiers, single-flight,
+    Tiger rate limiter queue depth and wait times, executor pools, blob storage, quota counters).
+    """
+    return {
+        "blob_storage": get_blob_store().stats(),
+        "cache": cache_service.stats(),
+        "executors": executor_stats(),
+        "quota_counters": quota_counters.stats(),
+        "single_flight": single_flight.stats(),
+        "tiger_rate_limiter": tiger_rate_limiter.stats(),
+    }
+
+
 @router.delete("/configs/{key}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_config(
     key: str,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
 ) -> None:
     """
     Delete a configuration item.
@@ -206,7 +231,7 @@ async def delete_config(
 # User management endpoints
 @router.get("/users", response_model=UsersListResponse)
 async def list_users(
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(50, ge=1, le=1000, description="Maximum number of users per page"),
     skip: int = Query(0, ge=0, description="Number of users to skip"),
@@ -270,7 +295,7 @@ async def list_users(
                     is_superuser=row.User.is_superuser,
                     subscription_id=row.User.subscription_id,
                     plan_expiry_date=row.User.plan_expiry_date,
-                    daily_ai_usage=row.User.daily_ai_usage,
+                    daily_ai_usage=current_usage(row.User)["daily_ai_usage"],
                     created_at=row.User.created_at,
                     strategies_count=row.strategies_count,
                     ai_reports_count=row.ai_reports_count,
@@ -292,7 +317,7 @@ async def list_users(
 @router.get("/users/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: UUID,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserResponse:
     """
@@ -338,7 +363,7 @@ async def get_user(
             is_superuser=row.User.is_superuser,
             subscription_id=row.User.subscription_id,
             plan_expiry_date=row.User.plan_expiry_date,
-            daily_ai_usage=row.User.daily_ai_usage,
+            daily_ai_usage=current_usage(row.User)["daily_ai_usage"],
             created_at=row.User.created_at,
             strategies_count=row.strategies_count,
             ai_reports_count=row.ai_reports_count,
@@ -357,7 +382,7 @@ async def get_user(
 async def update_user(
     user_id: UUID,
     request: UserUpdateRequest,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserResponse:
     """
@@ -384,6 +409,7 @@ async def update_user(
             user.plan_expiry_date = request.plan_expiry_date
 
         await db.commit()
+        await invalidate_user_context(user_id)
 
         strategy_count_subq = (
             select(func.count(Strategy.id))
@@ -422,7 +448,7 @@ async def update_user(
             is_superuser=row.User.is_superuser,
             subscription_id=row.User.subscription_id,
             plan_expiry_date=row.User.plan_expiry_date,
-            daily_ai_usage=row.User.daily_ai_usage,
+            daily_ai_usage=current_usage(row.User)["daily_ai_usage"],
             created_at=row.User.created_at,
             strategies_count=row.strategies_count,
             ai_reports_count=row.ai_reports_count,
@@ -441,7 +467,7 @@ async def update_user(
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_user(
     user_id: UUID,
-    current_user: Annotated[User, Depends(get_current_superuser)],
+    current_user: Annotated[UserContext, Depends(get_current_superuser)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """
@@ -497,6 +523,7 @@ async def delete_user(
         # Now delete the user (tasks will be deleted by cascade)
         await db.delete(user)
         await db.commit()
+        await invalidate_user_context(user_id)
         
         logger.info(f"User {user_id} deleted by admin {current_user.id} (deleted {len(images)} images, {len(strategies)} strategies, {len(reports)} reports)")
     except HTTPException:
@@ -2,7 +2,6 @@
 
 import logging
 import uuid
-from datetime import datetime, timezone
 from typing import Annotated
 
 from fastapi import Depends, HTTPException, Header, status
@@ -15,6 +14,7 @@ from app.core.config import settings
 from app.core.security import verify_token
 from app.db.models import User
 from app.db.session import get_db
+from app.services.user_context import UserContext, get_user_context
 
 logger = logging.getLogger(__name__)
 
@@ -26,7 +26,7 @@ security = HTTPBearer(auto_error=False)
 async def get_current_user(
     credentials: Annotated[HTTPAuthorizationCredentials | None, Depends(security)],
     db: Annotated[AsyncSession, Depends(get_db)],
-) -> User:
+) -> UserContext:
     """
     Dependency to get current authenticated user from JWT token.
 
@@ -34,15 +34,17 @@ async def get_current_user(
     1. Extract token from Authorization header
     2. Verify and decode JWT token
     3. Extract user ID from token (sub claim)
-    4. Query database for user
-    5. Return User model
+    4. Load the user's context (cached; see app/services/user_context.py)
+    5. Return UserContext
+
+    Handlers that modify the user row should depend on get_current_db_user instead.
 
     Args:
         credentials: HTTP Bearer token credentials from Authorization header (None for OPTIONS requests)
         db: Database session
 
     Returns:
-        User model instance
+        UserContext of the authenticated user
 
     Raises:
         HTTPException: If token is invalid, expired, or user not found
@@ -79,9 +81,8 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Query database for user
-        result = await db.execute(select(User).where(User.id == user_id))
-        user = result.scalar_one_or_none()
+        # Cached context (also auto-downgrades an expired Pro plan on load)
+        user = await get_user_context(db, user_id)
 
         if user is None:
             raise HTTPException(
@@ -90,27 +91,6 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        # Auto-downgrade expired Pro (safety net for missed webhooks).
-        # Guard: only write if is_pro is still True AND subscription_type is set,
-        # so we commit exactly once per expiry (not on every subsequent request).
-        if (
-            user.is_pro
-            and user.plan_expiry_date
-            and user.plan_expiry_date < datetime.now(timezone.utc)
-        ):
-            user.is_pro = False
-            user.subscription_type = None
-            try:
-                await db.commit()
-                await db.refresh(user)
-                logger.info(
-                    "Auto-downgraded expired Pro for user %s (expired %s)",
-                    user.id,
-                    user.plan_expiry_date,
-                )
-            except Exception:
-                await db.rollback()
-
         return user
 
     except JWTError as e:
@@ -131,9 +111,28 @@ async def get_current_user(
         )
 
 
-async def get_current_superuser(
-    current_user: Annotated[User, Depends(get_current_user)],
+async def get_current_db_user(
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
 ) -> User:
+    """
+    Dependency to load the authenticated user's full ORM row (for handlers that modify it).
+
+    Callers must invalidate_user_context(user.id) after committing changes.
+    """
+    result = await db.execute(select(User).where(User.id == current_user.id))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user
+
+
+async def get_current_superuser(
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+) -> UserContext:
     """
     Dependency to verify current user is a superuser.
 
@@ -143,7 +142,7 @@ async def get_current_superuser(
         current_user: Current authenticated user (from get_current_user)
 
     Returns:
-        User model instance if superuser
+        UserContext if superuser
 
     Raises:
         HTTPException: If user is not a superuser
@@ -1,27 +1,31 @@
 """AI analysis API endpoints."""
 
+import asyncio
 import logging
-from datetime import datetime, timezone, date
+from datetime import datetime, timedelta, timezone, date
 from io import BytesIO
-from typing import Annotated, Any
+from typing import Annotated, Any, Literal
 from uuid import UUID
 
 import pytz
 from fastapi import APIRouter, Depends, HTTPException, Query, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import and_, select, update
+from sqlalchemy import select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.api.schemas import AIReportResponse, TaskResponse
 from app.core.config import settings
-from app.db.models import AIReport, GeneratedImage, Task, User
+from app.db.models import AIReport, GeneratedImage, User
 from app.db.session import AsyncSessionLocal, get_db
 from app.services.ai_service import ai_service
 from app.services.config_service import config_service
+from app.services.quota_counters import QUOTA_COLUMNS, quota_counters
 from app.services.report_pdf_service import PdfExportUnavailable, generate_report_pdf
-from app.api.endpoints.tasks import create_task_async
+from app.services.task_payloads import load_text, offload_report_content
+from app.services.user_context import UserContext, apply_user_fields, invalidate_user_context
+from app.api.endpoints.tasks import create_task_async, symbol_from_metadata
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +41,14 @@ PRO_MONTHLY_IMAGE_QUOTA = 10
 PRO_YEARLY_AI_QUOTA = 100
 PRO_YEARLY_IMAGE_QUOTA = 30
 
+# Columns a daily reset writes (read back with RETURNING onto the caller's user)
+RESET_COLUMNS = (
+    User.daily_ai_usage,
+    User.daily_image_usage,
+    User.daily_fundamental_queries_used,
+    User.last_quota_reset_date,
+)
+
 
 class AIModelInfo(BaseModel):
     """One entry in the list of available report models."""
@@ -104,12 +116,12 @@ class StrategyAnalysisRequest(BaseModel):
     )
 
 
-def get_ai_quota_limit(user: User) -> int:
+def get_ai_quota_limit(user: User | UserContext) -> int:
     """
     Get AI report quota limit for user based on subscription type.
     
     Args:
-        user: User model instance
+        user: User model instance or request UserContext
         
     Returns:
         Quota limit (reports per day)
@@ -127,12 +139,12 @@ def get_ai_quota_limit(user: User) -> int:
         return PRO_MONTHLY_AI_QUOTA
 
 
-def get_image_quota_limit(user: User) -> int:
+def get_image_quota_limit(user: User | UserContext) -> int:
     """
     Get image generation quota limit for user based on subscription type.
     
     Args:
-        user: User model instance
+        user: User model instance or request UserContext
         
     Returns:
         Quota limit (images per day)
@@ -150,11 +162,13 @@ def get_image_quota_limit(user: User) -> int:
         return PRO_MONTHLY_IMAGE_QUOTA
 
 
-async def check_and_reset_quota_if_needed(user: User, db: AsyncSession) -> None:
+async def check_and_reset_quota_if_needed(user: User | UserContext, db: AsyncSession) -> None:
     """
     Check if AI/image quota needs to be reset based on date, and reset if needed.
     Also resets fundamental quota to avoid split-reset race condition where one
     quota type stays stale when the other resets first.
+
+    Only used while Redis is unavailable: the Redis counters are per day already.
     """
     today_utc = datetime.now(timezone.utc).date()
     last_reset_date = user.last_quota_reset_date.date() if user.last_quota_reset_date else None
@@ -169,14 +183,23 @@ async def check_and_reset_quota_if_needed(user: User, db: AsyncSession) -> None:
                 daily_fundamental_queries_used=0,
                 last_quota_reset_date=datetime.now(timezone.utc),
             )
+            .returning(*RESET_COLUMNS)
         )
-        await db.execute(stmt)
+        row = (await db.execute(stmt)).one_or_none()
         await db.commit()
-        await db.refresh(user)
+        if row is not None:
+            apply_user_fields(user, row._mapping)
+        await invalidate_user_context(user.id)
         logger.info(f"Reset all daily quotas for user {user.id} (date changed from {last_reset_date} to {today_utc})")
 
 
-async def check_ai_quota(user: User, db: AsyncSession, required_quota: int = 1) -> None:
+async def load_quota_usage(user: User | UserContext, db: AsyncSession) -> None:
+    """Bring user's daily counters up to date (Redis; Postgres with date-based reset as fallback)."""
+    if not await quota_counters.load_usage(user):
+        await check_and_reset_quota_if_needed(user, db)
+
+
+async def check_ai_quota(user: User | UserContext, db: AsyncSession, required_quota: int = 1) -> None:
     """
     Check if user has remaining AI report quota.
     Automatically resets quota if date has changed.
@@ -187,8 +210,7 @@ async def check_ai_quota(user: User, db: AsyncSession, required_quota: int = 1)
     Raises:
         HTTPException: If quota exceeded (429 Too Many Requests)
     """
-    # Check and reset quota if date changed
-    await check_and_reset_quota_if_needed(user, db)
+    await load_quota_usage(user, db)
     
     quota_limit = get_ai_quota_limit(user)
 
@@ -201,20 +223,19 @@ async def check_ai_quota(user: User, db: AsyncSession, required_quota: int = 1)
         )
 
 
-async def check_image_quota(user: User, db: AsyncSession) -> None:
+async def check_image_quota(user: User | UserContext, db: AsyncSession) -> None:
     """
     Check if user has remaining image generation quota.
     Automatically resets quota if date has changed.
 
     Args:
-        user: User model instance
+        user: User model instance or request UserContext
         db: Database session
 
     Raises:
         HTTPException: If quota exceeded (429 Too Many Requests)
     """
-    # Check and reset quota if date changed
-    await check_and_reset_quota_if_needed(user, db)
+    await load_quota_usage(user, db)
     
     quota_limit = get_image_quota_limit(user)
 
@@ -226,93 +247,119 @@ async def check_image_quota(user: User, db: AsyncSession) -> None:
         )
 
 
-async def increment_ai_usage(user: User, db: AsyncSession, quota_units: int = 1) -> None:
+async def _increment_usage_in_db(
+    user: User | UserContext, db: AsyncSession, column: str, amount: int, limit: int | None
+) -> bool:
+    """Postgres fallback for quota_counters.reserve (atomic conditional UPDATE)."""
+    await check_and_reset_quota_if_needed(user, db)
+    counter = getattr(User, column)
+    stmt = update(User).where(User.id == user.id)
+    if limit is not None:
+        stmt = stmt.where(counter + amount <= limit)
+    stmt = stmt.values({column: counter + amount}).returning(counter)
+    row = (await db.execute(stmt)).one_or_none()
+    await db.commit()
+    if row is None:
+        return False
+    apply_user_fields(user, row._mapping)
+    await invalidate_user_context(user.id)
+    return True
+
+
+async def increment_ai_usage(user: User | UserContext, db: AsyncSession, quota_units: int = 1) -> None:
     """
     Increment user's daily AI report usage counter.
     Automatically resets quota if date has changed.
 
     Args:
-        user: User model instance
+        user: User model instance or request UserContext
         db: Database session
         quota_units: Number of quota units to increment (1 for single-agent, 5 for multi-agent)
     """
-    # Check and reset quota if date changed
-    await check_and_reset_quota_if_needed(user, db)
-    
-    stmt = (
-        update(User)
-        .where(User.id == user.id)
-        .values(daily_ai_usage=User.daily_ai_usage + quota_units)
-    )
-    await db.execute(stmt)
-    await db.commit()
-    # Refresh user to get updated daily_ai_usage
-    await db.refresh(user)
+    if await quota_counters.reserve(user, "ai", quota_units) is None:
+        await _increment_usage_in_db(user, db, "daily_ai_usage", quota_units, None)
 
 
 async def increment_ai_usage_if_within_quota(
-    user: User, db: AsyncSession, quota_units: int = 1
+    user: User | UserContext, db: AsyncSession, quota_units: int = 1
 ) -> bool:
     """
     Atomically increment daily_ai_usage only if the new value would not exceed quota.
     Use this before generating a report to avoid race conditions under concurrency.
 
     Args:
-        user: User model instance (will be refreshed if quota was reset)
+        user: User model instance or request UserContext (counters are updated in place)
         db: Database session
         quota_units: Number of quota units to reserve (1 for single-agent, 5 for multi-agent)
 
     Returns:
         True if increment was applied (quota reserved), False if quota would be exceeded.
     """
-    await check_and_reset_quota_if_needed(user, db)
     quota_limit = get_ai_quota_limit(user)
-
-    stmt = (
-        update(User)
-        .where(
-            and_(
-                User.id == user.id,
-                (User.daily_ai_usage + quota_units) <= quota_limit,
-            )
-        )
-        .values(daily_ai_usage=User.daily_ai_usage + quota_units)
-    )
-    result = await db.execute(stmt)
-    await db.commit()
-    if result.rowcount == 0:
-        return False
-    await db.refresh(user)
-    return True
+    reserved = await quota_counters.reserve(user, "ai", quota_units, quota_limit)
+    if reserved is None:
+        reserved = await _increment_usage_in_db(user, db, "daily_ai_usage", quota_units, quota_limit)
+    return reserved
 
 
-async def increment_image_usage(user: User, db: AsyncSession) -> None:
+async def increment_image_usage(user: User | UserContext, db: AsyncSession) -> None:
     """
     Increment user's daily image generation usage counter.
     Automatically resets quota if date has changed.
 
     Args:
-        user: User model instance
+        user: User model instance or request UserContext
         db: Database session
     """
-    # Check and reset quota if date changed
-    await check_and_reset_quota_if_needed(user, db)
-    
-    stmt = (
+    if await quota_counters.reserve(user, "image", 1) is None:
+        await _increment_usage_in_db(user, db, "daily_image_usage", 1, None)
+
+
+async def increment_image_usage_if_within_quota(user: User | UserContext, db: AsyncSession) -> bool:
+    """
+    Atomically reserve one image generation if it would not exceed quota.
+
+    Returns:
+        True if reserved, False if the daily image quota is used up.
+    """
+    quota_limit = get_image_quota_limit(user)
+    reserved = await quota_counters.reserve(user, "image", 1, quota_limit)
+    if reserved is None:
+        reserved = await _increment_usage_in_db(user, db, "daily_image_usage", 1, quota_limit)
+    return reserved
+
+
+def reserved_quota_day(user: User | UserContext) -> date:
+    """Quota day a successful reservation on user was counted against (pass it to refund_quota)."""
+    # Both the Redis and the Postgres path leave last_quota_reset_date on the counters' day
+    return user.last_quota_reset_date.astimezone(timezone.utc).date()
+
+
+async def refund_quota(user_id: UUID, db: AsyncSession, kind: str, amount: int, day: date) -> None:
+    """Give back quota units (kind: "ai" or "image") reserved on day after a failed generation."""
+    if await quota_counters.refund(user_id, kind, amount, day):
+        return
+    # Postgres only holds the counters of one day; leave them alone if that is a later day
+    column = getattr(User, QUOTA_COLUMNS[kind])
+    day_start = datetime(day.year, day.month, day.day, tzinfo=timezone.utc)
+    await db.execute(
         update(User)
-        .where(User.id == user.id)
-        .values(daily_image_usage=User.daily_image_usage + 1)
+        .where(
+            User.id == user_id,
+            column >= amount,
+            User.last_quota_reset_date >= day_start,
+            User.last_quota_reset_date < day_start + timedelta(days=1),
+        )
+        .values({column: column - amount})
     )
-    await db.execute(stmt)
     await db.commit()
-    # Refresh user to get updated daily_image_usage
-    await db.refresh(user)
+    await invalidate_user_context(user_id)
 
 
 @router.post("/report", response_model=AIReportResponse | TaskResponse, status_code=status.HTTP_201_CREATED)
 async def generate_ai_report(
     request: StrategyAnalysisRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> AIReportResponse | TaskResponse:
     """
@@ -408,7 +455,8 @@ async def generate_ai_report(
             result_ref=task.result_ref,
             error_message=task.error_message,
             metadata=task.task_metadata,
-            execution_history=task.execution_history,
+            symbol=task.symbol,
+            event_summary=task.event_summary,
             prompt_used=task.prompt_used,
             model_used=task.model_used,
             started_at=task.started_at,
@@ -436,6 +484,7 @@ async def generate_ai_report(
             f"Current usage: {current_user.daily_ai_usage}, Required: {required_quota}, "
             f"Available: {quota_limit - current_user.daily_ai_usage}",
         )
+    reserved_day = reserved_quota_day(current_user)
 
     try:
         # Step 3: Generate report using AI service
@@ -511,8 +560,13 @@ async def generate_ai_report(
             user_id=current_user.id,
             report_content=report_content,
             model_used=settings.ai_model_default,
+            symbol=symbol_from_metadata({
+                "strategy_summary": request.strategy_summary,
+                "strategy_data": request.strategy_data,
+            }),
             created_at=datetime.now(timezone.utc),
         )
+        await offload_report_content(ai_report)
         db.add(ai_report)
         await db.flush()  # Flush to get the ID
         await db.refresh(ai_report)
@@ -525,7 +579,7 @@ async def generate_ai_report(
 
         return AIReportResponse(
             id=str(ai_report.id),
-            report_content=ai_report.report_content,
+            report_content=report_content,
             model_used=ai_report.model_used,
             created_at=ai_report.created_at,
             metadata=response_metadata,
@@ -539,14 +593,7 @@ async def generate_ai_report(
 
         # Refund reserved quota on AI generation failure
         try:
-            from sqlalchemy import update as _sql_update
-            refund_stmt = (
-                _sql_update(User)
-                .where(User.id == current_user.id, User.daily_ai_usage >= required_quota)
-                .values(daily_ai_usage=User.daily_ai_usage - required_quota)
-            )
-            await db.execute(refund_stmt)
-            await db.commit()
+            await refund_quota(current_user.id, db, "ai", required_quota, reserved_day)
             logger.info(f"Refunded {required_quota} quota units for user {current_user.id} after AI failure")
         except Exception as refund_err:
             logger.error(f"Failed to refund quota: {refund_err}")
@@ -566,69 +613,59 @@ async def generate_ai_report(
 
 @router.get("/reports", response_model=list[AIReportResponse])
 async def get_user_reports(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(10, ge=1, le=100, description="Maximum number of reports to return"),
-    offset: int = Query(0, ge=0, description="Number of reports to skip"),
+    offset: int = Query(0, ge=0, description="Number of reports to skip (deprecated: use before_created_at/before_id)"),
+    before_created_at: datetime | None = Query(None, description="Keyset cursor: created_at of the last report already seen"),
+    before_id: UUID | None = Query(None, description="Keyset cursor: id of the last report already seen"),
+    view: Literal["summary", "full"] = Query("summary", description="summary (no report_content) or full"),
 ) -> list[AIReportResponse]:
     """
-    Get user's AI reports (paginated).
+    Get user's AI reports (paginated, newest first).
 
-    Returns reports for the authenticated user only.
+    Returns reports for the authenticated user only. The default summary view selects
+    only id, model, symbol and created_at; report_content comes from
+    GET /ai/reports/{id} (or view=full). Pass the last item's created_at and id as
+    before_created_at/before_id to get the next page.
 
     Args:
         current_user: Authenticated user (from JWT token)
         db: Database session
         limit: Maximum number of reports to return (1-100)
-        offset: Number of reports to skip
+        offset: Number of reports to skip (ignored when a cursor is given)
+        before_created_at: created_at of the last report of the previous page
+        before_id: id of the last report of the previous page
+        view: "summary" or "full"
 
     Returns:
         List of AIReportResponse
     """
     try:
-        result = await db.execute(
-            select(AIReport)
-            .where(AIReport.user_id == current_user.id)
-            .order_by(AIReport.created_at.desc())
-            .limit(limit)
-            .offset(offset)
-        )
-        reports = result.scalars().all()
-        if not reports:
-            return []
-
-        report_ids = [str(r.id) for r in reports]
-        task_result = await db.execute(
-            select(Task).where(
-                Task.user_id == current_user.id,
-                Task.result_ref.in_(report_ids),
-            )
-        )
-        tasks = task_result.scalars().all()
-        symbol_by_result_ref: dict[str, str] = {}
-        for t in tasks:
-            if not t.result_ref:
-                continue
-            meta = t.task_metadata or {}
-            ss = meta.get("strategy_summary") or {}
-            sd = meta.get("strategy_data") or {}
-            symbol = (
-                (ss.get("symbol") if isinstance(ss, dict) else None)
-                or (sd.get("symbol") if isinstance(sd, dict) else None)
-                or meta.get("symbol")
-            )
-            if symbol and isinstance(symbol, str) and symbol.strip():
-                symbol_by_result_ref[t.result_ref.strip()] = symbol.strip().upper()
+        columns = [AIReport.id, AIReport.model_used, AIReport.symbol, AIReport.created_at]
+        if view == "full":
+            columns += [AIReport.report_content, AIReport.content_ref]
+        stmt = select(*columns).where(AIReport.user_id == current_user.id)
+        if before_created_at is not None and before_id is not None:
+            stmt = stmt.where(tuple_(AIReport.created_at, AIReport.id) < tuple_(before_created_at, before_id))
+        elif offset:
+            stmt = stmt.offset(offset)
+        stmt = stmt.order_by(AIReport.created_at.desc(), AIReport.id.desc()).limit(limit)
+        result = await db.execute(stmt)
+        rows = result.all()
+        contents: list[str | None] = [None] * len(rows)
+        if view == "full":
+            contents = await asyncio.gather(*(load_text(row.report_content, row.content_ref) for row in rows))
 
         return [
             AIReportResponse(
-                id=str(report.id),
-                report_content=report.report_content,
-                model_used=report.model_used or "",
-                created_at=report.created_at,
-                symbol=symbol_by_result_ref.get(str(report.id)),
+                id=str(row.id),
+                report_content=content,
+                model_used=row.model_used or "",
+                created_at=row.created_at,
+                symbol=row.symbol,
             )
-            for report in reports
+            for row, content in zip(rows, contents)
         ]
 
     except Exception as e:
@@ -642,7 +679,7 @@ async def get_user_reports(
 @router.get("/reports/{report_id}", response_model=AIReportResponse)
 async def get_report(
     report_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> AIReportResponse:
     """Get a single AI report by ID for the authenticated user."""
@@ -659,32 +696,13 @@ async def get_report(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Report not found",
             )
-        symbol: str | None = None
-        task_result = await db.execute(
-            select(Task).where(
-                Task.user_id == current_user.id,
-                Task.result_ref == str(report_id),
-            )
-        )
-        task = task_result.scalar_one_or_none()
-        if task and task.task_metadata:
-            meta = task.task_metadata
-            ss = meta.get("strategy_summary") or {}
-            sd = meta.get("strategy_data") or {}
-            sym = (
-                (ss.get("symbol") if isinstance(ss, dict) else None)
-                or (sd.get("symbol") if isinstance(sd, dict) else None)
-                or meta.get("symbol")
-            )
-            if sym and isinstance(sym, str) and sym.strip():
-                symbol = sym.strip().upper()
         return AIReportResponse(
             id=str(report.id),
-            report_content=report.report_content,
+            report_content=await load_text(report.report_content, report.content_ref),
             model_used=report.model_used or "",
             created_at=report.created_at,
             metadata=None,
-            symbol=symbol,
+            symbol=report.symbol,
         )
     except HTTPException:
         raise
@@ -699,7 +717,7 @@ async def get_report(
 @router.get("/reports/{report_id}/pdf")
 async def get_report_pdf(
     report_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """Export a single AI report as PDF (EC-style, server-side Playwright)."""
@@ -721,7 +739,7 @@ async def get_report_pdf(
             dt = pytz.utc.localize(dt)
         created_at_str = dt.astimezone(pytz.timezone("US/Eastern")).strftime("%Y-%m-%d %H:%M %Z")
         pdf_bytes = await generate_report_pdf(
-            report.report_content or "",
+            await load_text(report.report_content, report.content_ref) or "",
             report.model_used or "N/A",
             created_at_str,
         )
@@ -749,7 +767,7 @@ async def get_report_pdf(
 @router.delete("/reports/{report_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_report(
     report_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """
@@ -798,7 +816,7 @@ async def delete_report(
 @router.post("/chart", status_code=status.HTTP_201_CREATED)
 async def generate_strategy_chart(
     request: StrategyAnalysisRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
@@ -874,7 +892,7 @@ async def generate_strategy_chart(
 @router.get("/chart/info/{image_id}")
 async def get_strategy_chart_info(
     image_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, str | None]:
     """
@@ -931,7 +949,7 @@ async def get_strategy_chart_info(
 @router.get("/chart/by-hash/{strategy_hash}")
 async def get_strategy_chart_by_hash(
     strategy_hash: str,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, str | None]:
     """
@@ -993,7 +1011,7 @@ async def get_strategy_chart_by_hash(
 @router.get("/chart/{image_id}")
 async def get_strategy_chart(
     image_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
@@ -1059,7 +1077,7 @@ async def get_strategy_chart(
 @router.post("/report/multi-agent", response_model=AIReportResponse, status_code=status.HTTP_201_CREATED)
 async def generate_multi_agent_report(
     request: StrategyAnalysisRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> AIReportResponse:
     """
@@ -1116,7 +1134,7 @@ class StockScreeningResponse(BaseModel):
 @router.post("/workflows/stock-screening", response_model=StockScreeningResponse | TaskResponse, status_code=status.HTTP_200_OK)
 async def screen_stocks(
     request: StockScreeningRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> StockScreeningResponse | TaskResponse:
     """
@@ -1220,7 +1238,8 @@ Return ONLY valid JSON.
             result_ref=task.result_ref,
             error_message=task.error_message,
             metadata=task.task_metadata,
-            execution_history=task.execution_history,
+            symbol=task.symbol,
+            event_summary=task.event_summary,
             prompt_used=task.prompt_used,
             model_used=task.model_used,
             started_at=task.started_at,
@@ -1354,7 +1373,7 @@ class OptionsAnalysisWorkflowResponse(BaseModel):
 @router.post("/workflows/options-analysis", response_model=OptionsAnalysisWorkflowResponse | TaskResponse, status_code=status.HTTP_200_OK)
 async def analyze_options_workflow(
     request: OptionsAnalysisWorkflowRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> OptionsAnalysisWorkflowResponse | TaskResponse:
     """
@@ -1414,7 +1433,8 @@ async def analyze_options_workflow(
             result_ref=task.result_ref,
             error_message=task.error_message,
             metadata=task.task_metadata,
-            execution_history=task.execution_history,
+            symbol=task.symbol,
+            event_summary=task.event_summary,
             prompt_used=task.prompt_used,
             model_used=task.model_used,
             started_at=task.started_at,
@@ -1524,7 +1544,7 @@ class AgentListResponse(BaseModel):
 
 @router.get("/agents/list", response_model=AgentListResponse, status_code=status.HTTP_200_OK)
 async def list_agents(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     agent_type: Annotated[str | None, Query(description="Filter by agent type")] = None,
 ) -> AgentListResponse:
     """
@@ -1592,7 +1612,7 @@ async def list_agents(
 @router.get("/chart/{image_id}/download")
 async def download_strategy_chart(
     image_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ):
     """
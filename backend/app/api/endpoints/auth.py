@@ -10,9 +10,10 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.core.security import create_access_token
-from app.db.models import AIReport, Strategy, User
+from app.db.models import AIReport, Strategy
 from app.db.session import get_db
 from app.services.auth_service import authenticate_user, verify_google_token
+from app.services.user_context import UserContext
 
 logger = logging.getLogger(__name__)
 
@@ -104,7 +105,7 @@ class UserMeResponse(BaseModel):
 
 @router.get("/me", response_model=UserMeResponse, status_code=status.HTTP_200_OK)
 async def get_current_user_info(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> UserMeResponse:
     """
@@ -119,9 +120,12 @@ async def get_current_user_info(
     Returns:
         UserMeResponse with user details
     """
-    from app.api.endpoints.ai import get_ai_quota_limit, get_image_quota_limit
+    from app.api.endpoints.ai import get_ai_quota_limit, get_image_quota_limit, load_quota_usage
 
     try:
+        # Today's counters (the cached context may hold older ones)
+        await load_quota_usage(current_user, db)
+
         # Calculate quota based on subscription type
         ai_quota = get_ai_quota_limit(current_user)
         image_quota = get_image_quota_limit(current_user)
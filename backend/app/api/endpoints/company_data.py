@@ -21,6 +21,8 @@ from app.db.models import User, StockSymbol
 from app.db.session import get_db
 from app.services.fundamental_data_service import FundamentalDataService
 from app.services.market_data_service import MarketDataService
+from app.services.quota_counters import quota_counters
+from app.services.user_context import UserContext, apply_user_fields, invalidate_user_context
 
 logger = logging.getLogger(__name__)
 
@@ -30,11 +32,11 @@ FREE_FUNDAMENTAL_QUOTA = 2
 PRO_FUNDAMENTAL_QUOTA = 100
 
 
-def get_fundamental_quota_limit(user: User) -> int:
+def get_fundamental_quota_limit(user: User | UserContext) -> int:
     return PRO_FUNDAMENTAL_QUOTA if user.is_pro else FREE_FUNDAMENTAL_QUOTA
 
 
-async def check_and_reset_fundamental_quota_if_needed(user: User, db: AsyncSession) -> None:
+async def check_and_reset_fundamental_quota_if_needed(user: User | UserContext, db: AsyncSession) -> None:
     """If last_quota_reset_date is not today (UTC), reset ALL quotas atomically
     to avoid the race condition where one quota type stays stale."""
     today_utc = datetime.now(timezone.utc).date()
@@ -49,23 +51,49 @@ async def check_and_reset_fundamental_quota_if_needed(user: User, db: AsyncSessi
                 daily_image_usage=0,
                 last_quota_reset_date=datetime.now(timezone.utc),
             )
+            .returning(
+                User.daily_fundamental_queries_used,
+                User.daily_ai_usage,
+                User.daily_image_usage,
+                User.last_quota_reset_date,
+            )
         )
-        await db.execute(stmt)
+        row = (await db.execute(stmt)).one_or_none()
         await db.commit()
-        await db.refresh(user)
+        if row is not None:
+            apply_user_fields(user, row._mapping)
+        await invalidate_user_context(user.id)
+
+
+async def _deduct_fundamental_query_in_db(user: User | UserContext, db: AsyncSession, limit: int) -> bool:
+    """Postgres fallback for the Redis counter: atomic conditional increment."""
+    await check_and_reset_fundamental_quota_if_needed(user, db)
+    stmt = (
+        update(User)
+        .where(User.id == user.id, User.daily_fundamental_queries_used < limit)
+        .values(daily_fundamental_queries_used=User.daily_fundamental_queries_used + 1)
+        .returning(User.daily_fundamental_queries_used)
+    )
+    row = (await db.execute(stmt)).one_or_none()
+    if row is None:
+        return False
+    await db.commit()
+    apply_user_fields(user, row._mapping)
+    await invalidate_user_context(user.id)
+    return True
 
 
 async def ensure_fundamental_quota_and_deduct(
-    user: User,
+    user: User | UserContext,
     db: AsyncSession,
     symbol: str,
     fundamental_service: FundamentalDataService,
 ) -> None:
     """
-    Ensure quota is reset if new day; if already deducted for this symbol today, return.
-    Else if used >= limit raise 403; else increment daily_fundamental_queries_used and mark symbol deducted.
+    If already deducted for this symbol today, return. Else reserve one query on the
+    daily counter (Redis; Postgres with date-based reset while Redis is unavailable):
+    raise 403 if used >= limit, otherwise mark the symbol deducted.
     """
-    await check_and_reset_fundamental_quota_if_needed(user, db)
     # Check Redis dedup first (fast path, no DB hit)
     already = await fundamental_service.was_deducted_today(str(user.id), symbol)
     if already:
@@ -85,20 +113,15 @@ async def ensure_fundamental_quota_and_deduct(
     if _lock_acquired is False:
         return  # Another request already claimed this symbol
     limit = get_fundamental_quota_limit(user)
-    stmt = (
-        update(User)
-        .where(User.id == user.id, User.daily_fundamental_queries_used < limit)
-        .values(daily_fundamental_queries_used=User.daily_fundamental_queries_used + 1)
-    )
-    result = await db.execute(stmt)
-    if result.rowcount == 0:
+    reserved = await quota_counters.reserve(user, "fundamental", 1, limit)
+    if reserved is None:
+        reserved = await _deduct_fundamental_query_in_db(user, db, limit)
+    if not reserved:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail=f"Daily Company Data limit reached ({limit}/{limit}). "
             "Upgrade to Pro for 100 queries per day.",
         )
-    await db.commit()
-    await db.refresh(user)
     await fundamental_service.mark_deducted_today(str(user.id), symbol)
 
 
@@ -127,11 +150,12 @@ def _get_fundamental_service() -> FundamentalDataService:
 
 @router.get("/quota", response_model=CompanyDataQuotaResponse)
 async def get_quota(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> CompanyDataQuotaResponse:
     """Return current user's Company Data quota (used, limit, is_pro). Resets at UTC midnight."""
-    await check_and_reset_fundamental_quota_if_needed(current_user, db)
+    if not await quota_counters.load_usage(current_user):
+        await check_and_reset_fundamental_quota_if_needed(current_user, db)
     limit = get_fundamental_quota_limit(current_user)
     return CompanyDataQuotaResponse(
         used=current_user.daily_fundamental_queries_used,
@@ -175,7 +199,7 @@ async def _search_symbols_local(
 @router.get("/search", response_model=list[CompanyDataSearchItem])
 async def search(
     q: Annotated[str, Query(..., min_length=1, description="Symbol or company name")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: Annotated[int, Query(ge=1, le=30)] = 10,
 ) -> list[CompanyDataSearchItem]:
@@ -227,7 +251,7 @@ async def search(
 @router.get("/overview")
 async def get_overview(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, Any]:
     """Get overview module for symbol. Consumes 1 quota on cache miss (once per symbol per day)."""
@@ -247,7 +271,7 @@ async def get_overview(
 @router.get("/full")
 async def get_full(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     modules: Annotated[
         str | None,
@@ -281,7 +305,7 @@ async def get_full(
 @router.get("/news")
 async def get_news(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     limit: Annotated[int, Query(ge=1, le=20)] = 5,
 ) -> list[dict[str, Any]]:
     """Get stock news for symbol. Does not consume quota."""
@@ -300,7 +324,7 @@ async def get_news(
 @router.get("/statements")
 async def get_statements(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     period: Annotated[str, Query(description="annual or quarter")] = "annual",
     limit: Annotated[int, Query(ge=1, le=20)] = 5,
@@ -324,7 +348,7 @@ async def get_statements(
 @router.get("/sec-filings")
 async def get_sec_filings(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     limit: Annotated[int, Query(ge=1, le=50)] = 20,
 ) -> list[dict[str, Any]]:
     """SEC filings (10-K, 10-Q, 8-K). Does not consume quota."""
@@ -343,7 +367,7 @@ async def get_sec_filings(
 @router.get("/insider")
 async def get_insider(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     limit: Annotated[int, Query(ge=1, le=50)] = 20,
 ) -> list[dict[str, Any]]:
     """Insider trading. Does not consume quota."""
@@ -362,7 +386,7 @@ async def get_insider(
 @router.get("/governance")
 async def get_governance(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """Key executives and compensation. Does not consume quota."""
     service = _get_fundamental_service()
@@ -380,7 +404,7 @@ async def get_governance(
 @router.get("/calendar")
 async def get_calendar(
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """Get earnings, dividends, splits calendar for symbol. Does not consume quota."""
     service = _get_fundamental_service()
@@ -399,7 +423,7 @@ async def get_calendar(
 async def get_module(
     module_id: str,
     symbol: Annotated[str, Query(..., min_length=1)],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> dict[str, Any]:
     """Get one module (overview, valuation, ratios, analyst, charts). Consumes 1 quota on cache miss."""
@@ -1,29 +1,44 @@
 """Market data API endpoints."""
 
+import asyncio
+import json
 import logging
 import math
-from datetime import datetime, timezone
-from typing import Annotated, Any
+from datetime import datetime, timedelta, timezone
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable
 
-from fastapi import APIRouter, Depends, HTTPException, Path, Query, status
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Path, Query, Request, status
+from fastapi.responses import Response, StreamingResponse
 
 from app.api.deps import get_current_user
 from app.api.schemas import OptionChainResponse, SymbolSearchResponse
 from app.schemas.strategy_recommendation import (
+    BatchRecommendationRequest,
+    BatchRecommendationResponse,
+    RankedRecommendations,
+    RiskProfile,
     StrategyRecommendationRequest,
+    SymbolRecommendations,
     CalculatedStrategy,
     Outlook,
 )
-from app.db.models import User, StockSymbol
+from app.db.models import StockSymbol
 from app.db.session import get_db
 from app.core.constants import CacheTTL
 from app.services.cache import cache_service
+from app.services.chain_prefetcher import record_chain_request
+from app.services.chain_response import GZIP_MIN_BYTES, accepts_gzip, chain_body_cache, etag_matches
+from app.services.chain_stream import chain_stream_hub
+from app.services.executors import run_in_executor
+from app.services.option_chain import OptionChain
+from app.services.tiger_rate_limiter import TigerPriority, tiger_priority
 from app.services.tiger_service import tiger_service
 from app.services.market_data_service import MarketDataService
-from fastapi.concurrency import run_in_threadpool
 from app.services.strategy_engine import StrategyEngine
 from app.core.config import settings
 from app.services.config_service import config_service
+from app.services.user_context import UserContext
 from sqlalchemy import select, or_, case
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -32,10 +47,18 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/market", tags=["market"])
 
 market_data_service = MarketDataService()
+strategy_engine = StrategyEngine()
 
 
-def _average_implied_volatility(chain_data: dict[str, Any]) -> float | None:
+def _average_implied_volatility(chain_data: dict[str, Any] | OptionChain) -> float | None:
     """Compute average implied volatility from option chain (calls + puts). IV in decimal [0,1]."""
+    if isinstance(chain_data, OptionChain):
+        iv = np.concatenate([chain_data.calls.column("implied_vol"), chain_data.puts.column("implied_vol")])
+        iv = iv[iv > 0]  # drops NaN as well
+        # If IV looks like percent (e.g. 30), convert to decimal
+        iv = np.where(iv > 1.0, iv / 100.0, iv)
+        iv = iv[iv <= 2.0]
+        return float(iv.mean()) if iv.size else None
     values: list[float] = []
     for key in ("calls", "puts"):
         for opt in chain_data.get(key) or []:
@@ -58,6 +81,41 @@ def _average_implied_volatility(chain_data: dict[str, Any]) -> float | None:
     return sum(values) / len(values)
 
 
+def _next_friday() -> str:
+    """Default expiration when a request names none: next Friday (a week out on Fridays)."""
+    today = datetime.now(timezone.utc)
+    days_until_friday = (4 - today.weekday()) % 7 or 7
+    return (today + timedelta(days=days_until_friday)).strftime("%Y-%m-%d")
+
+
+def _chain_spot_price(chain_data: dict[str, Any] | OptionChain) -> float:
+    """Spot price of a chain, 0.0 when missing or invalid."""
+    raw_spot = chain_data.get("spot_price") or chain_data.get("underlying_price")
+    try:
+        spot_price = float(raw_spot) if raw_spot is not None else 0.0
+    except (ValueError, TypeError):
+        return 0.0
+    return spot_price if spot_price > 0 else 0.0
+
+
+def _resolve_outlook(outlook: Outlook, chain_data: dict[str, Any] | OptionChain) -> Outlook:
+    """AUTO -> infer the outlook from the chain's average IV; other outlooks pass through."""
+    if outlook != Outlook.AUTO:
+        return outlook
+    avg_iv = _average_implied_volatility(chain_data)
+    if avg_iv is None:
+        logger.info("AUTO outlook: no IV in chain -> fallback BULLISH")
+        return Outlook.BULLISH
+    if avg_iv > 0.5:
+        logger.info("AUTO outlook: avg_iv=%.4f -> NEUTRAL (high vol)", avg_iv)
+        return Outlook.NEUTRAL
+    if avg_iv < 0.3:
+        logger.info("AUTO outlook: avg_iv=%.4f -> VOLATILE (low vol)", avg_iv)
+        return Outlook.VOLATILE
+    logger.info("AUTO outlook: avg_iv=%.4f -> BULLISH (mid vol)", avg_iv)
+    return Outlook.BULLISH
+
+
 def _normalize_number(value: Any, default: float | None = None) -> float | None:
     """
     Normalize a value to a float number, handling various input types.
@@ -91,16 +149,21 @@ async def get_option_chain(
     expiration_date: Annotated[
         str, Query(..., description="Expiration date in YYYY-MM-DD format")
     ],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+    http_request: Request,
     force_refresh: Annotated[
         bool, Query(description="Force refresh from API, bypass cache")
     ] = False,
-) -> OptionChainResponse:
+) -> Response:
     """
     Get option chain for a stock symbol and expiration date.
 
     Cache Strategy: 10 minutes TTL for all users (to conserve API quota).
     Use force_refresh=true to bypass cache and fetch fresh data.
+
+    The JSON body is encoded once per chain version (see chain_response.py) and sent
+    with a strong ETag: If-None-Match polls get 304 Not Modified until the chain is
+    refetched. Clients accepting gzip get the precompressed body.
     
     **Free users cannot use force_refresh=true (real-time feature is Pro-only).**
 
@@ -111,7 +174,7 @@ async def get_option_chain(
         force_refresh: If True, bypass cache and fetch fresh data from API (Pro only)
 
     Returns:
-        OptionChainResponse with calls, puts, and spot price
+        OptionChainResponse JSON with calls, puts, and spot price (or an empty 304)
 
     Raises:
         HTTPException: If market data service is unavailable, invalid parameters, or free user tries to use force_refresh
@@ -125,6 +188,7 @@ async def get_option_chain(
     
     try:
         # Call tiger service with user's pro status and force_refresh flag
+        await record_chain_request(symbol, expiration_date)
         chain_data = await tiger_service.get_option_chain(
             symbol=symbol.upper(),
             expiration_date=expiration_date,
@@ -132,102 +196,45 @@ async def get_option_chain(
             force_refresh=force_refresh,
         )
 
-        # Normalize data structure
-        # Extract and normalize calls
-        raw_calls = chain_data.get("calls", []) or []
-        calls = []
-        for call in raw_calls:
-            if not call or not isinstance(call, dict):
-                continue
-            normalized_call = {
-                "strike": _normalize_number(call.get("strike") or call.get("strike_price")),
-                "bid": _normalize_number(call.get("bid") or call.get("bid_price"), default=0),
-                "ask": _normalize_number(call.get("ask") or call.get("ask_price"), default=0),
-                "volume": _normalize_number(call.get("volume"), default=0),
-                "open_interest": _normalize_number(call.get("open_interest") or call.get("openInterest"), default=0),
-            }
-            # Add Greeks (support both flat and nested formats)
-            greeks = {}
-            if isinstance(call.get("greeks"), dict):
-                greeks = call["greeks"]
-            for greek_name in ["delta", "gamma", "theta", "vega", "rho"]:
-                value = call.get(greek_name) or (greeks.get(greek_name) if greeks else None)
-                if value is not None:
-                    normalized_value = _normalize_number(value)
-                    if normalized_value is not None:
-                        normalized_call[greek_name] = normalized_value
-                        greeks[greek_name] = normalized_value
-            if greeks:
-                normalized_call["greeks"] = greeks
-            
-            # Add implied_volatility (critical for AI analysis)
-            implied_vol = call.get("implied_vol") or call.get("implied_volatility") or (greeks.get("implied_vol") if greeks else None)
-            if implied_vol is not None:
-                normalized_iv = _normalize_number(implied_vol)
-                if normalized_iv is not None:
-                    normalized_call["implied_volatility"] = normalized_iv
-                    normalized_call["implied_vol"] = normalized_iv  # Also keep short name for compatibility
-            
-            # Only add if strike is valid
-            if normalized_call["strike"] is not None and normalized_call["strike"] > 0:
-                calls.append(normalized_call)
-
-        # Extract and normalize puts
-        raw_puts = chain_data.get("puts", []) or []
-        puts = []
-        for put in raw_puts:
-            if not put or not isinstance(put, dict):
-                continue
-            normalized_put = {
-                "strike": _normalize_number(put.get("strike") or put.get("strike_price")),
-                "bid": _normalize_number(put.get("bid") or put.get("bid_price"), default=0),
-                "ask": _normalize_number(put.get("ask") or put.get("ask_price"), default=0),
-                "volume": _normalize_number(put.get("volume"), default=0),
-                "open_interest": _normalize_number(put.get("open_interest") or put.get("openInterest"), default=0),
-            }
-            # Add Greeks (support both flat and nested formats)
-            greeks = {}
-            if isinstance(put.get("greeks"), dict):
-                greeks = put["greeks"]
-            for greek_name in ["delta", "gamma", "theta", "vega", "rho"]:
-                value = put.get(greek_name) or (greeks.get(greek_name) if greeks else None)
-                if value is not None:
-                    normalized_value = _normalize_number(value)
-                    if normalized_value is not None:
-                        normalized_put[greek_name] = normalized_value
-                        greeks[greek_name] = normalized_value
-            if greeks:
-                normalized_put["greeks"] = greeks
-            
-            # Add implied_volatility (critical for AI analysis)
-            implied_vol = put.get("implied_vol") or put.get("implied_volatility") or (greeks.get("implied_vol") if greeks else None)
-            if implied_vol is not None:
-                normalized_iv = _normalize_number(implied_vol)
-                if normalized_iv is not None:
-                    normalized_put["implied_volatility"] = normalized_iv
-                    normalized_put["implied_vol"] = normalized_iv  # Also keep short name for compatibility
-            
-            # Only add if strike is valid
-            if normalized_put["strike"] is not None and normalized_put["strike"] > 0:
-                puts.append(normalized_put)
-
-        # Extract spot price (support multiple field names)
-        spot_price = (
-            _normalize_number(chain_data.get("spot_price")) or
-            _normalize_number(chain_data.get("underlying_price")) or
-            _normalize_number(chain_data.get("underlyingPrice")) or
-            None
-        )
+        symbol = symbol.upper()
         source = chain_data.get("_source", "api")
 
-        return OptionChainResponse(
-            symbol=symbol.upper(),
-            expiration_date=expiration_date,
-            calls=calls,
-            puts=puts,
-            spot_price=spot_price,
-            source=source,  # Will be serialized as _source due to alias
+        def build_response() -> dict[str, Any]:
+            # Normalize data structure once (flat/nested greeks, bid/bid_price, ... spellings)
+            option_chain = OptionChain.coerce(chain_data)
+            # Extract spot price (support multiple field names)
+            spot_price = (
+                _normalize_number(chain_data.get("spot_price")) or
+                _normalize_number(chain_data.get("underlying_price")) or
+                _normalize_number(chain_data.get("underlyingPrice")) or
+                None
+            )
+            return OptionChainResponse(
+                symbol=symbol,
+                expiration_date=expiration_date,
+                calls=option_chain.calls.to_records(include_extras=False),
+                puts=option_chain.puts.to_records(include_extras=False),
+                spot_price=spot_price,
+                _source=source,  # Populated by alias (source= was silently ignored)
+            ).model_dump(by_alias=True)
+
+        # Encoded once per chain version; polls with a matching ETag get an empty 304
+        entry = chain_body_cache.get(
+            (symbol, expiration_date, source), chain_data.get("_version"), build_response
         )
+        use_gzip = len(entry.body) >= GZIP_MIN_BYTES and accepts_gzip(http_request.headers.get("accept-encoding"))
+        headers = {
+            "ETag": entry.gzip_etag if use_gzip else entry.etag,
+            "Cache-Control": "private, no-cache",
+            "Vary": "Accept-Encoding",
+        }
+        if etag_matches(http_request.headers.get("if-none-match"), entry.etag, entry.gzip_etag):
+            return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+        if use_gzip:
+            return Response(
+                entry.gzipped, media_type="application/json", headers={**headers, "Content-Encoding": "gzip"}
+            )
+        return Response(entry.body, media_type="application/json", headers=headers)
 
     except HTTPException:
         # Re-raise HTTP exceptions from service layer (e.g., 503 from Circuit Breaker)
@@ -240,10 +247,55 @@ async def get_option_chain(
         )
 
 
+@router.get("/chain/stream")
+async def stream_option_chain(
+    symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
+    expiration_date: Annotated[
+        str, Query(..., description="Expiration date in YYYY-MM-DD format")
+    ],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+) -> StreamingResponse:
+    """
+    Stream an option chain as Server-Sent Events (see chain_stream.py).
+
+    The first event is a full ``snapshot``; ``delta`` events then carry only the rows
+    (and fields) that changed since the previous one. The chain is refreshed from Tiger
+    during market hours, shared by every client streaming it, at a cadence derived from
+    the streaming share of the Tiger budget, so live updates are available without
+    force_refresh.
+
+    Args:
+        symbol: Stock symbol (e.g., AAPL, TSLA)
+        expiration_date: Expiration date in YYYY-MM-DD format
+        current_user: Authenticated user (from JWT token)
+
+    Returns:
+        text/event-stream of snapshot / delta events (comment lines as keepalives)
+
+    Raises:
+        HTTPException: 503 when the streaming budget is taken by other chains
+    """
+    frames = await chain_stream_hub.subscribe(symbol, expiration_date)
+    await record_chain_request(symbol, expiration_date)
+
+    async def events() -> AsyncIterator[str]:
+        async for frame in frames:
+            if frame is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {frame['type']}\ndata: {json.dumps(frame)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/quote")
 async def get_stock_quote(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get stock quote/brief information using FinanceToolkit (FMP API).
@@ -267,8 +319,8 @@ async def get_stock_quote(
     """
     try:
         # ⚠️ OPTIMIZATION: Use FinanceToolkit (FMP API) for complete quote data
-        quote_data = await run_in_threadpool(
-            market_data_service.get_stock_quote, symbol.upper()
+        quote_data = await run_in_executor(
+            "fmp_sync", market_data_service.get_stock_quote, symbol.upper()
         )
         
         if not quote_data or "error" in quote_data:
@@ -330,7 +382,7 @@ async def get_stock_quote(
 @router.get("/profile")
 async def get_financial_profile(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     force_refresh: Annotated[
         bool, Query(description="Bypass cache, fetch fresh data")
     ] = False,
@@ -355,8 +407,8 @@ async def get_financial_profile(
             logger.warning(f"Cache get error for {cache_key}: {e}")
 
     try:
-        profile = await run_in_threadpool(
-            market_data_service.get_financial_profile, sym
+        profile = await run_in_executor(
+            "toolkit", market_data_service.get_financial_profile, sym
         )
         result = profile or {}
         try:
@@ -375,7 +427,7 @@ async def get_financial_profile(
 @router.get("/search", response_model=list[SymbolSearchResponse])
 async def search_symbols(
     q: Annotated[str, Query(..., description="Search query (symbol or company name)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: Annotated[int, Query(ge=1, le=50, description="Maximum number of results")] = 10,
 ) -> list[SymbolSearchResponse]:
@@ -447,7 +499,7 @@ async def search_symbols(
 @router.get("/quotes/batch")
 async def get_batch_quotes(
     symbols: Annotated[str, Query(..., description="Comma-separated stock symbols (e.g., AAPL,MSFT,GOOGL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get real-time quotes for multiple symbols.
@@ -480,7 +532,7 @@ async def get_batch_quotes(
 async def get_historical_price(
     interval: Annotated[str, Path(..., description="Time interval: 1min, 5min, 15min, 30min, 1hour, 4hour, 1day")],
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     limit: Annotated[int | None, Query(ge=1, le=10000, description="Maximum number of data points")] = None,
 ) -> dict[str, Any]:
     """
@@ -522,7 +574,7 @@ async def get_historical_price(
 async def get_technical_indicator(
     indicator: Annotated[str, Path(..., description="Technical indicator: sma, ema, rsi, adx, macd, etc.")],
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     period_length: Annotated[int, Query(ge=1, le=200, description="Period length for calculation")] = 10,
     timeframe: Annotated[str, Query(description="Time frame: 1min, 5min, 15min, 30min, 1hour, 1day")] = "1day",
 ) -> dict[str, Any]:
@@ -570,7 +622,7 @@ async def get_technical_indicator(
 
 @router.get("/market/sector-performance")
 async def get_sector_performance(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     date: Annotated[str | None, Query(description="Date in YYYY-MM-DD format (optional)")] = None,
 ) -> dict[str, Any]:
     """
@@ -591,7 +643,7 @@ async def get_sector_performance(
 
 @router.get("/market/industry-performance")
 async def get_industry_performance(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     date: Annotated[str | None, Query(description="Date in YYYY-MM-DD format (optional)")] = None,
 ) -> dict[str, Any]:
     """
@@ -612,7 +664,7 @@ async def get_industry_performance(
 
 @router.get("/market/biggest-gainers")
 async def get_biggest_gainers(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[dict[str, Any]]:
     """
     Get biggest stock gainers.
@@ -632,7 +684,7 @@ async def get_biggest_gainers(
 
 @router.get("/market/biggest-losers")
 async def get_biggest_losers(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[dict[str, Any]]:
     """
     Get biggest stock losers.
@@ -652,7 +704,7 @@ async def get_biggest_losers(
 
 @router.get("/market/most-actives")
 async def get_most_actives(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[dict[str, Any]]:
     """
     Get most actively traded stocks.
@@ -675,7 +727,7 @@ async def get_most_actives(
 @router.get("/analyst/estimates")
 async def get_analyst_estimates(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     period: Annotated[str, Query(description="Period: 'annual' or 'quarter'")] = "annual",
     limit: Annotated[int, Query(ge=1, le=100, description="Maximum number of estimates")] = 10,
 ) -> dict[str, Any]:
@@ -702,7 +754,7 @@ async def get_analyst_estimates(
 @router.get("/analyst/price-target")
 async def get_price_target_summary(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get price target summary.
@@ -723,7 +775,7 @@ async def get_price_target_summary(
 @router.get("/analyst/price-target-consensus")
 async def get_price_target_consensus(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get price target consensus (high, low, median, consensus).
@@ -744,7 +796,7 @@ async def get_price_target_consensus(
 @router.get("/analyst/grades")
 async def get_stock_grades(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[dict[str, Any]]:
     """
     Get stock grades/ratings from analysts.
@@ -765,7 +817,7 @@ async def get_stock_grades(
 @router.get("/analyst/ratings")
 async def get_ratings_snapshot(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get ratings snapshot.
@@ -788,7 +840,7 @@ async def get_ratings_snapshot(
 @router.get("/financial/key-metrics-ttm")
 async def get_key_metrics_ttm(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get trailing twelve months (TTM) key metrics.
@@ -809,7 +861,7 @@ async def get_key_metrics_ttm(
 @router.get("/financial/ratios-ttm")
 async def get_ratios_ttm(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> dict[str, Any]:
     """
     Get trailing twelve months (TTM) financial ratios.
@@ -830,7 +882,7 @@ async def get_ratios_ttm(
 @router.get("/expirations", response_model=list[str])
 async def get_option_expirations(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[str]:
     """
     Get available option expiration dates for a stock symbol.
@@ -862,7 +914,7 @@ async def get_option_expirations(
 @router.get("/history")
 async def get_historical_data(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     period: Annotated[str, Query(description="Period type: 'day', 'week', 'month'")] = "day",
     limit: Annotated[int, Query(ge=1, le=500, description="Number of bars to return")] = 100,
 ) -> dict[str, Any]:
@@ -929,7 +981,8 @@ async def get_historical_data(
         logger.warning(f"Tiger historical data error for {symbol}: {e}. Trying FMP fallback.", exc_info=True)
 
     try:
-        fmp_history = await run_in_threadpool(
+        fmp_history = await run_in_executor(
+            "toolkit",
             market_data_service.get_historical_data,
             symbol.upper(),
             "daily",
@@ -958,7 +1011,7 @@ async def get_historical_data(
 @router.get("/historical")
 async def get_historical_data_legacy(
     symbol: Annotated[str, Query(..., description="Stock symbol (e.g., AAPL)")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     days: Annotated[int, Query(ge=1, le=365, description="Number of days of historical data")] = 30,
 ) -> dict[str, Any]:
     """
@@ -976,10 +1029,55 @@ async def get_historical_data_legacy(
     )
 
 
+async def _search_strategy_recommendations(
+    request: StrategyRecommendationRequest,
+    current_user: UserContext,
+) -> list[CalculatedStrategy]:
+    """Recommendations across all expirations in the request's DTE window, ranked together."""
+    symbol = request.symbol.upper()
+    min_dte = request.min_dte if request.min_dte is not None else 0
+    max_dte = request.max_dte if request.max_dte is not None else 730
+    if min_dte > max_dte:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="min_dte must not exceed max_dte",
+        )
+
+    expirations = strategy_engine.select_expirations(
+        await tiger_service.get_option_expirations(symbol), min_dte, max_dte, request.max_expirations
+    )
+    if not expirations:
+        logger.warning("Recommendations search: no expirations for %s in %s-%s DTE", symbol, min_dte, max_dte)
+        return []
+
+    for expiration in expirations:
+        await record_chain_request(symbol, expiration)
+
+    async def fetch_chain(expiration: str) -> OptionChain:
+        return await tiger_service.get_option_chain(
+            symbol=symbol, expiration_date=expiration, is_pro=current_user.is_pro
+        )
+
+    strategies = await strategy_engine.search_expirations(
+        expirations,
+        fetch_chain,
+        symbol=symbol,
+        outlook=request.outlook,
+        risk_profile=request.risk_profile,
+        capital=request.capital,
+        optimize=request.optimize,
+        take_profit=request.take_profit_pct,
+    )
+    logger.info(
+        "Recommendations search: %s strategies for %s across %s", len(strategies), symbol, expirations
+    )
+    return strategies
+
+
 @router.post("/recommendations", response_model=list[CalculatedStrategy])
 async def get_strategy_recommendations(
     request: StrategyRecommendationRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> list[CalculatedStrategy]:
     """
     Generate algorithmic strategy recommendations based on advanced mathematical logic.
@@ -994,6 +1092,10 @@ async def get_strategy_recommendations(
     3. Run generation with strict filters
     4. Return valid strategies or warning if none pass filters
 
+    Search mode (no expiration_date, min_dte and/or max_dte set): chains for up to
+    max_expirations expirations in the DTE window are fetched concurrently, every
+    applicable algorithm runs on each (all four for AUTO) and one ranked list is returned.
+
     Args:
         request: StrategyRecommendationRequest with symbol, outlook, risk_profile, capital
         current_user: Authenticated user (for pro status and rate limiting)
@@ -1005,60 +1107,34 @@ async def get_strategy_recommendations(
         HTTPException: If market data is unavailable or invalid parameters
     """
     try:
+        if not request.expiration_date and (request.min_dte is not None or request.max_dte is not None):
+            return await _search_strategy_recommendations(request, current_user)
+
         # Step 1: Fetch real-time option chain
-        # Use the expiration_date from request if provided, otherwise we'll need to find optimal
-        expiration_date = request.expiration_date
-        if not expiration_date:
-            # For now, calculate next Friday (common expiration)
-            from datetime import datetime, timedelta, timezone as _tz
-            today = datetime.now(_tz.utc)
-            days_until_friday = (4 - today.weekday()) % 7
-            if days_until_friday == 0:
-                days_until_friday = 7
-            next_friday = today + timedelta(days=days_until_friday)
-            expiration_date = next_friday.strftime("%Y-%m-%d")
-
-        # Fetch real-time option chain
-        chain_data = await tiger_service.get_option_chain(
+        # Use the expiration_date from request if provided, otherwise next Friday
+        expiration_date = request.expiration_date or _next_friday()
+
+        # Fetch real-time option chain (parsed once into columnar form for the engine)
+        await record_chain_request(request.symbol, expiration_date)
+        chain_data = OptionChain.coerce(await tiger_service.get_option_chain(
             symbol=request.symbol.upper(),
             expiration_date=expiration_date,
             is_pro=current_user.is_pro,
-        )
+        ))
 
-        # Extract spot price
-        _raw_spot = chain_data.get("spot_price") or chain_data.get("underlying_price")
-        try:
-            spot_price = float(_raw_spot) if _raw_spot is not None else 0
-        except (ValueError, TypeError):
-            spot_price = 0
-        if not spot_price or spot_price <= 0:
+        spot_price = _chain_spot_price(chain_data)
+        if not spot_price:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="Spot price not available for this symbol",
             )
 
-        # Resolve outlook: AUTO -> infer from option chain average IV
-        effective_outlook = request.outlook
-        if request.outlook == Outlook.AUTO:
-            avg_iv = _average_implied_volatility(chain_data)
-            if avg_iv is not None:
-                if avg_iv > 0.5:
-                    effective_outlook = Outlook.NEUTRAL
-                    logger.info("AUTO outlook: avg_iv=%.4f -> NEUTRAL (high vol)", avg_iv)
-                elif avg_iv < 0.3:
-                    effective_outlook = Outlook.VOLATILE
-                    logger.info("AUTO outlook: avg_iv=%.4f -> VOLATILE (low vol)", avg_iv)
-                else:
-                    effective_outlook = Outlook.BULLISH
-                    logger.info("AUTO outlook: avg_iv=%.4f -> BULLISH (mid vol)", avg_iv)
-            else:
-                effective_outlook = Outlook.BULLISH
-                logger.info("AUTO outlook: no IV in chain -> fallback BULLISH")
-
-        engine = StrategyEngine()
+        effective_outlook = _resolve_outlook(request.outlook, chain_data)
 
-        # Step 3: Run generation
-        strategies = engine.generate_strategies(
+        # Step 3: Run generation (optimizer / Monte Carlo are CPU-bound: keep them off the event loop)
+        strategies = await run_in_executor(
+            "cpu",
+            strategy_engine.generate_strategies,
             chain=chain_data,
             symbol=request.symbol.upper(),
             spot_price=float(spot_price),
@@ -1066,6 +1142,8 @@ async def get_strategy_recommendations(
             risk_profile=request.risk_profile,
             capital=request.capital,
             expiration_date=expiration_date,
+            optimize=request.optimize,
+            take_profit=request.take_profit_pct,
         )
 
         # Step 4: Return results
@@ -1106,10 +1184,223 @@ async def get_strategy_recommendations(
         )
 
 
+def _recommend_from_chain(
+    chain: dict[str, Any] | OptionChain,
+    symbol: str,
+    expiration_date: str,
+    outlook: Outlook,
+    risk_profile: RiskProfile,
+    capital: float,
+    optimize: bool,
+    take_profit: float | None,
+    per_symbol: int,
+) -> list[CalculatedStrategy]:
+    """Best strategies for one fetched chain (CPU-bound; runs in the ``strategy`` executor, picklable)."""
+    chain_data = OptionChain.coerce(chain)
+    spot_price = _chain_spot_price(chain_data)
+    if not spot_price:
+        raise ValueError("Spot price not available for this symbol")
+    strategies = strategy_engine.generate_strategies(
+        chain=chain_data,
+        symbol=symbol,
+        spot_price=spot_price,
+        outlook=_resolve_outlook(outlook, chain_data),
+        risk_profile=risk_profile,
+        capital=capital,
+        expiration_date=expiration_date,
+        optimize=optimize,
+        take_profit=take_profit,
+    )
+    return strategies[:per_symbol]
+
+
+def _batch_symbols(request: BatchRecommendationRequest) -> list[str]:
+    """Upper-cased symbols of a batch, duplicates dropped, request order kept."""
+    return list(dict.fromkeys(s.strip().upper() for s in request.symbols if s.strip()))
+
+
+_BATCH_SLOT_PREFIX = "recommendations:batch_slot:"
+_local_batch_slots: dict[str, int] = {}
+
+
+async def _acquire_batch_slot(user_id: str) -> Callable[[], Awaitable[None]] | None:
+    """
+    Take one of the user's RECOMMENDATIONS_BATCH_PER_USER concurrent batch slots.
+
+    Slots are Redis locks (so the limit holds across replicas) and fall back to a
+    per-process count without Redis. Returns the slot's release callback, or None
+    when every slot is taken.
+    """
+    limit = max(1, settings.recommendations_batch_per_user)
+    if cache_service._redis:
+        for slot in range(limit):
+            key = f"{_BATCH_SLOT_PREFIX}{user_id}:{slot}"
+            token = await cache_service.acquire_lock(key, ttl=settings.recommendations_batch_slot_ttl_seconds)
+            if token:
+
+                async def release_lock() -> None:
+                    await cache_service.release_lock(key, token)
+
+                return release_lock
+        if cache_service._redis:
+            return None
+        # Redis failed while taking a slot: fall back to the per-process count
+    if _local_batch_slots.get(user_id, 0) >= limit:
+        return None
+    _local_batch_slots[user_id] = _local_batch_slots.get(user_id, 0) + 1
+
+    async def release_local() -> None:
+        remaining = _local_batch_slots.get(user_id, 1) - 1
+        if remaining > 0:
+            _local_batch_slots[user_id] = remaining
+        else:
+            _local_batch_slots.pop(user_id, None)
+
+    return release_local
+
+
+async def _iter_batch_recommendations(
+    request: BatchRecommendationRequest,
+    is_pro: bool,
+) -> AsyncIterator[SymbolRecommendations]:
+    """
+    Per-symbol recommendations of a batch, yielded as each symbol completes.
+
+    Chain fetches fan out under a semaphore (each Tiger call also waits on the Tiger
+    rate limiter, at background priority so interactive requests go first); generation
+    runs in the ``strategy`` executor (a process pool by default) so the event loop
+    keeps fetching while chains are scored on other cores. A symbol that fails yields
+    its error instead.
+    """
+    symbols = _batch_symbols(request)
+    expiration_date = request.expiration_date or _next_friday()
+    semaphore = asyncio.Semaphore(max(1, settings.recommendations_batch_concurrency))
+
+    async def recommend(symbol: str) -> SymbolRecommendations:
+        try:
+            async with semaphore:
+                await record_chain_request(symbol, expiration_date)
+                with tiger_priority(TigerPriority.BACKGROUND):
+                    chain = await tiger_service.get_option_chain(
+                        symbol=symbol, expiration_date=expiration_date, is_pro=is_pro
+                    )
+            strategies = await run_in_executor(
+                "strategy",
+                _recommend_from_chain,
+                chain,
+                symbol,
+                expiration_date,
+                request.outlook,
+                request.risk_profile,
+                request.capital,
+                request.optimize,
+                request.take_profit_pct,
+                request.per_symbol,
+            )
+        except Exception as e:
+            error = str(e.detail) if isinstance(e, HTTPException) else str(e)
+            logger.warning("Batch recommendations: %s skipped: %s", symbol, error)
+            return SymbolRecommendations(symbol=symbol, expiration_date=expiration_date, error=error)
+        return SymbolRecommendations(symbol=symbol, expiration_date=expiration_date, strategies=strategies)
+
+    tasks = [asyncio.create_task(recommend(symbol)) for symbol in symbols]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # Client disconnects close the generator: stop the remaining fetches
+        for task in tasks:
+            task.cancel()
+
+
+def _rank_batch(results: list[SymbolRecommendations], limit: int) -> list[CalculatedStrategy]:
+    """Best strategies across symbols, ranked like a single-symbol search."""
+    strategies = [strategy for result in results for strategy in result.strategies]
+    return sorted(strategies, key=strategy_engine.strategy_rank_key)[:limit]
+
+
+@router.post("/recommendations/batch", response_model=BatchRecommendationResponse)
+async def get_batch_strategy_recommendations(
+    request: BatchRecommendationRequest,
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+) -> BatchRecommendationResponse | StreamingResponse:
+    """
+    Strategy recommendations for a universe of symbols in one call.
+
+    Every symbol uses the same expiration (expiration_date, or next Friday) and the
+    same outlook / risk profile / capital as /recommendations. Chains are fetched
+    concurrently under the Tiger rate limit and scored in the cpu executor.
+
+    Up to RECOMMENDATIONS_BATCH_SYNC_LIMIT symbols (and stream=false) the response is
+    one JSON object: per-symbol results in request order plus a cross-symbol ranking.
+    Larger batches (or stream=true) return NDJSON: one SymbolRecommendations line per
+    symbol as it completes, then a final {"ranked": [...]} line.
+
+    Free users are limited to RECOMMENDATIONS_BATCH_FREE_MAX_SYMBOLS symbols, and each
+    user runs at most RECOMMENDATIONS_BATCH_PER_USER batches at a time, so one user
+    cannot drain the shared Tiger budget.
+
+    Args:
+        request: BatchRecommendationRequest with symbols and shared parameters
+        current_user: Authenticated user (for pro status)
+
+    Returns:
+        BatchRecommendationResponse, or a streamed NDJSON response
+
+    Raises:
+        HTTPException: 403 when a free user submits too many symbols, 429 when the
+            user already has a batch running
+    """
+    symbols = _batch_symbols(request)
+    if not current_user.is_pro and len(symbols) > settings.recommendations_batch_free_max_symbols:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=(
+                f"Free accounts can batch up to {settings.recommendations_batch_free_max_symbols} symbols. "
+                "Please upgrade to Pro for larger universes."
+            ),
+        )
+    release = await _acquire_batch_slot(str(current_user.id))
+    if release is None:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="A batch recommendation request is already running, please wait for it to finish",
+            headers={"Retry-After": "30"},
+        )
+
+    if request.stream or len(symbols) > settings.recommendations_batch_sync_limit:
+
+        async def lines() -> AsyncIterator[str]:
+            try:
+                results: list[SymbolRecommendations] = []
+                async for result in _iter_batch_recommendations(request, current_user.is_pro):
+                    results.append(result)
+                    yield result.model_dump_json() + "\n"
+                ranked = RankedRecommendations(ranked=_rank_batch(results, request.limit))
+                yield ranked.model_dump_json() + "\n"
+            finally:
+                await release()
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    try:
+        order = {symbol: i for i, symbol in enumerate(symbols)}
+        results = [result async for result in _iter_batch_recommendations(request, current_user.is_pro)]
+    finally:
+        await release()
+    results.sort(key=lambda result: order[result.symbol])
+    logger.info(
+        "Batch recommendations: %s symbols, %s with strategies",
+        len(results),
+        sum(1 for result in results if result.strategies),
+    )
+    return BatchRecommendationResponse(results=results, ranked=_rank_batch(results, request.limit))
+
+
 @router.post("/scanner")
 async def get_market_scanner(
     criteria: Annotated[str, Query(..., description="Scanner criteria: 'high_iv', 'top_gainers', 'most_active', 'top_losers', 'high_volume'")],
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     market_value_min: Annotated[float | None, Query(description="Minimum market cap filter (e.g., 100000000 for $100M)")] = None,
     volume_min: Annotated[float | None, Query(description="Minimum volume filter (e.g., 500000 for 500K)")] = None,
     limit: Annotated[int, Query(ge=1, le=500, description="Maximum number of results")] = 100,
@@ -1,4 +1,3 @@
-import asyncio
 import logging
 from typing import Any
 
@@ -12,6 +11,7 @@ from app.api.schemas.openapi_data import (
     StockOverviewDTO,
 )
 from app.services.cache import cache_service
+from app.services.executors import run_in_executor
 from app.services.fundamental_data_service import FundamentalDataService
 from app.services.market_data_service import MarketDataService
 from app.services.tiger_service import TigerService
@@ -180,25 +180,25 @@ async def get_options_volatility_openapi(
         iv_list = [x for x in (_iv_from_opt(o) for o in iv_sources) if x is not None and x > 0]
         avg_iv = (sum(iv_list) / len(iv_list)) if iv_list else 0.0
 
-        def _get_hv() -> float:
-            try:
-                profile = market_service.get_financial_profile(sym)
-                vol_data = profile.get("volatility") or {}
-                if isinstance(vol_data, dict):
-                    hv = vol_data.get("historical_volatility") or vol_data.get("annualized")
-                    if hv is not None:
-                        try:
-                            return float(hv)
-                        except (TypeError, ValueError):
-                            pass
-                    if isinstance(vol_data.get("error"), str):
-                        logger.debug("Volatility error in profile: %s", vol_data["error"])
-                return 0.0
-            except Exception as e:
-                logger.debug("get_financial_profile for HV: %s", e)
-                return 0.0
-
-        hv = await asyncio.to_thread(_get_hv)
+        def _hv_from_profile(profile: dict) -> float:
+            vol_data = profile.get("volatility") or {}
+            if isinstance(vol_data, dict):
+                hv = vol_data.get("historical_volatility") or vol_data.get("annualized")
+                if hv is not None:
+                    try:
+                        return float(hv)
+                    except (TypeError, ValueError):
+                        pass
+                if isinstance(vol_data.get("error"), str):
+                    logger.debug("Volatility error in profile: %s", vol_data["error"])
+            return 0.0
+
+        try:
+            profile = await run_in_executor("toolkit", market_service.get_financial_profile, sym)
+            hv = _hv_from_profile(profile)
+        except Exception as e:
+            logger.debug("get_financial_profile for HV: %s", e)
+            hv = 0.0
         if hv <= 0:
             hv = 0.3
 
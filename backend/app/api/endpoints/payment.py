@@ -16,13 +16,13 @@ from app.api.schemas.payment import (
 )
 from pydantic import BaseModel, Field
 from app.core.config import settings
-from app.db.models import User
 from app.services.payment_service import (
     create_checkout_link,
     get_customer_portal_url,
     process_webhook,
     verify_signature,
 )
+from app.services.user_context import UserContext
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +37,7 @@ class CheckoutRequest(BaseModel):
 @router.post("/checkout", response_model=CheckoutResponse, status_code=status.HTTP_200_OK)
 async def create_checkout(
     request: CheckoutRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> CheckoutResponse:
     """
     Create a Lemon Squeezy checkout link for Pro subscription.
@@ -216,7 +216,7 @@ async def get_pricing() -> dict[str, Any]:
 
 @router.get("/portal", response_model=CustomerPortalResponse, status_code=status.HTTP_200_OK)
 async def get_customer_portal(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
 ) -> CustomerPortalResponse:
     """
     Get customer portal URL for managing subscription.
@@ -10,8 +10,9 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_user
 from app.api.schemas import StrategyRequest, StrategyResponse
-from app.db.models import Strategy, User
+from app.db.models import Strategy
 from app.db.session import get_db
+from app.services.user_context import UserContext
 
 logger = logging.getLogger(__name__)
 
@@ -21,7 +22,7 @@ router = APIRouter(prefix="/strategies", tags=["strategies"])
 @router.post("", response_model=StrategyResponse, status_code=status.HTTP_201_CREATED)
 async def create_strategy(
     request: StrategyRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> StrategyResponse:
     """
@@ -68,7 +69,7 @@ async def create_strategy(
 
 @router.get("", response_model=list[StrategyResponse])
 async def list_strategies(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(10, ge=1, le=100, description="Maximum number of strategies to return"),
     offset: int = Query(0, ge=0, description="Number of strategies to skip"),
@@ -118,7 +119,7 @@ async def list_strategies(
 @router.get("/{strategy_id}", response_model=StrategyResponse)
 async def get_strategy(
     strategy_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> StrategyResponse:
     """
@@ -172,7 +173,7 @@ async def get_strategy(
 async def update_strategy(
     strategy_id: UUID,
     request: StrategyRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> StrategyResponse:
     """
@@ -235,7 +236,7 @@ async def update_strategy(
 @router.delete("/{strategy_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_strategy(
     strategy_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """
@@ -4,23 +4,41 @@ import asyncio
 import base64
 import json
 import logging
+import math
 import uuid
 from decimal import Decimal, ROUND_HALF_UP
 from datetime import date, datetime, timedelta, timezone
-from typing import Annotated, Any
+from typing import Annotated, Any, AsyncIterator, Literal
 from uuid import UUID
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
-from sqlalchemy import select
+from sqlalchemy import select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm.attributes import flag_modified
 
 from app.api.deps import get_current_user
 from app.api.schemas import TaskResponse
 from app.core.constants import FinancialPrecision, RetryConfig
-from app.db.models import Task, User
+from app.db.models import Task
 from app.db.session import AsyncSessionLocal, get_db
+from app.services.black_scholes import years_to_expiry
+from app.services.option_chain import GREEK_NAMES, OptionChain
+from app.services.payoff import strategy_payoff
+from app.services.executors import run_in_executor
+from app.services.task_events import EVENTS_PAGE_SIZE, load_events, record_event
+from app.services.task_payloads import (
+    hydrate_metadata,
+    load_text,
+    offload_metadata,
+    offload_report_content,
+    offload_task_payloads,
+)
+from app.services.task_progress import TaskProgress, progress_for, publish_status, task_event_bus
+from app.services.task_queue import enqueue_task
+from app.services.user_context import UserContext
 
 logger = logging.getLogger(__name__)
 
@@ -34,6 +52,21 @@ class TaskCreateRequest(BaseModel):
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def symbol_from_metadata(metadata: dict[str, Any] | None) -> str | None:
+    """Underlying symbol of a task (strategy_summary, legacy strategy_data, or top-level symbol)."""
+    meta = metadata or {}
+    ss = meta.get("strategy_summary") or {}
+    sd = meta.get("strategy_data") or {}
+    symbol = (
+        (ss.get("symbol") if isinstance(ss, dict) else None)
+        or (sd.get("symbol") if isinstance(sd, dict) else None)
+        or meta.get("symbol")
+    )
+    if symbol and isinstance(symbol, str) and symbol.strip():
+        return symbol.strip().upper()[:20]
+    return None
+
+
 async def create_task_async(
     db: AsyncSession,
     user_id: UUID | None,
@@ -41,7 +74,10 @@ async def create_task_async(
     metadata: dict[str, Any] | None = None,
 ) -> Task:
     """
-    Create a new task and start processing it asynchronously.
+    Create a new task and put it on the task queue.
+
+    Workers (``python -m app.worker``) process queued tasks. Without Redis the task
+    is processed in this process instead when TASK_QUEUE_INLINE_FALLBACK is set.
 
     Args:
         db: Database session
@@ -52,18 +88,38 @@ async def create_task_async(
     Returns:
         Created Task instance
     """
+    from app.core.config import settings
+
     task = Task(
         user_id=user_id,
         task_type=task_type,
         status="PENDING",
-        task_metadata=metadata,
+        task_metadata=await offload_metadata(metadata),
+        symbol=symbol_from_metadata(metadata),
         created_at=datetime.now(timezone.utc),
         updated_at=datetime.now(timezone.utc),
     )
     db.add(task)
     await db.flush()
     await db.refresh(task)
-    await db.commit()  # Must commit before scheduling so worker can find the task
+    await db.commit()  # Must commit before enqueueing so the worker can find the task
+
+    if await enqueue_task(task.id, task_type):
+        logger.info(f"Task {task.id} queued (type: {task_type})")
+    elif settings.task_queue_inline_fallback:
+        logger.warning(f"Task queue unavailable, processing task {task.id} in-process")
+        _start_inline_processing(task, task_type, metadata)
+    else:
+        logger.error(f"Task queue unavailable, cannot schedule task {task.id}")
+        task.status = "FAILED"
+        task.error_message = "Task queue unavailable"
+        task.updated_at = datetime.now(timezone.utc)
+
+    return task
+
+
+def _start_inline_processing(task: Task, task_type: str, metadata: dict[str, Any] | None) -> None:
+    """Process a task on this process's event loop (fallback when the task queue is unavailable)."""
 
     # Start background processing with error handling
     async def safe_process_task() -> None:
@@ -114,8 +170,6 @@ async def create_task_async(
         task.error_message = "No event loop available to process task"
         task.updated_at = datetime.now(timezone.utc)
 
-    return task
-
 
 def _calculate_strategy_metrics(
     strategy_data: dict[str, Any],
@@ -123,92 +177,45 @@ def _calculate_strategy_metrics(
 ) -> dict[str, Any]:
     """
     Calculate strategy metrics for image generation prompt.
-    
+
+    Max profit/loss and breakevens are exact expiration values from the payoff engine
+    (any leg set, stock legs included); unbounded profit/loss is +/-inf.
+
     Args:
         strategy_data: Strategy configuration with legs
-        option_chain: Optional option chain data for validation
-        
+        option_chain: Optional option chain data (unused, kept for the legacy signature)
+
     Returns:
-        Dictionary with metrics: net_cash_flow, margin, breakeven, max_profit, max_loss
+        Dictionary with metrics: net_cash_flow, margin, breakeven (first point),
+        breakeven_points, max_profit, max_loss (lowest P&L, negative when losing)
     """
-    legs = strategy_data.get("legs", [])
-    
-    # Calculate net cash flow
-    net_cash_flow = 0.0
-    for leg in legs:
-        premium = float(leg.get("premium", 0))
-        quantity = int(leg.get("quantity", 1))
-        action = leg.get("action", "buy")
-        multiplier = -1 if action == "buy" else 1
-        net_cash_flow += premium * quantity * multiplier
-    
-    # Estimate margin (simplified: use max loss for spreads, or 20% of notional for naked)
-    # This is a simplified calculation - real margin depends on broker rules
-    spot_price = strategy_data.get("current_price", 0) or (
-        option_chain.get("spot_price") if option_chain else 0
-    )
-    
-    margin = 0.0
-    if legs:
-        # For multi-leg spreads, margin is typically the max loss
-        # For naked positions, it's a percentage of notional
-        has_naked = False
-        max_strike = max((float(leg.get("strike", 0)) for leg in legs), default=0)
-        
-        # Check if strategy has naked legs
-        buy_count = sum(1 for leg in legs if leg.get("action") == "buy")
-        sell_count = sum(1 for leg in legs if leg.get("action") == "sell")
-        
-        if sell_count > buy_count:
-            # Has naked positions
-            margin = max_strike * 100 * 0.20  # 20% of notional (simplified)
-            has_naked = True
-        
-        # If it's a spread, margin is the spread width
-        if not has_naked and len(legs) >= 2:
-            strikes = [float(leg.get("strike", 0)) for leg in legs]
-            max_strike_val = max(strikes)
-            min_strike_val = min(strikes)
-            margin = (max_strike_val - min_strike_val) * 100
-    
-    # Calculate max profit and max loss from payoff at expiration
-    # This is a simplified calculation
-    max_profit = 0.0
-    max_loss = 0.0
-    breakeven = 0.0
-    
-    # Simplified: For credit spreads, max profit = net credit, max loss = spread width - credit
-    # For debit spreads, max profit = spread width - debit, max loss = debit
-    if net_cash_flow > 0:
-        # Credit strategy
-        if len(legs) >= 2:
-            strikes = [float(leg.get("strike", 0)) for leg in legs]
-            spread_width = (max(strikes) - min(strikes)) * 100
-            max_profit = net_cash_flow
-            max_loss = spread_width - net_cash_flow
-            # Breakeven: short strike + credit (for calls) or short strike - credit (for puts)
-            # Simplified: use average of strikes
-            avg_strike = sum(strikes) / len(strikes)
-            breakeven = avg_strike + (net_cash_flow / 100) if legs[0].get("type") == "call" else avg_strike - (net_cash_flow / 100)
+    legs = strategy_data.get("legs") or []
+    payoff = strategy_payoff(legs)
+    max_loss = payoff["max_loss"]
+
+    # Capital at risk for defined-risk strategies; naked short calls/stock fall back
+    # to 20% of the short notional (real margin depends on broker rules)
+    if math.isfinite(max_loss):
+        margin = max(0.0, -max_loss) * 100
     else:
-        # Debit strategy
-        if len(legs) >= 2:
-            strikes = [float(leg.get("strike", 0)) for leg in legs]
-            spread_width = (max(strikes) - min(strikes)) * 100
-            max_profit = spread_width + net_cash_flow  # net_cash_flow is negative
-            max_loss = abs(net_cash_flow)
-            # Breakeven: long strike + debit
-            buy_legs = [leg for leg in legs if leg.get("action") == "buy"]
-            if buy_legs:
-                buy_strike = float(buy_legs[0].get("strike", 0))
-                breakeven = buy_strike + abs(net_cash_flow / 100)
-    
+        short_notional = sum(
+            float(leg.get("strike") or leg.get("price") or 0) * float(leg.get("quantity") or 1)
+            for leg in legs
+            if isinstance(leg, dict) and leg.get("action") == "sell"
+        )
+        margin = short_notional * 100 * 0.20
+
+    def _round(value: float) -> float:
+        return round(value, 2) if math.isfinite(value) else value
+
+    breakeven_points = [round(b, 2) for b in payoff["breakeven_points"]]
     return {
-        "net_cash_flow": round(net_cash_flow, 2),
+        "net_cash_flow": round(payoff["net_cash_flow"], 2),
         "margin": round(margin, 2),
-        "breakeven": round(breakeven, 2),
-        "max_profit": round(max_profit, 2),
-        "max_loss": round(max_loss, 2),
+        "breakeven": breakeven_points[0] if breakeven_points else 0.0,
+        "breakeven_points": breakeven_points,
+        "max_profit": _round(payoff["max_profit"]),
+        "max_loss": _round(max_loss),
     }
 
 
@@ -290,11 +297,12 @@ def _build_input_summary(
 
 def _ensure_portfolio_greeks(
     strategy_summary: dict[str, Any], 
-    option_chain: dict[str, Any] | None = None
+    option_chain: dict[str, Any] | OptionChain | None = None
 ) -> None:
     """Ensure portfolio_greeks exists by deriving from legs if missing.
     
-    If legs don't have greeks, attempts to extract from option_chain.
+    If legs don't have greeks, attempts to extract from option_chain; chain rows
+    without Greeks are first filled from the Black-Scholes model.
     
     Args:
         strategy_summary: Strategy summary dictionary (modified in place)
@@ -313,109 +321,62 @@ def _ensure_portfolio_greeks(
     if not isinstance(legs, list) or not legs:
         return
     
-    def get_greek_from_chain(strike: float, option_type: str, greek_name: str) -> float:
-        """Extract greek value from option_chain if available."""
-        if not option_chain:
-            return 0.0
-        option_list = option_chain.get("calls" if option_type.lower() == "call" else "puts", [])
-        if not isinstance(option_list, list):
-            return 0.0
-        for option in option_list:
-            if not isinstance(option, dict):
-                continue
-            option_strike = option.get("strike")
-            if isinstance(option_strike, (int, float)) and abs(float(option_strike) - float(strike)) < 0.01:
-                # Found matching strike
-                greeks = option.get("greeks", {})
-                if isinstance(greeks, dict):
-                    value = greeks.get(greek_name)
-                else:
-                    value = option.get(greek_name)
-                if isinstance(value, (int, float)):
-                    return float(value)
-        return 0.0
-    
-    # Use Decimal for high-precision financial calculations
-    # This prevents floating-point precision errors in financial calculations
-    total_delta = Decimal('0')
-    total_gamma = Decimal('0')
-    total_theta = Decimal('0')
-    total_vega = Decimal('0')
-    total_rho = Decimal('0')
-    
-    # Precision settings for rounding
-    precision = Decimal('0.0001')  # 4 decimal places for Greeks
-    
-    for leg in legs:
-        if not isinstance(leg, dict):
-            continue
-        
-        # Try to get greeks from leg first, then from option_chain
+    # Parse the chain once; per-leg lookups are then O(log n) by strike
+    chain = OptionChain.coerce(option_chain) if option_chain else None
+    if chain is not None:
+        from app.core.config import settings
+        years = years_to_expiry(strategy_summary.get("expiration_date") or chain.get("expiration_date") or "")
+        if years is not None:
+            chain, _ = chain.with_filled_greeks(
+                years, settings.option_risk_free_rate, spot_price=strategy_summary.get("spot_price")
+            )
+
+    # Per-leg Greeks as an (L, 5) matrix: the leg's own value unless missing or zero, else the chain row
+    greek_count = len(GREEK_NAMES)
+    rows = [leg for leg in legs if isinstance(leg, dict)]
+    leg_greeks = np.full((len(rows), greek_count), np.nan)
+    strikes = np.full(len(rows), np.nan)
+    is_put = np.zeros(len(rows), dtype=bool)
+    weights = np.zeros(len(rows))
+    for i, leg in enumerate(rows):
+        option_type = str(leg.get("type", "call")).lower()
+        is_put[i] = option_type == "put"
         strike = leg.get("strike")
-        option_type = leg.get("type", "call")
-        action = leg.get("action", "buy")
-        
-        # Convert to Decimal for precision
-        quantity = Decimal(str(leg.get("quantity") or 1))
-        sign = Decimal('1' if action == "buy" else '-1')
-        multiplier = Decimal('-1' if option_type.lower() == "put" else '1')
-        
-        # Get greeks from leg or option_chain (convert to Decimal)
-        delta = leg.get("delta")
-        if delta is None or (isinstance(delta, (int, float)) and delta == 0):
-            if isinstance(strike, (int, float)):
-                delta = get_greek_from_chain(float(strike), option_type, "delta")
-            else:
-                delta = 0.0
-        delta = Decimal(str(delta or 0))
-        
-        gamma = leg.get("gamma")
-        if gamma is None or (isinstance(gamma, (int, float)) and gamma == 0):
-            if isinstance(strike, (int, float)):
-                gamma = get_greek_from_chain(float(strike), option_type, "gamma")
-            else:
-                gamma = 0.0
-        gamma = Decimal(str(gamma or 0))
-        
-        theta = leg.get("theta")
-        if theta is None or (isinstance(theta, (int, float)) and theta == 0):
-            if isinstance(strike, (int, float)):
-                theta = get_greek_from_chain(float(strike), option_type, "theta")
-            else:
-                theta = 0.0
-        theta = Decimal(str(theta or 0))
-        
-        vega = leg.get("vega")
-        if vega is None or (isinstance(vega, (int, float)) and vega == 0):
-            if isinstance(strike, (int, float)):
-                vega = get_greek_from_chain(float(strike), option_type, "vega")
-            else:
-                vega = 0.0
-        vega = Decimal(str(vega or 0))
-        
-        rho = leg.get("rho")
-        if rho is None or (isinstance(rho, (int, float)) and rho == 0):
-            if isinstance(strike, (int, float)):
-                rho = get_greek_from_chain(float(strike), option_type, "rho")
-            else:
-                rho = 0.0
-        rho = Decimal(str(rho or 0))
-        
-        # Calculate with Decimal precision
-        total_delta += delta * sign * multiplier * quantity
-        total_gamma += gamma * sign * quantity
-        total_theta += theta * sign * quantity
-        total_vega += vega * sign * quantity
-        total_rho += rho * sign * multiplier * quantity
-    
-    # Convert back to float for storage (database may not support Decimal)
-    # But use Decimal for all calculations to maintain precision
+        if isinstance(strike, (int, float)):
+            strikes[i] = strike
+        sign = 1.0 if leg.get("action", "buy") == "buy" else -1.0
+        weights[i] = sign * float(leg.get("quantity") or 1)
+        for j, name in enumerate(GREEK_NAMES):
+            try:
+                value = float(leg.get(name) or 0)
+            except (TypeError, ValueError):
+                value = 0.0
+            if value != 0 and math.isfinite(value):
+                leg_greeks[i, j] = value
+
+    if chain is not None:
+        # One batched strike lookup per side instead of a scan per leg and Greek
+        for put_side in (False, True):
+            mask = np.isnan(leg_greeks).any(axis=1) & (is_put == put_side)
+            if not mask.any():
+                continue
+            side = chain.puts if put_side else chain.calls
+            idx = side.find_strikes(strikes[mask])
+            found = idx >= 0
+            chain_greeks = np.full((len(idx), greek_count), np.nan)
+            chain_greeks[found] = np.column_stack([side.column(name)[idx[found]] for name in GREEK_NAMES])
+            leg_greeks[mask] = np.where(np.isnan(leg_greeks[mask]), chain_greeks, leg_greeks[mask])
+
+    # Delta and rho flip sign for puts (legs carry absolute values); gamma/theta/vega do not
+    flips = np.array([name in ("delta", "rho") for name in GREEK_NAMES])
+    orientation = np.where(flips & is_put[:, None], -1.0, 1.0)
+    totals = weights @ (np.nan_to_num(leg_greeks) * orientation)
+
+    # 4 decimal places, rounded half up as the stored values always were
+    precision = Decimal("0.0001")
     strategy_summary["portfolio_greeks"] = {
-        "delta": float(total_delta.quantize(precision, rounding=ROUND_HALF_UP)),
-        "gamma": float(total_gamma.quantize(precision, rounding=ROUND_HALF_UP)),
-        "theta": float(total_theta.quantize(precision, rounding=ROUND_HALF_UP)),
-        "vega": float(total_vega.quantize(precision, rounding=ROUND_HALF_UP)),
-        "rho": float(total_rho.quantize(precision, rounding=ROUND_HALF_UP)),
+        name: float(Decimal(repr(float(total))).quantize(precision, rounding=ROUND_HALF_UP))
+        for name, total in zip(GREEK_NAMES, totals)
     }
 
 
@@ -429,10 +390,10 @@ async def _run_data_enrichment(strategy_summary: dict[str, Any]) -> None:
         return
     from app.services.market_data_service import MarketDataService
     service = MarketDataService()
-    # Fundamental profile (sync, run in thread; timeout to avoid hang on SSL/Yahoo errors in Docker)
+    # Fundamental profile (sync, run in the toolkit pool; timeout to avoid hang on SSL/Yahoo errors in Docker)
     try:
         profile = await asyncio.wait_for(
-            asyncio.to_thread(service.get_financial_profile, symbol),
+            run_in_executor("toolkit", service.get_financial_profile, symbol),
             timeout=90.0,
         )
         if profile and isinstance(profile, dict):
@@ -531,7 +492,7 @@ async def _run_data_enrichment(strategy_summary: dict[str, Any]) -> None:
         hp = strategy_summary.get("historical_prices")
         if not hp or (isinstance(hp, list) and len(hp) < 2):
             hist = await asyncio.wait_for(
-                asyncio.to_thread(service.get_historical_data, symbol, "daily"),
+                run_in_executor("toolkit", service.get_historical_data, symbol, "daily"),
                 timeout=60.0,
             )
             data = (hist or {}).get("data") or {}
@@ -623,20 +584,13 @@ async def _run_data_enrichment(strategy_summary: dict[str, Any]) -> None:
 
 
 def _add_execution_event(
-    history: list[dict[str, Any]] | None,
-    event_type: str,
+    task: Task,
+    event_type: str,  # "start", "success", "error", "retry", "info", "requeue"
     message: str,
     timestamp: datetime | None = None,
-) -> list[dict[str, Any]]:
-    """Add an event to execution history."""
-    if history is None:
-        history = []
-    history.append({
-        "type": event_type,  # "start", "success", "error", "retry"
-        "message": message,
-        "timestamp": (timestamp or datetime.now(timezone.utc)).isoformat(),
-    })
-    return history
+) -> None:
+    """Append an event to the task's timeline (written to task_events by the session's next commit)."""
+    record_event(task, event_type, message, timestamp)
 
 
 def _get_multi_agent_stages_initial() -> list[dict[str, Any]]:
@@ -720,8 +674,14 @@ def _update_stage(
                     sub["status"] = set_sub_stages_status
             break
     flag_modified(task, "task_metadata")
+    progress_channel = progress_for(task.id)
+    if progress_channel is not None:
+        progress_channel.stages_changed()
 
 
+# Task metadata key holding the quota day (ISO date) a run reserved its units on
+QUOTA_DAY_METADATA_KEY = "quota_day"
+
 # Map executor agent names to phase_a sub_stage ids (for live UI updates)
 _AGENT_NAME_TO_PHASE_A_SUB_STAGE = {
     "options_greeks_analyst": "greeks",
@@ -732,80 +692,52 @@ _AGENT_NAME_TO_PHASE_A_SUB_STAGE = {
 }
 
 
-async def _update_phase_a_sub_stage_async(task_id: UUID, sub_stage_id: str, status: str) -> None:
-    """Update one Phase A sub_stage status in DB so UI shows running/success per agent."""
-    from app.db.session import AsyncSessionLocal
-    try:
-        async with AsyncSessionLocal() as progress_session:
-            progress_result = await progress_session.execute(select(Task).where(Task.id == task_id))
-            progress_task = progress_result.scalar_one_or_none()
-            if not progress_task or not progress_task.task_metadata:
-                return
-            stages = progress_task.task_metadata.get("stages") or []
-            for s in stages:
-                if s.get("id") != "phase_a" or "sub_stages" not in s:
-                    continue
-                for sub in s.get("sub_stages", []):
-                    if sub.get("id") == sub_stage_id:
-                        sub["status"] = status
-                        break
-                break
-            flag_modified(progress_task, "task_metadata")
-            progress_task.updated_at = datetime.now(timezone.utc)
-            await progress_session.commit()
-    except Exception as e:
-        logger.warning("Failed to update phase_a sub_stage for task %s: %s", task_id, e)
-
+def _record_quota_day(task: Task, user: Any) -> None:
+    """Remember the quota day the run's reservation counted against (for _refund_task_quota)."""
+    from app.api.endpoints.ai import reserved_quota_day
 
-async def _update_phase_b_sub_stage_async(task_id: UUID, sub_stage_id: str, status: str) -> None:
-    """Update one Phase B (Deep Research) sub_stage status in DB for UI."""
-    from app.db.session import AsyncSessionLocal
-    try:
-        async with AsyncSessionLocal() as progress_session:
-            progress_result = await progress_session.execute(select(Task).where(Task.id == task_id))
-            progress_task = progress_result.scalar_one_or_none()
-            if not progress_task or not progress_task.task_metadata:
-                return
-            stages = progress_task.task_metadata.get("stages") or []
-            for s in stages:
-                if s.get("id") != "phase_b" or "sub_stages" not in s:
-                    continue
-                for sub in s.get("sub_stages", []):
-                    if sub.get("id") == sub_stage_id:
-                        sub["status"] = status
-                        break
-                break
-            flag_modified(progress_task, "task_metadata")
-            progress_task.updated_at = datetime.now(timezone.utc)
-            await progress_session.commit()
-    except Exception as e:
-        logger.warning("Failed to update phase_b sub_stage for task %s: %s", task_id, e)
+    if task.task_metadata is None:
+        task.task_metadata = {}
+    task.task_metadata[QUOTA_DAY_METADATA_KEY] = reserved_quota_day(user).isoformat()
+    flag_modified(task, "task_metadata")
 
 
 async def _refund_task_quota(task_id: UUID, task_type: str, user_id: UUID | None) -> None:
-    """Refund pre-reserved quota when a task fails after reservation."""
+    """Refund pre-reserved quota when a task fails after reservation.
+
+    Only runs that reserved quota are refunded: the reservation day recorded in the
+    task metadata (by _record_quota_day) is cleared in the refund's transaction, so a
+    task that fails again before its next reservation is not refunded twice. The
+    units go back to the day they were reserved on.
+    """
     if not user_id:
         return
+    if task_type in ("ai_report", "multi_agent_report"):
+        # One run = 5 units (unified per PRD). Both ai_report and multi_agent_report
+        # cost 5 units. The sync-mode single-agent fallback also costs 5.
+        kind, units = "ai", 5
+    elif task_type == "generate_strategy_chart":
+        kind, units = "image", 1
+    else:
+        return
     try:
-        from app.db.session import AsyncSessionLocal
-        from app.db.models import User
-        from sqlalchemy import update as _upd
+        from app.api.endpoints.ai import refund_quota
         async with AsyncSessionLocal() as refund_session:
-            if task_type in ("ai_report", "multi_agent_report"):
-                # One run = 5 units (unified per PRD). Both ai_report and multi_agent_report
-                # cost 5 units. The sync-mode single-agent fallback also costs 5.
-                units = 5
+            # Row lock: concurrent refunds of the same run see the cleared day and skip
+            metadata = (
                 await refund_session.execute(
-                    _upd(User).where(User.id == user_id, User.daily_ai_usage >= units)
-                    .values(daily_ai_usage=User.daily_ai_usage - units)
+                    select(Task.task_metadata).where(Task.id == task_id).with_for_update()
                 )
-            elif task_type == "generate_strategy_chart":
-                await refund_session.execute(
-                    _upd(User).where(User.id == user_id, User.daily_image_usage >= 1)
-                    .values(daily_image_usage=User.daily_image_usage - 1)
-                )
-            else:
+            ).scalar_one_or_none()
+            recorded = (metadata or {}).get(QUOTA_DAY_METADATA_KEY)
+            if not recorded:
                 return
+            await refund_session.execute(
+                update(Task)
+                .where(Task.id == task_id)
+                .values(task_metadata=Task.task_metadata.delete_path([QUOTA_DAY_METADATA_KEY]))
+            )
+            await refund_quota(user_id, refund_session, kind, units, date.fromisoformat(recorded))
             await refund_session.commit()
             logger.info(f"Task {task_id}: refunded quota for user {user_id} (type={task_type})")
     except Exception as e:
@@ -840,10 +772,8 @@ async def _update_task_status_failed(
                 task.completed_at = failed_at
                 task.updated_at = failed_at
                 
-                if task.execution_history is None:
-                    task.execution_history = []
-                task.execution_history = _add_execution_event(
-                    task.execution_history,
+                _add_execution_event(
+                    task,
                     "error",
                     f"Task failed: {error_message[:200]}",
                     failed_at,
@@ -868,16 +798,15 @@ async def _update_task_status_failed(
                     task.completed_at = failed_at
                     task.updated_at = failed_at
                     
-                    if task.execution_history is None:
-                        task.execution_history = []
-                    task.execution_history = _add_execution_event(
-                        task.execution_history,
+                    _add_execution_event(
+                        task,
                         "error",
                         f"Task failed: {error_message[:200]}",
                         failed_at,
                     )
                     await new_session.commit()
                     logger.info(f"Task {task_id} status updated to FAILED")
+                    await publish_status(task)
                 else:
                     logger.warning(f"Task {task_id} not found when updating status to FAILED")
             except Exception as update_error:
@@ -896,6 +825,31 @@ async def _update_task_status_failed(
                 # Consider sending alert to monitoring service (Sentry, PagerDuty, etc.)
 
 
+async def _mark_task_requeued(task_id: UUID, task_type: str, reason: str) -> int | None:
+    """Record that the task queue is putting an unfinished task back (independent session).
+
+    A run that already reserved quota (its reservation day is recorded in the task
+    metadata) is refunded here because the rerun reserves it again. Runs stopped
+    before the reservation have nothing to give back.
+
+    Returns:
+        Number of times the task has been requeued (including this one), or None
+        when the task is missing or already SUCCESS/FAILED.
+    """
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Task).where(Task.id == task_id))
+        task = result.scalar_one_or_none()
+        if task is None or task.status in ("SUCCESS", "FAILED"):
+            return None
+        if task.status == "PROCESSING" and QUOTA_DAY_METADATA_KEY in (task.task_metadata or {}):
+            await _refund_task_quota(task_id, task_type, task.user_id)
+        requeued_at = datetime.now(timezone.utc)
+        _add_execution_event(task, "requeue", reason, requeued_at)
+        task.updated_at = requeued_at
+        await session.commit()
+        return task.event_summary["by_type"]["requeue"]
+
+
 async def _handle_ai_report_task(
     task_id: UUID,
     task: Task,
@@ -939,8 +893,8 @@ async def _handle_ai_report_task(
     # Record model in task (supports Gemini and ZenMux)
     provider = ai_service._get_provider()
     task.model_used = getattr(provider, "model_name", None) or settings.ai_model_default
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         f"Using AI provider: {ai_service._default_provider_name}, model: {task.model_used}",
     )
@@ -950,60 +904,13 @@ async def _handle_ai_report_task(
     use_deep_research = True
     logger.info(f"Task {task_id} - Using Deep Research mode (only mode available)")
 
-    # Progress callback for deep research
-    # Get the current event loop to ensure we schedule tasks in the correct context
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        # No running loop, can't schedule async operations
-        loop = None
+    # Progress callback for deep research: buffered in memory, persisted with the task's
+    # commits (or every TASK_PROGRESS_FLUSH_SECONDS) and pushed to live subscribers
+    progress_channel = TaskProgress(task).start()
 
     def progress_callback(progress: int, message: str) -> None:
-        """Update task progress in database (sync wrapper for async operations)."""
-        if loop is None:
-            # Can't update progress without a running event loop
-            logger.debug(f"[Deep Research {progress}%] {message} (progress update skipped - no event loop)")
-            return
-    
-        async def _update_progress_async() -> None:
-            # Create a new session for this update to avoid cross-task session usage
-            async with AsyncSessionLocal() as update_session:
-                try:
-                    # Re-fetch task in this session
-                    result = await update_session.execute(
-                        select(Task).where(Task.id == task_id)
-                    )
-                    update_task = result.scalar_one_or_none()
-                    if not update_task:
-                        logger.warning(f"Task {task_id} not found for progress update")
-                        return
-                
-                    # Update task metadata with progress
-                    if update_task.task_metadata is None:
-                        update_task.task_metadata = {}
-                    update_task.task_metadata["progress"] = progress
-                    update_task.task_metadata["current_stage"] = message
-                
-                    # Add progress event to execution history
-                    if update_task.execution_history is None:
-                        update_task.execution_history = []
-                    update_task.execution_history = _add_execution_event(
-                        update_task.execution_history,
-                        "info",
-                        f"[{progress}%] {message}",
-                    )
-                
-                    update_task.updated_at = datetime.now(timezone.utc)
-                    await update_session.commit()
-                except Exception as e:
-                    logger.warning(f"Failed to update task progress: {e}")
-                    # Don't fail the whole task if progress update fails
-    
-        # Schedule async update using the current event loop
-        try:
-            loop.create_task(_update_progress_async())
-        except Exception as e:
-            logger.warning(f"Failed to schedule progress update: {e}")
+        """Record task progress (sync; the progress channel persists and publishes it)."""
+        progress_channel.emit(progress, message, event_type="info")
 
     # Generate prompt before calling AI service (for logging/debugging)
     # We'll generate the actual prompt that will be used by the AI provider
@@ -1060,6 +967,8 @@ async def _handle_ai_report_task(
 
     if not await increment_ai_usage_if_within_quota(user, session, quota_units=5):
         raise ValueError("Daily AI report quota insufficient (reservation failed)")
+    _record_quota_day(task, user)
+    await session.commit()
     logger.info(f"Task {task_id} - Quota reserved: 5 units for user {task.user_id}")
 
     # Generate report with retry logic
@@ -1070,8 +979,8 @@ async def _handle_ai_report_task(
         try:
             if attempt > 0:
                 wait_time = RetryConfig.INITIAL_WAIT_SECONDS * (RetryConfig.BACKOFF_MULTIPLIER ** attempt)
-                task.execution_history = _add_execution_event(
-                    task.execution_history,
+                _add_execution_event(
+                    task,
                     "retry",
                     f"Retry attempt {attempt}/{MAX_RETRIES} after {wait_time}s wait",
                 )
@@ -1097,8 +1006,8 @@ async def _handle_ai_report_task(
             break
         except Exception as e:
             last_error = e
-            task.execution_history = _add_execution_event(
-                task.execution_history,
+            _add_execution_event(
+                task,
                 "error",
                 f"Attempt {attempt + 1} failed: {str(e)}",
             )
@@ -1119,8 +1028,10 @@ async def _handle_ai_report_task(
         user_id=task.user_id,
         report_content=report_content,
         model_used=task.model_used or settings.ai_model_default,
+        symbol=task.symbol,
         created_at=current_time,
     )
+    await offload_report_content(ai_report)
     session.add(ai_report)
     await session.flush()
     await session.refresh(ai_report)
@@ -1133,8 +1044,8 @@ async def _handle_ai_report_task(
     task.result_ref = str(ai_report.id)
     task.completed_at = completed_at
     task.updated_at = completed_at
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "success",
         f"Task completed successfully. Report ID: {ai_report.id}",
         completed_at,
@@ -1185,9 +1096,8 @@ async def _handle_multi_agent_report_task(
         if symbol and expiration_date:
             try:
                 from app.services.tiger_service import tiger_service
-                option_chain = await tiger_service.get_option_chain(
-                    symbol, expiration_date
-                )
+                # Dict shape: stored in the task metadata (JSONB) and passed to the AI prompts
+                option_chain = (await tiger_service.get_option_chain(symbol, expiration_date)).to_dict()
                 if option_chain and (
                     option_chain.get("calls") is not None
                     or option_chain.get("puts") is not None
@@ -1237,12 +1147,12 @@ async def _handle_multi_agent_report_task(
                 raise ValueError(
                     f"Daily AI report quota insufficient (required {required_quota} units, reservation failed)"
                 )
-            task.execution_history = _add_execution_event(
-                task.execution_history,
+            _record_quota_day(task, user)
+            _add_execution_event(
+                task,
                 "info",
                 f"Quota reserved: {required_quota} units",
             )
-            flag_modified(task, "execution_history")
             await session.commit()
 
     # Data Enrichment: inject fundamental_profile etc.
@@ -1262,46 +1172,19 @@ async def _handle_multi_agent_report_task(
 
     # Record model
     task.model_used = settings.ai_model_default
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         f"Using AI model: {task.model_used} (multi-agent: {use_multi_agent})",
     )
-    flag_modified(task, "execution_history")
     await session.commit()
 
-    # Progress callback: update execution_history and task_metadata (progress, current_stage)
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+    # Progress: timeline events and task_metadata (progress, current_stage, sub_stages) are
+    # buffered in memory, persisted with the task's commits and pushed live (task_progress.py)
+    progress_channel = TaskProgress(task).start()
 
     def _emit_progress(progress: int, message: str) -> None:
-        if loop is None:
-            logger.debug(f"[{progress}%] {message} (progress update skipped)")
-            return
-        async def update_progress_async() -> None:
-            try:
-                async with AsyncSessionLocal() as progress_session:
-                    progress_result = await progress_session.execute(
-                        select(Task).where(Task.id == task_id)
-                    )
-                    progress_task = progress_result.scalar_one_or_none()
-                    if progress_task:
-                        progress_task.execution_history = _add_execution_event(
-                            progress_task.execution_history,
-                            "progress",
-                            f"[{progress}%] {message}",
-                        )
-                        if progress_task.task_metadata is None:
-                            progress_task.task_metadata = {}
-                        progress_task.task_metadata["progress"] = progress
-                        progress_task.task_metadata["current_stage"] = message
-                        progress_task.updated_at = datetime.now(timezone.utc)
-                        await progress_session.commit()
-            except Exception as e:
-                logger.warning(f"Failed to update progress for task {task_id}: {e}")
-        loop.create_task(update_progress_async())
+        progress_channel.emit(progress, message)
 
     # Phase A callback: scale coordinator 0-100 to task 5-45; update sub_stages for UI
     def phase_a_progress_callback(progress: int, message: str) -> None:
@@ -1309,7 +1192,7 @@ async def _handle_multi_agent_report_task(
         _emit_progress(scaled, f"Phase A: {message}")
         # Live-update Multi-Agent sub_stages (Greeks, IV, Market, Risk, Synthesis)
         # Support both "Agent name: status" and "Agent name status" (executor uses space)
-        if loop and message.startswith("Agent "):
+        if message.startswith("Agent "):
             rest = message[6:].strip()  # after "Agent "
             agent_name = None
             status = None
@@ -1336,35 +1219,35 @@ async def _handle_multi_agent_report_task(
             if status and agent_name:
                 sub_id = _AGENT_NAME_TO_PHASE_A_SUB_STAGE.get(agent_name)
                 if sub_id:
-                    loop.create_task(_update_phase_a_sub_stage_async(task_id, sub_id, status))
+                    progress_channel.set_sub_stage("phase_a", sub_id, status)
 
     # Phase B callback: scale deep research 0-100 to task 50-100; update sub_stages for UI
     def phase_b_progress_callback(progress: int, message: str) -> None:
         scaled = 50 + int(progress * 0.5)
         _emit_progress(scaled, f"Phase B: {message}")
         # Live-update Deep Research sub_stages (Planning, Research, Synthesis)
-        if loop and message:
+        if message:
             m = message.lower()
             if "planning research" in m or ("planning" in m and "questions" in m):
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "planning", "running"))
+                progress_channel.set_sub_stage("phase_b", "planning", "running")
             elif "generated" in m and "research questions" in m:
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "planning", "success"))
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "research", "running"))
+                progress_channel.set_sub_stage("phase_b", "planning", "success")
+                progress_channel.set_sub_stage("phase_b", "research", "running")
             elif "researching" in m and "parallel" in m:
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "research", "running"))
+                progress_channel.set_sub_stage("phase_b", "research", "running")
             elif "research phase completed" in m or "synthesizing final" in m:
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "research", "success"))
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "synthesis", "running"))
+                progress_channel.set_sub_stage("phase_b", "research", "success")
+                progress_channel.set_sub_stage("phase_b", "synthesis", "running")
             elif "deep research report completed" in m or "report completed" in m:
-                loop.create_task(_update_phase_b_sub_stage_async(task_id, "synthesis", "success"))
+                progress_channel.set_sub_stage("phase_b", "synthesis", "success")
 
     # Data Enrichment done (0-5%); Phase A (5-45%)
     _emit_progress(5, "Phase A: Multi-agent analysis...")
     now_a = datetime.now(timezone.utc)
     _update_stage(task, "phase_a", "running", started_at=now_a)
     task.updated_at = now_a
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         "Starting Phase A: Multi-agent report generation...",
     )
@@ -1401,7 +1284,6 @@ async def _handle_multi_agent_report_task(
         task.task_metadata = {}
     task.task_metadata["agent_summaries"] = agent_summaries
     now_a_end = datetime.now(timezone.utc)
-    await session.refresh(task)  # pick up sub_stage updates from progress callbacks
     _update_stage(task, "phase_a", "success", ended_at=now_a_end, set_sub_stages_status="success")
     task.updated_at = now_a_end
     await session.commit()
@@ -1479,7 +1361,6 @@ async def _handle_multi_agent_report_task(
     report_content = f"{input_summary}\n{report_content}"
 
     now_b_end = datetime.now(timezone.utc)
-    await session.refresh(task)  # pick up Phase B sub_stage updates from progress callbacks
     _update_stage(task, "phase_b", "success", ended_at=now_b_end, set_sub_stages_status="success")
 
     # Save report to database
@@ -1487,8 +1368,10 @@ async def _handle_multi_agent_report_task(
         user_id=task.user_id,
         report_content=report_content,
         model_used=task.model_used,
+        symbol=task.symbol,
         created_at=datetime.now(timezone.utc),
     )
+    await offload_report_content(ai_report)
     session.add(ai_report)
     await session.flush()
     await session.refresh(ai_report)
@@ -1501,8 +1384,8 @@ async def _handle_multi_agent_report_task(
     task.task_metadata["progress"] = 100
     task.task_metadata["current_stage"] = "Complete"
     # stages already updated with started_at/ended_at/sub_stages; do not overwrite
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "success",
         f"Full pipeline completed. Report ID: {ai_report.id}",
         task.completed_at,
@@ -1510,8 +1393,8 @@ async def _handle_multi_agent_report_task(
 
     if user_id and user:
         quota_limit = get_ai_quota_limit(user)
-        task.execution_history = _add_execution_event(
-            task.execution_history,
+        _add_execution_event(
+            task,
             "info",
             f"Quota used: {required_quota}. Usage: {user.daily_ai_usage}/{quota_limit}",
         )
@@ -1554,44 +1437,19 @@ async def _handle_options_analysis_workflow_task(
 
     # Record model
     task.model_used = settings.ai_model_default
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         f"Starting options analysis workflow with {task.model_used}",
     )
     await session.commit()
 
-    # Progress callback
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+    # Progress callback (buffered and pushed live; see task_progress.py)
+    progress_channel = TaskProgress(task).start()
 
     def progress_callback(progress: int, message: str) -> None:
-        """Update task progress in database."""
-        if loop is None:
-            return
-    
-        async def update_progress_async() -> None:
-            try:
-                async with AsyncSessionLocal() as progress_session:
-                    progress_result = await progress_session.execute(
-                        select(Task).where(Task.id == task_id)
-                    )
-                    progress_task = progress_result.scalar_one_or_none()
-                    if progress_task:
-                        progress_task.execution_history = _add_execution_event(
-                            progress_task.execution_history,
-                            "progress",
-                            f"[{progress}%] {message}",
-                        )
-                        progress_task.updated_at = datetime.now(timezone.utc)
-                        await progress_session.commit()
-            except Exception as e:
-                logger.warning(f"Failed to update progress: {e}")
-    
-        if loop:
-            loop.create_task(update_progress_async())
+        """Record task progress (persisted in batches, published to live subscribers)."""
+        progress_channel.emit(progress, message)
 
     # Execute workflow
     coordinator = ai_service.agent_coordinator
@@ -1615,8 +1473,10 @@ async def _handle_options_analysis_workflow_task(
         user_id=task.user_id,
         report_content=report_content,
         model_used=task.model_used,
+        symbol=task.symbol,
         created_at=datetime.now(timezone.utc),
     )
+    await offload_report_content(ai_report)
     session.add(ai_report)
     await session.flush()
     await session.refresh(ai_report)
@@ -1638,8 +1498,8 @@ async def _handle_options_analysis_workflow_task(
         task.task_metadata = {}
     task.task_metadata["workflow_results"] = workflow_metadata
 
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "success",
         f"Options analysis workflow completed. Report ID: {ai_report.id}",
         task.completed_at,
@@ -1686,44 +1546,19 @@ async def _handle_stock_screening_workflow_task(
 
     # Record model
     task.model_used = settings.ai_model_default
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         f"Starting stock screening workflow. Criteria: {criteria}",
     )
     await session.commit()
 
-    # Progress callback
-    try:
-        loop = asyncio.get_running_loop()
-    except RuntimeError:
-        loop = None
+    # Progress callback (buffered and pushed live; see task_progress.py)
+    progress_channel = TaskProgress(task).start()
 
     def progress_callback(progress: int, message: str) -> None:
-        """Update task progress in database."""
-        if loop is None:
-            return
-    
-        async def update_progress_async() -> None:
-            try:
-                async with AsyncSessionLocal() as progress_session:
-                    progress_result = await progress_session.execute(
-                        select(Task).where(Task.id == task_id)
-                    )
-                    progress_task = progress_result.scalar_one_or_none()
-                    if progress_task:
-                        progress_task.execution_history = _add_execution_event(
-                            progress_task.execution_history,
-                            "progress",
-                            f"[{progress}%] {message}",
-                        )
-                        progress_task.updated_at = datetime.now(timezone.utc)
-                        await progress_session.commit()
-            except Exception as e:
-                logger.warning(f"Failed to update progress: {e}")
-    
-        if loop:
-            loop.create_task(update_progress_async())
+        """Record task progress (persisted in batches, published to live subscribers)."""
+        progress_channel.emit(progress, message)
 
     # Execute workflow
     coordinator = ai_service.agent_coordinator
@@ -1746,8 +1581,8 @@ async def _handle_stock_screening_workflow_task(
     task.status = "SUCCESS"
     task.completed_at = datetime.now(timezone.utc)
     task.updated_at = task.completed_at
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "success",
         f"Stock screening completed. Found {len(candidates)} candidates",
         task.completed_at,
@@ -1813,8 +1648,8 @@ async def _handle_generate_strategy_chart_task(
 
     # Record model in task
     task.model_used = settings.ai_image_model
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "info",
         f"Using image model: {task.model_used}",
     )
@@ -1835,7 +1670,7 @@ async def _handle_generate_strategy_chart_task(
     # Reserve image quota BEFORE calling the AI image API to prevent cost overrun
     if not task.user_id:
         raise ValueError("Image generation tasks require a user_id")
-    from app.api.endpoints.ai import check_image_quota, get_image_quota_limit
+    from app.api.endpoints.ai import check_image_quota, increment_image_usage_if_within_quota
     from app.db.models import User as _UserModel
     _uq_result = await session.execute(select(_UserModel).where(_UserModel.id == task.user_id))
     _uq_user = _uq_result.scalar_one_or_none()
@@ -1843,15 +1678,9 @@ async def _handle_generate_strategy_chart_task(
         raise ValueError(f"User {task.user_id} not found")
     await check_image_quota(_uq_user, session)
     # Atomically increment image usage before generation
-    from sqlalchemy import update as _sql_update
-    _img_limit = get_image_quota_limit(_uq_user)
-    _rows = await session.execute(
-        _sql_update(_UserModel)
-        .where(_UserModel.id == _uq_user.id, _UserModel.daily_image_usage < _img_limit)
-        .values(daily_image_usage=_UserModel.daily_image_usage + 1)
-    )
-    if _rows.rowcount == 0:
+    if not await increment_image_usage_if_within_quota(_uq_user, session):
         raise ValueError("Daily image generation quota exceeded (atomic reservation failed)")
+    _record_quota_day(task, _uq_user)
     await session.commit()
 
     image_base64 = None
@@ -1861,8 +1690,8 @@ async def _handle_generate_strategy_chart_task(
         try:
             if attempt > 0:
                 wait_time = 2 ** attempt
-                task.execution_history = _add_execution_event(
-                    task.execution_history,
+                _add_execution_event(
+                    task,
                     "retry",
                     f"Retry attempt {attempt}/{MAX_RETRIES} after {wait_time}s wait",
                 )
@@ -1878,8 +1707,8 @@ async def _handle_generate_strategy_chart_task(
             break  # Success
         except Exception as e:
             last_error = e
-            task.execution_history = _add_execution_event(
-                task.execution_history,
+            _add_execution_event(
+                task,
                 "error",
                 f"Attempt {attempt + 1} failed: {str(e)}",
             )
@@ -2055,8 +1884,8 @@ async def _handle_generate_strategy_chart_task(
     task.result_ref = json.dumps({"image_id": str(generated_image.id)})
     task.completed_at = completed_at
     task.updated_at = completed_at
-    task.execution_history = _add_execution_event(
-        task.execution_history,
+    _add_execution_event(
+        task,
         "success",
         f"Task completed successfully. Image ID: {generated_image.id}",
         completed_at,
@@ -2076,6 +1905,7 @@ async def process_task_async(
     # ⚠️ DEPRECATED: db parameter is ignored. This function creates its own session.
     # Will be removed in v2.0. Do not pass db parameter.
     db: AsyncSession | None = None,  # Deprecated, ignored
+    final_attempt: bool = True,
 ) -> None:
     """
     Process a task asynchronously in the background with retry support.
@@ -2085,6 +1915,8 @@ async def process_task_async(
         task_type: Task type
         metadata: Task metadata
         db: DEPRECATED - Ignored. This function creates its own database session.
+        final_attempt: When False, network errors are re-raised without failing the
+            task so the task queue can retry it (see app.services.task_queue)
     
     Note:
         This function creates its own database session for processing.
@@ -2115,10 +1947,6 @@ async def process_task_async(
                 logger.info(f"Task {task_id} already in final state: {task.status}, skipping")
                 return
 
-            # Initialize execution history if not exists
-            if task.execution_history is None:
-                task.execution_history = []
-            
             # Merge metadata from parameter and task.task_metadata (task_metadata is source of truth after task creation)
             # Priority: task.task_metadata > metadata (from parameter)
             if metadata is None:
@@ -2127,14 +1955,16 @@ async def process_task_async(
                 # Merge: task_metadata takes precedence (may have been updated)
                 merged_metadata = {**(metadata or {}), **task.task_metadata}
                 metadata = merged_metadata
+            # Handlers work on full values: resolve payloads kept in blob storage
+            metadata = await hydrate_metadata(metadata)
             
             # Record start time and update status to PROCESSING
             started_at = datetime.now(timezone.utc)
             task.started_at = started_at
             task.status = "PROCESSING"
             task.updated_at = started_at
-            task.execution_history = _add_execution_event(
-                task.execution_history, "start", "Task processing started", started_at
+            _add_execution_event(
+                task, "start", "Task processing started", started_at
             )
             await session.commit()
             await session.refresh(task)
@@ -2142,18 +1972,33 @@ async def process_task_async(
             logger.info(f"Task {task_id} status updated to PROCESSING")
 
             # Process based on task type
-            if task_type == "ai_report":
-                await _handle_ai_report_task(task_id, task, metadata, session)
-            elif task_type == "multi_agent_report":
-                await _handle_multi_agent_report_task(task_id, task, metadata, session)
-            elif task_type == "options_analysis_workflow":
-                await _handle_options_analysis_workflow_task(task_id, task, metadata, session)
-            elif task_type == "stock_screening_workflow":
-                await _handle_stock_screening_workflow_task(task_id, task, metadata, session)
-            elif task_type == "generate_strategy_chart":
-                await _handle_generate_strategy_chart_task(task_id, task, metadata, session)
-            else:
-                raise ValueError(f"Unknown task type: {task_type}")
+            try:
+                if task_type == "ai_report":
+                    await _handle_ai_report_task(task_id, task, metadata, session)
+                elif task_type == "multi_agent_report":
+                    await _handle_multi_agent_report_task(task_id, task, metadata, session)
+                elif task_type == "options_analysis_workflow":
+                    await _handle_options_analysis_workflow_task(task_id, task, metadata, session)
+                elif task_type == "stock_screening_workflow":
+                    await _handle_stock_screening_workflow_task(task_id, task, metadata, session)
+                elif task_type == "generate_strategy_chart":
+                    await _handle_generate_strategy_chart_task(task_id, task, metadata, session)
+                else:
+                    raise ValueError(f"Unknown task type: {task_type}")
+            finally:
+                # Publish and persist buffered progress before the session is rolled back or closed
+                progress_channel = progress_for(task_id)
+                if progress_channel is not None:
+                    await progress_channel.close()
+            # Large metadata values and the prompt move to blob storage once the run is over
+            try:
+                await offload_task_payloads(task, metadata)
+                await session.commit()
+            except Exception as e:
+                logger.warning(f"Task {task_id}: payload offload failed, payloads stay inline: {e}")
+                await session.rollback()
+            if task.status in ("SUCCESS", "FAILED"):
+                await publish_status(task)
 
         except (ValueError, TypeError, KeyError) as e:
             logger.warning(f"Task {task_id} validation/type error: {e}", exc_info=True)
@@ -2164,6 +2009,8 @@ async def process_task_async(
         except (ConnectionError, TimeoutError, asyncio.TimeoutError) as e:
             logger.error(f"Task {task_id} network error: {e}", exc_info=True)
             await session.rollback()
+            if not final_attempt:
+                raise  # The queue requeues the task with backoff (refunding the reservation)
             await _refund_task_quota(task_id, task_type, task.user_id)
             await _update_task_status_failed(task_id, f"Network error: {str(e)}", session=None)
             raise
@@ -2180,7 +2027,7 @@ async def process_task_async(
 @router.post("", response_model=TaskResponse, status_code=status.HTTP_201_CREATED)
 async def create_task(
     request: TaskCreateRequest,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> TaskResponse:
     """
@@ -2206,11 +2053,9 @@ async def create_task(
         # Pre-check quota BEFORE creating task (units must match worker)
         if request.task_type in ("ai_report", "multi_agent_report"):
             from app.api.endpoints.ai import check_ai_quota
-            await db.refresh(current_user)
             await check_ai_quota(current_user, db, required_quota=5)
         elif request.task_type == "generate_strategy_chart":
             from app.api.endpoints.ai import check_image_quota
-            await db.refresh(current_user)
             await check_image_quota(current_user, db)
         
         task = await create_task_async(
@@ -2230,7 +2075,8 @@ async def create_task(
             result_ref=task.result_ref,
             error_message=task.error_message,
             metadata=task.task_metadata,
-            execution_history=task.execution_history,
+            symbol=task.symbol,
+            event_summary=task.event_summary,
             prompt_used=task.prompt_used,
             model_used=task.model_used,
             started_at=task.started_at,
@@ -2251,13 +2097,36 @@ async def create_task(
         )
 
 
+# Columns of a summary listing (no prompt_used / task_metadata bodies)
+_TASK_SUMMARY_COLUMNS = (
+    Task.id,
+    Task.task_type,
+    Task.status,
+    Task.result_ref,
+    Task.error_message,
+    Task.symbol,
+    Task.event_summary,
+    Task.model_used,
+    Task.started_at,
+    Task.retry_count,
+    Task.created_at,
+    Task.updated_at,
+    Task.completed_at,
+)
+
+
 @router.get("", response_model=list[TaskResponse])
 async def list_tasks(
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
     limit: int = Query(20, ge=1, le=200, description="Maximum number of tasks to return"),
-    skip: int = Query(0, ge=0, description="Number of tasks to skip"),
+    skip: int = Query(0, ge=0, description="Number of tasks to skip (deprecated: use before_created_at/before_id)"),
     result_ref: str | None = Query(None, description="Filter by result_ref (e.g. report ID for One-Click Load)"),
+    before_created_at: datetime | None = Query(None, description="Keyset cursor: created_at of the last task already seen"),
+    before_id: UUID | None = Query(None, description="Keyset cursor: id of the last task already seen"),
+    view: Literal["summary", "full"] | None = Query(
+        None, description="summary (no metadata/prompt) or full; default summary, full with result_ref"
+    ),
 ) -> list[TaskResponse]:
     """
     List tasks for the authenticated user (paginated).
@@ -2265,23 +2134,42 @@ async def list_tasks(
     Returns only tasks owned by the current user, sorted by created_at DESC.
     When result_ref is provided (e.g. report ID), returns the task that produced that result (for recommended_strategies).
 
+    The summary view selects only the listing columns (status, symbol, model, timeline
+    summary, timestamps); metadata and prompt_used come from GET /tasks/{id}, or with
+    view=full. Pass the last item's created_at and id as before_created_at/before_id
+    to get the next page.
+
     Args:
         current_user: Authenticated user (from JWT token)
         db: Database session
         limit: Maximum number of tasks to return (1-200)
-        skip: Number of tasks to skip
+        skip: Number of tasks to skip (ignored when a cursor is given)
         result_ref: Optional filter by result_ref (e.g. AI report ID)
+        before_created_at: created_at of the last task of the previous page
+        before_id: id of the last task of the previous page
+        view: "summary" or "full" (default: full when filtering by result_ref, else summary)
 
     Returns:
         List of TaskResponse
     """
     try:
-        stmt = select(Task).where(Task.user_id == current_user.id)
+        full = view == "full" or (view is None and result_ref is not None)
+        stmt = select(Task) if full else select(*_TASK_SUMMARY_COLUMNS)
+        stmt = stmt.where(Task.user_id == current_user.id)
         if result_ref:
             stmt = stmt.where(Task.result_ref == result_ref)
-        stmt = stmt.order_by(Task.created_at.desc()).limit(limit).offset(skip)
+        if before_created_at is not None and before_id is not None:
+            stmt = stmt.where(tuple_(Task.created_at, Task.id) < tuple_(before_created_at, before_id))
+        elif skip:
+            stmt = stmt.offset(skip)
+        stmt = stmt.order_by(Task.created_at.desc(), Task.id.desc()).limit(limit)
         result = await db.execute(stmt)
-        tasks = result.scalars().all()
+        tasks = result.scalars().all() if full else result.all()
+        metadatas: list[dict[str, Any] | None] = [None] * len(tasks)
+        prompts: list[str | None] = [None] * len(tasks)
+        if full:
+            metadatas = await asyncio.gather(*(hydrate_metadata(task.task_metadata) for task in tasks))
+            prompts = await asyncio.gather(*(load_text(task.prompt_used, task.prompt_ref) for task in tasks))
 
         return [
             TaskResponse(
@@ -2290,9 +2178,10 @@ async def list_tasks(
                 status=task.status,
                 result_ref=task.result_ref,
                 error_message=task.error_message,
-                metadata=task.task_metadata,  # Fixed: use task_metadata instead of metadata
-                execution_history=task.execution_history,
-                prompt_used=task.prompt_used,
+                metadata=metadata,
+                symbol=task.symbol,
+                event_summary=task.event_summary,
+                prompt_used=prompt,
                 model_used=task.model_used,
                 started_at=task.started_at,
                 retry_count=task.retry_count,
@@ -2300,7 +2189,7 @@ async def list_tasks(
                 updated_at=task.updated_at,
                 completed_at=task.completed_at,
             )
-            for task in tasks
+            for task, metadata, prompt in zip(tasks, metadatas, prompts)
         ]
 
     except Exception as e:
@@ -2314,18 +2203,24 @@ async def list_tasks(
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
+    since: int = Query(0, ge=0, description="Only return timeline events with seq greater than this"),
+    event_limit: int = Query(EVENTS_PAGE_SIZE, ge=1, le=2000, description="Maximum number of timeline events"),
 ) -> TaskResponse:
     """
     Get a specific task by ID.
 
-    Only returns task if it belongs to the authenticated user.
+    Only returns task if it belongs to the authenticated user. execution_history holds
+    the events after ``since`` (oldest first); pollers pass the last seq they have and
+    keep paging while event_summary.last_seq is ahead of it.
 
     Args:
         task_id: Task UUID
         current_user: Authenticated user (from JWT token)
         db: Database session
+        since: Last event seq the client already has
+        event_limit: Page size for timeline events
 
     Returns:
         TaskResponse with full task details
@@ -2351,9 +2246,11 @@ async def get_task(
             status=task.status,
             result_ref=task.result_ref,
             error_message=task.error_message,
-            metadata=task.task_metadata,
-            execution_history=task.execution_history,
-            prompt_used=task.prompt_used,
+            metadata=await hydrate_metadata(task.task_metadata),
+            symbol=task.symbol,
+            execution_history=await load_events(db, task.id, since=since, limit=event_limit),
+            event_summary=task.event_summary,
+            prompt_used=await load_text(task.prompt_used, task.prompt_ref),
             model_used=task.model_used,
             started_at=task.started_at,
             retry_count=task.retry_count,
@@ -2372,10 +2269,77 @@ async def get_task(
         )
 
 
+async def _load_task_snapshot(task_id: UUID) -> dict[str, Any] | None:
+    """Current progress state of a task as a ``snapshot`` event (None if it no longer exists)."""
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(select(Task).where(Task.id == task_id))
+        task = result.scalar_one_or_none()
+    if task is None:
+        return None
+    metadata = task.task_metadata or {}
+    return {
+        "type": "snapshot",
+        "status": task.status,
+        "progress": metadata.get("progress"),
+        "current_stage": metadata.get("current_stage"),
+        "stages": metadata.get("stages"),
+        "result_ref": task.result_ref,
+        "error_message": task.error_message,
+    }
+
+
+@router.get("/{task_id}/events")
+async def stream_task_events(
+    task_id: UUID,
+    current_user: Annotated[UserContext, Depends(get_current_user)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> StreamingResponse:
+    """
+    Stream a task's progress as Server-Sent Events (see task_progress.py).
+
+    The first event is a ``snapshot`` (status, progress, current_stage, stages); then
+    ``progress`` and ``stages`` events as the worker reports them, and a final
+    ``status`` event (SUCCESS / FAILED) after which the stream ends. Replaces polling
+    GET /tasks/{task_id} for live progress.
+
+    Args:
+        task_id: Task UUID
+        current_user: Authenticated user (from JWT token)
+        db: Database session
+
+    Returns:
+        text/event-stream of snapshot / progress / stages / status events (comment lines as keepalives)
+
+    Raises:
+        HTTPException: If task not found or doesn't belong to user
+    """
+    result = await db.execute(
+        select(Task.id).where(Task.id == task_id, Task.user_id == current_user.id)
+    )
+    if result.scalar_one_or_none() is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Task not found",
+        )
+
+    async def events() -> AsyncIterator[str]:
+        async for event in task_event_bus.subscribe(task_id, lambda: _load_task_snapshot(task_id)):
+            if event is None:
+                yield ": keepalive\n\n"
+            else:
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_task(
     task_id: UUID,
-    current_user: Annotated[User, Depends(get_current_user)],
+    current_user: Annotated[UserContext, Depends(get_current_user)],
     db: Annotated[AsyncSession, Depends(get_db)],
 ) -> None:
     """
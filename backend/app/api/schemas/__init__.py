@@ -62,7 +62,7 @@ class AIReportResponse(BaseModel):
     model_config = {"protected_namespaces": ()}  # Fix Pydantic warning for "model_used" field
 
     id: str = Field(..., description="Report UUID")
-    report_content: str = Field(..., description="Markdown report content")
+    report_content: str | None = Field(None, description="Markdown report content (omitted in summary listings)")
     model_used: str = Field(..., description="AI model used")
     created_at: datetime = Field(..., description="Generation timestamp")
     metadata: dict[str, Any] | None = Field(
@@ -90,8 +90,15 @@ class TaskResponse(BaseModel):
     status: str = Field(..., description="Task status: PENDING, PROCESSING, SUCCESS, FAILED")
     result_ref: str | None = Field(None, description="Reference to result (e.g., AI report ID)")
     error_message: str | None = Field(None, description="Error message if task failed")
-    metadata: dict[str, Any] | None = Field(None, description="Additional task metadata")
-    execution_history: list[dict[str, Any]] | None = Field(None, description="Timeline of execution events")
+    metadata: dict[str, Any] | None = Field(None, description="Additional task metadata (omitted in summary listings)")
+    symbol: str | None = Field(None, description="Underlying symbol (from metadata)")
+    execution_history: list[dict[str, Any]] | None = Field(
+        None,
+        description="Timeline events (seq, type, message, timestamp); GET /tasks/{id} only, paged with ?since=seq",
+    )
+    event_summary: dict[str, Any] | None = Field(
+        None, description="Timeline summary: count, last_seq, by_type, last_event, last_error"
+    )
     prompt_used: str | None = Field(None, description="Full prompt sent to AI")
     model_used: str | None = Field(None, description="AI model used")
     started_at: datetime | None = Field(None, description="When processing started")
@@ -51,6 +51,11 @@ class Settings(BaseSettings):
 
     # Redis Configuration
     redis_url: str = "redis://localhost:6379/0"
+    # Binary codecs (msgpack+zstd) for large cached values such as option chains.
+    # Readers always accept both formats; set False during a rolling upgrade from a version without codecs.
+    cache_binary_codecs: bool = True
+    # In-process L1 cache tier for hot keys (chains, expirations, K-lines, config); invalidated via Redis pub/sub
+    cache_l1_enabled: bool = True
 
     # Tiger Brokers API
     tiger_api_key: str = ""  # Legacy - may not be needed for Open SDK
@@ -64,6 +69,14 @@ class Settings(BaseSettings):
     # When False (dev): do not call Tiger for option chain; load from fixture to avoid 开发/生产 抢占
     tiger_use_live_api: bool = True  # Production: True. Development: False + option_chain_fixture.json
     tiger_option_chain_fixture_path: str = ""  # Path to option_chain_fixture.json; empty = app/data/fixtures/option_chain_fixture.json
+    # Black-Scholes fill for chain rows Tiger returns without Greeks/IV (app/services/black_scholes.py)
+    option_risk_free_rate: float = 0.04  # Annualized, decimal
+    # Batch recommendations (POST /market/recommendations/batch)
+    recommendations_batch_sync_limit: int = 20  # Larger batches stream NDJSON as symbols complete
+    recommendations_batch_concurrency: int = 8  # Concurrent chain fetches (Tiger calls are also rate limited)
+    recommendations_batch_free_max_symbols: int = 10  # Distinct symbols per batch for free users (Pro: request max)
+    recommendations_batch_per_user: int = 1  # Concurrent batches per user (across replicas with Redis)
+    recommendations_batch_slot_ttl_seconds: int = 600  # Safety expiry of a batch slot if its release is lost
 
     # Financial Modeling Prep API (for FinanceToolkit)
     # Required for market data. Only FMP is used; Yahoo Finance is not used.
@@ -90,6 +103,10 @@ class Settings(BaseSettings):
     jwt_secret_key: str
     jwt_algorithm: str = "HS256"
     jwt_expiration_hours: int = 24
+    # Cached user context for authenticated requests (app/services/user_context.py); 0 = always load from Postgres
+    user_context_cache_ttl: int = 60
+    # Daily quota counters live in Redis (app/services/quota_counters.py); seconds between flushes to Postgres
+    quota_flush_interval_seconds: int = 30
 
     # Application Environment
     environment: str = "development"
@@ -130,8 +147,42 @@ class Settings(BaseSettings):
     domain: str = ""  # Production domain (e.g., https://thetamind.com or thetamind.com)
     allowed_origins: str = ""  # Comma-separated list of allowed origins (e.g., "https://app.example.com,https://www.example.com")
     
+    # Named executors for blocking work (app/services/executors.py)
+    executor_tiger_workers: int = 8  # Tiger SDK calls
+    executor_fmp_sync_workers: int = 8  # Synchronous FMP HTTP calls
+    executor_toolkit_workers: int = 4  # FinanceToolkit profiles / history
+    executor_toolkit_use_processes: bool = False  # Run toolkit work in a process pool
+    executor_cpu_workers: int = 2  # Charts and other CPU-bound work
+    executor_cpu_use_processes: bool = False
+    executor_strategy_workers: int = 2  # Strategy scoring for batch recommendations
+    executor_strategy_use_processes: bool = True  # Numpy/Python scoring holds the GIL; scale across cores
+    executor_blob_workers: int = 8  # Blob storage reads / writes (R2, local files)
+
     # Scheduler Configuration
-    enable_scheduler: bool = False  # Set to True to enable automatic scheduled jobs (e.g., quota reset)
+    enable_scheduler: bool = False  # Set to True to enable automatic scheduled jobs (e.g., Alpha Radar)
+    # Option chain prefetch job (scheduler): warms the most requested chains during US market hours
+    enable_chain_prefetch: bool = True
+    chain_prefetch_interval_minutes: int = 5
+    chain_prefetch_top_n: int = 20  # Most requested (symbol, expiration) pairs to keep warm
+    chain_prefetch_max_calls: int = 20  # Tiger calls per run (hard cap)
+    chain_prefetch_budget_share: float = 0.5  # Share of RateLimits.TIGER_API_CALLS_PER_MINUTE used for pacing
+    # Option chain streaming (GET /market/chain/stream): streamed chains share a slice of the Tiger budget
+    chain_stream_budget_share: float = 0.3  # Share of RateLimits.TIGER_API_CALLS_PER_MINUTE spread over streamed chains
+    chain_stream_interval_seconds: int = 15  # Fastest refresh per chain (few chains streamed)
+    chain_stream_max_interval_seconds: int = 120  # Slowest acceptable refresh; bounds how many chains fit the budget
+    chain_stream_max_keys: int = 200  # Hard cap on distinct streamed chains (the budget usually binds first)
+    # Background task queue (Redis Streams): the API enqueues, `python -m app.worker` processes
+    task_queue_visibility_timeout_seconds: int = 600  # Unacked tasks idle this long are recovered by another worker
+    task_queue_inline_fallback: bool = True  # No Redis: process tasks in the API process (development)
+    task_worker_concurrency: str = (  # Per-type slots per worker, "type=limit,..." (0 = not handled)
+        "multi_agent_report=2,ai_report=4,options_analysis_workflow=2,"
+        "stock_screening_workflow=2,generate_strategy_chart=4"
+    )
+    task_worker_default_concurrency: int = 2  # Task types not listed above
+    task_worker_shutdown_grace_seconds: int = 25  # In-flight tasks still running after this are requeued
+    task_worker_embedded: bool = False  # Also run a worker inside the API process (single-container deploys)
+    task_worker_external: bool = False  # A separate worker service consumes the queue (e.g. the compose "worker")
+    task_progress_flush_seconds: float = 5.0  # Buffered task progress is written at most this often between stage commits
 
     # Telegram (Alpha Radar push)
     telegram_bot_token: str = ""  # Bot token from @BotFather
@@ -144,6 +195,12 @@ class Settings(BaseSettings):
     cloudflare_r2_bucket_name: str = ""  # R2 bucket name
     cloudflare_r2_public_url_base: str = ""  # Public URL base (e.g., https://pub-xxx.r2.dev or custom domain)
 
+    # Blob storage for large task payloads (app/services/storage/blob_store.py)
+    blob_storage_backend: str = "auto"  # auto (R2 when credentials and blob bucket are set, else off), r2, local, off
+    blob_r2_bucket_name: str = ""  # Private bucket for blobs; required for R2 (never the public image bucket)
+    blob_local_dir: str = "/app/data/blobs"  # Root directory of the local backend (dev / tests)
+    blob_offload_min_bytes: int = 16384  # Payloads at least this large (serialized) are moved to blob storage
+
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         # Auto-construct DATABASE_URL if using Cloud SQL (separate components)
@@ -6,7 +6,9 @@ from typing import Final
 class CacheTTL:
     """Cache TTL constants (in seconds)."""
     
-    OPTION_CHAIN: Final[int] = 600  # 10 minutes
+    OPTION_CHAIN: Final[int] = 600  # 10 minutes (soft TTL: older chains are served stale and refreshed in background)
+    OPTION_CHAIN_HARD: Final[int] = 1800  # 30 minutes (Redis TTL: past this a request blocks on Tiger)
+    OPTION_CHAIN_REFRESH_BACKOFF: Final[int] = 30  # Seconds before retrying a failed background refresh
     HISTORICAL_DATA: Final[int] = 86400  # 24 hours
     EXPIRATIONS: Final[int] = 86400  # 24 hours
     MARKET_QUOTE: Final[int] = 60  # 1 minute
@@ -83,8 +83,12 @@ class AIReport(Base):
     user_id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), ForeignKey("users.id"), nullable=False, index=True
     )
-    report_content: Mapped[str] = mapped_column(Text, nullable=False)
+    report_content: Mapped[str] = mapped_column(Text, nullable=False)  # Excerpt when content_ref is set
+    content_ref: Mapped[str | None] = mapped_column(String(80), nullable=True)  # Blob digest of the full report
     model_used: Mapped[str] = mapped_column(String(100), nullable=False)
+    symbol: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # Underlying symbol, copied from the producing task at write time (for listings)
     created_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True), default=utc_now, nullable=False
     )
@@ -92,6 +96,11 @@ class AIReport(Base):
     # Relationships
     user: Mapped["User"] = relationship("User", back_populates="ai_reports")
 
+    # Indexes
+    __table_args__ = (
+        Index("ix_ai_reports_user_created_id", "user_id", "created_at", "id"),  # Keyset pagination
+    )
+
 
 class PaymentEvent(Base):
     """Payment events from Lemon Squeezy webhooks (Audit Trail)."""
@@ -213,9 +222,15 @@ class Task(Base):
     )  # Reference to result (e.g., AI report ID)
     error_message: Mapped[str | None] = mapped_column(Text, nullable=True)
     task_metadata: Mapped[dict[str, Any] | None] = mapped_column(JSONB, nullable=True)
+    symbol: Mapped[str | None] = mapped_column(
+        String(20), nullable=True
+    )  # Underlying symbol from task_metadata, denormalized at creation (for listings)
     # Execution details
-    execution_history: Mapped[list[dict[str, Any]] | None] = mapped_column(JSONB, nullable=True)  # Timeline of execution events
-    prompt_used: Mapped[str | None] = mapped_column(Text, nullable=True)  # Full prompt sent to AI
+    event_summary: Mapped[dict[str, Any] | None] = mapped_column(
+        JSONB, nullable=True
+    )  # Materialized summary of task_events (count, last_seq, by_type, last_event, last_error)
+    prompt_used: Mapped[str | None] = mapped_column(Text, nullable=True)  # Full prompt sent to AI (excerpt when prompt_ref is set)
+    prompt_ref: Mapped[str | None] = mapped_column(String(80), nullable=True)  # Blob digest of the full prompt
     model_used: Mapped[str | None] = mapped_column(String(100), nullable=True)  # AI model used
     started_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)  # When processing started
     retry_count: Mapped[int] = mapped_column(Integer, default=0, nullable=False)  # Number of retries
@@ -236,7 +251,21 @@ class Task(Base):
     __table_args__ = (
         Index("ix_tasks_user_status", "user_id", "status"),
         Index("ix_tasks_created_at", "created_at"),
+        Index("ix_tasks_user_created_id", "user_id", "created_at", "id"),  # Keyset pagination
     )
 
 
+class TaskEvent(Base):
+    """Task execution timeline entry (append-only, see app.services.task_events)."""
+
+    __tablename__ = "task_events"
 
+    task_id: Mapped[uuid.UUID] = mapped_column(
+        UUID(as_uuid=True), ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True
+    )
+    seq: Mapped[int] = mapped_column(Integer, primary_key=True)  # 1, 2, ... per task
+    event_type: Mapped[str] = mapped_column(String(20), nullable=False)  # "start", "progress", "success", "error", ...
+    message: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=utc_now, nullable=False
+    )
@@ -28,8 +28,13 @@ from app.core.config import settings
 from app.db.session import AsyncSessionLocal, close_db, init_db
 from app.services.ai_service import ai_service
 from app.services.cache import cache_service
+from app.services.chain_stream import chain_stream_hub
 from app.services.config_service import config_service
+from app.services.executors import shutdown_executors
+from app.services.quota_counters import quota_counters
 from app.services.scheduler import shutdown_scheduler, setup_scheduler, start_scheduler
+from app.services.task_progress import task_event_bus
+from app.services.task_queue import TaskWorker
 from app.services.tiger_service import tiger_service
 
 logger = logging.getLogger(__name__)
@@ -43,7 +48,9 @@ async def lifespan(app: FastAPI):
     - Initialize database connections
     - Connect to Redis
     - Check Tiger API connectivity (Ping)
-    - Start scheduler (quota reset only)
+    - Start the quota counter flusher (Redis -> Postgres)
+    - Start scheduler (Alpha Radar, chain prefetch)
+    - Start an embedded task worker when TASK_WORKER_EMBEDDED is set
     """
     # Startup
     logger.info("Starting ThetaMind backend...")
@@ -60,6 +67,8 @@ async def lifespan(app: FastAPI):
     # Connect to Redis (non-critical - continue if it fails)
     try:
         await cache_service.connect()
+        await cache_service.start_invalidation_listener()
+        await quota_counters.start_flusher()
         logger.info("Redis connected")
     except Exception as e:
         logger.warning(f"Redis connection failed (continuing anyway): {e}")
@@ -85,14 +94,41 @@ async def lifespan(app: FastAPI):
         logger.warning(f"Scheduler setup failed (continuing anyway): {e}")
         # Don't fail startup if scheduler fails
 
+    # Embedded task worker (single-container deployments; normally `python -m app.worker`)
+    task_worker: TaskWorker | None = None
+    task_worker_run: asyncio.Task | None = None
+    if settings.task_worker_embedded:
+        if cache_service._redis is None:
+            logger.warning("Embedded task worker not started: Redis unavailable")
+        else:
+            task_worker = TaskWorker()
+            task_worker_run = asyncio.create_task(task_worker.run())
+            logger.info("Embedded task worker started")
+    elif cache_service._redis is not None and not settings.task_worker_external:
+        # Tasks are enqueued (not run inline) whenever Redis is up: without a worker they never start
+        logger.error(
+            "NO TASK WORKER CONFIGURED: Redis is up, so AI report and chart tasks are queued, but "
+            "TASK_WORKER_EMBEDDED and TASK_WORKER_EXTERNAL are both false. Tasks will stay PENDING "
+            "until a worker (python -m app.worker) runs. Set TASK_WORKER_EMBEDDED=true, or "
+            "TASK_WORKER_EXTERNAL=true where a worker service is deployed."
+        )
+
     logger.info("ThetaMind backend startup completed successfully!")
 
     yield
 
     # Shutdown
     logger.info("Shutting down ThetaMind backend...")
+    if task_worker is not None and task_worker_run is not None:
+        task_worker.stop()
+        await asyncio.gather(task_worker_run, return_exceptions=True)
     shutdown_scheduler()
+    await chain_stream_hub.shutdown()
+    await task_event_bus.shutdown()
+    await quota_counters.stop_flusher()
+    await cache_service.stop_invalidation_listener()
     await cache_service.disconnect()
+    shutdown_executors()
     await close_db()
     logger.info("Shutdown complete")
 
@@ -85,6 +85,74 @@ class StrategyRecommendationRequest(BaseModel):
         default=10000.0, ge=1000.0, description="Available capital in USD"
     )
     expiration_date: str | None = Field(
-        None, description="Preferred expiration date (YYYY-MM-DD). If None, engine selects optimal DTE."
+        None, description="Preferred expiration date (YYYY-MM-DD). If None, next Friday, or a DTE window search (min_dte/max_dte)."
     )
+    min_dte: int | None = Field(
+        None, ge=0, le=730, description="Search mode: smallest days to expiration (used when expiration_date is None)"
+    )
+    max_dte: int | None = Field(
+        None, ge=0, le=730, description="Search mode: largest days to expiration (used when expiration_date is None)"
+    )
+    max_expirations: int = Field(
+        4, ge=1, le=12, description="Search mode: most expirations fetched (closest to 45 DTE first)"
+    )
+    optimize: bool = Field(
+        False, description="Search every strike combination for spreads/condors and return the Pareto-best ones"
+    )
+    take_profit_pct: float | None = Field(
+        None, gt=0, le=1,
+        description="Also simulate closing at this fraction of max profit (e.g. 0.5) and rank by that expectancy",
+    )
+
+
+class BatchRecommendationRequest(BaseModel):
+    """Request model for recommendations across a universe of symbols (one expiration each)."""
+
+    symbols: list[str] = Field(
+        ..., min_length=1, max_length=200,
+        description="Stock symbols (duplicates are dropped; free accounts are limited to a few symbols)",
+    )
+    outlook: Outlook = Field(..., description="Market outlook (AUTO resolves per symbol)")
+    risk_profile: RiskProfile = Field(
+        default=RiskProfile.CONSERVATIVE, description="Risk tolerance"
+    )
+    capital: float = Field(
+        default=10000.0, ge=1000.0, description="Available capital in USD"
+    )
+    expiration_date: str | None = Field(
+        None, description="Expiration date (YYYY-MM-DD) for every symbol. If None, next Friday."
+    )
+    optimize: bool = Field(
+        False, description="Search every strike combination for spreads/condors and return the Pareto-best ones"
+    )
+    take_profit_pct: float | None = Field(
+        None, gt=0, le=1,
+        description="Also simulate closing at this fraction of max profit (e.g. 0.5) and rank by that expectancy",
+    )
+    per_symbol: int = Field(3, ge=1, le=20, description="Best strategies kept per symbol")
+    limit: int = Field(50, ge=1, le=1000, description="Strategies in the cross-symbol ranking")
+    stream: bool = Field(
+        False,
+        description="Stream NDJSON results as symbols complete (always on above the synchronous batch limit)",
+    )
+
+
+class SymbolRecommendations(BaseModel):
+    """Recommendations for one symbol of a batch, or the reason there are none."""
+
+    symbol: str = Field(..., description="Stock symbol")
+    expiration_date: str = Field(..., description="Expiration date used (YYYY-MM-DD)")
+    strategies: list[CalculatedStrategy] = Field(default_factory=list, description="Best strategies, ranked")
+    error: str | None = Field(None, description="Why the symbol was skipped (no chain, no spot price, ...)")
+
+
+class RankedRecommendations(BaseModel):
+    """Best strategies across all symbols of a batch (the last line of a streamed batch)."""
+
+    ranked: list[CalculatedStrategy] = Field(..., description="Best strategies across all symbols")
+
+
+class BatchRecommendationResponse(RankedRecommendations):
+    """Per-symbol results plus one ranking across all symbols."""
 
+    results: list[SymbolRecommendations] = Field(..., description="Per-symbol results, in request order")
@@ -1,11 +1,11 @@
 """Fundamental Analyst Agent - Analyzes company fundamentals using MarketDataService."""
 
-import asyncio
 import logging
 from typing import Any, Dict
 
 from app.services.agents.base import BaseAgent, AgentContext, AgentResult, AgentType
 from app.services.ai.base import BaseAIProvider
+from app.services.executors import run_in_executor
 from app.services.market_data_service import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -88,9 +88,9 @@ When a specific language is requested, you MUST generate your analysis in that l
                     error="ticker not provided in context",
                 )
             
-            # Fetch financial profile using MarketDataService (run in thread pool to avoid blocking)
+            # Fetch financial profile using MarketDataService (toolkit executor, off the event loop)
             logger.debug(f"Fetching financial profile for {ticker}")
-            profile = await asyncio.to_thread(self.market_data_service.get_financial_profile, ticker)
+            profile = await run_in_executor("toolkit", self.market_data_service.get_financial_profile, ticker)
             
             if not profile:
                 return AgentResult(
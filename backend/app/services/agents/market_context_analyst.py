@@ -1,12 +1,12 @@
 """Market Context Analyst Agent - Analyzes market environment and context."""
 
-import asyncio
 import json
 import logging
 from typing import Any, Dict
 
 from app.services.agents.base import BaseAgent, AgentContext, AgentResult, AgentType
 from app.services.ai.base import BaseAIProvider
+from app.services.executors import run_in_executor
 from app.services.market_data_service import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -87,7 +87,7 @@ Be comprehensive, objective, and focus on actionable insights. Respond in Englis
             ) else None
             if not profile:
                 logger.debug(f"Fetching market data for {ticker} (no pre-enriched profile)")
-                profile = await asyncio.to_thread(self.market_data_service.get_financial_profile, ticker)
+                profile = await run_in_executor("toolkit", self.market_data_service.get_financial_profile, ticker)
             
             if not profile:
                 return AgentResult(
@@ -1,11 +1,11 @@
 """Technical Analyst Agent - Analyzes technical indicators and chart patterns."""
 
-import asyncio
 import logging
 from typing import Any, Dict
 
 from app.services.agents.base import BaseAgent, AgentContext, AgentResult, AgentType
 from app.services.ai.base import BaseAIProvider
+from app.services.executors import run_in_executor
 from app.services.market_data_service import MarketDataService
 
 logger = logging.getLogger(__name__)
@@ -80,9 +80,9 @@ Be objective, data-driven, and focus on practical trading insights."""
                     error="ticker not provided in context",
                 )
             
-            # Fetch technical data using MarketDataService (run in thread pool to avoid blocking)
+            # Fetch technical data using MarketDataService (toolkit executor, off the event loop)
             logger.debug(f"Fetching technical data for {ticker}")
-            profile = await asyncio.to_thread(self.market_data_service.get_financial_profile, ticker)
+            profile = await run_in_executor("toolkit", self.market_data_service.get_financial_profile, ticker)
             
             if not profile:
                 return AgentResult(
@@ -97,11 +97,11 @@ Be objective, data-driven, and focus on practical trading insights."""
             technical_indicators = profile.get("technical_indicators", {})
             analysis = profile.get("analysis", {})
             
-            # Get technical chart (optional, run in thread pool to avoid blocking)
+            # Get technical chart (optional, toolkit executor, off the event loop)
             chart_base64 = None
             try:
-                chart_base64 = await asyncio.to_thread(
-                    self.market_data_service.generate_technical_chart, ticker, "rsi"
+                chart_base64 = await run_in_executor(
+                    "toolkit", self.market_data_service.generate_technical_chart, ticker, "rsi"
                 )
             except Exception as e:
                 logger.debug(f"Failed to generate technical chart: {e}")
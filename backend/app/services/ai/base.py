@@ -3,6 +3,8 @@
 from abc import ABC, abstractmethod
 from typing import Any, Callable, Optional
 
+from app.services.option_chain import OptionChain
+
 
 class BaseAIProvider(ABC):
     """Abstract base class for AI providers (Gemini, DeepSeek, Qwen)."""
@@ -85,13 +87,13 @@ class BaseAIProvider(ABC):
 
     @abstractmethod
     def filter_option_chain(
-        self, chain_data: dict[str, Any], spot_price: float
+        self, chain_data: dict[str, Any] | OptionChain, spot_price: float
     ) -> dict[str, Any]:
         """
         Filter option chain to keep only relevant strikes (ATM ±15%).
 
         Args:
-            chain_data: Full option chain data
+            chain_data: Full option chain data (dict shape or OptionChain)
             spot_price: Current spot price
 
         Returns:
@@ -6,6 +6,7 @@ Supports both Generative Language API (AIza... keys) and Vertex AI (AQ.Ab... key
 import asyncio
 import json
 import logging
+import math
 import re
 from datetime import datetime
 from typing import Any, Callable, Optional
@@ -33,6 +34,8 @@ except ImportError:
 
 from app.core.config import settings
 from app.services.ai.base import BaseAIProvider
+from app.services.option_chain import OptionChain
+from app.services.payoff import finite_or_text, format_pnl, summary_metrics
 from app.services.config_service import config_service
 
 logger = logging.getLogger(__name__)
@@ -126,14 +129,14 @@ class GeminiProvider(BaseAIProvider):
             raise RuntimeError("HTTP client is not available. Please check API key configuration.")
 
     def filter_option_chain(
-        self, chain_data: dict[str, Any], spot_price: float
+        self, chain_data: dict[str, Any] | OptionChain, spot_price: float
     ) -> dict[str, Any]:
         """
         Filter option chain to keep only strikes within ±15% of spot price.
         Crucial for saving Token costs and reducing AI hallucinations.
 
         Args:
-            chain_data: Full option chain data
+            chain_data: Full option chain data (dict shape or OptionChain)
             spot_price: Current spot price
 
         Returns:
@@ -144,18 +147,23 @@ class GeminiProvider(BaseAIProvider):
             logger.warning("Invalid spot price for filtering. Returning full chain (risky).")
             return chain_data
 
-        filtered = {"calls": [], "puts": []}
         threshold_low = spot_price * 0.85
         threshold_high = spot_price * 1.15
 
-        for option_type in ["calls", "puts"]:
-            if option_type not in chain_data:
-                continue
+        if isinstance(chain_data, OptionChain):
+            # Columnar chain: strike-range slice via binary search
+            sliced = chain_data.slice_strikes(threshold_low, threshold_high)
+            filtered = {"calls": sliced.calls.to_records(), "puts": sliced.puts.to_records()}
+        else:
+            filtered = {"calls": [], "puts": []}
+            for option_type in ["calls", "puts"]:
+                if option_type not in chain_data:
+                    continue
 
-            for option in chain_data[option_type]:
-                strike = option.get("strike", 0)
-                if threshold_low <= strike <= threshold_high:
-                    filtered[option_type].append(option)
+                for option in chain_data[option_type]:
+                    strike = option.get("strike", 0)
+                    if threshold_low <= strike <= threshold_high:
+                        filtered[option_type].append(option)
 
         logger.info(
             f"Filtered option chain: {len(filtered['calls'])} calls, "
@@ -315,10 +323,8 @@ class GeminiProvider(BaseAIProvider):
         net_theta = portfolio_greeks.get("theta", 0)
         net_vega = portfolio_greeks.get("vega", 0)
         
-        # Extract strategy metrics (handle None case)
-        strategy_metrics = strategy_context.get("strategy_metrics")
-        if not isinstance(strategy_metrics, dict):
-            strategy_metrics = {}
+        # Extract strategy metrics (exact payoff figures from the legs when available)
+        strategy_metrics = summary_metrics(strategy_context)
         # Safely extract and convert max_profit and max_loss to float
         max_profit_raw = strategy_metrics.get("max_profit")
         max_profit = float(max_profit_raw) if max_profit_raw is not None and isinstance(max_profit_raw, (int, float)) else 0.0
@@ -344,7 +350,7 @@ class GeminiProvider(BaseAIProvider):
         
         # Estimate Probability of Profit (simplified - can be improved with Black-Scholes)
         # For now, use a heuristic based on max profit and max loss
-        risk_reward = abs(max_profit / max_loss) if max_loss < 0 else 0
+        risk_reward = abs(max_profit / max_loss) if max_loss < 0 and math.isfinite(max_profit / max_loss) else 0
         pop_estimate = min(95, max(5, 50 + (risk_reward - 1) * 15))  # Rough estimate: 50% base, adjust by risk/reward
         
         # 3. Load prompt template from config service (with fallback to default)
@@ -370,8 +376,8 @@ class GeminiProvider(BaseAIProvider):
                 spot_price=f"{spot_price:.2f}",
                 iv_info=iv_info,
                 legs_json=json.dumps(legs_json, indent=2),
-                max_profit=f"{max_profit:,.2f}",
-                max_loss=f"{max_loss:,.2f}",
+                max_profit=format_pnl(max_profit),
+                max_loss=format_pnl(max_loss),
                 pop=f"{pop_estimate:.0f}",
                 breakevens=breakevens,
                 net_delta=f"{net_delta:.4f}",
@@ -427,8 +433,8 @@ Write the investment memo:"""
                 "vega": net_vega,
             },
             "strategy_metrics": {
-                "max_profit": max_profit,
-                "max_loss": max_loss,
+                "max_profit": finite_or_text(max_profit),
+                "max_loss": finite_or_text(max_loss),
                 "breakeven_points": breakeven_points,
             },
             "trade_execution": trade_execution,
@@ -1501,9 +1507,7 @@ Research Summary:"""
             if not isinstance(portfolio_greeks, dict):
                 portfolio_greeks = {}
             
-            strategy_metrics = strategy_context.get("strategy_metrics")
-            if not isinstance(strategy_metrics, dict):
-                strategy_metrics = {}
+            strategy_metrics = summary_metrics(strategy_context)
             
             trade_execution = strategy_context.get("trade_execution")
             if not isinstance(trade_execution, dict):
@@ -1571,7 +1575,7 @@ Research Summary:"""
             
             # Calculate risk/reward ratio safely
             try:
-                if max_loss < 0 and max_loss != 0:
+                if max_loss < 0 and math.isfinite(max_profit / max_loss):
                     risk_reward = abs(max_profit / max_loss)
                 else:
                     risk_reward = 0
@@ -1650,7 +1654,7 @@ Subject: Investment Memo: {symbol} {strategy_name}
 **User Strategy Context:**
 Symbol: {symbol}, Strategy: {strategy_name}, Spot: ${spot_price:.2f}, IV: {iv_info}
 Legs: {json.dumps(legs_json, indent=2, default=str)}
-Max Profit: ${max_profit:,.2f}, Max Loss: ${max_loss:,.2f}, POP: {pop_estimate:.0f}%, Breakevens: {breakevens}
+Max Profit: ${format_pnl(max_profit)}, Max Loss: ${format_pnl(max_loss)}, POP: {pop_estimate:.0f}%, Breakevens: {breakevens}
 Net Greeks: Delta {float(portfolio_greeks.get('delta', 0) or 0):.4f}, Theta {float(portfolio_greeks.get('theta', 0) or 0):.4f}, Vega {float(portfolio_greeks.get('vega', 0) or 0):.4f}
 
 **Fundamental Data (FMP):**
@@ -1686,8 +1690,8 @@ Output Markdown only."""
                     "legs": legs_json,
                     "portfolio_greeks": portfolio_greeks,
                     "strategy_metrics": {
-                        "max_profit": max_profit,
-                        "max_loss": max_loss,
+                        "max_profit": finite_or_text(max_profit),
+                        "max_loss": finite_or_text(max_loss),
                         "breakeven_points": breakeven_points,
                     },
                     "trade_execution": trade_execution,
@@ -1714,8 +1718,8 @@ Strategy Structure (Legs):
 {json.dumps(legs_json, indent=2, default=str)}
 
 Financial Metrics:
-- Max Profit: ${max_profit:,.2f}
-- Max Loss: ${max_loss:,.2f}
+- Max Profit: ${format_pnl(max_profit)}
+- Max Loss: ${format_pnl(max_loss)}
 - Probability of Profit: {pop_estimate:.0f}%
 - Breakeven Points: {breakevens}
 
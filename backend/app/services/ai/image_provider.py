@@ -4,6 +4,7 @@ import asyncio
 import base64
 import json
 import logging
+import math
 from typing import Any
 
 import httpx
@@ -45,6 +46,7 @@ else:
 from openai import AsyncOpenAI
 
 from app.core.config import settings
+from app.services.payoff import summary_metrics
 
 logger = logging.getLogger(__name__)
 
@@ -177,10 +179,8 @@ class GeminiImageProvider:
                     role_text = ""
                 legs_text += f"    {i}. {action} {strike} {option_type}{role_text}\n"
 
-            # Extract metrics from strategy_summary (handle None case)
-            strategy_metrics = strategy_summary.get("strategy_metrics")
-            if not isinstance(strategy_metrics, dict):
-                strategy_metrics = {}
+            # Extract metrics from strategy_summary (exact payoff figures from the legs when available)
+            strategy_metrics = summary_metrics(strategy_summary)
             trade_execution = strategy_summary.get("trade_execution")
             if not isinstance(trade_execution, dict):
                 trade_execution = {}
@@ -214,12 +214,12 @@ class GeminiImageProvider:
             # Ensure max_profit is a number (handle None case)
             max_profit_raw = strategy_metrics.get("max_profit")
             max_profit = float(max_profit_raw) if max_profit_raw is not None and isinstance(max_profit_raw, (int, float)) else 0.0
-            max_profit_text = f"${max_profit:,.2f}" if max_profit > 0 else "N/A"
+            max_profit_text = ("Unlimited" if math.isinf(max_profit) else f"${max_profit:,.2f}") if max_profit > 0 else "N/A"
             
             # Ensure max_loss is a number (handle None case)
             max_loss_raw = strategy_metrics.get("max_loss")
             max_loss = float(max_loss_raw) if max_loss_raw is not None and isinstance(max_loss_raw, (int, float)) else 0.0
-            max_loss_text = f"${abs(max_loss):,.2f}" if max_loss < 0 else "N/A"
+            max_loss_text = ("Unlimited" if math.isinf(max_loss) else f"${abs(max_loss):,.2f}") if max_loss < 0 else "N/A"
         elif strategy_data and metrics:
             # Legacy format (backward compatibility)
             ticker = strategy_data.get("symbol", "N/A")
@@ -258,7 +258,7 @@ class GeminiImageProvider:
             margin_text = f"${margin:,.0f}" if margin > 0 else "N/A"
             
             # Legacy format may have single breakeven or list
-            breakeven_raw = metrics.get("breakeven")
+            breakeven_raw = metrics.get("breakeven_points") or metrics.get("breakeven")
             if isinstance(breakeven_raw, list):
                 # Filter out None values and ensure all are numbers
                 valid_breakevens = [
@@ -277,12 +277,12 @@ class GeminiImageProvider:
             # Ensure max_profit is a number (handle None case)
             max_profit_raw = metrics.get("max_profit")
             max_profit = float(max_profit_raw) if max_profit_raw is not None and isinstance(max_profit_raw, (int, float)) else 0.0
-            max_profit_text = f"${max_profit:,.2f}" if max_profit > 0 else "N/A"
+            max_profit_text = ("Unlimited" if math.isinf(max_profit) else f"${max_profit:,.2f}") if max_profit > 0 else "N/A"
             
             # Ensure max_loss is a number (handle None case)
             max_loss_raw = metrics.get("max_loss")
             max_loss = float(max_loss_raw) if max_loss_raw is not None and isinstance(max_loss_raw, (int, float)) else 0.0
-            max_loss_text = f"${abs(max_loss):,.2f}" if max_loss < 0 else "N/A"
+            max_loss_text = ("Unlimited" if math.isinf(max_loss) else f"${abs(max_loss):,.2f}") if max_loss < 0 else "N/A"
         else:
             raise ValueError("Either strategy_summary or (strategy_data + metrics) must be provided")
 
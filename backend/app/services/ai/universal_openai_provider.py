@@ -17,6 +17,8 @@ from tenacity import (
 
 from app.core.config import settings
 from app.services.ai.base import BaseAIProvider
+from app.services.option_chain import OptionChain
+from app.services.payoff import format_pnl, summary_metrics
 from app.services.config_service import config_service
 
 logger = logging.getLogger(__name__)
@@ -104,14 +106,17 @@ class UniversalOpenAIProvider(BaseAIProvider):
             raise RuntimeError("Universal OpenAI client is not available.")
 
     def filter_option_chain(
-        self, chain_data: dict[str, Any], spot_price: float
+        self, chain_data: dict[str, Any] | OptionChain, spot_price: float
     ) -> dict[str, Any]:
         if not spot_price or spot_price <= 0:
             logger.warning("Invalid spot price for filtering. Returning full chain.")
             return chain_data
-        filtered = {"calls": [], "puts": []}
         threshold_low = spot_price * 0.85
         threshold_high = spot_price * 1.15
+        if isinstance(chain_data, OptionChain):
+            sliced = chain_data.slice_strikes(threshold_low, threshold_high)
+            return {"calls": sliced.calls.to_records(), "puts": sliced.puts.to_records()}
+        filtered = {"calls": [], "puts": []}
         for option_type in ["calls", "puts"]:
             if option_type not in chain_data:
                 continue
@@ -154,6 +159,7 @@ class UniversalOpenAIProvider(BaseAIProvider):
         legs = strategy_context.get("legs") or []
         legs_json = json.dumps(legs, indent=2, default=str)
         metrics = strategy_context.get("strategy_metrics") or strategy_context.get("metrics") or {}
+        metrics = summary_metrics({"legs": legs, "strategy_metrics": metrics})
         pg = strategy_context.get("portfolio_greeks") or {}
         spot_price = float(strategy_context.get("spot_price") or metrics.get("spot_price") or 0)
         format_dict = {
@@ -162,8 +168,8 @@ class UniversalOpenAIProvider(BaseAIProvider):
             "spot_price": f"{spot_price:.2f}" if spot_price else "N/A",
             "iv_info": str(strategy_context.get("iv_summary") or metrics.get("iv") or "N/A"),
             "legs_json": legs_json,
-            "max_profit": float(metrics.get("max_profit") or 0),
-            "max_loss": float(metrics.get("max_loss") or 0),
+            "max_profit": format_pnl(float(metrics.get("max_profit") or 0)),
+            "max_loss": format_pnl(float(metrics.get("max_loss") or 0)),
             "pop": float(metrics.get("probability_of_profit") or metrics.get("pop") or 0),
             "breakevens": ", ".join(str(x) for x in (metrics.get("breakeven_points") or metrics.get("breakeven") or [])),
             "net_delta": float(pg.get("delta") or 0),
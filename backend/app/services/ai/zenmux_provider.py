@@ -18,6 +18,8 @@ from tenacity import (
 
 from app.core.config import settings
 from app.services.ai.base import BaseAIProvider
+from app.services.option_chain import OptionChain
+from app.services.payoff import format_pnl, summary_metrics
 from app.services.config_service import config_service
 
 logger = logging.getLogger(__name__)
@@ -157,14 +159,14 @@ class ZenMuxProvider(BaseAIProvider):
             raise RuntimeError("ZenMux client is not available. Please check API key configuration.")
 
     def filter_option_chain(
-        self, chain_data: dict[str, Any], spot_price: float
+        self, chain_data: dict[str, Any] | OptionChain, spot_price: float
     ) -> dict[str, Any]:
         """
         Filter option chain to keep only strikes within ±15% of spot price.
         Crucial for saving Token costs and reducing AI hallucinations.
 
         Args:
-            chain_data: Full option chain data
+            chain_data: Full option chain data (dict shape or OptionChain)
             spot_price: Current spot price
 
         Returns:
@@ -175,18 +177,23 @@ class ZenMuxProvider(BaseAIProvider):
             logger.warning("Invalid spot price for filtering. Returning full chain (risky).")
             return chain_data
 
-        filtered = {"calls": [], "puts": []}
         threshold_low = spot_price * 0.85
         threshold_high = spot_price * 1.15
 
-        for option_type in ["calls", "puts"]:
-            if option_type not in chain_data:
-                continue
+        if isinstance(chain_data, OptionChain):
+            # Columnar chain: strike-range slice via binary search
+            sliced = chain_data.slice_strikes(threshold_low, threshold_high)
+            filtered = {"calls": sliced.calls.to_records(), "puts": sliced.puts.to_records()}
+        else:
+            filtered = {"calls": [], "puts": []}
+            for option_type in ["calls", "puts"]:
+                if option_type not in chain_data:
+                    continue
 
-            for option in chain_data[option_type]:
-                strike = option.get("strike", 0)
-                if threshold_low <= strike <= threshold_high:
-                    filtered[option_type].append(option)
+                for option in chain_data[option_type]:
+                    strike = option.get("strike", 0)
+                    if threshold_low <= strike <= threshold_high:
+                        filtered[option_type].append(option)
 
         logger.info(
             f"Filtered option chain: {len(filtered['calls'])} calls, "
@@ -255,6 +262,7 @@ class ZenMuxProvider(BaseAIProvider):
         legs = strategy_context.get("legs") or []
         legs_json = json.dumps(legs, indent=2, default=str)
         metrics = strategy_context.get("strategy_metrics") or strategy_context.get("metrics") or {}
+        metrics = summary_metrics({"legs": legs, "strategy_metrics": metrics})
         pg = strategy_context.get("portfolio_greeks") or {}
         spot_price = float(strategy_context.get("spot_price") or metrics.get("spot_price") or 0)
         format_dict = {
@@ -263,8 +271,8 @@ class ZenMuxProvider(BaseAIProvider):
             "spot_price": f"{spot_price:.2f}" if spot_price else "N/A",
             "iv_info": str(strategy_context.get("iv_summary") or metrics.get("iv") or "N/A"),
             "legs_json": legs_json,
-            "max_profit": float(metrics.get("max_profit") or 0),
-            "max_loss": float(metrics.get("max_loss") or 0),
+            "max_profit": format_pnl(float(metrics.get("max_profit") or 0)),
+            "max_loss": format_pnl(float(metrics.get("max_loss") or 0)),
             "pop": float(metrics.get("probability_of_profit") or metrics.get("pop") or 0),
             "breakevens": ", ".join(str(x) for x in (metrics.get("breakeven_points") or metrics.get("breakeven") or [])),
             "net_delta": float(pg.get("delta") or 0),
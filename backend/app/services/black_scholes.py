@@ -0,0 +1,225 @@
+"""Vectorized Black-Scholes / Black-76 pricing, Greeks and implied volatility.
+
+Tiger chains normally carry Greeks and IV, but after hours or on partial data some rows
+come back without them. This module fills those gaps for a whole chain side in one
+NumPy call (no per-row Python loop):
+
+- ``bs_greeks`` / ``black76_greeks``: delta, gamma, theta, vega, rho (+ price)
+- ``implied_volatility``: IV from option prices (e.g. bid/ask mid), vectorized Newton
+  with a bisection safeguard; the few rows that do not converge are finished with
+  scalar Brent (scipy.optimize.brentq)
+
+Units follow Tiger's chain fields so filled values mix with real ones: theta per
+calendar day, vega and rho per 1 percentage point, volatility and rates as decimals.
+Invalid inputs (non-positive spot/strike/time/vol, NaN) give NaN, never an exception.
+"""
+
+from datetime import datetime, time as dt_time
+from typing import Any
+
+import numpy as np
+import pytz
+from scipy.optimize import brentq
+from scipy.special import ndtr
+
+GREEK_NAMES: tuple[str, ...] = ("delta", "gamma", "theta", "vega", "rho")
+
+# US equity options stop trading at 16:00 New York time on the expiration date
+_US_EASTERN = pytz.timezone("US/Eastern")
+_EXPIRY_CLOSE = dt_time(16, 0)
+_SECONDS_PER_YEAR = 365.0 * 86400.0
+MIN_YEARS = 1.0 / (365.0 * 24.0)  # One hour: floor so expiry-day options stay priceable
+
+# Implied volatility search bracket (decimal vol)
+IV_LOWER = 1e-4
+IV_UPPER = 5.0
+
+_INV_SQRT_2PI = 1.0 / np.sqrt(2.0 * np.pi)
+
+
+def years_to_expiry(expiration_date: str, now: datetime | None = None) -> float | None:
+    """Year fraction from now to the 16:00 ET close on expiration_date (YYYY-MM-DD), floored at MIN_YEARS."""
+    try:
+        day = datetime.strptime(str(expiration_date)[:10], "%Y-%m-%d").date()
+    except (TypeError, ValueError):
+        return None
+    expiry = _US_EASTERN.localize(datetime.combine(day, _EXPIRY_CLOSE))
+    now = now or datetime.now(pytz.utc)
+    if now.tzinfo is None:
+        now = pytz.utc.localize(now)
+    return max(MIN_YEARS, (expiry - now).total_seconds() / _SECONDS_PER_YEAR)
+
+
+def _is_call_array(is_call: Any) -> np.ndarray:
+    """Bool array from bools or "call"/"put" strings (and OptionType enums)."""
+    values = np.asarray(is_call)
+    if values.dtype == bool:
+        return values
+    if values.dtype.kind in "OUS":
+        flat = [str(getattr(v, "value", v)).lower().startswith("call") for v in values.ravel()]
+        return np.asarray(flat, dtype=bool).reshape(values.shape)
+    return values.astype(bool)
+
+
+def _black(
+    underlying: Any,
+    strike: Any,
+    years: Any,
+    vol: Any,
+    is_call: Any,
+    rate: float,
+    carry: float,
+    futures: bool,
+) -> dict[str, np.ndarray]:
+    """Generalized Black-Scholes (cost of carry b): b = r - q for stocks, b = 0 for futures (Black-76)."""
+    s, k, t, sigma, call = np.broadcast_arrays(
+        np.asarray(underlying, dtype="float64"),
+        np.asarray(strike, dtype="float64"),
+        np.asarray(years, dtype="float64"),
+        np.asarray(vol, dtype="float64"),
+        _is_call_array(is_call),
+    )
+    valid = (s > 0) & (k > 0) & (t > 0) & (sigma > 0)
+    with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+        sqrt_t = np.sqrt(t)
+        sig_sqrt_t = sigma * sqrt_t
+        d1 = (np.log(s / k) + (carry + 0.5 * sigma * sigma) * t) / sig_sqrt_t
+        d2 = d1 - sig_sqrt_t
+        sign = np.where(call, 1.0, -1.0)
+        carry_df = np.exp((carry - rate) * t)  # e^{-qt} for stocks, e^{-rt} for futures
+        rate_df = np.exp(-rate * t)
+        nd1 = ndtr(sign * d1)
+        nd2 = ndtr(sign * d2)
+        pdf_d1 = _INV_SQRT_2PI * np.exp(-0.5 * d1 * d1)
+
+        price = sign * (s * carry_df * nd1 - k * rate_df * nd2)
+        delta = sign * carry_df * nd1
+        gamma = carry_df * pdf_d1 / (s * sig_sqrt_t)
+        vega = s * carry_df * pdf_d1 * sqrt_t
+        theta = (
+            -s * carry_df * pdf_d1 * sigma / (2.0 * sqrt_t)
+            - sign * (carry - rate) * s * carry_df * nd1
+            - sign * rate * k * rate_df * nd2
+        )
+        rho = -t * price if futures else sign * k * t * rate_df * nd2
+
+    out = {
+        "price": price,
+        "delta": delta,
+        "gamma": gamma,
+        "theta": theta / 365.0,
+        "vega": vega / 100.0,
+        "rho": rho / 100.0,
+    }
+    return {name: np.where(valid, values, np.nan) for name, values in out.items()}
+
+
+def bs_greeks(
+    spot: Any,
+    strike: Any,
+    years: Any,
+    vol: Any,
+    is_call: Any,
+    rate: float = 0.0,
+    dividend_yield: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Black-Scholes(-Merton) price and Greeks for equity options; array arguments broadcast.
+
+    Returns:
+        {"price", "delta", "gamma", "theta", "vega", "rho"} arrays (NaN where inputs are invalid)
+    """
+    return _black(spot, strike, years, vol, is_call, rate, rate - dividend_yield, futures=False)
+
+
+def black76_greeks(
+    forward: Any,
+    strike: Any,
+    years: Any,
+    vol: Any,
+    is_call: Any,
+    rate: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Black-76 price and Greeks for options on futures/forwards (delta and gamma are w.r.t. the forward)."""
+    return _black(forward, strike, years, vol, is_call, rate, 0.0, futures=True)
+
+
+def implied_volatility(
+    price: Any,
+    underlying: Any,
+    strike: Any,
+    years: Any,
+    is_call: Any,
+    rate: float = 0.0,
+    dividend_yield: float = 0.0,
+    black76: bool = False,
+    tol: float = 1e-8,
+    max_iter: int = 50,
+) -> np.ndarray:
+    """Implied volatility for an array of option prices.
+
+    Newton steps run on all rows at once inside a [IV_LOWER, IV_UPPER] bracket that
+    shrinks every iteration; a step that leaves the bracket (or has ~zero vega) becomes
+    a bisection step. Rows still unconverged after max_iter are solved with brentq.
+
+    Returns:
+        Decimal IV per row; NaN when the price is missing or outside no-arbitrage bounds
+    """
+    carry = 0.0 if black76 else rate - dividend_yield
+    target, s, k, t, call = np.broadcast_arrays(
+        np.asarray(price, dtype="float64"),
+        np.asarray(underlying, dtype="float64"),
+        np.asarray(strike, dtype="float64"),
+        np.asarray(years, dtype="float64"),
+        _is_call_array(is_call),
+    )
+    result = np.full(target.shape, np.nan)
+    with np.errstate(invalid="ignore"):
+        ok = (target > 0) & (s > 0) & (k > 0) & (t > 0)
+    if not ok.any():
+        return result
+
+    target, s, k, t, call = target[ok], s[ok], k[ok], t[ok], call[ok]
+    # Solvable only strictly between the zero-vol and infinite-vol prices
+    lo_price = _black(s, k, t, IV_LOWER, call, rate, carry, black76)["price"]
+    hi_price = _black(s, k, t, IV_UPPER, call, rate, carry, black76)["price"]
+    solvable = (target > lo_price) & (target < hi_price)
+
+    lo = np.full(target.shape, IV_LOWER)
+    hi = np.full(target.shape, IV_UPPER)
+    # Brenner-Subrahmanyam ATM approximation as the starting point
+    with np.errstate(divide="ignore", invalid="ignore"):
+        guess = np.sqrt(2.0 * np.pi / t) * target / s
+    sigma = np.clip(np.where(np.isfinite(guess), guess, 0.3), 0.05, 2.0)
+    done = ~solvable
+
+    for _ in range(max_iter):
+        if done.all():
+            break
+        active = ~done
+        res = _black(s[active], k[active], t[active], sigma[active], call[active], rate, carry, black76)
+        diff = res["price"] - target[active]
+        vega = res["vega"] * 100.0  # Per unit vol
+        sig = sigma[active]
+        lo_a = np.where(diff < 0, sig, lo[active])
+        hi_a = np.where(diff > 0, sig, hi[active])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            newton = sig - diff / vega
+        step_ok = np.isfinite(newton) & (newton > lo_a) & (newton < hi_a)
+        new_sig = np.where(step_ok, newton, 0.5 * (lo_a + hi_a))
+        # Done when the vol estimate moves less than tol (Newton) or the bracket is that narrow
+        converged = (diff == 0) | (np.abs(new_sig - sig) < tol) | (hi_a - lo_a < tol)
+        lo[active], hi[active] = lo_a, hi_a
+        sigma[active] = np.where(diff == 0, sig, new_sig)
+        done[active] = converged
+
+    pending = np.flatnonzero(solvable & ~done)
+    for i in pending:
+        def _objective(v: float, i: int = i) -> float:
+            return float(_black(s[i], k[i], t[i], v, call[i], rate, carry, black76)["price"]) - target[i]
+        try:
+            sigma[i] = brentq(_objective, IV_LOWER, IV_UPPER, xtol=tol)
+        except ValueError:
+            solvable[i] = False
+
+    result[ok] = np.where(solvable, sigma, np.nan)
+    return result
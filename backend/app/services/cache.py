@@ -1,27 +1,169 @@
-"""Redis cache service with connection pool and auto-reconnect."""
+"""Redis cache service with connection pool and auto-reconnect.
+
+Reads go through two tiers:
+- L1: bounded in-process LRU/TTL tier for hot prefixes (option chains, expirations,
+  K-lines, config, user contexts). Entry TTL is capped by the key's remaining Redis TTL.
+  Writes/deletes publish on a Redis pub/sub channel so other replicas evict.
+- L2: Redis (values encoded by cache_codecs).
+"""
 
 import asyncio
-import json
 import logging
+import time
+import uuid
+from collections import OrderedDict
 from typing import Any
 
 import redis.asyncio as aioredis
 
 from app.core.config import settings
+from app.services.cache_codecs import JSON_CODEC, decode_value, encode_value, resolve_codec
 
 logger = logging.getLogger(__name__)
 
+# KEYS[1] = lock key, ARGV[1] = owner token; deletes the lock only if we still own it
+_RELEASE_LOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _shallow_copy(value: Any) -> Any:
+    """Copy the top level of a cached container so callers can annotate it (e.g. _source).
+
+    Nested structures are shared with the L1 entry and must be treated as read-only.
+    """
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, list):
+        return list(value)
+    return value
+
+
+class LocalCacheTier:
+    """Bounded in-process LRU/TTL cache with per-prefix capacity and TTL limits."""
+
+    def __init__(self, limits: dict[str, tuple[int, float]]) -> None:
+        """
+        Args:
+            limits: key prefix -> (max entries, max TTL seconds). Keys without a
+                matching prefix are not cached in this tier.
+        """
+        self._limits = dict(limits)
+        # Longest prefix first so the most specific limit wins
+        self._prefixes = sorted(self._limits, key=len, reverse=True)
+        self._buckets: dict[str, OrderedDict[str, tuple[float, Any]]] = {p: OrderedDict() for p in self._limits}
+
+    def prefix_for(self, key: str) -> str | None:
+        """The configured prefix covering key, or None if key is not L1-cacheable."""
+        for prefix in self._prefixes:
+            if key.startswith(prefix):
+                return prefix
+        return None
+
+    def get(self, key: str) -> tuple[bool, Any]:
+        """Return (hit, value); expired entries are dropped."""
+        prefix = self.prefix_for(key)
+        if prefix is None:
+            return False, None
+        bucket = self._buckets[prefix]
+        entry = bucket.get(key)
+        if entry is None:
+            return False, None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del bucket[key]
+            return False, None
+        bucket.move_to_end(key)
+        return True, value
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        """Store value for min(ttl, prefix TTL) seconds, evicting the LRU entry when full."""
+        prefix = self.prefix_for(key)
+        if prefix is None:
+            return
+        max_entries, max_ttl = self._limits[prefix]
+        ttl = min(ttl, max_ttl)
+        if ttl <= 0 or max_entries <= 0:
+            return
+        bucket = self._buckets[prefix]
+        bucket[key] = (time.monotonic() + ttl, value)
+        bucket.move_to_end(key)
+        while len(bucket) > max_entries:
+            bucket.popitem(last=False)
+
+    def pop(self, key: str) -> None:
+        prefix = self.prefix_for(key)
+        if prefix is not None:
+            self._buckets[prefix].pop(key, None)
+
+    def clear(self) -> None:
+        for bucket in self._buckets.values():
+            bucket.clear()
+
+    def size(self) -> dict[str, int]:
+        return {prefix: len(bucket) for prefix, bucket in self._buckets.items()}
+
 
 class CacheService:
     """Redis cache service with connection pool, auto-reconnect, and TTL control."""
 
     _PING_INTERVAL: float = 30.0  # Only ping every 30 seconds
 
+    # Value codec per key prefix (longest match wins; unmatched keys use legacy JSON text).
+    # Option chains are hundreds of KB of JSON: msgpack+zstd is ~5x smaller and decodes faster.
+    _DEFAULT_PREFIX_CODECS: dict[str, str] = {
+        "market:chain:": "msgpack+zstd",
+    }
+
+    # L1 (in-process) tier: prefix -> (max entries, max TTL seconds); effective TTL is also
+    # capped by the key's remaining Redis TTL. Decoded chains are a few MB each, hence the small cap.
+    _L1_PREFIX_LIMITS: dict[str, tuple[int, float]] = {
+        "market:chain:": (32, 60),
+        "market:expirations:": (512, 300),
+        "market:kline:": (256, 60),
+        "config:": (512, 60),
+        "user:ctx:": (10_000, 30),
+    }
+    _INVALIDATION_CHANNEL = "cache:invalidate"
+
     def __init__(self) -> None:
         """Initialize Redis connection pool."""
         self._redis: aioredis.Redis | None = None
         self._connection_pool: aioredis.ConnectionPool | None = None
+        # Binary-safe client (decode_responses=False) used for cached values, which may be codec frames
+        self._redis_bin: aioredis.Redis | None = None
+        self._binary_pool: aioredis.ConnectionPool | None = None
         self._last_ping_time: float = 0.0  # Instance variable, not class-level
+        self._prefix_codecs: dict[str, str] = {}
+        if settings.cache_binary_codecs:
+            for prefix, codec in self._DEFAULT_PREFIX_CODECS.items():
+                self.register_prefix_codec(prefix, codec)
+        self._l1: LocalCacheTier | None = (
+            LocalCacheTier(self._L1_PREFIX_LIMITS) if settings.cache_l1_enabled else None
+        )
+        # Identifies this process on the invalidation channel (own messages are ignored)
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_task: asyncio.Task | None = None
+        self._stats: dict[str, dict[str, int]] = {
+            "l1": {"hits": 0, "misses": 0},
+            "redis": {"hits": 0, "misses": 0, "errors": 0},
+        }
+
+    def register_prefix_codec(self, prefix: str, codec: str) -> None:
+        """Select the value codec for keys starting with prefix (falls back if codec is unavailable)."""
+        self._prefix_codecs[prefix] = resolve_codec(codec)
+
+    def _codec_for(self, key: str) -> str:
+        """Codec for key: longest registered prefix match, else legacy JSON."""
+        best_prefix = ""
+        codec = JSON_CODEC
+        for prefix, name in self._prefix_codecs.items():
+            if key.startswith(prefix) and len(prefix) > len(best_prefix):
+                best_prefix, codec = prefix, name
+        return codec
 
     async def connect(self) -> None:
         """Connect to Redis with connection pool for high performance."""
@@ -41,6 +183,17 @@ class CacheService:
             
             # Create Redis client with connection pool
             self._redis = aioredis.Redis(connection_pool=self._connection_pool)
+            self._binary_pool = aioredis.ConnectionPool.from_url(
+                settings.redis_url,
+                decode_responses=False,
+                socket_connect_timeout=5,
+                socket_keepalive=True,
+                socket_keepalive_options={},
+                retry_on_timeout=True,
+                health_check_interval=30,
+                max_connections=50,
+            )
+            self._redis_bin = aioredis.Redis(connection_pool=self._binary_pool)
             
             # Test connection
             await asyncio.wait_for(self._redis.ping(), timeout=5.0)
@@ -49,11 +202,15 @@ class CacheService:
             logger.warning("Redis connection timeout - continuing without cache")
             self._redis = None
             self._connection_pool = None
+            self._redis_bin = None
+            self._binary_pool = None
         except Exception as e:
             logger.warning(f"Failed to connect to Redis (continuing anyway): {e}")
             # Allow app to start even if Redis is down (degraded mode)
             self._redis = None
             self._connection_pool = None
+            self._redis_bin = None
+            self._binary_pool = None
 
     async def disconnect(self) -> None:
         """Disconnect from Redis and close connection pool."""
@@ -71,6 +228,20 @@ class CacheService:
                 logger.warning(f"Error disconnecting Redis connection pool: {e}")
             self._connection_pool = None
 
+        if self._redis_bin:
+            try:
+                await self._redis_bin.close()
+            except Exception as e:
+                logger.warning(f"Error closing binary Redis client: {e}")
+            self._redis_bin = None
+
+        if self._binary_pool:
+            try:
+                await self._binary_pool.disconnect()
+            except Exception as e:
+                logger.warning(f"Error disconnecting binary Redis connection pool: {e}")
+            self._binary_pool = None
+
     async def _ensure_connected(self) -> bool:
         """Ensure Redis connection is alive, reconnect if needed."""
         if not self._redis:
@@ -96,28 +267,57 @@ class CacheService:
         """
         Get value from cache with auto-reconnect.
 
+        Checks the in-process L1 tier first, then Redis. Values are decoded by their
+        stored format (codec frame or legacy JSON text), so entries written before a
+        prefix switched codec keep working. Dict/list values from L1-cached prefixes
+        are returned as shallow copies; nested data is shared and must not be mutated.
+
         Args:
             key: Cache key
 
         Returns:
             Cached value or None if not found
         """
+        l1_prefix = self._l1.prefix_for(key) if self._l1 else None
+        if l1_prefix is not None:
+            hit, value = self._l1.get(key)
+            if hit:
+                self._stats["l1"]["hits"] += 1
+                return _shallow_copy(value)
+            self._stats["l1"]["misses"] += 1
+
         if not await self._ensure_connected():
             return None
 
         try:
-            value = await self._redis.get(key)
-            if value is not None:
-                try:
-                    return json.loads(value)
-                except json.JSONDecodeError:
-                    return value
-            return None
+            if l1_prefix is not None:
+                # Fetch remaining TTL in the same round trip so L1 never outlives Redis
+                async with self._redis_bin.pipeline(transaction=False) as pipe:
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    value, pttl = await pipe.execute()
+            else:
+                value, pttl = await self._redis_bin.get(key), None
         except Exception as e:
+            self._stats["redis"]["errors"] += 1
             logger.warning(f"Redis GET error for {key}: {e}")  # Changed to WARNING (not critical)
             # Try to reconnect on next call
             self._redis = None
             return None
+        if value is None:
+            self._stats["redis"]["misses"] += 1
+            return None
+        self._stats["redis"]["hits"] += 1
+        try:
+            decoded = decode_value(value)
+        except Exception as e:
+            # Corrupt entry or codec unavailable on this replica: treat as a miss
+            logger.warning(f"Cache decode error for {key}: {e}")
+            return None
+        if l1_prefix is not None and pttl and pttl > 0:
+            self._l1.set(key, decoded, pttl / 1000.0)
+            return _shallow_copy(decoded)
+        return decoded
 
     async def set(
         self, key: str, value: Any, ttl: int, is_pro: bool = False
@@ -131,23 +331,41 @@ class CacheService:
             ttl: Time to live in seconds
             is_pro: Unused, kept for backward compatibility
         """
-        if not await self._ensure_connected():
-            return
         if ttl <= 0:
             return
+        l1_key = self._l1 is not None and self._l1.prefix_for(key) is not None
+        if l1_key:
+            # Keep L1 coherent locally even if Redis is down; other replicas evict via pub/sub
+            self._l1.set(key, _shallow_copy(value), ttl)
+        if not await self._ensure_connected():
+            return
 
         try:
             if isinstance(value, (dict, list)):
-                value = json.dumps(value)
+                codec = self._codec_for(key)
+                try:
+                    value = encode_value(value, codec)
+                except (TypeError, ValueError) as e:
+                    if codec == JSON_CODEC:
+                        raise
+                    logger.debug(f"Cache codec {codec} failed for {key} ({e}); storing JSON")
+                    value = encode_value(value, JSON_CODEC)
 
-            await self._redis.setex(key, ttl, value)
+            await self._redis_bin.setex(key, ttl, value)
         except Exception as e:
             logger.warning(f"Redis SET error for {key}: {e}")  # Changed to WARNING
             # Try to reconnect on next call
             self._redis = None
+            return
+        if l1_key:
+            # Only after the write, so a replica that evicts and re-reads gets the new value
+            await self._publish_invalidation(key)
 
     async def delete(self, key: str) -> None:
-        """Delete key from cache with auto-reconnect."""
+        """Delete key from cache (all tiers, all replicas) with auto-reconnect."""
+        l1_key = self._l1 is not None and self._l1.prefix_for(key) is not None
+        if l1_key:
+            self._l1.pop(key)
         if not await self._ensure_connected():
             return
         try:
@@ -156,8 +374,27 @@ class CacheService:
             logger.warning(f"Redis DELETE error for {key}: {e}")  # Changed to WARNING
             # Try to reconnect on next call
             self._redis = None
+            return
+        if l1_key:
+            await self._publish_invalidation(key)
+
+    async def incr(self, key: str, ttl: int) -> int | None:
+        """Increment an integer counter, (re)setting its TTL; None if Redis is unavailable."""
+        if not await self._ensure_connected():
+            return None
+        try:
+            async with self._redis.pipeline(transaction=True) as pipe:
+                pipe.incr(key)
+                pipe.expire(key, ttl)
+                value, _ = await pipe.execute()
+            return int(value)
+        except Exception as e:
+            logger.warning(f"Redis INCR error for {key}: {e}")
+            # Try to reconnect on next call
+            self._redis = None
+            return None
 
-    async def acquire_lock(self, lock_key: str, ttl: int = 3600) -> bool:
+    async def acquire_lock(self, lock_key: str, ttl: int = 3600) -> str | None:
         """
         Acquire a distributed lock using Redis SETNX.
         
@@ -166,22 +403,108 @@ class CacheService:
             ttl: Time to live in seconds (lock expiration)
             
         Returns:
-            True if lock was successfully acquired, False otherwise
+            The owner token (truthy) if the lock was acquired, None otherwise.
+            Pass the token to release_lock.
         """
         if not await self._ensure_connected():
-            # Fail-closed: return False so callers skip execution rather than risk duplicates.
-            return False
+            # Fail-closed: return None so callers skip execution rather than risk duplicates.
+            return None
             
+        token = uuid.uuid4().hex
         try:
             # set(name, value, ex=expiry, nx=True)
             # returns True if set, None/False if not set
-            result = await self._redis.set(lock_key, "1", ex=ttl, nx=True)
-            return bool(result)
+            result = await self._redis.set(lock_key, token, ex=ttl, nx=True)
+            return token if result else None
         except Exception as e:
             logger.warning(f"Redis SETNX error for lock {lock_key}: {e}")
             self._redis = None
+            return None
+
+    async def release_lock(self, lock_key: str, token: str) -> None:
+        """
+        Release a lock taken with acquire_lock (best effort; it also expires on its own).
+
+        Only deletes the lock if it still holds token, so a holder whose lock expired
+        cannot release the lock another process has taken since.
+        """
+        if not await self._ensure_connected():
+            return
+        try:
+            await self._redis.eval(_RELEASE_LOCK_LUA, 1, lock_key, token)
+        except Exception as e:
+            logger.warning(f"Redis release error for lock {lock_key}: {e}")
+
+    async def lock_held(self, lock_key: str) -> bool:
+        """True if lock_key is currently held. False when Redis is unavailable."""
+        if not await self._ensure_connected():
+            return False
+        try:
+            return bool(await self._redis.exists(lock_key))
+        except Exception as e:
+            logger.warning(f"Redis EXISTS error for lock {lock_key}: {e}")
             return False
 
+    async def _publish_invalidation(self, key: str) -> None:
+        """Tell other processes to drop key from their L1 tier (best effort)."""
+        if not self._redis:
+            return
+        try:
+            await self._redis.publish(self._INVALIDATION_CHANNEL, f"{self._instance_id} {key}")
+        except Exception as e:
+            logger.warning(f"Redis PUBLISH error for invalidation of {key}: {e}")
+
+    async def start_invalidation_listener(self) -> None:
+        """Start the background task that applies L1 invalidations from other processes."""
+        if self._l1 is None or self._invalidation_task is not None:
+            return
+        self._invalidation_task = asyncio.create_task(self._invalidation_loop())
+
+    async def stop_invalidation_listener(self) -> None:
+        """Stop the invalidation listener (call before disconnect)."""
+        task, self._invalidation_task = self._invalidation_task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    async def _invalidation_loop(self) -> None:
+        """Subscribe to the invalidation channel; resubscribe (and flush L1) after errors."""
+        while True:
+            try:
+                if not await self._ensure_connected():
+                    await asyncio.sleep(5)
+                    continue
+                pubsub = self._redis.pubsub()
+                await pubsub.subscribe(self._INVALIDATION_CHANNEL)
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "message":
+                            continue
+                        sender, _, key = str(message.get("data", "")).partition(" ")
+                        if sender != self._instance_id and key:
+                            self._l1.pop(key)
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Messages may have been missed while disconnected: drop everything local
+                logger.warning(f"Cache invalidation listener error (L1 flushed, retrying): {e}")
+                self._l1.clear()
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict[str, Any]:
+        """Hit/miss counters per tier plus current L1 entry counts per prefix."""
+        return {
+            "l1": {**self._stats["l1"], "enabled": self._l1 is not None,
+                   "entries": self._l1.size() if self._l1 else {}},
+            "redis": dict(self._stats["redis"]),
+        }
+
     def get_market_chain_key(self, symbol: str, date: str) -> str:
         """
         Generate market chain cache key.
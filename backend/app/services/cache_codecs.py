@@ -0,0 +1,164 @@
+"""Pluggable value codecs for CacheService.
+
+Legacy entries are plain JSON text. Binary codecs write a small frame header
+(``MAGIC`` + 1-byte codec id) followed by the serialized, optionally compressed
+payload. JSON text never starts with a NUL byte, so readers can tell the two
+apart and old JSON entries keep decoding transparently.
+
+Codecs (by name):
+- ``json``          legacy text, no frame (default)
+- ``json+zlib``     JSON compressed with zlib (stdlib only)
+- ``msgpack``       MessagePack (requires ``msgpack``)
+- ``msgpack+zlib``  MessagePack + zlib
+- ``msgpack+zstd``  MessagePack + Zstandard (requires ``msgpack`` and ``zstandard``)
+
+``msgpack`` and ``zstandard`` are optional; codecs that need a missing package
+are simply not registered and ``resolve_codec`` falls back to the next best one.
+"""
+
+import json
+import logging
+import zlib
+from typing import Any, Callable
+
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+MAGIC = b"\x00TM"
+JSON_CODEC = "json"
+
+# Preference order used when a requested codec is not available in this environment
+_FALLBACK_ORDER: tuple[str, ...] = ("msgpack+zstd", "msgpack+zlib", "json+zlib", JSON_CODEC)
+
+
+class CacheCodec:
+    """A serializer + optional compressor pair identified by a stable 1-byte id."""
+
+    def __init__(
+        self,
+        name: str,
+        codec_id: int,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[bytes], Any],
+        compress: Callable[[bytes], bytes] | None = None,
+        decompress: Callable[[bytes], bytes] | None = None,
+    ) -> None:
+        self.name = name
+        self.codec_id = codec_id
+        self._dumps = dumps
+        self._loads = loads
+        self._compress = compress
+        self._decompress = decompress
+        self._header = MAGIC + bytes([codec_id])
+
+    def encode(self, value: Any) -> bytes:
+        """Serialize value to a framed payload."""
+        payload = self._dumps(value)
+        if self._compress is not None:
+            payload = self._compress(payload)
+        return self._header + payload
+
+    def decode(self, payload: bytes) -> Any:
+        """Decode the payload that follows the frame header."""
+        if self._decompress is not None:
+            payload = self._decompress(payload)
+        return self._loads(payload)
+
+
+_codecs_by_name: dict[str, CacheCodec] = {}
+_codecs_by_id: dict[int, CacheCodec] = {}
+
+
+def register_codec(codec: CacheCodec) -> None:
+    """Register a codec (ids must be unique and stable: they are persisted in Redis)."""
+    existing = _codecs_by_id.get(codec.codec_id)
+    if existing is not None and existing.name != codec.name:
+        raise ValueError(f"Codec id {codec.codec_id} already used by {existing.name}")
+    _codecs_by_name[codec.name] = codec
+    _codecs_by_id[codec.codec_id] = codec
+
+
+def available_codecs() -> list[str]:
+    """Names of all usable codecs (including the legacy json codec)."""
+    return [JSON_CODEC, *_codecs_by_name]
+
+
+def resolve_codec(name: str) -> str:
+    """Return name if usable here, else the best available fallback."""
+    if name == JSON_CODEC or name in _codecs_by_name:
+        return name
+    start = _FALLBACK_ORDER.index(name) + 1 if name in _FALLBACK_ORDER else 0
+    for candidate in _FALLBACK_ORDER[start:]:
+        if candidate == JSON_CODEC or candidate in _codecs_by_name:
+            logger.info("Cache codec %s not available, using %s", name, candidate)
+            return candidate
+    return JSON_CODEC
+
+
+def encode_value(value: Any, codec_name: str = JSON_CODEC) -> str | bytes:
+    """Encode value for storage: JSON text for the legacy codec, framed bytes otherwise."""
+    if codec_name == JSON_CODEC:
+        return json.dumps(value)
+    return _codecs_by_name[codec_name].encode(value)
+
+
+def decode_value(raw: str | bytes) -> Any:
+    """Decode a stored value: framed binary via its codec, else JSON (raw string if not JSON)."""
+    if isinstance(raw, bytes):
+        if raw[:len(MAGIC)] == MAGIC and len(raw) > len(MAGIC):
+            codec = _codecs_by_id.get(raw[len(MAGIC)])
+            if codec is None:
+                raise ValueError(f"Unknown cache codec id {raw[len(MAGIC)]}")
+            return codec.decode(raw[len(MAGIC) + 1:])
+        try:
+            raw = raw.decode("utf-8")
+        except UnicodeDecodeError:
+            return raw
+    try:
+        return json.loads(raw)
+    except json.JSONDecodeError:
+        return raw
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+
+def _zlib_compress(data: bytes) -> bytes:
+    return zlib.compress(data, 6)
+
+
+register_codec(CacheCodec("json+zlib", 1, _json_dumps, json.loads, _zlib_compress, zlib.decompress))
+
+if MSGPACK_AVAILABLE:
+    def _msgpack_dumps(value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def _msgpack_loads(data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+    register_codec(CacheCodec("msgpack", 2, _msgpack_dumps, _msgpack_loads))
+    register_codec(CacheCodec("msgpack+zlib", 3, _msgpack_dumps, _msgpack_loads, _zlib_compress, zlib.decompress))
+
+    if ZSTD_AVAILABLE:
+        # Module-level one-shot functions (compressor objects are not thread-safe).
+        # Level 3 is zstd's default: ~zlib-6 ratio at several times the speed.
+        def _zstd_compress(data: bytes) -> bytes:
+            return zstandard.compress(data, 3)
+
+        register_codec(CacheCodec(
+            "msgpack+zstd", 4, _msgpack_dumps, _msgpack_loads, _zstd_compress, zstandard.decompress,
+        ))
@@ -0,0 +1,151 @@
+"""Predictive option chain prefetch: keep the most requested chains warm.
+
+Demand is tracked per (symbol, expiration) in a daily Redis sorted set. A scheduled
+job (scheduler.py) re-fetches the top chains, plus radar movers and the scanner's
+fallback blue chips, before their cached copy goes stale, so user requests hit the
+cache instead of waiting on Tiger. Prefetch calls are paced to a share of the Tiger
+per-minute limit, leaving the rest for interactive traffic.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+from app.core.config import settings
+from app.core.constants import CacheTTL, RateLimits
+from app.services.cache import cache_service
+from app.services.market_scanner import FALLBACK_STOCKS
+from app.services.radar_service import RADAR_MOVERS_KEY, is_us_market_hours
+from app.services.tiger_rate_limiter import TigerPriority, tiger_priority
+from app.services.tiger_service import tiger_service
+
+logger = logging.getLogger(__name__)
+
+_US_EASTERN = pytz.timezone("US/Eastern")
+_DEMAND_KEY_PREFIX = "prefetch:chain_demand:"
+PREFETCH_LOCK_KEY = "scheduler:chain_prefetch_lock"
+
+
+def _demand_key(day: datetime) -> str:
+    return f"{_DEMAND_KEY_PREFIX}{day.strftime('%Y%m%d')}"
+
+
+async def record_chain_request(symbol: str, expiration_date: str) -> None:
+    """Count a user request for a chain (best effort, never raises)."""
+    if not settings.enable_chain_prefetch or not cache_service._redis:
+        return
+    key = _demand_key(datetime.now(_US_EASTERN))
+    try:
+        async with cache_service._redis.pipeline(transaction=False) as pipe:
+            pipe.zincrby(key, 1, f"{symbol.upper()}|{expiration_date}")
+            pipe.expire(key, 2 * 86400)
+            await pipe.execute()
+    except Exception as e:
+        logger.debug(f"Failed to record chain demand for {symbol} {expiration_date}: {e}")
+
+
+async def _top_requested(limit: int) -> list[tuple[str, str]]:
+    """Most requested (symbol, expiration) pairs today and yesterday (ET), highest first."""
+    if not cache_service._redis or limit <= 0:
+        return []
+    now = datetime.now(_US_EASTERN)
+    scores: dict[str, float] = {}
+    try:
+        for day in (now, now - timedelta(days=1)):
+            for member, score in await cache_service._redis.zrevrange(
+                _demand_key(day), 0, limit - 1, withscores=True
+            ):
+                scores[member] = scores.get(member, 0.0) + score
+    except Exception as e:
+        logger.warning(f"Chain prefetch: failed to read demand: {e}")
+        return []
+    today = now.strftime("%Y-%m-%d")
+    pairs = []
+    for member in sorted(scores, key=scores.get, reverse=True):
+        symbol, _, expiration = member.partition("|")
+        if symbol and expiration >= today:  # Skip expired contracts
+            pairs.append((symbol, expiration))
+    return pairs[:limit]
+
+
+async def _needs_refresh(symbol: str, expiration_date: str, horizon: float) -> bool:
+    """True if the cached chain is missing or goes stale within horizon seconds."""
+    cached = await cache_service.get(f"market:chain:{symbol}:{expiration_date}")
+    if not isinstance(cached, dict):
+        return True
+    cached_at = cached.get("_cached_at")
+    if not isinstance(cached_at, (int, float)):
+        return True
+    return time.time() - cached_at > CacheTTL.OPTION_CHAIN - horizon
+
+
+async def prefetch_hot_chains() -> None:
+    """
+    Pre-warm the top requested chains (plus radar movers and fallback stocks).
+    Runs during US market hours only, on one replica at a time. Never raises.
+    """
+    if not settings.enable_chain_prefetch or not settings.tiger_use_live_api or not is_us_market_hours():
+        return
+    interval = settings.chain_prefetch_interval_minutes * 60
+    # Fail-closed like the radar lock: no Redis, no prefetch (avoids duplicate Tiger calls)
+    if not await cache_service.acquire_lock(PREFETCH_LOCK_KEY, ttl=max(interval - 5, 30)):
+        logger.debug("Chain prefetch: another replica holds the lock (or Redis unavailable), skipping.")
+        return
+
+    # Pace calls to our share of the Tiger per-minute limit
+    calls_per_minute = max(RateLimits.TIGER_API_CALLS_PER_MINUTE * settings.chain_prefetch_budget_share, 0.1)
+    min_gap = 60.0 / calls_per_minute
+    budget = settings.chain_prefetch_max_calls
+    last_call = 0.0
+    used = 0
+    warmed = 0
+
+    async def _pace() -> None:
+        nonlocal last_call, used
+        wait = last_call + min_gap - time.monotonic()
+        if wait > 0:
+            await asyncio.sleep(wait)
+        last_call = time.monotonic()
+        used += 1
+
+    async def _warm(symbol: str, expiration: str) -> None:
+        nonlocal warmed
+        if not await _needs_refresh(symbol, expiration, horizon=interval):
+            return
+        await _pace()
+        try:
+            await tiger_service.get_option_chain(symbol, expiration, force_refresh=True)
+            warmed += 1
+        except Exception as e:
+            logger.warning("Chain prefetch failed for %s %s: %s", symbol, expiration, e)
+
+    try:
+        with tiger_priority(TigerPriority.PREFETCH):
+            # 1. Most requested chains first: they carry the traffic
+            pairs = await _top_requested(settings.chain_prefetch_top_n)
+            for symbol, expiration in pairs:
+                if used >= budget:
+                    break
+                await _warm(symbol, expiration)
+
+            # 2. Radar movers and fallback stocks without tracked demand: nearest expiry
+            seen = {s for s, _ in pairs}
+            extra = [s for s in (await cache_service.get(RADAR_MOVERS_KEY) or []) + FALLBACK_STOCKS if s not in seen]
+            today = datetime.now(_US_EASTERN).strftime("%Y-%m-%d")
+            for symbol in dict.fromkeys(extra):
+                if used >= budget:
+                    break
+                if await cache_service.get(f"market:expirations:{symbol}") is None:
+                    await _pace()  # Expirations miss costs a Tiger call too
+                upcoming = [e for e in await tiger_service.get_option_expirations(symbol) if e >= today]
+                if upcoming and used < budget:
+                    await _warm(symbol, upcoming[0])
+
+            if used >= budget:
+                logger.info("Chain prefetch: Tiger call budget (%d) exhausted.", budget)
+            logger.info("Chain prefetch: warmed %d chain(s), %d Tiger call(s).", warmed, used)
+    except Exception as e:
+        logger.warning("Chain prefetch error (non-fatal): %s", e, exc_info=True)
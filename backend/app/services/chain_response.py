@@ -0,0 +1,115 @@
+"""Pre-serialized /market/chain response bodies with strong ETags.
+
+The chain endpoint used to re-normalize every option dict and build an
+``OptionChainResponse`` for FastAPI to serialize again on every request, cache hits
+included. A chain only changes when ``tiger_service`` refetches it, and every fetch
+stamps it with ``_version`` (the fetch time), so the final body is built once per
+(symbol, expiration, version, source) and reused until the chain is refetched:
+
+- body: the ``OptionChainResponse`` JSON, encoded with ``orjson`` (stdlib ``json``
+  when orjson is not installed)
+- gzip: compressed once, on the first request that accepts it
+- ETag: strong, a hash of the uncompressed body (with a ``-gzip`` suffix for the
+  compressed representation), so replicas serving the same chain agree on it and
+  ``If-None-Match`` polls are answered with an empty 304
+
+Chains without a version (dev fixtures) are serialized per request but still get an ETag.
+"""
+
+import gzip
+import hashlib
+import json
+from collections import OrderedDict
+from typing import Any, Callable
+
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None
+    ORJSON_AVAILABLE = False
+
+MAX_ENTRIES = 64  # Bodies are a few hundred KB each
+GZIP_MIN_BYTES = 1024  # Smaller bodies are sent uncompressed
+GZIP_LEVEL = 6
+
+
+def encode_json(payload: Any) -> bytes:
+    """Compact JSON bytes (orjson when available)."""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(payload)
+    return json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+class ChainBody:
+    """One encoded response body, its strong ETags and (lazily) its gzip encoding."""
+
+    __slots__ = ("body", "etag", "gzip_etag", "_gzipped")
+
+    def __init__(self, body: bytes) -> None:
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.body = body
+        self.etag = f'"{digest}"'
+        self.gzip_etag = f'"{digest}-gzip"'
+        self._gzipped: bytes | None = None
+
+    @property
+    def gzipped(self) -> bytes:
+        if self._gzipped is None:
+            self._gzipped = gzip.compress(self.body, compresslevel=GZIP_LEVEL, mtime=0)
+        return self._gzipped
+
+
+class ChainBodyCache:
+    """Bounded LRU of encoded chain bodies keyed by (symbol, expiration, version, source)."""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._entries: OrderedDict[tuple[Any, ...], ChainBody] = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "unversioned": 0}
+
+    def get(self, key: tuple[Any, ...], version: Any, build: Callable[[], Any]) -> ChainBody:
+        """The cached body for key at version, else encode build() (cached only when versioned)."""
+        if version is None:
+            self._stats["unversioned"] += 1
+            return ChainBody(encode_json(build()))
+        full_key = (*key, version)
+        entry = self._entries.get(full_key)
+        if entry is not None:
+            self._stats["hits"] += 1
+            self._entries.move_to_end(full_key)
+            return entry
+        self._stats["misses"] += 1
+        entry = ChainBody(encode_json(build()))
+        self._entries[full_key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+        return entry
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "entries": len(self._entries)}
+
+
+def etag_matches(if_none_match: str | None, *etags: str) -> bool:
+    """If-None-Match check against any of etags (weak comparison, as RFC 9110 requires here)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return not candidates.isdisjoint(etags)
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """True when the Accept-Encoding header allows gzip (q=0 opts out)."""
+    for part in (accept_encoding or "").lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        if coding.strip() in ("gzip", "*"):
+            return params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000")
+    return False
+
+
+chain_body_cache = ChainBodyCache()
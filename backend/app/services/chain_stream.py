@@ -0,0 +1,411 @@
+"""Option chain streaming: one refresher per (symbol, expiration), delta frames for every client.
+
+Clients subscribe to a (symbol, expiration) with ``chain_stream_hub.subscribe`` (served
+as Server-Sent Events by GET /market/chain/stream). On every tick exactly one replica
+refreshes each streamed chain from Tiger (whichever takes the per-key Redis lock for
+that tick), diffs it against the previous version and publishes a delta frame on Redis
+pub/sub. Every replica with local subscribers applies the frame to its copy of the
+chain and fans it out, so Tiger calls scale with the number of distinct streamed
+chains, not with connected users. Refreshed chains also land in the regular chain cache
+(``force_refresh``), which keeps /market/chain polls warm.
+
+Streaming shares CHAIN_STREAM_BUDGET_SHARE of the Tiger per-minute limit across all
+streamed chains (tracked in a Redis sorted set across replicas): the tick stretches from
+CHAIN_STREAM_INTERVAL_SECONDS as more chains are streamed, and new chains are refused
+once the budget could no longer refresh each of them every
+CHAIN_STREAM_MAX_INTERVAL_SECONDS.
+
+Frames (JSON objects, rows are flat: strike, bid, ask, volume, open_interest, Greeks,
+latest_price, implied_vol; null = missing):
+- ``snapshot``: version, spot_price and every row per side. Sent first, after a resync
+  and to clients too slow to keep up.
+- ``delta``: base and new version, spot_price and per side ``rows`` (strike plus only
+  the fields that changed) and ``removed`` strikes. A replica whose copy is not at
+  ``base`` (it missed a frame) reloads the chain from the cache and sends a snapshot.
+
+Refreshes pause outside US market hours. Without Redis each process refreshes its own
+streams and delivers frames locally.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import time
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+from app.core.constants import RateLimits
+from app.services.cache import cache_service
+from app.services.option_chain import GREEK_NAMES, OptionChain, OptionSide
+from app.services.radar_service import is_us_market_hours
+from app.services.tiger_rate_limiter import TigerPriority, tiger_priority
+from app.services.tiger_service import tiger_service
+
+logger = logging.getLogger(__name__)
+
+FRAME_CHANNEL_PREFIX = "chain_stream:frames:"
+LOCK_KEY_PREFIX = "chain_stream:lock:"
+ACTIVE_KEY = "chain_stream:active"  # name -> expiry timestamp of every streamed chain (all replicas)
+QUEUE_SIZE = 16  # Frames buffered per client before it is resynced with a snapshot
+
+FIELDS: tuple[str, ...] = ("bid", "ask", "volume", "open_interest", *GREEK_NAMES, "latest_price", "implied_vol")
+SIDES: tuple[str, ...] = ("calls", "puts")
+
+Rows = dict[float, dict[str, float | None]]
+
+
+def side_rows(side: OptionSide) -> Rows:
+    """strike -> {field: value} for one side (NaN becomes None)."""
+    columns = {name: side.column(name).tolist() for name in FIELDS}
+    return {
+        strike: {name: (None if values[i] != values[i] else values[i]) for name, values in columns.items()}
+        for i, strike in enumerate(side.strikes.tolist())
+    }
+
+
+def diff_rows(old: Rows, new: Rows) -> dict[str, list[Any]]:
+    """Changed fields per strike (all fields for new strikes) and removed strikes."""
+    rows = []
+    for strike, row in new.items():
+        previous = old.get(strike)
+        if previous is None:
+            changed = {name: value for name, value in row.items() if value is not None}
+        else:
+            changed = {name: value for name, value in row.items() if previous.get(name) != value}
+        if changed or previous is None:
+            rows.append({"strike": strike, **changed})
+    return {"rows": rows, "removed": [strike for strike in old if strike not in new]}
+
+
+def apply_diff(rows: Rows, diff: dict[str, list[Any]]) -> None:
+    """Apply a side diff to rows in place."""
+    for strike in diff.get("removed", []):
+        rows.pop(strike, None)
+    for changed in diff.get("rows", []):
+        strike = changed["strike"]
+        row = rows.setdefault(strike, dict.fromkeys(FIELDS))
+        row.update((name, value) for name, value in changed.items() if name != "strike")
+
+
+def stream_calls_per_minute() -> float:
+    """Tiger calls per minute available to chain streaming (all replicas together)."""
+    return max(RateLimits.TIGER_API_CALLS_PER_MINUTE * settings.chain_stream_budget_share, 0.1)
+
+
+def max_streamed_chains() -> int:
+    """Distinct chains the streaming budget can refresh at CHAIN_STREAM_MAX_INTERVAL_SECONDS (at least 1)."""
+    fits = int(stream_calls_per_minute() * settings.chain_stream_max_interval_seconds / 60)
+    return max(1, min(settings.chain_stream_max_keys, fits))
+
+
+def refresh_interval(active: int) -> float:
+    """Seconds between refreshes of each chain when ``active`` chains share the budget."""
+    return max(float(settings.chain_stream_interval_seconds), 60.0 * max(active, 1) / stream_calls_per_minute(), 1.0)
+
+
+def _spot(data: Any) -> float | None:
+    try:
+        spot = float(data.get("spot_price") or data.get("underlying_price") or 0)
+    except (TypeError, ValueError):
+        return None
+    return spot if spot > 0 and math.isfinite(spot) else None
+
+
+class _ChainChannel:
+    """Local state and subscribers of one streamed (symbol, expiration)."""
+
+    def __init__(self, hub: "ChainStreamHub", symbol: str, expiration_date: str) -> None:
+        self.hub = hub
+        self.symbol = symbol
+        self.expiration_date = expiration_date
+        self.rows: dict[str, Rows] | None = None
+        self.spot_price: float | None = None
+        self.version: float | None = None
+        self.queues: set[asyncio.Queue] = set()
+        self._task: asyncio.Task | None = None
+        self._resync_task: asyncio.Task | None = None
+
+    @property
+    def name(self) -> str:
+        return f"{self.symbol}:{self.expiration_date}"
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run())
+
+    def stop(self) -> None:
+        for task in (self._task, self._resync_task):
+            if task is not None:
+                task.cancel()
+        self._task = self._resync_task = None
+
+    def attach(self) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self.queues.add(queue)
+        if self.rows is not None:
+            queue.put_nowait(self.snapshot())
+        return queue
+
+    def snapshot(self) -> dict[str, Any]:
+        frame: dict[str, Any] = {
+            "type": "snapshot",
+            "symbol": self.symbol,
+            "expiration_date": self.expiration_date,
+            "version": self.version,
+            "spot_price": self.spot_price,
+        }
+        for side in SIDES:
+            rows = (self.rows or {}).get(side, {})
+            frame[side] = [{"strike": strike, **rows[strike]} for strike in sorted(rows)]
+        return frame
+
+    def _broadcast(self, frame: dict[str, Any]) -> None:
+        for queue in self.queues:
+            if queue.full():
+                # Slow client: drop its backlog and resync it
+                while not queue.empty():
+                    queue.get_nowait()
+                frame_for_queue = self.snapshot()
+            else:
+                frame_for_queue = frame
+            queue.put_nowait(frame_for_queue)
+
+    def _load(self, data: Any) -> None:
+        chain = OptionChain.coerce(data)
+        self.rows = {"calls": side_rows(chain.calls), "puts": side_rows(chain.puts)}
+        self.spot_price = _spot(data)
+        self.version = data.get("_version")
+
+    def schedule_resync(self) -> None:
+        """Resync in the background (at most one at a time)."""
+        if self._resync_task is None or self._resync_task.done():
+            self._resync_task = asyncio.create_task(self.resync())
+
+    async def resync(self) -> None:
+        """Reload the chain through the regular (cached) path and snapshot it to every client."""
+        try:
+            data = await tiger_service.get_option_chain(self.symbol, self.expiration_date)
+        except Exception as e:
+            logger.warning("Chain stream %s: resync failed: %s", self.name, e)
+            return
+        self._load(data)
+        self._broadcast(self.snapshot())
+
+    def apply(self, frame: dict[str, Any]) -> None:
+        """Apply a published delta frame, or resync when it does not start at our version."""
+        if self.rows is None or frame.get("base") != self.version:
+            self.schedule_resync()
+            return
+        diffs = [frame.get(side) or {} for side in SIDES]
+        for side, diff in zip(SIDES, diffs):
+            apply_diff(self.rows[side], diff)
+        self.spot_price = frame.get("spot_price")
+        self.version = frame.get("version")
+        # Unchanged refreshes only move the version; clients are not told
+        if frame.get("spot_changed") or any(diff.get("rows") or diff.get("removed") for diff in diffs):
+            self._broadcast(frame)
+
+    async def refresh(self) -> dict[str, Any] | None:
+        """Fetch the chain from Tiger and return the delta frame from our copy to it."""
+        try:
+            with tiger_priority(TigerPriority.BACKGROUND):
+                data = await tiger_service.get_option_chain(
+                    self.symbol, self.expiration_date, is_pro=True, force_refresh=True
+                )
+        except Exception as e:
+            logger.warning("Chain stream %s: refresh failed: %s", self.name, e)
+            return None
+        chain = OptionChain.coerce(data)
+        old = self.rows or {side: {} for side in SIDES}
+        spot_price = _spot(data)
+        frame: dict[str, Any] = {
+            "type": "delta",
+            "symbol": self.symbol,
+            "expiration_date": self.expiration_date,
+            "base": self.version,
+            "version": data.get("_version") or time.time(),
+            "spot_price": spot_price,
+            "spot_changed": spot_price != self.spot_price,
+        }
+        for side, new_side in (("calls", chain.calls), ("puts", chain.puts)):
+            frame[side] = diff_rows(old.get(side, {}), side_rows(new_side))
+        return frame
+
+    async def _run(self) -> None:
+        await self.resync()
+        while True:
+            interval = refresh_interval(await self.hub.active_count())
+            await self.hub.register(self.name, interval)
+            await asyncio.sleep(interval)
+            try:
+                if not is_us_market_hours() or not await self.hub.take_turn(self.name, interval):
+                    continue
+                frame = await self.refresh()
+                if frame is not None:
+                    await self.hub.publish(self.name, frame)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning("Chain stream %s: refresh loop error: %s", self.name, e)
+
+
+class ChainStreamHub:
+    """Per-process registry of streamed chains plus the Redis pub/sub fan-in."""
+
+    def __init__(self) -> None:
+        self._channels: dict[str, _ChainChannel] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def subscribe(
+        self, symbol: str, expiration_date: str, heartbeat: float = 15.0
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """
+        Frames for (symbol, expiration_date) as they arrive; None every heartbeat seconds
+        without one (for keepalives).
+
+        Raises:
+            HTTPException: 503 when the streaming budget is taken by other chains
+        """
+        name = f"{symbol.upper()}:{expiration_date}"
+        if name not in self._channels and not await self._admit(name):
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many option chains are being streamed, please poll /market/chain instead",
+            )
+        return self._frames(symbol.upper(), expiration_date, heartbeat)
+
+    async def _admit(self, name: str) -> bool:
+        """Reserve a streaming slot for a chain not streamed by this process."""
+        limit = max_streamed_chains()
+        if not cache_service._redis:
+            return len(self._channels) < limit
+        try:
+            redis = cache_service._redis
+            await redis.zremrangebyscore(ACTIVE_KEY, "-inf", time.time())
+            if await redis.zscore(ACTIVE_KEY, name) is not None:
+                return True  # Already refreshed by another replica: no extra Tiger calls
+            if await redis.zcard(ACTIVE_KEY) >= limit:
+                return False
+            await self.register(name, refresh_interval(limit))
+            return True
+        except Exception as e:
+            logger.warning(f"Chain stream registry unavailable, using local limit: {e}")
+            return len(self._channels) < limit
+
+    async def register(self, name: str, interval: float) -> None:
+        """Mark a chain as streamed for the next couple of ticks (best effort)."""
+        if not cache_service._redis:
+            return
+        try:
+            await cache_service._redis.zadd(ACTIVE_KEY, {name: time.time() + 2 * interval + 30})
+        except Exception as e:
+            logger.debug(f"Chain stream {name}: registry update failed: {e}")
+
+    async def active_count(self) -> int:
+        """Distinct chains streamed across replicas (this process's count without Redis)."""
+        if cache_service._redis:
+            try:
+                await cache_service._redis.zremrangebyscore(ACTIVE_KEY, "-inf", time.time())
+                return max(int(await cache_service._redis.zcard(ACTIVE_KEY)), len(self._channels))
+            except Exception as e:
+                logger.debug(f"Chain stream registry unavailable: {e}")
+        return len(self._channels)
+
+    async def _frames(self, symbol: str, expiration_date: str, heartbeat: float) -> AsyncIterator[dict[str, Any] | None]:
+        name = f"{symbol}:{expiration_date}"
+        channel = self._channels.get(name)
+        if channel is None:
+            channel = self._channels[name] = _ChainChannel(self, symbol, expiration_date)
+            channel.start()
+            self._ensure_listener()
+        queue = channel.attach()
+        try:
+            while True:
+                try:
+                    yield await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    yield None
+        finally:
+            channel.queues.discard(queue)
+            if not channel.queues and self._channels.get(name) is channel:
+                channel.stop()
+                del self._channels[name]
+                if not self._channels:
+                    self._stop_listener()
+
+    async def take_turn(self, name: str, interval: float) -> bool:
+        """True if this process refreshes the chain this tick (always, without Redis)."""
+        if not cache_service._redis:
+            return True
+        return bool(await cache_service.acquire_lock(f"{LOCK_KEY_PREFIX}{name}", ttl=max(1, int(interval) - 1)))
+
+    async def publish(self, name: str, frame: dict[str, Any]) -> None:
+        """Send a frame to every replica streaming the chain (locally when Redis is unavailable)."""
+        if cache_service._redis and self._listener is not None:
+            try:
+                await cache_service._redis.publish(f"{FRAME_CHANNEL_PREFIX}{name}", json.dumps(frame))
+                return
+            except Exception as e:
+                logger.warning("Chain stream %s: publish failed, delivering locally: %s", name, e)
+        self.deliver(name, frame)
+
+    def deliver(self, name: str, frame: dict[str, Any]) -> None:
+        channel = self._channels.get(name)
+        if channel is not None:
+            channel.apply(frame)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None and cache_service._redis:
+            self._listener = asyncio.create_task(self._listen())
+
+    def _stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        """Apply frames published by any replica; resync every stream after errors."""
+        while True:
+            try:
+                redis = cache_service._redis
+                if not redis:
+                    await asyncio.sleep(5)
+                    continue
+                pubsub = redis.pubsub()
+                await pubsub.psubscribe(f"{FRAME_CHANNEL_PREFIX}*")
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "pmessage":
+                            continue
+                        channel = message.get("channel")
+                        channel = channel.decode() if isinstance(channel, bytes) else str(channel)
+                        self.deliver(channel[len(FRAME_CHANNEL_PREFIX):], json.loads(message["data"]))
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Frames may have been missed while disconnected
+                logger.warning(f"Chain stream listener error (resyncing streams, retrying): {e}")
+                for channel in self._channels.values():
+                    channel.schedule_resync()
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "streams": len(self._channels),
+            "max_streams": max_streamed_chains(),
+            "subscribers": sum(len(channel.queues) for channel in self._channels.values()),
+        }
+
+    async def shutdown(self) -> None:
+        """Stop every refresher and the listener (app shutdown)."""
+        for channel in self._channels.values():
+            channel.stop()
+        self._channels.clear()
+        self._stop_listener()
+
+
+chain_stream_hub = ChainStreamHub()
@@ -5,11 +5,12 @@ from typing import Any, Callable, Optional
 from uuid import UUID
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.future import select
 
-from app.db.session import AsyncSessionLocal
 from app.db.models import Task, AIReport
 from app.services.ai_service import ai_service
+from app.services.task_events import record_event
+from app.services.task_payloads import offload_report_content
+from app.services.task_progress import TaskProgress, progress_for
 # Quota is reserved atomically by the task handler before this orchestrator runs
 from app.core.config import settings
 
@@ -24,20 +25,6 @@ _AGENT_NAME_TO_PHASE_A_SUB_STAGE = {
     "Synthesis": "synthesis",
 }
 
-def _add_execution_event(
-    history: list[dict[str, Any]] | None, level: str, message: str, ts: datetime | None = None
-) -> list[dict[str, Any]]:
-    """Helper to append an event to the task execution history."""
-    if history is None:
-        history = []
-    event = {
-        "timestamp": (ts or datetime.now(timezone.utc)).isoformat(),
-        "level": level,
-        "message": message,
-    }
-    history.append(event)
-    return history
-
 def _update_stage(
     task: Task,
     stage_id: str,
@@ -63,6 +50,9 @@ def _update_stage(
             if set_sub_stages_status and "sub_stages" in stage:
                 for sub in stage["sub_stages"]:
                     sub["status"] = set_sub_stages_status
+            progress = progress_for(task.id)
+            if progress is not None:
+                progress.stages_changed()
             return
     logger.warning(f"Stage {stage_id} not found in task_metadata.stages")
 
@@ -75,85 +65,24 @@ class DeepResearchOrchestrator:
     def __init__(self, task_id: UUID, session: AsyncSession):
         self.task_id = task_id
         self.session = session
-        self.loop = asyncio.get_running_loop()
+        self.progress: TaskProgress | None = None
         
-    async def _emit_progress(self, progress: int, message: str) -> None:
-        if self.loop is None:
-            return
-            
-        async def update_progress_async() -> None:
-            try:
-                # We use a separate session for progress updates to avoid interfering
-                # with the main orchestrator transaction state
-                async with AsyncSessionLocal() as progress_session:
-                    progress_result = await progress_session.execute(
-                        select(Task).where(Task.id == self.task_id)
-                    )
-                    progress_task = progress_result.scalar_one_or_none()
-                    if progress_task:
-                        progress_task.execution_history = _add_execution_event(
-                            progress_task.execution_history,
-                            "progress",
-                            f"[{progress}%] {message}",
-                        )
-                        if progress_task.task_metadata is None:
-                            progress_task.task_metadata = {}
-                        progress_task.task_metadata["progress"] = progress
-                        progress_task.task_metadata["current_stage"] = message
-                        progress_task.updated_at = datetime.now(timezone.utc)
-                        await progress_session.commit()
-            except Exception as e:
-                logger.warning(f"Failed to update progress for task {self.task_id}: {e}")
-                
-        self.loop.create_task(update_progress_async())
+    def _emit_progress(self, progress: int, message: str) -> None:
+        # Buffered and pushed live by the task's progress channel (task_progress.py)
+        if self.progress is not None:
+            self.progress.emit(progress, message)
 
-    async def _update_phase_a_sub_stage(self, sub_stage_id: str, status: str) -> None:
-        async def run_update():
-            try:
-                async with AsyncSessionLocal() as s:
-                    res = await s.execute(select(Task).where(Task.id == self.task_id))
-                    t = res.scalar_one_or_none()
-                    if not t or not t.task_metadata: return
-                    stages = t.task_metadata.get("stages", [])
-                    modified = False
-                    for stage in stages:
-                        if stage.get("id") == "phase_a" and "sub_stages" in stage:
-                            for sub in stage["sub_stages"]:
-                                if sub.get("id") == sub_stage_id:
-                                    sub["status"] = status
-                                    modified = True
-                    if modified:
-                        t.updated_at = datetime.now(timezone.utc)
-                        await s.commit()
-            except Exception as e:
-                logger.warning(f"Phase A sub-stage update error: {e}")
-        self.loop.create_task(run_update())
+    def _update_phase_a_sub_stage(self, sub_stage_id: str, status: str) -> None:
+        if self.progress is not None:
+            self.progress.set_sub_stage("phase_a", sub_stage_id, status)
+
+    def _update_phase_b_sub_stage(self, sub_stage_id: str, status: str) -> None:
+        if self.progress is not None:
+            self.progress.set_sub_stage("phase_b", sub_stage_id, status)
 
-    async def _update_phase_b_sub_stage(self, sub_stage_id: str, status: str) -> None:
-        async def run_update():
-            try:
-                async with AsyncSessionLocal() as s:
-                    res = await s.execute(select(Task).where(Task.id == self.task_id))
-                    t = res.scalar_one_or_none()
-                    if not t or not t.task_metadata: return
-                    stages = t.task_metadata.get("stages", [])
-                    modified = False
-                    for stage in stages:
-                        if stage.get("id") == "phase_b" and "sub_stages" in stage:
-                            for sub in stage["sub_stages"]:
-                                if sub.get("id") == sub_stage_id:
-                                    sub["status"] = status
-                                    modified = True
-                    if modified:
-                        t.updated_at = datetime.now(timezone.utc)
-                        await s.commit()
-            except Exception as e:
-                logger.warning(f"Phase B sub-stage update error: {e}")
-        self.loop.create_task(run_update())
-        
     def _phase_a_progress_callback(self, progress: int, message: str) -> None:
         scaled = 5 + int(progress * 0.4)
-        self.loop.create_task(self._emit_progress(scaled, f"Phase A: {message}"))
+        self._emit_progress(scaled, f"Phase A: {message}")
         
         if message.startswith("Agent "):
             rest = message[6:].strip()
@@ -184,36 +113,47 @@ class DeepResearchOrchestrator:
             if status and agent_name:
                 sub_id = _AGENT_NAME_TO_PHASE_A_SUB_STAGE.get(agent_name)
                 if sub_id:
-                    self.loop.create_task(self._update_phase_a_sub_stage(sub_id, status))
+                    self._update_phase_a_sub_stage(sub_id, status)
 
     def _phase_b_progress_callback(self, progress: int, message: str) -> None:
         scaled = 50 + int(progress * 0.5)
-        self.loop.create_task(self._emit_progress(scaled, f"Phase B: {message}"))
+        self._emit_progress(scaled, f"Phase B: {message}")
         
         m = message.lower()
         if "planning research" in m or ("planning" in m and "questions" in m):
-            self.loop.create_task(self._update_phase_b_sub_stage("planning", "running"))
+            self._update_phase_b_sub_stage("planning", "running")
         elif "generated" in m and "research questions" in m:
-            self.loop.create_task(self._update_phase_b_sub_stage("planning", "success"))
-            self.loop.create_task(self._update_phase_b_sub_stage("research", "running"))
+            self._update_phase_b_sub_stage("planning", "success")
+            self._update_phase_b_sub_stage("research", "running")
         elif "researching" in m and "parallel" in m:
-            self.loop.create_task(self._update_phase_b_sub_stage("research", "running"))
+            self._update_phase_b_sub_stage("research", "running")
         elif "research phase completed" in m or "synthesizing final" in m:
-            self.loop.create_task(self._update_phase_b_sub_stage("research", "success"))
-            self.loop.create_task(self._update_phase_b_sub_stage("synthesis", "running"))
+            self._update_phase_b_sub_stage("research", "success")
+            self._update_phase_b_sub_stage("synthesis", "running")
         elif "deep research report completed" in m or "report completed" in m:
-            self.loop.create_task(self._update_phase_b_sub_stage("synthesis", "success"))
+            self._update_phase_b_sub_stage("synthesis", "success")
 
     async def execute_workflow(self, task: Task, strategy_summary: dict[str, Any], option_chain: dict[str, Any], use_multi_agent: bool, preferred_model_id: str | None = None) -> None:
         """
         Executes the full multi-agent deep research workflow.
         """
-        await self._emit_progress(5, "Phase A: Multi-agent analysis...")
+        self.progress = progress_for(task.id)
+        owned = self.progress is None
+        if owned:
+            self.progress = TaskProgress(task).start()
+        try:
+            await self._run_workflow(task, strategy_summary, option_chain, use_multi_agent, preferred_model_id)
+        finally:
+            if owned:
+                await self.progress.close()
+
+    async def _run_workflow(self, task: Task, strategy_summary: dict[str, Any], option_chain: dict[str, Any], use_multi_agent: bool, preferred_model_id: str | None = None) -> None:
+        self._emit_progress(5, "Phase A: Multi-agent analysis...")
         now_a = datetime.now(timezone.utc)
         _update_stage(task, "phase_a", "running", started_at=now_a)
         task.updated_at = now_a
-        task.execution_history = _add_execution_event(
-            task.execution_history,
+        record_event(
+            task,
             "info",
             "Starting Phase A: Multi-agent report generation...",
         )
@@ -250,13 +190,12 @@ class DeepResearchOrchestrator:
             task.task_metadata = {}
         task.task_metadata["agent_summaries"] = agent_summaries
         now_a_end = datetime.now(timezone.utc)
-        await self.session.refresh(task) 
         _update_stage(task, "phase_a", "success", ended_at=now_a_end, set_sub_stages_status="success")
         task.updated_at = now_a_end
         await self.session.commit()
         
         # Phase A+
-        await self._emit_progress(45, "Phase A+: Strategy recommendation...")
+        self._emit_progress(45, "Phase A+: Strategy recommendation...")
         now_a_plus = datetime.now(timezone.utc)
         _update_stage(task, "phase_a_plus", "running", started_at=now_a_plus)
         task.updated_at = now_a_plus
@@ -282,7 +221,7 @@ class DeepResearchOrchestrator:
         await self.session.commit()
         
         # Phase B
-        await self._emit_progress(50, "Phase B: Deep Research (planning, research, synthesis)...")
+        self._emit_progress(50, "Phase B: Deep Research (planning, research, synthesis)...")
         now_b = datetime.now(timezone.utc)
         _update_stage(task, "phase_b", "running", started_at=now_b)
         task.updated_at = now_b
@@ -332,7 +271,6 @@ class DeepResearchOrchestrator:
         report_content = f"{input_summary}\n{report_content}"
         
         now_b_end = datetime.now(timezone.utc)
-        await self.session.refresh(task) 
         _update_stage(task, "phase_b", "success", ended_at=now_b_end, set_sub_stages_status="success")
         task.updated_at = now_b_end
         task.task_metadata["progress"] = 100
@@ -347,8 +285,10 @@ class DeepResearchOrchestrator:
             user_id=task.user_id,
             report_content=report_content,
             model_used=task.model_used,
+            symbol=task.symbol,
             created_at=datetime.now(timezone.utc),
         )
+        await offload_report_content(new_report)
         self.session.add(new_report)
         await self.session.flush()
         await self.session.refresh(new_report)
@@ -357,8 +297,8 @@ class DeepResearchOrchestrator:
         task.status = "SUCCESS"
         task.completed_at = datetime.now(timezone.utc)
         task.updated_at = task.completed_at
-        task.execution_history = _add_execution_event(
-            task.execution_history, "success", f"Multi-agent deep research report successfully generated. Report ID: {new_report.id}",
+        record_event(
+            task, "success", f"Multi-agent deep research report successfully generated. Report ID: {new_report.id}",
             task.completed_at
         )
         
@@ -0,0 +1,234 @@
+"""Named, separately sized executors for blocking work.
+
+Blocking calls used to share the default anyio/asyncio thread pool, so one slow
+FinanceToolkit profile could starve Tiger chain requests. Each workload now gets
+its own pool:
+
+- ``tiger``:    Tiger SDK calls (network I/O)
+- ``fmp_sync``: synchronous FMP HTTP calls (quotes, DCF / insider / senate data)
+- ``toolkit``:  FinanceToolkit profiles and history (slow, partly CPU-bound)
+- ``cpu``:      pure computation (charts, numeric work)
+- ``strategy``: strategy scoring for batch recommendations (a process pool by default)
+- ``blob``:     blob storage reads and writes (R2, local files)
+
+An asyncio semaphore in front of each pool bounds concurrency, so the time a call
+spends waiting for it is its queue wait; it is recorded with run time and saturation
+counters (see ``executor_stats``). ``toolkit``, ``cpu`` and ``strategy`` can be
+switched between thread and process pools via settings; functions and their
+arguments must be picklable for a process pool.
+
+Code already running in a worker (e.g. a toolkit profile fanning out FMP calls) has
+no event loop to await on and uses ``submit_blocking`` instead; those calls are
+counted in the same metrics.
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class BoundedExecutor:
+    """A named thread (or process) pool with a concurrency limit and usage metrics."""
+
+    def __init__(self, name: str, max_workers: int, use_processes: bool = False) -> None:
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self.use_processes = use_processes
+        self._pool: Executor | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._semaphore_loop: asyncio.AbstractEventLoop | None = None
+        self._active = 0
+        self._queued = 0
+        self._lock = threading.Lock()  # Metrics are also updated from worker threads (submit_blocking)
+        self._stats = {
+            "submitted": 0, "completed": 0, "failed": 0, "saturated": 0,
+            "wait_total_s": 0.0, "wait_max_s": 0.0, "run_total_s": 0.0,
+        }
+
+    @property
+    def pool(self) -> Executor:
+        """Underlying pool (created on first use)."""
+        if self._pool is None:
+            if self.use_processes:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=f"tm-{self.name}")
+        return self._pool
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Semaphores bind to the running loop; recreate if the loop changed (tests, reloads)
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_workers)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def run(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run fn(*args, **kwargs) in this pool, waiting for a free slot first."""
+        semaphore = self._get_semaphore()
+        with self._lock:
+            self._stats["submitted"] += 1
+            if semaphore.locked():
+                self._stats["saturated"] += 1
+            self._queued += 1
+        queued_at = time.monotonic()
+        try:
+            await semaphore.acquire()
+        finally:
+            with self._lock:
+                self._queued -= 1
+        started = time.monotonic()
+        self._record_start(started - queued_at)
+        loop = asyncio.get_running_loop()
+        try:
+            if self.use_processes:
+                call = functools.partial(fn, *args, **kwargs)
+            else:
+                # Same as asyncio.to_thread: the worker sees the caller's context variables
+                call = functools.partial(contextvars.copy_context().run, fn, *args, **kwargs)
+            future = self.pool.submit(call)
+        except BaseException:
+            with self._lock:
+                self._active -= 1
+            semaphore.release()
+            raise
+
+        def _finished(done: Future) -> None:
+            # Runs when the work really ends, even if the awaiting caller was cancelled or
+            # timed out, so the slot is not reused while the worker is still busy
+            failed = done.cancelled() or done.exception() is not None
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(self._release, semaphore, started, failed)
+
+        future.add_done_callback(_finished)
+        return await asyncio.wrap_future(future)
+
+    def submit_blocking(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+        """
+        Submit fn(*args, **kwargs) from synchronous code; wait with future.result(timeout).
+
+        For code already running in a worker thread, where run() cannot be awaited.
+        There is no semaphore to queue on here: the pool's own work queue bounds
+        concurrency, and the time spent in it is recorded as queue wait. Thread pools only.
+        """
+        if self.use_processes:
+            raise RuntimeError(f"submit_blocking needs a thread pool ({self.name} uses processes)")
+        with self._lock:
+            self._stats["submitted"] += 1
+            if self._active >= self.max_workers:
+                self._stats["saturated"] += 1
+            self._queued += 1
+        queued_at = time.monotonic()
+        context = contextvars.copy_context()
+
+        def call() -> Any:
+            started = time.monotonic()
+            with self._lock:
+                self._queued -= 1
+            self._record_start(started - queued_at)
+            failed = True
+            try:
+                result = context.run(fn, *args, **kwargs)
+                failed = False
+                return result
+            finally:
+                self._record_end(started, failed)
+
+        def _cancelled(done: Future) -> None:
+            if done.cancelled():  # Cancelled while still queued: call() never ran
+                with self._lock:
+                    self._queued -= 1
+                    self._stats["failed"] += 1
+
+        try:
+            future = self.pool.submit(call)
+        except BaseException:
+            with self._lock:
+                self._queued -= 1
+            raise
+        future.add_done_callback(_cancelled)
+        return future
+
+    def _record_start(self, wait: float) -> None:
+        with self._lock:
+            self._stats["wait_total_s"] += wait
+            self._stats["wait_max_s"] = max(self._stats["wait_max_s"], wait)
+            self._active += 1
+
+    def _record_end(self, started: float, failed: bool) -> None:
+        with self._lock:
+            self._active -= 1
+            self._stats["failed" if failed else "completed"] += 1
+            self._stats["run_total_s"] += time.monotonic() - started
+
+    def _release(self, semaphore: asyncio.Semaphore, started: float, failed: bool) -> None:
+        self._record_end(started, failed)
+        semaphore.release()
+
+    def stats(self) -> dict[str, Any]:
+        """Concurrency, queue depth, wait/run times and saturation for this pool."""
+        s = self._stats
+        started = s["submitted"] - self._queued
+        return {
+            "kind": "process" if self.use_processes else "thread",
+            "max_workers": self.max_workers,
+            "active": self._active,
+            "queued": self._queued,
+            "utilization": round(self._active / self.max_workers, 2),
+            "submitted": s["submitted"],
+            "completed": s["completed"],
+            "failed": s["failed"],
+            "saturated": s["saturated"],  # Calls that found every worker busy
+            "avg_wait_s": round(s["wait_total_s"] / started, 4) if started else 0.0,
+            "max_wait_s": round(s["wait_max_s"], 4),
+            "avg_run_s": round(s["run_total_s"] / started, 4) if started else 0.0,
+        }
+
+    def shutdown(self, wait: bool = False) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait, cancel_futures=True)
+            self._pool = None
+
+
+_executors: dict[str, BoundedExecutor] = {
+    "tiger": BoundedExecutor("tiger", settings.executor_tiger_workers),
+    "fmp_sync": BoundedExecutor("fmp_sync", settings.executor_fmp_sync_workers),
+    "toolkit": BoundedExecutor(
+        "toolkit", settings.executor_toolkit_workers, use_processes=settings.executor_toolkit_use_processes
+    ),
+    "cpu": BoundedExecutor("cpu", settings.executor_cpu_workers, use_processes=settings.executor_cpu_use_processes),
+    "strategy": BoundedExecutor(
+        "strategy", settings.executor_strategy_workers, use_processes=settings.executor_strategy_use_processes
+    ),
+    "blob": BoundedExecutor("blob", settings.executor_blob_workers),
+}
+
+
+def get_executor(name: str) -> BoundedExecutor:
+    """Return the named executor (tiger, fmp_sync, toolkit, cpu, strategy, blob)."""
+    return _executors[name]
+
+
+async def run_in_executor(name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Run a blocking callable in the named executor and await its result."""
+    return await _executors[name].run(fn, *args, **kwargs)
+
+
+def executor_stats() -> dict[str, dict[str, Any]]:
+    """Metrics for every named executor."""
+    return {name: executor.stats() for name, executor in _executors.items()}
+
+
+def shutdown_executors() -> None:
+    """Shut down all pools (application shutdown)."""
+    for executor in _executors.values():
+        executor.shutdown()
@@ -33,6 +33,8 @@ for LLM compatibility and API responses.
 import logging
 import math
 import os
+import time
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -56,9 +58,13 @@ from tenacity import (
 
 from app.core.config import settings
 from app.services.cache import cache_service
+from app.services.executors import get_executor
+from app.services.single_flight import single_flight
 
 logger = logging.getLogger(__name__)
 EST = pytz.timezone("US/Eastern")
+# Longest a financial profile waits for its DCF / insider / senate calls (each HTTP call has a 15s timeout)
+FMP_ADVANCED_TIMEOUT_SECONDS = 20.0
 
 # Circuit breaker: Open if 5 failures, stay open for 60s
 fmp_circuit_breaker = CircuitBreaker(
@@ -99,6 +105,12 @@ class MarketDataService:
         
         logger.info("MarketDataService initialized")
 
+    def __getstate__(self) -> dict[str, Any]:
+        """Pickle without lazy clients/databases (lets bound methods run in a process pool)."""
+        state = self.__dict__.copy()
+        state.update(_equities_db=None, _etfs_db=None, _http_client=None)
+        return state
+
     @property
     def equities_db(self) -> fd.Equities:
         """Lazy-load Equities database."""
@@ -1366,10 +1378,22 @@ class MarketDataService:
                     logger.info(f"Financial profile for {ticker} enriched via FMP direct API")
             
             # FMP advanced APIs: DCF, insider trading, senate trading (non-blocking; None on error)
+            # Fetched concurrently on the fmp_sync pool (each call is an independent HTTP request)
             if self._fmp_api_key:
-                profile["dcf_valuation"] = self._fetch_fmp_dcf_sync(ticker)
-                profile["insider_trading"] = self._fetch_fmp_insider_trading_sync(ticker)
-                profile["senate_trading"] = self._fetch_fmp_senate_trading_sync(ticker)
+                fmp_executor = get_executor("fmp_sync")
+                futures = {
+                    "dcf_valuation": fmp_executor.submit_blocking(self._fetch_fmp_dcf_sync, ticker),
+                    "insider_trading": fmp_executor.submit_blocking(self._fetch_fmp_insider_trading_sync, ticker),
+                    "senate_trading": fmp_executor.submit_blocking(self._fetch_fmp_senate_trading_sync, ticker),
+                }
+                deadline = time.monotonic() + FMP_ADVANCED_TIMEOUT_SECONDS
+                for key, future in futures.items():
+                    try:
+                        profile[key] = future.result(timeout=max(0.0, deadline - time.monotonic()))
+                    except FuturesTimeoutError:
+                        future.cancel()
+                        logger.warning(f"FMP {key} for {ticker} timed out (pool saturated?); omitted")
+                        profile[key] = None
             
             logger.info(f"Financial profile retrieved for {ticker}")
             return self._sanitize_mapping(profile)
@@ -2044,24 +2068,29 @@ class MarketDataService:
         request_params = params or {}
         request_params["apikey"] = self._fmp_api_key
         
-        # Record API call count for monitoring
-        try:
-            today = datetime.now(EST).date().isoformat()
-            usage_key = f"fmp_usage:{today}:{endpoint}"
-            if cache_service._redis:
-                await cache_service._redis.incr(usage_key)
-                await cache_service._redis.expire(usage_key, 86400)  # 24 hours TTL
-        except Exception as e:
-            logger.debug(f"Failed to record FMP API usage: {e}")
-        
-        try:
+        async def _request() -> Any:
+            # Record API call count for monitoring (actual HTTP calls, not coalesced waiters)
+            try:
+                today = datetime.now(EST).date().isoformat()
+                usage_key = f"fmp_usage:{today}:{endpoint}"
+                if cache_service._redis:
+                    await cache_service._redis.incr(usage_key)
+                    await cache_service._redis.expire(usage_key, 86400)  # 24 hours TTL
+            except Exception as e:
+                logger.debug(f"Failed to record FMP API usage: {e}")
+
             client = await self._get_http_client()
             response = await client.get(url, params=request_params)
             response.raise_for_status()
-            data = response.json()
-            
             # Sanitize response data
-            return self._sanitize_mapping(data)
+            return self._sanitize_mapping(response.json())
+
+        # Identical concurrent calls (same endpoint + params) share one HTTP request
+        flight_key = "fmp:" + endpoint + "?" + "&".join(
+            f"{k}={v}" for k, v in sorted(request_params.items()) if k != "apikey"
+        )
+        try:
+            return await single_flight.do(flight_key, _request)
         except httpx.HTTPStatusError as e:
             logger.error(f"FMP API error for {endpoint}: {e.response.status_code} - {e.response.text}")
             raise
@@ -0,0 +1,484 @@
+"""Columnar option chain representation shared by services, endpoints and agents.
+
+Across the codebase an option chain travels as ``{"calls": [dict, ...], "puts": [dict, ...],
+"spot_price": ...}``. ``OptionChain`` holds the same data as sorted NumPy columns, parsed
+once (from a Tiger DataFrame or from the dict shape) so consumers get:
+
+- O(log n) strike lookup (exact and nearest, one strike or a batch) via ``np.searchsorted``
+- delta-nearest lookup (vectorized, NaN-aware)
+- strike range slicing (views, no copy)
+- model Greeks / IV for rows the source left blank (``with_filled_greeks``, vectorized;
+  the chain itself is never written, cached chains are shared between requests)
+
+``to_dict()`` serializes back to the existing JSON shape used by the API (lossless for
+chains produced by ``tiger_service``; other inputs are normalized to that shape).
+``to_columnar()`` is the compact form kept in the Redis cache: each side as column
+lists instead of row dicts. ``from_dict`` / ``coerce`` accept either shape, and
+rebuilding from columns is a handful of array conversions, not a per-row parse. ``OptionChain`` also implements the read-only ``Mapping`` interface
+(``chain.get("calls")``, ``chain["spot_price"]``, ``"puts" in chain``) so code written
+against the dict shape keeps working unchanged.
+"""
+
+from collections.abc import Iterable, Iterator, Mapping
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from app.services.black_scholes import bs_greeks, implied_volatility
+
+GREEK_NAMES: tuple[str, ...] = ("delta", "gamma", "theta", "vega", "rho")
+
+# Numeric columns stored per side (NaN = missing)
+_COLUMNS: tuple[str, ...] = (
+    "strike", "bid", "ask", "volume", "open_interest",
+    *GREEK_NAMES, "latest_price", "implied_vol",
+)
+
+# Record keys understood by from_records (canonical names and accepted aliases);
+# any other key is carried through untouched as a per-row extra.
+_KNOWN_RECORD_KEYS = frozenset({
+    "strike", "strike_price", "bid", "bid_price", "ask", "ask_price", "volume",
+    "open_interest", "openInterest", *GREEK_NAMES, "greeks", "latest_price",
+    "implied_vol", "implied_volatility",
+})
+
+
+def _to_float(value: Any) -> float:
+    """Parse a scalar to float; missing, non-numeric and inf values become NaN."""
+    if value is None or isinstance(value, bool):
+        return np.nan
+    if isinstance(value, str):
+        value = value.replace(",", "").strip()
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return np.nan
+    return number if np.isfinite(number) else np.nan
+
+
+def _first_present(record: Mapping[str, Any], *keys: str) -> Any:
+    """Return the first non-None value among keys (canonical name first, then aliases)."""
+    for key in keys:
+        value = record.get(key)
+        if value is not None:
+            return value
+    return None
+
+
+def numeric_column(frame: pd.DataFrame, column: str, strip_commas: bool = False) -> np.ndarray:
+    """Coerce one DataFrame column to float64; missing, non-numeric and inf cells become NaN."""
+    if column not in frame.columns:
+        return np.full(len(frame), np.nan)
+    series = frame[column]
+    if strip_commas and not pd.api.types.is_numeric_dtype(series):
+        series = series.map(lambda v: v.replace(",", "").strip() if isinstance(v, str) else v)
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    return np.where(np.isfinite(values), values, np.nan)
+
+
+class OptionSide:
+    """One side (calls or puts) of a chain as strike-sorted float64 columns."""
+
+    __slots__ = ("_columns", "_extras", "_records")
+
+    def __init__(self, columns: Mapping[str, np.ndarray], extras: list[dict[str, Any] | None] | None = None) -> None:
+        """Build from column arrays. Rows are sorted by strike; rows without a positive strike are dropped."""
+        strike = np.asarray(columns.get("strike", ()), dtype="float64")
+        n = len(strike)
+        keep = np.flatnonzero(strike > 0)
+        order = keep[np.argsort(strike[keep], kind="stable")]
+        self._columns: dict[str, np.ndarray] = {}
+        for name in _COLUMNS:
+            values = columns.get(name)
+            values = np.full(n, np.nan) if values is None else np.asarray(values, dtype="float64")
+            self._columns[name] = values[order]
+        self._extras = [extras[i] for i in order] if extras is not None and any(extras) else None
+        self._records: list[dict[str, Any]] | None = None
+
+    @classmethod
+    def _from_sorted(cls, columns: dict[str, np.ndarray], extras: list[dict[str, Any] | None] | None) -> "OptionSide":
+        side = cls.__new__(cls)
+        side._columns = columns
+        side._extras = extras
+        side._records = None
+        return side
+
+    @classmethod
+    def from_frame(cls, frame: pd.DataFrame) -> "OptionSide":
+        """Parse one side of a Tiger SDK DataFrame (bid_price/ask_price/... columns) column-wise."""
+        columns = {name: numeric_column(frame, name) for name in _COLUMNS if name not in ("strike", "bid", "ask")}
+        columns["strike"] = numeric_column(frame, "strike", strip_commas=True)
+        columns["bid"] = np.nan_to_num(numeric_column(frame, "bid_price"), nan=0.0)
+        columns["ask"] = np.nan_to_num(numeric_column(frame, "ask_price"), nan=0.0)
+        columns["volume"] = np.nan_to_num(columns["volume"], nan=0.0)
+        columns["open_interest"] = np.nan_to_num(columns["open_interest"], nan=0.0)
+        return cls(columns)
+
+    @classmethod
+    def from_records(cls, records: Iterable[Any] | None) -> "OptionSide":
+        """Parse a list of option dicts (flat or nested greeks, bid/bid_price, ... spellings)."""
+        rows = [r for r in (records or []) if isinstance(r, Mapping) and r]
+        n = len(rows)
+        columns = {name: np.full(n, np.nan) for name in _COLUMNS}
+        extras: list[dict[str, Any] | None] = [None] * n
+        for i, rec in enumerate(rows):
+            nested = rec.get("greeks") if isinstance(rec.get("greeks"), Mapping) else {}
+            columns["strike"][i] = _to_float(_first_present(rec, "strike", "strike_price"))
+            columns["bid"][i] = _to_float(_first_present(rec, "bid", "bid_price"))
+            columns["ask"][i] = _to_float(_first_present(rec, "ask", "ask_price"))
+            columns["volume"][i] = _to_float(rec.get("volume"))
+            columns["open_interest"][i] = _to_float(_first_present(rec, "open_interest", "openInterest"))
+            for name in GREEK_NAMES:
+                value = rec.get(name)
+                columns[name][i] = _to_float(value if value is not None else nested.get(name))
+            columns["latest_price"][i] = _to_float(rec.get("latest_price"))
+            iv_value = _first_present(rec, "implied_vol", "implied_volatility")
+            columns["implied_vol"][i] = _to_float(iv_value if iv_value is not None else nested.get("implied_vol"))
+            if not _KNOWN_RECORD_KEYS.issuperset(rec.keys()):
+                extras[i] = {k: v for k, v in rec.items() if k not in _KNOWN_RECORD_KEYS}
+        for name in ("bid", "ask", "volume", "open_interest"):
+            columns[name] = np.nan_to_num(columns[name], nan=0.0)
+        return cls(columns, extras)
+
+    @classmethod
+    def from_columns(cls, data: Mapping[str, Any]) -> "OptionSide":
+        """Rebuild a side serialized by to_columns (rows are already sorted and filtered)."""
+        n = len(data.get("strike") or ())
+        columns = {
+            name: np.full(n, np.nan) if data.get(name) is None else np.asarray(data[name], dtype="float64")
+            for name in _COLUMNS
+        }
+        return cls._from_sorted(columns, data.get("extras"))
+
+    def __len__(self) -> int:
+        return len(self._columns["strike"])
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a column array (strike, bid, ask, volume, open_interest, greeks, latest_price, implied_vol)."""
+        return self._columns[name]
+
+    @property
+    def strikes(self) -> np.ndarray:
+        return self._columns["strike"]
+
+    @property
+    def mid(self) -> np.ndarray:
+        return (self._columns["bid"] + self._columns["ask"]) / 2.0
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def find_strike(self, strike: float, tolerance: float = 0.01) -> int | None:
+        """Index of the row whose strike is within tolerance of strike (O(log n)), else None."""
+        idx = self.nearest_strike(strike)
+        if idx is None or abs(self.strikes[idx] - strike) >= tolerance:
+            return None
+        return idx
+
+    def nearest_strike(self, strike: float) -> int | None:
+        """Index of the row with strike closest to strike (O(log n)); ties resolve to the lower strike."""
+        strikes = self.strikes
+        if len(strikes) == 0:
+            return None
+        pos = int(np.searchsorted(strikes, strike, side="left"))
+        if pos <= 0:
+            return 0
+        if pos >= len(strikes):
+            return len(strikes) - 1
+        # searchsorted(side="left") lands on the first equal strike, so `<=` keeps the lower one on ties
+        return pos - 1 if strike - strikes[pos - 1] <= strikes[pos] - strike else pos
+
+    def nearest_strikes(self, strikes: Any) -> np.ndarray:
+        """Vectorized nearest_strike: one row index per target strike (-1 on an empty side)."""
+        targets = np.asarray(strikes, dtype="float64")
+        chain_strikes = self.strikes
+        if len(chain_strikes) < 2:
+            return np.full(targets.shape, len(chain_strikes) - 1, dtype=np.intp)
+        pos = np.clip(np.searchsorted(chain_strikes, targets, side="left"), 1, len(chain_strikes) - 1)
+        lower = pos - 1
+        return np.where(targets - chain_strikes[lower] <= chain_strikes[pos] - targets, lower, pos)
+
+    def find_strikes(self, strikes: Any, tolerance: float = 0.01) -> np.ndarray:
+        """Vectorized find_strike: one row index per target strike, -1 where the chain has no match."""
+        idx = self.nearest_strikes(strikes)
+        if len(self) == 0:
+            return idx
+        matched = np.abs(self.strikes[idx] - np.asarray(strikes, dtype="float64")) < tolerance
+        return np.where(matched, idx, -1)
+
+    def nearest_delta(self, target_delta: float) -> int | None:
+        """Index of the row with delta closest to target_delta (rows without delta are ignored)."""
+        deltas = self._columns["delta"]
+        diffs = np.abs(deltas - target_delta)
+        if len(diffs) == 0 or np.all(np.isnan(diffs)):
+            return None
+        return int(np.nanargmin(diffs))
+
+    def slice_strikes(self, low: float, high: float) -> "OptionSide":
+        """Rows with low <= strike <= high, as array views (no copy)."""
+        strikes = self.strikes
+        start = int(np.searchsorted(strikes, low, side="left"))
+        stop = int(np.searchsorted(strikes, high, side="right"))
+        columns = {name: values[start:stop] for name, values in self._columns.items()}
+        extras = self._extras[start:stop] if self._extras is not None else None
+        return OptionSide._from_sorted(columns, extras)
+
+    # ------------------------------------------------------------------
+    # Model fill
+    # ------------------------------------------------------------------
+
+    def fill_greeks(
+        self,
+        spot: float,
+        years: float,
+        is_call: bool,
+        rate: float = 0.0,
+        dividend_yield: float = 0.0,
+    ) -> int:
+        """Fill missing Greeks (and IV) in place with Black-Scholes values; returns rows changed.
+
+        Rows keep every value the source provided. The model uses the row's implied_vol
+        when present, else the IV solved from the bid/ask mid (or latest_price when there
+        is no two-sided quote); rows with no usable price stay NaN.
+        """
+        greeks = [self._columns[name] for name in GREEK_NAMES]
+        missing = np.logical_or.reduce([np.isnan(values) for values in greeks])
+        if not (spot and spot > 0 and years and years > 0) or not missing.any():
+            return 0
+        rows = np.flatnonzero(missing)
+        strikes = self.strikes[rows]
+        iv = self._columns["implied_vol"][rows]
+        need_iv = ~(iv > 0)
+        if need_iv.any():
+            bid, ask = self._columns["bid"][rows], self._columns["ask"][rows]
+            price = np.where((bid > 0) & (ask >= bid), (bid + ask) / 2.0, self._columns["latest_price"][rows])
+            solved = implied_volatility(
+                price[need_iv], spot, strikes[need_iv], years, is_call, rate, dividend_yield
+            )
+            iv = iv.copy()
+            iv[need_iv] = solved
+        model = bs_greeks(spot, strikes, years, iv, is_call, rate, dividend_yield)
+        changed = np.zeros(len(rows), dtype=bool)
+        for name, values in zip(GREEK_NAMES, greeks):
+            gap = np.isnan(values[rows]) & ~np.isnan(model[name])
+            values[rows[gap]] = model[name][gap]
+            changed |= gap
+        iv_column = self._columns["implied_vol"]
+        iv_gap = ~(iv_column[rows] > 0) & (iv > 0)
+        iv_column[rows[iv_gap]] = iv[iv_gap]
+        if changed.any() or iv_gap.any():
+            self._records = None
+        return int(changed.sum())
+
+    def with_filled_greeks(
+        self,
+        spot: float,
+        years: float,
+        is_call: bool,
+        rate: float = 0.0,
+        dividend_yield: float = 0.0,
+    ) -> tuple["OptionSide", int]:
+        """Copy of this side with missing Greeks filled (see fill_greeks), and rows changed.
+
+        This side is left untouched; it is returned as is when nothing needs filling.
+        """
+        if not np.logical_or.reduce([np.isnan(self._columns[name]) for name in GREEK_NAMES]).any():
+            return self, 0
+        filled = OptionSide._from_sorted({name: values.copy() for name, values in self._columns.items()}, self._extras)
+        changed = filled.fill_greeks(spot, years, is_call, rate, dividend_yield)
+        return (filled, changed) if changed else (self, 0)
+
+    # ------------------------------------------------------------------
+    # Serialization
+    # ------------------------------------------------------------------
+
+    def record(self, index: int) -> dict[str, Any]:
+        """The row at index in the dict shape (shared with get("calls") / to_records())."""
+        return self.to_records()[index]
+
+    def to_columns(self) -> dict[str, Any]:
+        """Serialize as {column: list} (NaN = missing), plus the per-row extras when any."""
+        out: dict[str, Any] = {name: values.tolist() for name, values in self._columns.items()}
+        if self._extras is not None:
+            out["extras"] = self._extras
+        return out
+
+    def to_records(self, include_extras: bool = True) -> list[dict[str, Any]]:
+        """Serialize to the list-of-dicts shape produced by tiger_service (memoized).
+
+        Key order: strike, bid, ask, volume, open_interest, flat greeks, greeks sub-dict
+        (only when present), latest_price, implied_vol/implied_volatility, then extras.
+        """
+        if include_extras and self._records is not None:
+            return self._records
+        cols = {name: values.tolist() for name, values in self._columns.items()}
+        greek_cols = [(name, cols[name]) for name in GREEK_NAMES]
+        latest, ivs = cols["latest_price"], cols["implied_vol"]
+        records: list[dict[str, Any]] = []
+        for i, strike in enumerate(cols["strike"]):
+            record: dict[str, Any] = {
+                "strike": strike,
+                "bid": cols["bid"][i],
+                "ask": cols["ask"][i],
+                "volume": cols["volume"][i],
+                "open_interest": cols["open_interest"][i],
+            }
+            greeks = {}
+            for name, values in greek_cols:
+                value = values[i]
+                if value == value:  # not NaN
+                    record[name] = value
+                    greeks[name] = value
+            if greeks:
+                record["greeks"] = greeks
+            if latest[i] == latest[i]:
+                record["latest_price"] = latest[i]
+            if ivs[i] == ivs[i]:
+                record["implied_vol"] = ivs[i]
+                record["implied_volatility"] = ivs[i]  # Also include full name
+            if include_extras and self._extras is not None and self._extras[i]:
+                for key, value in self._extras[i].items():
+                    record.setdefault(key, value)
+            records.append(record)
+        if include_extras:
+            self._records = records
+        return records
+
+
+def _parse_side(data: Any) -> OptionSide:
+    if isinstance(data, Mapping):
+        return OptionSide.from_columns(data)
+    return OptionSide.from_records(data)
+
+
+class OptionChain(Mapping[str, Any]):
+    """Array-backed option chain (calls + puts + spot price + passthrough metadata).
+
+    Read-only Mapping over the dict shape: ``chain["calls"]`` returns the (memoized)
+    list of option dicts, other keys come from spot_price and metadata (_source,
+    expiration_date, symbol, ...). Use ``calls`` / ``puts`` / ``side()`` for the
+    columnar API and ``to_dict()`` for JSON serialization.
+    """
+
+    __slots__ = ("calls", "puts", "spot_price", "meta")
+
+    def __init__(
+        self,
+        calls: OptionSide,
+        puts: OptionSide,
+        spot_price: float | None = None,
+        meta: dict[str, Any] | None = None,
+    ) -> None:
+        self.calls = calls
+        self.puts = puts
+        self.spot_price = spot_price
+        self.meta: dict[str, Any] = dict(meta or {})
+
+    @classmethod
+    def from_dict(cls, data: Mapping[str, Any] | None) -> "OptionChain":
+        """Parse the {"calls", "puts", "spot_price", ...} dict shape; other top-level keys go to meta.
+
+        Sides may be record lists (to_dict) or column mappings (to_columnar).
+        """
+        data = data or {}
+        meta = {k: v for k, v in data.items() if k not in ("calls", "puts", "spot_price")}
+        spot = data.get("spot_price")
+        return cls(
+            calls=_parse_side(data.get("calls")),
+            puts=_parse_side(data.get("puts")),
+            spot_price=spot,
+            meta=meta,
+        )
+
+    @classmethod
+    def coerce(cls, data: "OptionChain | Mapping[str, Any] | None") -> "OptionChain":
+        """Return data unchanged if it is already an OptionChain, else parse it."""
+        if isinstance(data, OptionChain):
+            return data
+        return cls.from_dict(data)
+
+    def side(self, option_type: Any) -> OptionSide:
+        """Calls or puts for "call"/"calls"/"put"/"puts" or an OptionType enum."""
+        value = getattr(option_type, "value", option_type)
+        return self.puts if str(value).lower().startswith("put") else self.calls
+
+    def slice_strikes(self, low: float, high: float) -> "OptionChain":
+        """Chain restricted to low <= strike <= high on both sides."""
+        return OptionChain(
+            calls=self.calls.slice_strikes(low, high),
+            puts=self.puts.slice_strikes(low, high),
+            spot_price=self.spot_price,
+            meta=self.meta,
+        )
+
+    def with_filled_greeks(
+        self,
+        years: float,
+        rate: float = 0.0,
+        dividend_yield: float = 0.0,
+        spot_price: float | None = None,
+    ) -> tuple["OptionChain", int]:
+        """Chain with missing Greeks filled from the model on both sides, and rows changed.
+
+        This chain (often the cached copy shared by concurrent requests) is not modified,
+        and is returned as is when nothing needs filling. spot_price is used when the
+        chain has none.
+        """
+        spot = _to_float(self.spot_price if self.spot_price is not None else spot_price)
+        if np.isnan(spot):
+            return self, 0
+        calls, filled_calls = self.calls.with_filled_greeks(spot, years, True, rate, dividend_yield)
+        puts, filled_puts = self.puts.with_filled_greeks(spot, years, False, rate, dividend_yield)
+        if not filled_calls + filled_puts:
+            return self, 0
+        chain = OptionChain(calls, puts, self.spot_price if self.spot_price is not None else spot_price, self.meta)
+        return chain, filled_calls + filled_puts
+
+    def with_meta(self, **meta: Any) -> "OptionChain":
+        """A chain sharing this one's sides, with meta updated (e.g. _source / _version per caller)."""
+        return OptionChain(self.calls, self.puts, self.spot_price, {**self.meta, **meta})
+
+    def to_columnar(self) -> dict[str, Any]:
+        """Serialize to the compact cache shape: like to_dict, but each side as column lists."""
+        out: dict[str, Any] = {
+            "calls": self.calls.to_columns(),
+            "puts": self.puts.to_columns(),
+            "spot_price": self.spot_price,
+        }
+        out.update(self.meta)
+        return out
+
+    def to_dict(self, include_extras: bool = True) -> dict[str, Any]:
+        """Serialize to the JSON-compatible dict shape (Redis cache / API response)."""
+        out: dict[str, Any] = {
+            "calls": self.calls.to_records(include_extras=include_extras),
+            "puts": self.puts.to_records(include_extras=include_extras),
+            "spot_price": self.spot_price,
+        }
+        out.update(self.meta)
+        return out
+
+    # Mapping interface (read-only dict compatibility)
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "calls":
+            return self.calls.to_records()
+        if key == "puts":
+            return self.puts.to_records()
+        if key == "spot_price":
+            return self.spot_price
+        return self.meta[key]
+
+    def __iter__(self) -> Iterator[str]:
+        yield "calls"
+        yield "puts"
+        yield "spot_price"
+        yield from self.meta
+
+    def __len__(self) -> int:
+        return 3 + len(self.meta)
+
+    def __contains__(self, key: object) -> bool:
+        return key in ("calls", "puts", "spot_price") or key in self.meta
@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.db.models import PaymentEvent, User
+from app.services.user_context import invalidate_user_context
 
 logger = logging.getLogger(__name__)
 
@@ -407,6 +408,7 @@ async def process_webhook(
         # Step 4: Mark as processed and commit
         payment_event.processed = True
         await db.commit()
+        await invalidate_user_context(user.id)
 
         logger.info(f"Successfully processed webhook event {lemon_squeezy_id}")
 
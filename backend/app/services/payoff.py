@@ -0,0 +1,180 @@
+"""Exact expiration payoff for arbitrary leg sets (options and stock).
+
+At expiration every leg's P&L is piecewise linear in the underlying price with kinks
+only at option strikes, so the whole curve is known from its values at the kinks
+(plus price 0) and its slope beyond the highest strike. That gives exact figures
+instead of sampling a price grid:
+
+- max profit / max loss: extremes over the kinks, or +/-inf when the right tail
+  slopes up / down (net long / short calls or stock)
+- breakevens: the linear root inside every segment whose end values change sign,
+  and in the right tail
+- ``payoff_at``: the P&L curve on any price grid, for charts
+
+Strategies are evaluated in batches: ``leg_arrays`` packs N strategies into (N, L)
+arrays (shorter strategies are padded with zero-quantity legs), and every function
+works on all rows at once.
+
+Units follow the strategy summaries the frontend sends: per-share prices times
+signed quantity (+ long / - short), no contract multiplier. ``max_loss`` is the
+lowest P&L, so it is negative for a losing strategy.
+"""
+
+from typing import Any
+
+import numpy as np
+
+CALL, PUT, STOCK = 0, 1, 2
+_KINDS = {"call": CALL, "put": PUT, "stock": STOCK}
+
+
+def _number(value: Any, default: float = 0.0) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def _parse_leg(leg: Any) -> tuple[int, float, float, float] | None:
+    """(kind, strike, signed quantity, premium) from a leg dict, None if not usable.
+
+    Option legs use ``type`` (call/put), ``strike``, ``premium`` and ``action`` (buy/sell)
+    with a positive ``quantity``. Stock legs (type "stock") use the entry ``price``
+    (or ``premium``) as cost basis.
+    """
+    if not isinstance(leg, dict):
+        return None
+    kind = _KINDS.get(str(leg.get("type", "call")).lower())
+    if kind is None:
+        return None
+    quantity = abs(_number(leg.get("quantity"), 1.0))
+    if str(leg.get("action", "buy")).lower() == "sell":
+        quantity = -quantity
+    if kind == STOCK:
+        entry = leg.get("price") if leg.get("price") is not None else leg.get("premium")
+        return kind, 0.0, quantity, _number(entry)
+    strike = _number(leg.get("strike"), np.nan)
+    if not strike > 0:
+        return None
+    return kind, strike, quantity, _number(leg.get("premium"))
+
+
+def leg_arrays(strategies: list[list[dict[str, Any]]]) -> dict[str, np.ndarray]:
+    """Pack strategies (lists of leg dicts) into padded (N, L) kind/strike/quantity/premium arrays."""
+    parsed = [[p for p in map(_parse_leg, legs or []) if p is not None] for legs in strategies]
+    width = max((len(legs) for legs in parsed), default=0)
+    table = np.zeros((len(parsed), max(1, width), 4))
+    for row, legs in enumerate(parsed):
+        if legs:
+            table[row, : len(legs)] = legs
+    return {
+        "kind": table[:, :, 0].astype(int),
+        "strike": table[:, :, 1],
+        "quantity": table[:, :, 2],
+        "premium": table[:, :, 3],
+    }
+
+
+def _pnl(arrays: dict[str, np.ndarray], prices: np.ndarray) -> np.ndarray:
+    """P&L of every strategy at prices of shape (N, M) -> (N, M)."""
+    kind = arrays["kind"][:, :, None]
+    strike = arrays["strike"][:, :, None]
+    s = prices[:, None, :]
+    value = np.where(
+        kind == CALL,
+        np.maximum(s - strike, 0.0),
+        np.where(kind == PUT, np.maximum(strike - s, 0.0), s),
+    )
+    return np.sum(arrays["quantity"][:, :, None] * (value - arrays["premium"][:, :, None]), axis=1)
+
+
+def payoff_at(arrays: dict[str, np.ndarray], prices: Any) -> np.ndarray:
+    """P&L curve (N, M) on a price grid: one grid (M,) shared by all strategies, or one per row (N, M)."""
+    prices = np.asarray(prices, dtype=float)
+    if prices.ndim == 1:
+        prices = np.broadcast_to(prices, (len(arrays["kind"]), len(prices)))
+    return _pnl(arrays, prices)
+
+
+def net_cash_flow(arrays: dict[str, np.ndarray]) -> np.ndarray:
+    """Premium received (+) or paid (-) at entry, per strategy."""
+    return 0.0 - np.sum(arrays["quantity"] * arrays["premium"], axis=1)
+
+
+def analyze(arrays: dict[str, np.ndarray]) -> dict[str, np.ndarray]:
+    """Exact max_profit, max_loss and breakevens for every strategy.
+
+    Returns (N,) max_profit / max_loss arrays (+inf / -inf when unbounded) and an
+    (N, K) breakevens array sorted ascending and NaN padded.
+    """
+    kind, strike, quantity = arrays["kind"], arrays["strike"], arrays["quantity"]
+    # Kinks: every option strike plus 0 (stock and padded legs sit at strike 0)
+    kinks = np.sort(np.where(kind == STOCK, 0.0, strike), axis=1)
+    kinks = np.concatenate([np.zeros((len(kinks), 1)), kinks], axis=1)
+    values = _pnl(arrays, kinks)
+    # Beyond the highest strike only calls and stock still move with the price
+    slope = np.sum(np.where(kind == PUT, 0.0, quantity), axis=1)
+
+    max_profit = np.where(slope > 0, np.inf, values.max(axis=1))
+    max_loss = np.where(slope < 0, -np.inf, values.min(axis=1))
+
+    left, right = values[:, :-1], values[:, 1:]
+    x0, x1 = kinks[:, :-1], kinks[:, 1:]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        crossing = np.where(left * right < 0, x0 + left * (x1 - x0) / (left - right), np.nan)
+        # A kink that lands exactly on zero counts once, from the segment it closes
+        crossing = np.where((right == 0) & (left != 0), x1, crossing)
+        last = values[:, -1]
+        tail = np.where((last != 0) & (last * slope < 0), kinks[:, -1] - last / slope, np.nan)
+    breakevens = np.sort(np.concatenate([crossing, tail[:, None]], axis=1), axis=1)
+    keep = max(1, int((~np.isnan(breakevens)).sum(axis=1).max(initial=0)))
+    return {"max_profit": max_profit, "max_loss": max_loss, "breakevens": breakevens[:, :keep]}
+
+
+def strategy_payoff(legs: list[dict[str, Any]]) -> dict[str, Any]:
+    """Exact expiration metrics for one strategy as plain Python values.
+
+    Keys: max_profit, max_loss (floats, +/-inf when unbounded), breakeven_points
+    (ascending list) and net_cash_flow.
+    """
+    arrays = leg_arrays([legs])
+    result = analyze(arrays)
+    breakevens = result["breakevens"][0]
+    return {
+        "max_profit": float(result["max_profit"][0]),
+        "max_loss": float(result["max_loss"][0]),
+        "breakeven_points": [float(b) for b in breakevens[~np.isnan(breakevens)]],
+        "net_cash_flow": float(net_cash_flow(arrays)[0]),
+    }
+
+
+def summary_metrics(strategy_summary: dict[str, Any]) -> dict[str, Any]:
+    """``strategy_metrics`` of a strategy summary with exact payoff figures from its legs.
+
+    The frontend derives max profit/loss and breakevens from a sampled +/-30% price
+    grid, which clips unbounded strategies at the grid edge. When the summary has
+    usable legs their exact max_profit, max_loss and breakeven_points replace the
+    sampled ones (other keys are kept); otherwise the metrics are returned as sent.
+    """
+    metrics = strategy_summary.get("strategy_metrics")
+    metrics = dict(metrics) if isinstance(metrics, dict) else {}
+    legs = strategy_summary.get("legs")
+    if not isinstance(legs, list) or not any(_parse_leg(leg) for leg in legs):
+        return metrics
+    payoff = strategy_payoff(legs)
+    metrics.update(
+        max_profit=payoff["max_profit"],
+        max_loss=payoff["max_loss"],
+        breakeven_points=payoff["breakeven_points"],
+    )
+    return metrics
+
+
+def format_pnl(value: float) -> str:
+    """Prompt text for a max profit/loss figure: "1,234.50", or "Unlimited" when unbounded."""
+    return "Unlimited" if np.isinf(value) else f"{value:,.2f}"
+
+
+def finite_or_text(value: float) -> float | str:
+    """JSON-safe max profit/loss: the number, or "Unlimited" (the engine's convention) when unbounded."""
+    return "Unlimited" if np.isinf(value) else value
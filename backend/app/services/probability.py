@@ -0,0 +1,264 @@
+"""Probability of profit and expected value under a lognormal underlying.
+
+The engine's POP figures are rules of thumb (``1 - |short call delta| - |short put
+delta|`` for condors, fixed 0.60-0.65 for spreads, 0.30 for straddles). Here the
+expiration payoff (payoff.py) is integrated against the terminal distribution of
+the underlying, S_T = S0 * exp((r - q - vol^2 / 2) T + vol * sqrt(T) * Z), with vol
+taken from the chain's implied volatility:
+
+- ``closed_form``: exact POP (lognormal probability mass of the price intervals
+  between breakevens where P&L > 0) and expected value (Black-Scholes forward value
+  of each leg minus its premium). Hold-to-expiration only.
+- ``monte_carlo``: simulated paths for path-dependent exit rules (take profit at a
+  share of max profit, stop loss at a share of max loss). Positions are marked with
+  Black-Scholes at every check; paths use antithetic pairs and a seedable RNG, and
+  every strategy in a batch sees the same shocks (common random numbers), so
+  candidates are compared on equal footing.
+- ``evaluate``: closed form when there is no exit rule, Monte Carlo otherwise.
+
+Everything takes the (N, L) leg arrays from ``payoff.leg_arrays`` and returns (N,)
+arrays, so thousands of candidates are scored in one call. Like payoff.py, amounts
+are per share times quantity and undiscounted.
+"""
+
+import math
+from typing import Any
+
+import numpy as np
+from scipy import sparse
+from scipy.special import ndtr
+
+from app.services import payoff
+from app.services.black_scholes import implied_volatility
+from app.services.option_chain import OptionChain
+
+# Monte Carlo defaults: paths (rounded up to an even number for antithetic pairs) and
+# the cap on mark-to-market checks (one per calendar day up to this many)
+DEFAULT_PATHS = 2000
+MAX_STEPS = 60
+
+
+def _column(value: Any, n: int) -> np.ndarray:
+    """Scalar or (N,) input as an (N, 1) float column."""
+    return np.broadcast_to(np.asarray(value, dtype=float), (n,)).reshape(n, 1)
+
+
+def terminal_cdf(
+    prices: Any, spot: Any, years: Any, vol: Any, rate: float = 0.0, dividend_yield: float = 0.0
+) -> np.ndarray:
+    """P(S_T <= price) under the lognormal model (0 at price 0, 1 at +inf)."""
+    prices = np.asarray(prices, dtype=float)
+    sd = np.maximum(np.asarray(vol, dtype=float) * np.sqrt(years), 1e-12)
+    mean = np.log(spot) + (rate - dividend_yield - 0.5 * np.asarray(vol, dtype=float) ** 2) * years
+    with np.errstate(divide="ignore"):
+        return ndtr((np.log(prices) - mean) / sd)
+
+
+def _forward_values(
+    kind: np.ndarray, strike: np.ndarray, forward: np.ndarray, sd: np.ndarray
+) -> np.ndarray:
+    """Undiscounted expected leg value at expiration: E[(S-K)+], E[(K-S)+] or E[S]."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        d1 = (np.log(forward / strike) + 0.5 * sd * sd) / sd
+        d2 = d1 - sd
+        call = forward * ndtr(d1) - strike * ndtr(d2)
+        put = strike * ndtr(-d2) - forward * ndtr(-d1)
+    has_strike = strike > 0
+    call = np.where(has_strike, call, forward)
+    put = np.where(has_strike, put, 0.0)
+    forward = np.broadcast_to(forward, kind.shape)
+    return np.where(kind == payoff.CALL, call, np.where(kind == payoff.PUT, put, forward))
+
+
+def closed_form(
+    arrays: dict[str, np.ndarray],
+    spot: float,
+    years: Any,
+    vol: Any,
+    rate: float = 0.0,
+    dividend_yield: float = 0.0,
+) -> dict[str, np.ndarray]:
+    """Exact hold-to-expiration POP and expected value for every strategy.
+
+    Args:
+        arrays: Leg arrays from payoff.leg_arrays (N strategies)
+        spot: Underlying price
+        years: Time to expiration, scalar or (N,)
+        vol: Lognormal volatility (decimal), scalar or (N,)
+
+    Returns:
+        {"pop": (N,), "expected_value": (N,)}
+    """
+    n = len(arrays["kind"])
+    years, vol = _column(years, n), _column(vol, n)
+    sd = np.maximum(vol * np.sqrt(years), 1e-12)
+    forward = spot * np.exp((rate - dividend_yield) * years)
+    values = _forward_values(arrays["kind"], arrays["strike"], forward, sd)
+    expected_value = np.sum(arrays["quantity"] * (values - arrays["premium"]), axis=1)
+
+    # P&L has one sign between consecutive breakevens: test one price per interval
+    breakevens = payoff.analyze(arrays)["breakevens"]
+    edges = np.concatenate([np.zeros((n, 1)), np.nan_to_num(breakevens, nan=np.inf), np.full((n, 1), np.inf)], axis=1)
+    left, right = edges[:, :-1], edges[:, 1:]
+    probe = np.where(np.isinf(right), left * 1.5 + 1.0, (left + right) / 2.0)
+    probe = np.where(np.isinf(left), 0.0, probe)
+    profitable = (payoff.payoff_at(arrays, probe) > 0) & ~np.isinf(left)
+    mass = terminal_cdf(right, spot, years, vol, rate, dividend_yield) - terminal_cdf(
+        left, spot, years, vol, rate, dividend_yield
+    )
+    pop = np.clip(np.sum(np.where(profitable, mass, 0.0), axis=1), 0.0, 1.0)
+    return {"pop": pop, "expected_value": expected_value}
+
+
+def _mark(kind: np.ndarray, strike: np.ndarray, s: np.ndarray, tau: float, vol: float, rate: float, q: float) -> np.ndarray:
+    """Black-Scholes value of legs (M, 1) at prices (P,) -> (M, P); intrinsic at tau = 0."""
+    if tau <= 0:
+        call, put = np.maximum(s - strike, 0.0), np.maximum(strike - s, 0.0)
+    else:
+        sd = vol * math.sqrt(tau)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            d1 = (np.log(s / strike) + (rate - q) * tau + 0.5 * sd * sd) / sd
+            d2 = d1 - sd
+        disc_s = s * math.exp(-q * tau)
+        disc_k = strike * math.exp(-rate * tau)
+        call = disc_s * ndtr(d1) - disc_k * ndtr(d2)
+        put = disc_k * ndtr(-d2) - disc_s * ndtr(-d1)
+    return np.where(kind == payoff.CALL, call, np.where(kind == payoff.PUT, put, s))
+
+
+def monte_carlo(
+    arrays: dict[str, np.ndarray],
+    spot: float,
+    years: float,
+    vol: Any,
+    take_profit: float | None = None,
+    stop_loss: float | None = None,
+    rate: float = 0.0,
+    dividend_yield: float = 0.0,
+    paths: int = DEFAULT_PATHS,
+    steps: int | None = None,
+    seed: int | None = None,
+) -> dict[str, np.ndarray]:
+    """POP and expected value with early exits, by simulation.
+
+    A position is closed at the first check where its marked P&L reaches
+    take_profit x max profit, or falls to stop_loss x max loss (both fractions,
+    e.g. 0.5; None disables the rule, and a rule on an unbounded side never fires).
+    Otherwise it is held to expiration.
+
+    The simulation steps through time: at each check every distinct leg of the batch
+    (kind, strike) is marked once on all paths, and strategy P&L is a sparse
+    quantity-matrix product, so cost grows with distinct strikes, not strategies x legs.
+
+    Args:
+        arrays: Leg arrays from payoff.leg_arrays (N strategies)
+        spot: Underlying price
+        years: Time to expiration (shared by the batch: one path grid)
+        vol: Volatility for paths and marks, scalar or (N,)
+        paths: Simulated paths (antithetic pairs)
+        steps: Mark-to-market checks (default one per day, at most MAX_STEPS)
+        seed: RNG seed (same seed, same result)
+
+    Returns:
+        {"pop": (N,), "expected_value": (N,), "exit_rate": (N,)} where exit_rate is
+        the share of paths closed early.
+    """
+    n = len(arrays["kind"])
+    steps = steps or max(1, min(MAX_STEPS, math.ceil(years * 365)))
+    half = max(1, (paths + 1) // 2)
+    shocks = np.random.default_rng(seed).standard_normal((half, steps))
+    shocks = np.concatenate([shocks, -shocks])
+    dt = years / steps
+    walk = np.cumsum(shocks, axis=1) * math.sqrt(dt)  # Brownian motion at each check
+
+    analysis = payoff.analyze(arrays)
+    max_profit, max_loss = analysis["max_profit"], analysis["max_loss"]
+    target = np.full(n, np.inf)
+    if take_profit is not None:
+        bounded = np.isfinite(max_profit) & (max_profit > 0)
+        target[bounded] = take_profit * max_profit[bounded]
+    floor = np.full(n, -np.inf)
+    if stop_loss is not None:
+        bounded = np.isfinite(max_loss) & (max_loss < 0)
+        floor[bounded] = stop_loss * max_loss[bounded]
+    cost = np.sum(arrays["quantity"] * arrays["premium"], axis=1)
+    vol = np.broadcast_to(np.asarray(vol, dtype=float), (n,))
+
+    out = {name: np.zeros(n) for name in ("pop", "expected_value", "exit_rate")}
+    # Strategies sharing a volatility share price paths and leg marks
+    for sigma in np.unique(vol):
+        rows = np.flatnonzero(vol == sigma)
+        kind, strike = arrays["kind"][rows], arrays["strike"][rows]
+        quantity = arrays["quantity"][rows]
+        legs, leg_index = np.unique(np.stack([kind.ravel(), strike.ravel()], axis=1), axis=0, return_inverse=True)
+        weights = sparse.csr_matrix(
+            (quantity.ravel(), (np.repeat(np.arange(len(rows)), kind.shape[1]), leg_index.ravel())),
+            shape=(len(rows), len(legs)),
+        )
+        weights = weights.astype(np.float32)
+        leg_kind, leg_strike = legs[:, :1].astype(int), legs[:, 1:]
+        group_cost = cost[rows, None].astype(np.float32)
+        group_target = target[rows, None].astype(np.float32)
+        group_floor = floor[rows, None].astype(np.float32)
+        final = np.zeros((len(rows), len(shocks)), dtype=np.float32)
+        open_ = np.ones(final.shape, dtype=bool)
+        for step in range(steps - 1):
+            elapsed = dt * (step + 1)
+            prices = spot * np.exp((rate - dividend_yield - 0.5 * sigma**2) * elapsed + sigma * walk[:, step])
+            marks = _mark(leg_kind, leg_strike, prices, years - elapsed, sigma, rate, dividend_yield)
+            pnl = weights @ marks.astype(np.float32) - group_cost
+            close = (pnl >= group_target) | (pnl <= group_floor)
+            close &= open_
+            np.copyto(final, pnl, where=close)
+            open_ &= ~close
+        out["exit_rate"][rows] = 1.0 - open_.mean(axis=1)
+        # Positions still open are held to expiration
+        prices = spot * np.exp((rate - dividend_yield - 0.5 * sigma**2) * years + sigma * walk[:, -1])
+        pnl = weights @ _mark(leg_kind, leg_strike, prices, 0.0, sigma, rate, dividend_yield).astype(np.float32) - group_cost
+        np.copyto(final, pnl, where=open_)
+        out["pop"][rows] = (final > 0).mean(axis=1)
+        out["expected_value"][rows] = final.mean(axis=1, dtype=np.float64)
+    return out
+
+
+def evaluate(
+    arrays: dict[str, np.ndarray],
+    spot: float,
+    years: float,
+    vol: Any,
+    take_profit: float | None = None,
+    stop_loss: float | None = None,
+    rate: float = 0.0,
+    dividend_yield: float = 0.0,
+    seed: int | None = None,
+) -> dict[str, np.ndarray]:
+    """Closed form for hold-to-expiration, Monte Carlo when an exit rule is set."""
+    if take_profit is None and stop_loss is None:
+        return closed_form(arrays, spot, years, vol, rate, dividend_yield)
+    return monte_carlo(
+        arrays, spot, years, vol, take_profit, stop_loss, rate, dividend_yield, seed=seed
+    )
+
+
+def atm_volatility(chain: OptionChain, spot: float, years: float, rate: float = 0.0) -> float | None:
+    """Implied volatility at the money: chain IV interpolated at spot, averaged over calls and puts.
+
+    A side without IV values gets it solved from the mids of the two strikes around
+    spot. None when neither side yields a volatility.
+    """
+    vols = []
+    for side, is_call in ((chain.calls, True), (chain.puts, False)):
+        if len(side) == 0:
+            continue
+        strikes, iv = side.strikes, side.column("implied_vol")
+        known = iv > 0
+        if not known.any():
+            nearest = np.argsort(np.abs(strikes - spot))[:2]
+            mid = side.mid[nearest]
+            iv = np.full(len(strikes), np.nan)
+            iv[nearest] = implied_volatility(mid, spot, strikes[nearest], years, is_call, rate)
+            known = iv > 0
+            if not known.any():
+                continue
+        vols.append(float(np.interp(spot, strikes[known], iv[known])))
+    return float(np.mean(vols)) if vols else None
@@ -0,0 +1,285 @@
+"""Daily quota counters (AI units, images, Company Data queries) in Redis.
+
+Each user has one hash per UTC day, ``quota:<YYYYMMDD>:<user_id>``, with the fields
+ai / image / fundamental. It expires two days later, so a new day starts from zero
+without a reset job. Check-and-increment and refunds are single Lua scripts, so
+concurrent requests on any replica cannot overshoot a limit or refund below zero.
+
+The first touch of a day seeds the hash from the user's Postgres columns when they
+are for that day (last_quota_reset_date), otherwise from zero. Changed counters are
+recorded in a dirty set. A background flusher copies them to users.daily_* and
+last_quota_reset_date every QUOTA_FLUSH_INTERVAL_SECONDS (durability, admin views,
+analytics). It pops members atomically, so running it in every API process is safe.
+
+While Redis is unavailable the functions return None/False and callers fall back to
+the Postgres counters (see the quota helpers in app/api/endpoints/ai.py).
+"""
+
+import asyncio
+import logging
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Any
+
+from sqlalchemy import bindparam, or_, update
+
+from app.core.config import settings
+from app.db.models import User
+from app.db.session import AsyncSessionLocal
+from app.services.cache import CacheService, cache_service
+from app.services.user_context import UserContext, apply_user_fields
+
+logger = logging.getLogger(__name__)
+
+# Quota kind -> User column holding its flushed counter (hash fields use the kind)
+QUOTA_COLUMNS: dict[str, str] = {
+    "ai": "daily_ai_usage",
+    "image": "daily_image_usage",
+    "fundamental": "daily_fundamental_queries_used",
+}
+QUOTA_KEY_PREFIX = "quota:"
+DIRTY_KEY = "quota:dirty"  # Members: "<YYYYMMDD>:<user_id>"
+COUNTER_TTL = 2 * 86400  # Outlives the day so the last increments can still be flushed
+FLUSH_BATCH = 500
+
+# KEYS[1] = day hash, KEYS[2] = dirty set
+# ARGV = field, amount, limit (-1 = none), ttl, dirty member, seed ai, seed image, seed fundamental
+# Returns {granted (1/0), ai, image, fundamental}. Amount 0 only reads (seeding the hash if new).
+_RESERVE_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  redis.call('HSET', KEYS[1], 'ai', ARGV[6], 'image', ARGV[7], 'fundamental', ARGV[8])
+  redis.call('EXPIRE', KEYS[1], ARGV[4])
+end
+local amount = tonumber(ARGV[2])
+local limit = tonumber(ARGV[3])
+local granted = 1
+if amount > 0 then
+  local used = tonumber(redis.call('HGET', KEYS[1], ARGV[1]))
+  if limit >= 0 and used + amount > limit then
+    granted = 0
+  else
+    redis.call('HINCRBY', KEYS[1], ARGV[1], amount)
+    redis.call('SADD', KEYS[2], ARGV[5])
+  end
+end
+local counts = redis.call('HMGET', KEYS[1], 'ai', 'image', 'fundamental')
+return {granted, tonumber(counts[1]), tonumber(counts[2]), tonumber(counts[3])}
+"""
+
+# KEYS[1] = day hash, KEYS[2] = dirty set; ARGV = field, amount, dirty member
+# Returns the counter after the refund (never below zero), -1 if the day has no hash.
+_REFUND_LUA = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+  return -1
+end
+local used = tonumber(redis.call('HGET', KEYS[1], ARGV[1])) or 0
+local amount = math.min(tonumber(ARGV[2]), used)
+if amount > 0 then
+  used = redis.call('HINCRBY', KEYS[1], ARGV[1], -amount)
+  redis.call('SADD', KEYS[2], ARGV[3])
+end
+return used
+"""
+
+_users = User.__table__
+# Executed with one parameter set per user; never overwrites counters of a later day
+_FLUSH_STMT = (
+    update(_users)
+    .where(
+        _users.c.id == bindparam("user_id"),
+        or_(_users.c.last_quota_reset_date.is_(None), _users.c.last_quota_reset_date < bindparam("next_day")),
+    )
+    .values(
+        daily_ai_usage=bindparam("ai"),
+        daily_image_usage=bindparam("image"),
+        daily_fundamental_queries_used=bindparam("fundamental"),
+        last_quota_reset_date=bindparam("day_start"),
+    )
+)
+
+
+def quota_day() -> date:
+    """Current quota day (UTC)."""
+    return datetime.now(timezone.utc).date()
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def _member(day: date, user_id: uuid.UUID) -> str:
+    return f"{day:%Y%m%d}:{user_id}"
+
+
+def quota_key(day: date, user_id: uuid.UUID) -> str:
+    return f"{QUOTA_KEY_PREFIX}{_member(day, user_id)}"
+
+
+def _seeds(user: User | UserContext, day: date) -> list[int]:
+    """Counters to start day's hash from: the user's columns if they are for day, else zeros."""
+    reset = user.last_quota_reset_date
+    if reset is None or reset.astimezone(timezone.utc).date() != day:
+        return [0] * len(QUOTA_COLUMNS)
+    return [int(getattr(user, column) or 0) for column in QUOTA_COLUMNS.values()]
+
+
+def current_usage(user: User | UserContext) -> dict[str, int]:
+    """Today's counters by column, from the user's flushed columns (zeros if from an earlier day).
+
+    Lags the Redis counters by up to one flush interval; meant for display (admin views).
+    """
+    return dict(zip(QUOTA_COLUMNS.values(), _seeds(user, quota_day())))
+
+
+class QuotaCounters:
+    """Redis-resident daily quota counters with a Postgres flusher (see module docstring)."""
+
+    def __init__(self, cache: CacheService) -> None:
+        self._cache = cache
+        self._scripts: dict[str, Any] = {}
+        self._flusher: asyncio.Task | None = None
+        self._stats = {"granted": 0, "rejected": 0, "refunds": 0, "flushed": 0, "redis_unavailable": 0}
+
+    async def _run(self, lua: str, keys: list[str], args: list[Any]) -> Any | None:
+        """Run a script; None if Redis is unavailable."""
+        if not await self._cache._ensure_connected():
+            self._stats["redis_unavailable"] += 1
+            return None
+        try:
+            script = self._scripts.get(lua)
+            if script is None:
+                script = self._scripts[lua] = self._cache._redis.register_script(lua)
+            return await script(keys=keys, args=args)
+        except Exception as e:
+            logger.warning(f"Quota counters: Redis error, falling back to Postgres: {e}")
+            self._scripts.clear()
+            self._stats["redis_unavailable"] += 1
+            return None
+
+    async def reserve(
+        self, user: User | UserContext, kind: str, amount: int, limit: int | None = None
+    ) -> bool | None:
+        """
+        Atomically add amount to today's counter unless it would exceed limit.
+
+        Today's counters are copied onto user either way.
+
+        Returns:
+            True if reserved, False if over the limit, None if Redis is unavailable
+        """
+        day = quota_day()
+        result = await self._run(
+            _RESERVE_LUA,
+            [quota_key(day, user.id), DIRTY_KEY],
+            [kind, amount, -1 if limit is None else limit, COUNTER_TTL, _member(day, user.id), *_seeds(user, day)],
+        )
+        if result is None:
+            return None
+        granted, *counts = (int(value) for value in result)
+        apply_user_fields(
+            user,
+            {**dict(zip(QUOTA_COLUMNS.values(), counts)), "last_quota_reset_date": _day_start(day)},
+        )
+        if amount > 0:
+            self._stats["granted" if granted else "rejected"] += 1
+        return bool(granted)
+
+    async def load_usage(self, user: User | UserContext) -> bool:
+        """Copy today's counters onto user; False if Redis is unavailable."""
+        return await self.reserve(user, "ai", 0) is not None
+
+    async def refund(self, user_id: uuid.UUID, kind: str, amount: int, day: date) -> bool:
+        """
+        Give back units reserved on day (that day's counter, not below zero).
+
+        Returns:
+            False if Redis is unavailable or has no counters for day (the reservation was
+            made in Postgres, or the hash expired): the caller refunds in Postgres then
+        """
+        result = await self._run(
+            _REFUND_LUA, [quota_key(day, user_id), DIRTY_KEY], [kind, amount, _member(day, user_id)]
+        )
+        if result is None or int(result) < 0:
+            return False
+        self._stats["refunds"] += 1
+        return True
+
+    async def flush(self) -> int:
+        """Write dirty counters to Postgres; returns the number of users written."""
+        if not await self._cache._ensure_connected():
+            return 0
+        redis = self._cache._redis
+        flushed = 0
+        while True:
+            members = await redis.spop(DIRTY_KEY, FLUSH_BATCH)
+            if not members:
+                return flushed
+            try:
+                rows = await self._dirty_rows(redis, members)
+                if rows:
+                    async with AsyncSessionLocal() as session:
+                        await session.execute(_FLUSH_STMT, rows)
+                        await session.commit()
+            except Exception:
+                # Put them back for the next run
+                await redis.sadd(DIRTY_KEY, *members)
+                raise
+            flushed += len(rows)
+            self._stats["flushed"] += len(rows)
+
+    async def _dirty_rows(self, redis: Any, members: list[str]) -> list[dict[str, Any]]:
+        parsed = []
+        for member in members:
+            day_str, _, user_id = member.partition(":")
+            try:
+                parsed.append((datetime.strptime(day_str, "%Y%m%d").date(), uuid.UUID(user_id)))
+            except ValueError:
+                logger.warning(f"Quota counters: dropping malformed dirty member {member!r}")
+        async with redis.pipeline(transaction=False) as pipe:
+            for day, user_id in parsed:
+                pipe.hmget(quota_key(day, user_id), *QUOTA_COLUMNS)
+            counters = await pipe.execute()
+        rows = []
+        for (day, user_id), counts in zip(parsed, counters):
+            if counts[0] is None:
+                continue  # Hash expired; nothing left to write
+            rows.append({
+                "user_id": user_id,
+                **{kind: int(value or 0) for kind, value in zip(QUOTA_COLUMNS, counts)},
+                "day_start": _day_start(day),
+                "next_day": _day_start(day + timedelta(days=1)),
+            })
+        return rows
+
+    async def start_flusher(self) -> None:
+        """Start the background task that flushes counters every QUOTA_FLUSH_INTERVAL_SECONDS."""
+        if self._flusher is None:
+            self._flusher = asyncio.create_task(self._flush_loop())
+
+    async def stop_flusher(self) -> None:
+        """Stop the flusher and write what is pending (call before the cache disconnects)."""
+        task, self._flusher = self._flusher, None
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        try:
+            await self.flush()
+        except Exception as e:
+            logger.warning(f"Final quota flush failed (counters stay in Redis): {e}")
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(settings.quota_flush_interval_seconds)
+            try:
+                await self.flush()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Quota flush failed (will retry): {e}")
+
+    def stats(self) -> dict[str, Any]:
+        return {**self._stats, "flusher_running": self._flusher is not None}
+
+
+# Global instance
+quota_counters = QuotaCounters(cache_service)
@@ -14,6 +14,8 @@ from app.services.tiger_service import tiger_service
 logger = logging.getLogger(__name__)
 
 MIN_MOVE_PCT = 5.0
+# Latest movers, read by the chain prefetcher to warm their option chains
+RADAR_MOVERS_KEY = "prefetch:radar_movers"
 _US_EASTERN = pytz.timezone("US/Eastern")
 
 
@@ -38,7 +40,7 @@ def _format_alert(symbol: str, change_percent: float, price: float | None) -> st
     )
 
 
-def _is_us_market_hours() -> bool:
+def is_us_market_hours() -> bool:
     """Return True if current time is roughly within US regular trading hours (9:00-16:30 ET, Mon-Fri)."""
     now_et = datetime.now(_US_EASTERN)
     if now_et.weekday() >= 5:  # Sat/Sun
@@ -68,7 +70,7 @@ async def scan_and_alert() -> None:
         logger.debug("Radar: Telegram not configured. Skip scan_and_alert.")
         return
 
-    if not _is_us_market_hours():
+    if not is_us_market_hours():
         logger.debug("Radar: outside US market hours. Skip scan_and_alert.")
         return
 
@@ -107,6 +109,10 @@ async def scan_and_alert() -> None:
         except Exception as e:
             logger.warning("Radar: top_losers scan failed: %s", e, exc_info=True)
 
+        movers = [(s.get("symbol") or "").upper() for s in gainers + losers]
+        if any(movers):
+            await cache_service.set(RADAR_MOVERS_KEY, [m for m in movers if m], ttl=3600)
+
         sent = 0
         for s in gainers + losers:
             symbol = (s.get("symbol") or "").upper()
@@ -1,59 +1,26 @@
 """APScheduler configuration for scheduled tasks."""
 
 import logging
-import pytz
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
-from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
-from sqlalchemy import update
 
-from app.db.models import User
-from app.db.session import AsyncSessionLocal
 from app.core.config import settings
 from app.services.radar_service import scan_and_alert
+from app.services.tiger_rate_limiter import TigerPriority, tiger_priority
 
 logger = logging.getLogger(__name__)
 
 # Initialize Scheduler
 scheduler = AsyncIOScheduler()
 
-# Define Timezones
-UTC = pytz.UTC
-
-
-async def reset_daily_ai_usage() -> None:
-    """
-    Reset daily_ai_usage and daily_image_usage to 0 for all users.
-    Runs at 00:00 UTC daily.
-    """
-    async with AsyncSessionLocal() as session:
-        try:
-            stmt = update(User).values(
-                daily_ai_usage=0,
-                daily_image_usage=0,
-                daily_fundamental_queries_used=0,
-            )
-            await session.execute(stmt)
-            await session.commit()
-            logger.info("✅ Daily AI usage and image usage quota reset for all users.")
-        except Exception as e:
-            logger.error(f"❌ Failed to reset daily AI usage: {e}", exc_info=True)
-            await session.rollback()
-
 
 def setup_scheduler() -> None:
     """Configure and start the scheduler jobs."""
     
-    # Job 1: Reset Quota (00:00 UTC)
-    # This ensures global users get fresh quota every 24h
-    scheduler.add_job(
-        reset_daily_ai_usage,
-        trigger=CronTrigger(hour=0, minute=0, timezone=UTC),
-        id="reset_ai_usage",
-        replace_existing=True,
-    )
+    # Daily quotas need no reset job: the Redis counters are keyed per UTC day
+    # (app/services/quota_counters.py).
 
-    # Job 2: Alpha Radar — scan top gainers/losers and push Telegram alerts every 30 min
+    # Job 1: Alpha Radar — scan top gainers/losers and push Telegram alerts every 30 min
     # Wrapped with Redis distributed lock to prevent duplicate alerts in multi-replica deployments
     async def _radar_with_lock() -> None:
         from app.services.cache import cache_service
@@ -73,7 +40,8 @@ def setup_scheduler() -> None:
             # Redis error — fail-closed: better to skip one scan than send duplicates
             logger.warning("Radar: Redis lock error (%s), skipping to avoid duplicates.", e)
             return
-        await scan_and_alert()
+        with tiger_priority(TigerPriority.BACKGROUND):
+            await scan_and_alert()
 
     scheduler.add_job(
         _radar_with_lock,
@@ -82,7 +50,21 @@ def setup_scheduler() -> None:
         replace_existing=True,
     )
 
-    logger.info("Scheduler configured: Quota Reset + Alpha Radar (30 min).")
+    # Job 2: Option chain prefetch — re-warm the most requested chains before they go stale.
+    # Single replica via Redis lock inside prefetch_hot_chains; US market hours only.
+    if settings.enable_chain_prefetch:
+        from app.services.chain_prefetcher import prefetch_hot_chains
+
+        scheduler.add_job(
+            prefetch_hot_chains,
+            trigger=IntervalTrigger(minutes=settings.chain_prefetch_interval_minutes),
+            id="chain_prefetch",
+            replace_existing=True,
+            max_instances=1,
+            coalesce=True,
+        )
+
+    logger.info("Scheduler configured: Alpha Radar (30 min) + Chain Prefetch.")
 
 
 def start_scheduler() -> None:
@@ -0,0 +1,144 @@
+"""Single-flight coalescing of concurrent upstream fetches (Tiger, FMP).
+
+When a hot cache key expires, every concurrent request misses at once. SingleFlight
+makes sure exactly one fetch runs per key:
+
+- In-process: the first caller starts the fetch as a task; concurrent callers for
+  the same key await that task instead of starting their own.
+- Across replicas: the in-process leader takes a Redis lock (CacheService.acquire_lock).
+  If another replica holds it, we wait for that replica to fill the value instead of
+  fetching. The value is read from ``fill_key`` (the regular cache key, when the fetch
+  writes it) or from a short-lived result key written by the leader.
+
+If Redis is unavailable, or the remote leader finishes without filling (error / lock
+expiry), the caller fetches itself, so coalescing never turns into an outage.
+Results shared with followers are shallow-copied; nested data must not be mutated.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable
+
+from app.services.cache import CacheService, _shallow_copy, cache_service
+
+logger = logging.getLogger(__name__)
+
+_LOCK_PREFIX = "singleflight:lock:"
+_RESULT_PREFIX = "singleflight:result:"
+
+
+class SingleFlight:
+    """Coalesce concurrent fetches by key, in-process and across replicas."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        lock_ttl: int = 30,
+        result_ttl: int = 15,
+        poll_interval: float = 0.1,
+    ) -> None:
+        """
+        Args:
+            cache: Cache service providing locks and value storage
+            lock_ttl: Redis lock TTL (seconds); also the longest we wait on another replica
+            result_ttl: TTL of the result key used when no fill_key is given
+            poll_interval: Seconds between checks while waiting on another replica
+        """
+        self._cache = cache
+        self._lock_ttl = lock_ttl
+        self._result_ttl = result_ttl
+        self._poll_interval = poll_interval
+        self._inflight: dict[str, asyncio.Task] = {}
+        self._stats = {"leader": 0, "coalesced": 0, "remote_filled": 0, "remote_fallback": 0}
+
+    async def do(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        fill_key: str | None = None,
+        distributed: bool = True,
+    ) -> Any:
+        """
+        Run fetch() once per key among all concurrent callers and return its result.
+
+        Args:
+            key: Coalescing key (normally the cache key of the fetched value)
+            fetch: Coroutine factory doing the upstream call
+            fill_key: Cache key the fetch writes its result to; other replicas poll it.
+                When None, the leader stores the result under a short-lived result key.
+            distributed: Also coalesce across replicas via Redis (in-process only if False)
+
+        Returns:
+            The fetch result (exceptions from the fetch propagate to every waiter)
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            self._stats["leader"] += 1
+            task = asyncio.create_task(self._lead(key, fetch, fill_key, distributed))
+            self._inflight[key] = task
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self._stats["coalesced"] += 1
+        # Shield so a cancelled caller does not cancel the fetch others are waiting on
+        return _shallow_copy(await asyncio.shield(task))
+
+    def _done(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # Mark retrieved: all waiters may have been cancelled
+
+    async def _lead(
+        self,
+        key: str,
+        fetch: Callable[[], Awaitable[Any]],
+        fill_key: str | None,
+        distributed: bool,
+    ) -> Any:
+        if not distributed:
+            return await fetch()
+
+        lock_key = f"{_LOCK_PREFIX}{key}"
+        token = await self._cache.acquire_lock(lock_key, ttl=self._lock_ttl)
+        if token:
+            try:
+                result = await fetch()
+                if fill_key is None and result is not None:
+                    await self._cache.set(f"{_RESULT_PREFIX}{key}", result, ttl=self._result_ttl)
+                return result
+            finally:
+                await self._cache.release_lock(lock_key, token)
+
+        # Another replica is fetching: wait for its value rather than calling upstream again
+        poll_key = fill_key or f"{_RESULT_PREFIX}{key}"
+        deadline = time.monotonic() + self._lock_ttl
+        while time.monotonic() < deadline:
+            value = await self._cache.get(poll_key)
+            if value is not None:
+                self._stats["remote_filled"] += 1
+                return value
+            if not await self._cache.lock_held(lock_key):
+                # Leader finished without a value, lock expired, or Redis is down: check once more
+                value = await self._cache.get(poll_key)
+                if value is not None:
+                    self._stats["remote_filled"] += 1
+                    return value
+                break
+            await asyncio.sleep(self._poll_interval)
+
+        self._stats["remote_fallback"] += 1
+        logger.debug(f"Single-flight: no value from remote leader for {key}, fetching locally")
+        return await fetch()
+
+    def inflight(self) -> int:
+        """Number of keys with a fetch in progress in this process."""
+        return len(self._inflight)
+
+    def stats(self) -> dict[str, int]:
+        """Counters: leader fetches, coalesced waiters, remote fills and local fallbacks."""
+        return dict(self._stats)
+
+
+# Global single-flight instance for upstream market data fetches
+single_flight = SingleFlight(cache_service)
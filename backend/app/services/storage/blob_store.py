@@ -0,0 +1,220 @@
+"""Content-addressed blob storage for large payloads.
+
+Bodies are stored zlib-compressed under ``blobs/<aa>/<sha256>``, where the hash is taken
+over the uncompressed bytes, so identical payloads (the same option chain attached to
+several tasks, a re-stored unchanged strategy summary) are written once. A digest
+(``sha256:<hex>``) is all the database needs to keep.
+
+Backends:
+- ``R2BlobBackend``: Cloudflare R2 through R2StorageService (production)
+- ``LocalBlobBackend``: a directory on the local filesystem (dev and tests)
+
+BLOB_STORAGE_BACKEND selects one: ``auto`` (R2 when configured, otherwise off), ``r2``,
+``local`` (BLOB_LOCAL_DIR) or ``off``. R2 counts as configured only with the R2
+credentials and an explicit BLOB_R2_BUCKET_NAME: blobs never go to the (public) image
+bucket CLOUDFLARE_R2_BUCKET_NAME. With storage off nothing is offloaded and payloads
+stay inline in Postgres. Backend calls are blocking and run in the ``blob``
+executor; recently read blobs are kept in a small in-process LRU.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import zlib
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Protocol
+
+from app.core.config import settings
+from app.services.executors import run_in_executor
+
+logger = logging.getLogger(__name__)
+
+DIGEST_PREFIX = "sha256:"
+REF_KEY = "$blob"  # JSON reference: {"$blob": "sha256:<hex>", "bytes": <uncompressed size>}
+READ_CACHE_SIZE = 64
+KNOWN_DIGESTS_MAX = 10_000
+
+
+class BlobBackend(Protocol):
+    def put(self, key: str, data: bytes) -> None: ...
+
+    def get(self, key: str) -> bytes: ...  # FileNotFoundError when missing
+
+    def exists(self, key: str) -> bool: ...
+
+
+class LocalBlobBackend:
+    """Blobs as files under a root directory (written atomically)."""
+
+    def __init__(self, root: str | Path) -> None:
+        self.root = Path(root)
+
+    def _path(self, key: str) -> Path:
+        return self.root / key
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def get(self, key: str) -> bytes:
+        return self._path(key).read_bytes()
+
+    def exists(self, key: str) -> bool:
+        return self._path(key).exists()
+
+
+class R2BlobBackend:
+    """Blobs as private objects in the R2 bucket."""
+
+    def __init__(self, r2_service: Any) -> None:
+        self.r2 = r2_service
+
+    def put(self, key: str, data: bytes) -> None:
+        self.r2.put_object(key, data, content_type="application/octet-stream")
+
+    def get(self, key: str) -> bytes:
+        return self.r2.get_object(key)
+
+    def exists(self, key: str) -> bool:
+        return self.r2.object_exists(key)
+
+
+def blob_key(digest: str) -> str:
+    hex_digest = digest.removeprefix(DIGEST_PREFIX)
+    return f"blobs/{hex_digest[:2]}/{hex_digest}"
+
+
+def is_ref(value: Any) -> bool:
+    return isinstance(value, dict) and isinstance(value.get(REF_KEY), str)
+
+
+def _json_bytes(value: Any) -> bytes:
+    # Canonical form so equal values hash equal
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str).encode("utf-8")
+
+
+class BlobStore:
+    """Compressed, deduplicated blob storage over a backend (see module docstring)."""
+
+    def __init__(self, backend: BlobBackend | None, min_bytes: int | None = None) -> None:
+        self.backend = backend
+        self.min_bytes = settings.blob_offload_min_bytes if min_bytes is None else min_bytes
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+        self._known: OrderedDict[str, None] = OrderedDict()  # Digests known to be stored
+        self.stats_counters = {"puts": 0, "dedup_hits": 0, "gets": 0, "cache_hits": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def put(self, data: bytes) -> str:
+        """Store bytes (if not already stored) and return their digest."""
+        if self.backend is None:
+            raise ValueError("Blob storage is not configured")
+        digest = DIGEST_PREFIX + hashlib.sha256(data).hexdigest()
+        if digest in self._known:
+            self._known.move_to_end(digest)
+            self.stats_counters["dedup_hits"] += 1
+            return digest
+        await run_in_executor("blob", self._put_sync, digest, data)
+        self._remember(digest)
+        return digest
+
+    def _put_sync(self, digest: str, data: bytes) -> None:
+        key = blob_key(digest)
+        if self.backend.exists(key):
+            self.stats_counters["dedup_hits"] += 1
+            return
+        self.backend.put(key, zlib.compress(data, 6))
+        self.stats_counters["puts"] += 1
+
+    async def get(self, digest: str) -> bytes:
+        """Bytes stored under digest (FileNotFoundError if missing)."""
+        if self.backend is None:
+            raise ValueError("Blob storage is not configured")
+        self.stats_counters["gets"] += 1
+        cached = self._cache.get(digest)
+        if cached is not None:
+            self._cache.move_to_end(digest)
+            self.stats_counters["cache_hits"] += 1
+            return cached
+        data = zlib.decompress(await run_in_executor("blob", self.backend.get, blob_key(digest)))
+        self._cache[digest] = data
+        while len(self._cache) > READ_CACHE_SIZE:
+            self._cache.popitem(last=False)
+        self._remember(digest)
+        return data
+
+    def _remember(self, digest: str) -> None:
+        self._known[digest] = None
+        while len(self._known) > KNOWN_DIGESTS_MAX:
+            self._known.popitem(last=False)
+
+    async def put_text(self, text: str) -> str:
+        return await self.put(text.encode("utf-8"))
+
+    async def get_text(self, digest: str) -> str:
+        return (await self.get(digest)).decode("utf-8")
+
+    async def offload_json(self, value: Any) -> Any:
+        """Replace value with a reference if it serializes to at least min_bytes (else return it)."""
+        if self.backend is None or is_ref(value) or not isinstance(value, (dict, list)):
+            return value
+        data = _json_bytes(value)
+        if len(data) < self.min_bytes:
+            return value
+        return {REF_KEY: await self.put(data), "bytes": len(data)}
+
+    async def load_json(self, value: Any) -> Any:
+        """Resolve a reference made by offload_json (other values are returned as is)."""
+        if not is_ref(value):
+            return value
+        return json.loads(await self.get(value[REF_KEY]))
+
+    def stats(self) -> dict[str, Any]:
+        return {"enabled": self.enabled, "cached": len(self._cache), **self.stats_counters}
+
+
+def _build_backend() -> BlobBackend | None:
+    mode = settings.blob_storage_backend.lower()
+    if mode == "off":
+        return None
+    if mode == "local":
+        return LocalBlobBackend(settings.blob_local_dir)
+    from app.services.storage.r2_service import R2StorageService
+
+    # No fallback to CLOUDFLARE_R2_BUCKET_NAME: that bucket serves public images
+    if settings.blob_r2_bucket_name:
+        r2 = R2StorageService(bucket_name=settings.blob_r2_bucket_name)
+        if r2.is_enabled():
+            return R2BlobBackend(r2)
+    if mode == "r2":
+        logger.warning(
+            "BLOB_STORAGE_BACKEND=r2 but R2 credentials or BLOB_R2_BUCKET_NAME are not set; "
+            "large payloads stay in Postgres"
+        )
+    return None
+
+
+_blob_store: BlobStore | None = None
+
+
+def get_blob_store() -> BlobStore:
+    """Get singleton blob store (backend from settings)."""
+    global _blob_store
+    if _blob_store is None:
+        _blob_store = BlobStore(_build_backend())
+        if _blob_store.enabled:
+            logger.info(f"Blob storage enabled ({type(_blob_store.backend).__name__})")
+    return _blob_store
@@ -185,6 +185,55 @@ class R2StorageService:
             logger.error(f"Failed to delete image from R2: {e}")
             raise Exception(f"R2 deletion failed: {str(e)}")
 
+    def put_object(self, object_key: str, data: bytes, content_type: str = "application/octet-stream") -> None:
+        """
+        Upload a private object (blocking; used by the blob store's executor).
+
+        Raises:
+            ValueError: If R2 is not enabled
+            Exception: If upload fails
+        """
+        if not self.is_enabled():
+            raise ValueError("R2 storage is not enabled or configured")
+        try:
+            self._client.put_object(
+                Bucket=self.bucket_name, Key=object_key, Body=data, ContentType=content_type
+            )
+        except ClientError as e:
+            logger.error(f"Failed to upload object to R2: {e}")
+            raise Exception(f"R2 upload failed: {str(e)}")
+
+    def get_object(self, object_key: str) -> bytes:
+        """
+        Download an object (blocking).
+
+        Raises:
+            ValueError: If R2 is not enabled
+            FileNotFoundError: If the object does not exist
+            Exception: If download fails
+        """
+        if not self.is_enabled():
+            raise ValueError("R2 storage is not enabled or configured")
+        try:
+            return self._client.get_object(Bucket=self.bucket_name, Key=object_key)["Body"].read()
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") == "NoSuchKey":
+                raise FileNotFoundError(f"Object not found in R2: {object_key}")
+            logger.error(f"Failed to get object from R2: {e}")
+            raise Exception(f"R2 download failed: {str(e)}")
+
+    def object_exists(self, object_key: str) -> bool:
+        """Check whether an object exists (blocking HEAD request)."""
+        if not self.is_enabled():
+            raise ValueError("R2 storage is not enabled or configured")
+        try:
+            self._client.head_object(Bucket=self.bucket_name, Key=object_key)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code", "") in ("404", "NoSuchKey", "NotFound"):
+                return False
+            raise
+
     def generate_object_key(
         self,
         user_id: str,
@@ -4,10 +4,13 @@ This engine runs strictly on the backend (Python) and uses advanced mathematical
 logic and full Greeks analysis to select optimal strikes. It does NOT call
 Gemini/OpenAI. It must be fast, deterministic, and financially rigorous.
 
-Option chain and Greeks are provided by Tiger (tiger_service.get_option_chain).
+Option chain and Greeks are provided by Tiger (tiger_service.get_option_chain);
+rows Tiger leaves without Greeks are filled from the Black-Scholes model.
 """
 
+import asyncio
 import logging
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
 from typing import Any, Optional
 
@@ -18,9 +21,24 @@ from app.schemas.strategy_recommendation import (
     Outlook,
     RiskProfile,
 )
+from app.core.config import settings
+from app.services.black_scholes import years_to_expiry
+from app.services.executors import run_in_executor
+from app.services.option_chain import GREEK_NAMES, OptionChain, OptionSide
+from app.services.payoff import leg_arrays, strategy_payoff
+from app.services import probability, strike_optimizer
 
 logger = logging.getLogger(__name__)
 
+# Expiration search: preferred DTE (ties in ranking go to the expiration closest to it)
+TARGET_DTE = 45
+
+# Seed for take-profit simulations (identical requests get identical rankings)
+MONTE_CARLO_SEED = 0
+
+# Outlooks with an algorithm (AUTO in search mode runs all of them)
+_SEARCH_OUTLOOKS: tuple[Outlook, ...] = (Outlook.NEUTRAL, Outlook.VOLATILE, Outlook.BULLISH, Outlook.BEARISH)
+
 
 class StrategyEngine:
     """Professional-grade strategy recommendation engine with strict validation.
@@ -30,26 +48,33 @@ class StrategyEngine:
 
     def __init__(self) -> None:
         """Initialize the strategy engine."""
-        pass
+        self._risk_free_rate = settings.option_risk_free_rate
 
-    def _get_greeks_from_financetoolkit(
+    def _model_greeks(
         self,
-        symbol: str,
-        strike: float,
+        option: dict[str, Any],
         option_type: OptionType,
         expiration_date: str,
         spot_price: float,
     ) -> dict[str, float]:
         """
-        Greeks fallback: 期权链统一来自 Tiger，Greeks 由 option_chain 提供，此处不再从其他源拉取。
-        Option chain and Greeks are from Tiger (tiger_service.get_option_chain with return_greek_value=True).
-        Returns {} so callers use Greeks from the option_chain (Tiger) only.
+        Greeks fallback for a single chain row missing them (Black-Scholes, see black_scholes.py).
+
+        Uses the row's implied_vol when present, else the IV solved from its bid/ask mid
+        (or latest_price). Returns {} when the row has no usable volatility or price.
         """
-        return {}
+        side = OptionSide.from_records([option])
+        years = years_to_expiry(expiration_date)
+        if years is None or side.fill_greeks(
+            spot_price, years, option_type == OptionType.CALL, self._risk_free_rate
+        ) == 0:
+            return {}
+        row = side.record(0)
+        return {name: row[name] for name in GREEK_NAMES if name in row}
 
     def _find_option(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         option_type: OptionType,
         target_delta: float,
         spot_price: float,
@@ -58,16 +83,29 @@ class StrategyEngine:
         Find the option closest to target delta.
         
         Safety: Handles missing delta values gracefully (skips options with None delta).
-        Greeks come from option_chain (Tiger); if missing, option is skipped.
+        Greeks come from option_chain (Tiger); if missing, the Black-Scholes fallback fills
+        them (needs the chain's expiration_date and a price or IV), else the option is skipped.
 
         Args:
-            chain: Option chain data from Tiger with 'calls' and 'puts' lists
+            chain: Option chain data from Tiger with 'calls' and 'puts' lists, or an OptionChain
+                (vectorized nearest-delta lookup)
             option_type: CALL or PUT
             spot_price: Current spot price
 
         Returns:
             Option data dict or None if not found
         """
+        if isinstance(chain, OptionChain):
+            side = chain.side(option_type)
+            idx = side.nearest_delta(target_delta)
+            if idx is None:
+                logger.debug(
+                    "_find_option: no option with valid delta for %s target_delta=%.2f (chain has %s options, Greeks may be missing)",
+                    option_type.value, target_delta, len(side),
+                )
+                return None
+            return side.record(idx)
+
         options = chain.get("calls" if option_type == OptionType.CALL else "puts", [])
         if not options:
             return None
@@ -79,19 +117,14 @@ class StrategyEngine:
             # Extract delta from Greeks (handle different field names)
             delta = self._extract_greek(option, "delta")
             
-            # Greeks from Tiger option_chain only; if missing, skip this option
+            # Greeks from Tiger option_chain; if missing, fill from the model (skip if that fails too)
             if delta is None:
-                strike = option.get("strike") or option.get("strike_price")
                 expiration_date = chain.get("expiration_date") or option.get("expiration_date")
                 
-                if strike and expiration_date and spot_price:
+                if expiration_date and spot_price:
                     try:
-                        calculated_greeks = self._get_greeks_from_financetoolkit(
-                            symbol=chain.get("symbol", ""),
-                            strike=float(strike),
-                            option_type=option_type,
-                            expiration_date=str(expiration_date),
-                            spot_price=spot_price,
+                        calculated_greeks = self._model_greeks(
+                            option, option_type, str(expiration_date), spot_price
                         )
                         delta = calculated_greeks.get("delta")
                         if delta is not None:
@@ -128,7 +161,7 @@ class StrategyEngine:
     
     def _find_closest_strike(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         option_type: OptionType,
         target_strike: float,
     ) -> dict[str, Any] | None:
@@ -139,13 +172,19 @@ class StrategyEngine:
         This is common in real market data where strikes are discrete.
 
         Args:
-            chain: Option chain data with 'calls' and 'puts' lists
+            chain: Option chain data with 'calls' and 'puts' lists, or an OptionChain
+                (O(log n) strike lookup)
             option_type: CALL or PUT
             target_strike: Target strike price
 
         Returns:
             Option data dict or None if not found
         """
+        if isinstance(chain, OptionChain):
+            side = chain.side(option_type)
+            idx = side.nearest_strike(target_strike)
+            return side.record(idx) if idx is not None else None
+
         options = chain.get("calls" if option_type == OptionType.CALL else "puts", [])
         if not options:
             return None
@@ -178,6 +217,9 @@ class StrategyEngine:
         - Nested: greeks.delta, greek_delta
         - Case variations: Delta, DELTA
 
+        Rows returned by OptionChain lookups always carry the canonical flat keys,
+        so the first probe hits.
+
         Args:
             option: Option data dict
             greek_name: Name of the Greek (delta, gamma, theta, vega, rho)
@@ -262,7 +304,7 @@ class StrategyEngine:
         Calculate net Greeks by summing leg.ratio * leg.greek.
         
         ⚠️ NOTE: This is strategy-level calculation (combining multiple options).
-        Individual option Greeks should come from FinanceToolkit (via option chain or calculation).
+        Individual option Greeks come from the option chain (Tiger) or the Black-Scholes fill.
         
         Safety: Handles None/missing greek values gracefully (defaults to 0.0).
         Real market data can have missing Greeks, so we must be resilient.
@@ -297,6 +339,75 @@ class StrategyEngine:
 
         return net_greeks
 
+    def _payoff_legs(self, legs: list[OptionLeg]) -> list[dict[str, Any]]:
+        """Legs in the payoff engine's shape, priced at execution (ask to buy, bid to sell)."""
+        return [
+            {
+                "type": leg.type.value.lower(),
+                "action": "buy" if leg.ratio > 0 else "sell",
+                "quantity": abs(leg.ratio),
+                "strike": leg.strike,
+                "premium": leg.ask if leg.ratio > 0 else leg.bid,
+            }
+            for leg in legs
+        ]
+
+    def _calculate_payoff(self, legs: list[OptionLeg]) -> dict[str, Any]:
+        """
+        Exact expiration payoff of the legs at their execution prices (ask to buy, bid to sell).
+
+        Returns max_profit / max_loss as positive per-share amounts (inf when unbounded)
+        and the sorted breakeven_points, so strikes that land away from the targeted
+        widths (uneven condor wings, a straddle whose call and put strikes differ)
+        are still measured correctly.
+        """
+        payoff = strategy_payoff(self._payoff_legs(legs))
+        return {
+            "max_profit": payoff["max_profit"],
+            "max_loss": -payoff["max_loss"],
+            "breakeven_points": payoff["breakeven_points"],
+        }
+
+    def _score_probabilities(
+        self,
+        strategies: list[CalculatedStrategy],
+        chain: OptionChain,
+        spot_price: float,
+        expiration_date: str,
+        take_profit: float | None = None,
+    ) -> None:
+        """
+        Replace the heuristic POP with lognormal model values, in place, in one batch.
+
+        Sets metrics pop and expected_value (hold to expiration, closed form, per share)
+        from the chain's ATM implied volatility. With take_profit (fraction of max
+        profit), a seeded Monte Carlo adds take_profit_pop, take_profit_expected_value
+        and take_profit_exit_rate. Strategies keep their heuristic POP when the chain
+        yields no volatility.
+        """
+        years = years_to_expiry(expiration_date)
+        if not strategies or years is None or not spot_price or spot_price <= 0:
+            return
+        vol = probability.atm_volatility(chain, spot_price, years, self._risk_free_rate)
+        if vol is None:
+            logger.info("Recommendations: no ATM IV for model POP, keeping heuristic POP")
+            return
+        arrays = leg_arrays([self._payoff_legs(strategy.legs) for strategy in strategies])
+        scores = probability.closed_form(arrays, spot_price, years, vol, self._risk_free_rate)
+        exits = None
+        if take_profit is not None:
+            exits = probability.monte_carlo(
+                arrays, spot_price, years, vol, take_profit=take_profit,
+                rate=self._risk_free_rate, seed=MONTE_CARLO_SEED,
+            )
+        for i, strategy in enumerate(strategies):
+            strategy.metrics["pop"] = round(float(scores["pop"][i]), 4)
+            strategy.metrics["expected_value"] = round(float(scores["expected_value"][i]), 4)
+            if exits is not None:
+                strategy.metrics["take_profit_pop"] = round(float(exits["pop"][i]), 4)
+                strategy.metrics["take_profit_expected_value"] = round(float(exits["expected_value"][i]), 4)
+                strategy.metrics["take_profit_exit_rate"] = round(float(exits["exit_rate"][i]), 4)
+
     def _calculate_liquidity_score(self, legs: list[OptionLeg]) -> float:
         """
         Calculate overall liquidity score (0-100).
@@ -338,7 +449,7 @@ class StrategyEngine:
         """
         Create an OptionLeg from option chain data.
         
-        ⚠️ OPTIMIZATION: If Greeks are missing, FinanceToolkit will be used to calculate them.
+        If Greeks are missing, they are filled from the Black-Scholes model (_model_greeks).
 
         Args:
             option: Option data from chain
@@ -347,7 +458,7 @@ class StrategyEngine:
             option_type: CALL or PUT
             expiration_date: Expiration date string
             dte: Days to expiration
-            spot_price: Current spot price (for FinanceToolkit calculation if needed)
+            spot_price: Current spot price (for the model fallback if needed)
 
         Returns:
             OptionLeg instance
@@ -367,16 +478,9 @@ class StrategyEngine:
 
         # Attempt fallback only for truly missing Greeks (None), not valid zeros.
         if any(v is None for v in greeks_raw.values()):
-            strike = float(option.get("strike", option.get("strike_price", 0.0)))
-            if strike > 0 and spot_price > 0:
+            if spot_price > 0:
                 try:
-                    calculated_greeks = self._get_greeks_from_financetoolkit(
-                        symbol=symbol,
-                        strike=strike,
-                        option_type=option_type,
-                        expiration_date=expiration_date,
-                        spot_price=spot_price,
-                    )
+                    calculated_greeks = self._model_greeks(option, option_type, expiration_date, spot_price)
                     for greek_name in greeks_raw:
                         if greeks_raw[greek_name] is None and greek_name in calculated_greeks:
                             greeks_raw[greek_name] = calculated_greeks[greek_name]
@@ -421,7 +525,7 @@ class StrategyEngine:
 
     def _algorithm_iron_condor(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         symbol: str,
         spot_price: float,
         expiration_date: str,
@@ -465,15 +569,7 @@ class StrategyEngine:
         long_call_strike = short_call_strike + wing_width
 
         # Find closest call to long_call_strike
-        calls = chain.get("calls", [])
-        long_call = None
-        min_diff = float("inf")
-        for call in calls:
-            strike = float(call.get("strike", call.get("strike_price", 0.0)))
-            diff = abs(strike - long_call_strike)
-            if diff < min_diff:
-                min_diff = diff
-                long_call = call
+        long_call = self._find_closest_strike(chain, OptionType.CALL, long_call_strike)
 
         if not long_call:
             logger.info("Iron Condor: no long call found at strike %.1f", long_call_strike)
@@ -490,15 +586,7 @@ class StrategyEngine:
         long_put_strike = short_put_strike - wing_width
 
         # Find closest put to long_put_strike
-        puts = chain.get("puts", [])
-        long_put = None
-        min_diff = float("inf")
-        for put in puts:
-            strike = float(put.get("strike", put.get("strike_price", 0.0)))
-            diff = abs(strike - long_put_strike)
-            if diff < min_diff:
-                min_diff = diff
-                long_put = put
+        long_put = self._find_closest_strike(chain, OptionType.PUT, long_put_strike)
 
         if not long_put:
             logger.info("Iron Condor: no long put found at strike %.1f", long_put_strike)
@@ -543,8 +631,9 @@ class StrategyEngine:
             return None
 
         # Calculate metrics
-        max_profit = net_credit
-        max_loss = wing_width - net_credit
+        payoff = self._calculate_payoff(legs)
+        max_profit = payoff["max_profit"]
+        max_loss = payoff["max_loss"]
         risk_reward_ratio = max_profit / max_loss if max_loss > 0 else 0.0
 
         # POP via short deltas: POP ≈ 1 - |short_call_delta| - |short_put_delta|
@@ -552,10 +641,7 @@ class StrategyEngine:
         sp_delta = abs(self._extract_greek(short_put, "delta") or target_delta_short)
         pop = max(0.0, min(1.0, 1.0 - sc_delta - sp_delta))
 
-        breakeven_points = [
-            short_call_strike + net_credit,
-            short_put_strike - net_credit,
-        ]
+        breakeven_points = payoff["breakeven_points"]
 
         liquidity_score = self._calculate_liquidity_score(legs)
         theta_decay_per_day = net_greeks["theta"] * 100.0  # Convert to dollars per day
@@ -578,7 +664,7 @@ class StrategyEngine:
 
     def _algorithm_long_straddle(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         symbol: str,
         spot_price: float,
         expiration_date: str,
@@ -649,22 +735,17 @@ class StrategyEngine:
 
         # Calculate metrics
         # Max profit: Unlimited (either direction)
-        # Max loss: Net debit
-        max_profit = float("inf")  # Unlimited
-        max_loss = net_debit
-        risk_reward_ratio = float("inf")  # Unlimited upside
+        # Max loss: Net debit (more if the call strike sits above the put strike)
+        payoff = self._calculate_payoff(legs)
+        max_loss = payoff["max_loss"]
 
         # Estimate POP - simplified model
         # For Long Straddle, POP is low (need significant move)
         # Rough estimate: POP ≈ 30% for ATM straddle
         pop = 0.30
 
-        # Breakeven points
-        strike = float(atm_call.get("strike", atm_call.get("strike_price", spot_price)))
-        breakeven_points = [
-            strike + net_debit,  # Upper breakeven
-            strike - net_debit,  # Lower breakeven
-        ]
+        # Breakeven points (lower, upper)
+        breakeven_points = payoff["breakeven_points"]
 
         liquidity_score = self._calculate_liquidity_score(legs)
         theta_decay_per_day = net_greeks["theta"] * 100.0
@@ -687,7 +768,7 @@ class StrategyEngine:
 
     def _algorithm_bull_call_spread(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         symbol: str,
         spot_price: float,
         expiration_date: str,
@@ -757,8 +838,9 @@ class StrategyEngine:
         net_greeks = self._calculate_net_greeks(legs)
 
         # Calculate metrics
-        max_profit = spread_width - net_debit
-        max_loss = net_debit
+        payoff = self._calculate_payoff(legs)
+        max_profit = payoff["max_profit"]
+        max_loss = payoff["max_loss"]
         risk_reward_ratio = max_profit / max_loss if max_loss > 0 else 0.0
 
         # Estimate POP - simplified model
@@ -767,7 +849,7 @@ class StrategyEngine:
         pop = 0.65
 
         # Breakeven point
-        breakeven_points = [buy_strike + net_debit]
+        breakeven_points = payoff["breakeven_points"]
 
         liquidity_score = self._calculate_liquidity_score(legs)
         theta_decay_per_day = net_greeks["theta"] * 100.0
@@ -790,7 +872,7 @@ class StrategyEngine:
 
     def _algorithm_bear_put_spread(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         symbol: str,
         spot_price: float,
         expiration_date: str,
@@ -844,11 +926,12 @@ class StrategyEngine:
 
         net_greeks = self._calculate_net_greeks(legs)
 
-        max_profit = spread_width - net_debit
-        max_loss = net_debit
+        payoff = self._calculate_payoff(legs)
+        max_profit = payoff["max_profit"]
+        max_loss = payoff["max_loss"]
         risk_reward_ratio = max_profit / max_loss if max_loss > 0 else 0.0
         pop = 0.60
-        breakeven_points = [buy_strike - net_debit]
+        breakeven_points = payoff["breakeven_points"]
         liquidity_score = self._calculate_liquidity_score(legs)
         theta_decay_per_day = net_greeks["theta"] * 100.0
 
@@ -868,39 +951,115 @@ class StrategyEngine:
             },
         )
 
+    def _optimized_strategies(
+        self,
+        chain: OptionChain,
+        symbol: str,
+        spot_price: float,
+        outlook: Outlook,
+        expiration_date: str,
+        risk_profile: RiskProfile,
+        capital: float,
+        limit: int = 3,
+    ) -> list[CalculatedStrategy]:
+        """
+        Pareto-best spreads / condors from the vectorized strike search.
+
+        Conservative profiles sell lower-delta condor shorts (0.10-0.25) than aggressive
+        ones (0.20-0.35); spreads search widths up to 20 strikes. Returns up to limit
+        strategies, best edge (POP-weighted profit minus loss) first.
+        """
+        dte = self._calculate_dte(expiration_date)
+        if outlook == Outlook.NEUTRAL:
+            short_delta = (0.10, 0.25) if risk_profile == RiskProfile.CONSERVATIVE else (0.20, 0.35)
+            candidates = strike_optimizer.iron_condors(chain.calls, chain.puts, capital, short_delta)
+            name = "Optimized Iron Condor"
+            leg_specs = [
+                (chain.calls, OptionType.CALL, -1), (chain.calls, OptionType.CALL, +1),
+                (chain.puts, OptionType.PUT, -1), (chain.puts, OptionType.PUT, +1),
+            ]
+        elif outlook == Outlook.BULLISH:
+            candidates = strike_optimizer.bull_call_spreads(chain.calls, capital)
+            name = "Optimized Bull Call Spread"
+            leg_specs = [(chain.calls, OptionType.CALL, +1), (chain.calls, OptionType.CALL, -1)]
+        else:
+            candidates = strike_optimizer.bear_put_spreads(chain.puts, capital)
+            name = "Optimized Bear Put Spread"
+            leg_specs = [(chain.puts, OptionType.PUT, +1), (chain.puts, OptionType.PUT, -1)]
+
+        best = strike_optimizer.pareto_best(candidates, limit)
+        logger.info(
+            "Optimizer: %s symbol=%s candidates=%s pareto_returned=%s",
+            name, symbol, len(candidates["pop"]), len(best),
+        )
+        strategies = []
+        for index in best:
+            scores = strike_optimizer.candidate(candidates, int(index))
+            legs = [
+                self._create_option_leg(side.record(row), symbol, ratio, option_type, expiration_date, dte, spot_price)
+                for (side, option_type, ratio), row in zip(leg_specs, scores["legs"])
+            ]
+            net_greeks = self._calculate_net_greeks(legs)
+            net_credit = scores["net_credit"]
+            premium = f"Credit: ${net_credit:.2f}" if net_credit >= 0 else f"Debit: ${-net_credit:.2f}"
+            strikes = "/".join(f"{leg.strike:g}" for leg in legs)
+            strategies.append(CalculatedStrategy(
+                name=name,
+                description=f"Strikes {strikes} selected by exhaustive search. {premium}, Max loss: ${scores['max_loss']:.2f}",
+                legs=legs,
+                metrics={
+                    "max_profit": round(scores["max_profit"], 2),
+                    "max_loss": round(scores["max_loss"], 2),
+                    "risk_reward_ratio": round(scores["risk_reward"], 4),
+                    "pop": round(scores["pop"], 4),
+                    "breakeven_points": [round(bp, 2) for bp in scores["breakevens"]],
+                    "net_greeks": {k: round(v, 4) for k, v in net_greeks.items()},
+                    "theta_decay_per_day": round(net_greeks["theta"] * 100.0, 2),
+                    "liquidity_score": round(scores["liquidity_score"], 2),
+                    "expected_edge": round(scores["edge"], 4),
+                },
+            ))
+        return strategies
+
     def generate_strategies(
         self,
-        chain: dict[str, Any],
+        chain: dict[str, Any] | OptionChain,
         symbol: str,
         spot_price: float,
         outlook: Outlook,
         risk_profile: RiskProfile,
         capital: float,
         expiration_date: str | None = None,
+        optimize: bool = False,
+        take_profit: float | None = None,
     ) -> list[CalculatedStrategy]:
         """
         Generate strategy recommendations based on outlook and risk profile.
 
+        With optimize=True, spreads and condors come from the exhaustive strike search
+        (strike_optimizer, Pareto-best candidates) instead of one nearest-delta pick per
+        leg; the straddle has a single ATM combination and is unaffected.
+
         Args:
-            chain: Option chain data with Greeks
+            chain: Option chain data with Greeks (dict shape or OptionChain)
             symbol: Stock symbol
             spot_price: Current spot price
             outlook: Market outlook (BULLISH, BEARISH, NEUTRAL, VOLATILE)
             risk_profile: Risk tolerance (CONSERVATIVE, AGGRESSIVE)
             capital: Available capital
-            expiration_date: Preferred expiration date (if None, selects optimal DTE)
+            expiration_date: Expiration date to use (if None, the chain's expiration_date)
+            optimize: Search all strike combinations (see _optimized_strategies)
+            take_profit: Also simulate closing at this fraction of max profit (see _score_probabilities)
 
         Returns:
-            List of valid CalculatedStrategy objects
+            List of valid CalculatedStrategy objects, best expectancy first
         """
         strategies: list[CalculatedStrategy] = []
 
         # Filter expirations (focus on 30-60 DTE for optimal Greeks behavior)
         # For now, use the provided expiration_date or find best one
         if expiration_date is None:
-            # Find expiration closest to 45 DTE
-            # This would require iterating through available expirations
-            # For now, we'll use a placeholder - in production, fetch multiple expirations
+            # Single-chain mode; searching several expirations is search_expirations()
             logger.warning("No expiration_date provided, using chain's expiration")
             expiration_date = chain.get("expiration_date", "")
 
@@ -908,15 +1067,31 @@ class StrategyEngine:
             logger.warning("Recommendations: no expiration_date in chain or request")
             return []
 
-        num_calls = len(chain.get("calls") or [])
-        num_puts = len(chain.get("puts") or [])
+        # Parse once into columnar form; algorithms then use O(log n) / vectorized lookups
+        chain = OptionChain.coerce(chain)
+        # Rows Tiger left without Greeks (after hours, partial data) get model values in one pass
+        years = years_to_expiry(expiration_date)
+        if years is not None:
+            # A filled copy: the chain may be the cached one shared with other requests
+            chain, filled = chain.with_filled_greeks(years, self._risk_free_rate, spot_price=spot_price)
+            if filled:
+                logger.info("Recommendations: filled model Greeks for %s rows (symbol=%s)", filled, symbol)
+        num_calls = len(chain.calls)
+        num_puts = len(chain.puts)
         logger.info(
             "Recommendations: symbol=%s outlook=%s expiry=%s chain_size: calls=%s puts=%s",
             symbol, outlook.value, expiration_date, num_calls, num_puts,
         )
 
         # Select algorithm based on outlook
-        if outlook == Outlook.NEUTRAL:
+        if optimize and outlook in (Outlook.NEUTRAL, Outlook.BULLISH, Outlook.BEARISH):
+            strategies.extend(self._optimized_strategies(
+                chain, symbol, spot_price, outlook, expiration_date, risk_profile, capital
+            ))
+            if not strategies:
+                logger.info("Recommendations: optimizer found no valid %s combination for symbol=%s", outlook.value, symbol)
+
+        elif outlook == Outlook.NEUTRAL:
             strategy = self._algorithm_iron_condor(
                 chain, symbol, spot_price, expiration_date, risk_profile, capital
             )
@@ -952,10 +1127,130 @@ class StrategyEngine:
             else:
                 logger.info("Recommendations: Bear Put Spread returned none for symbol=%s", symbol)
 
-        # Sort by POP (Probability of Profit) descending
-        strategies.sort(
-            key=lambda s: s.metrics.get("pop", 0.0) if isinstance(s.metrics.get("pop"), (int, float)) else 0.0,
-            reverse=True,
+        # Model POP / expected value, then best expectancy first
+        self._score_probabilities(strategies, chain, spot_price, expiration_date, take_profit)
+        strategies.sort(key=self.strategy_rank_key)
+
+        return strategies
+
+    def select_expirations(
+        self,
+        expirations: list[str],
+        min_dte: int,
+        max_dte: int,
+        limit: int,
+    ) -> list[str]:
+        """
+        Pick up to limit expirations with min_dte <= DTE <= max_dte, closest to TARGET_DTE first.
+
+        Returns:
+            Selected expiration dates in chronological order
+        """
+        window = []
+        for expiration in expirations:
+            dte = self._calculate_dte(expiration)
+            if min_dte <= dte <= max_dte:
+                window.append((abs(dte - TARGET_DTE), dte, expiration))
+        window.sort()
+        return sorted(expiration for _, _, expiration in window[:max(0, limit)])
+
+    def strategy_rank_key(self, strategy: CalculatedStrategy) -> tuple[float, float, float, int]:
+        """
+        Sort key ranking strategies best first (within a symbol and across symbols):
+        expected value (the take-profit one when simulated), then POP, then
+        risk/reward, then DTE closest to TARGET_DTE.
+        """
+        metrics = strategy.metrics
+
+        def number(key: str) -> float:
+            value = metrics.get(key, 0.0)
+            return value if isinstance(value, (int, float)) else 0.0
+
+        expectancy = number("take_profit_expected_value" if "take_profit_expected_value" in metrics else "expected_value")
+        dte = strategy.legs[0].days_to_expiration if strategy.legs else 0
+        return (-expectancy, -number("pop"), -number("risk_reward_ratio"), abs(dte - TARGET_DTE))
+
+    async def search_expirations(
+        self,
+        expirations: list[str],
+        fetch_chain: Callable[[str], Awaitable[dict[str, Any] | OptionChain]],
+        symbol: str,
+        outlook: Outlook,
+        risk_profile: RiskProfile,
+        capital: float,
+        spot_price: float | None = None,
+        optimize: bool = False,
+        take_profit: float | None = None,
+    ) -> list[CalculatedStrategy]:
+        """
+        Run the strategy search over several expirations and rank the results together.
+
+        Chains are fetched concurrently (latency is that of the slowest fetch, not the
+        sum); an expiration whose fetch fails is skipped. Every applicable algorithm
+        (the outlook's own, or all four for AUTO) then runs against every chain in
+        parallel in the ``cpu`` executor.
+
+        Args:
+            expirations: Expiration dates to search (e.g. from select_expirations)
+            fetch_chain: Coroutine function returning the chain for one expiration
+            symbol: Stock symbol
+            outlook: Market outlook (AUTO runs every algorithm)
+            risk_profile: Risk tolerance
+            capital: Available capital
+            spot_price: Spot price; taken from the fetched chains if None
+            optimize: Use the exhaustive strike search per chain (see generate_strategies)
+            take_profit: Simulated take-profit fraction (see generate_strategies)
+
+        Returns:
+            Strategies from all expirations, best first (see strategy_rank_key)
+        """
+        fetched = await asyncio.gather(*(fetch_chain(exp) for exp in expirations), return_exceptions=True)
+        chains: dict[str, OptionChain] = {}
+        for expiration, result in zip(expirations, fetched):
+            if isinstance(result, BaseException):
+                logger.warning("Expiration search: chain fetch failed for %s %s: %s", symbol, expiration, result)
+                continue
+            if result:
+                chains[expiration] = OptionChain.coerce(result)
+        if not chains:
+            return []
+
+        if not spot_price:
+            for chain in chains.values():
+                try:
+                    spot_price = float(chain.spot_price or 0)
+                except (TypeError, ValueError):
+                    continue
+                if spot_price > 0:
+                    break
+        if not spot_price or spot_price <= 0:
+            logger.warning("Expiration search: no spot price for %s", symbol)
+            return []
+
+        outlooks = _SEARCH_OUTLOOKS if outlook == Outlook.AUTO else (outlook,)
+        jobs = [(expiration, o) for expiration in chains for o in outlooks]
+        results = await asyncio.gather(
+            *(
+                run_in_executor(
+                    "cpu", self.generate_strategies,
+                    chains[expiration], symbol, spot_price, o, risk_profile, capital, expiration, optimize, take_profit,
+                )
+                for expiration, o in jobs
+            ),
+            return_exceptions=True,
         )
+        strategies: list[CalculatedStrategy] = []
+        for (expiration, o), result in zip(jobs, results):
+            if isinstance(result, BaseException):
+                logger.warning(
+                    "Expiration search: %s failed for %s %s: %s", o.value, symbol, expiration, result
+                )
+                continue
+            strategies.extend(result)
 
+        strategies.sort(key=self.strategy_rank_key)
+        logger.info(
+            "Expiration search: symbol=%s expirations=%s outlooks=%s -> %s strategies",
+            symbol, list(chains), [o.value for o in outlooks], len(strategies),
+        )
         return strategies
@@ -0,0 +1,236 @@
+"""Vectorized strike-combination search for vertical spreads and iron condors.
+
+The ``StrategyEngine._algorithm_*`` methods pick one strike per leg by nearest delta,
+so a better-priced wing one strike away is never looked at. Here every valid leg
+combination of a template is built as NumPy index arrays and scored in bulk:
+
+- ``bull_call_spreads`` / ``bear_put_spreads``: every (long, short) pair up to
+  max_width_steps strikes apart
+- ``iron_condors``: short put x short call grid (short deltas inside a window) x
+  wing widths of 1..max_wing_steps strikes (same number of strikes on both wings)
+
+Each template returns a dict of equal-length arrays: ``legs`` (row indices into the
+sides, one column per leg), net_credit (negative = debit), max_profit, max_loss,
+risk_reward, pop, breakevens, liquidity_score, net Greeks and ``edge`` (POP-weighted
+profit minus loss). Candidates breaking the engine's rules (debit < 50% of width,
+condor credit >= 1/3 of width, |net delta| < 0.10 for condors, leg spreads <= 10%,
+max loss within capital) are dropped. ``pareto_best`` then keeps the candidates no
+other candidate beats on POP, risk/reward and liquidity at once.
+
+All prices are per share, like the engine's metrics. POP uses |delta| at the
+breakeven (interpolated over the chain) as the probability of finishing beyond it.
+"""
+
+from typing import Any
+
+import numpy as np
+
+from app.services.option_chain import GREEK_NAMES, OptionSide
+
+# Engine validation rules (see StrategyEngine._validate_liquidity and the algorithms)
+MAX_LEG_SPREAD_PCT = 10.0
+MAX_DEBIT_SHARE = 0.50
+MIN_CONDOR_CREDIT_SHARE = 1.0 / 3.0
+MAX_CONDOR_NET_DELTA = 0.10
+CONTRACT_MULTIPLIER = 100
+
+
+def _quotes(side: OptionSide) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """bid, ask, per-row spread % of mid (inf when unquoted) and a usable-quote mask."""
+    bid, ask = side.column("bid"), side.column("ask")
+    mid = (bid + ask) / 2.0
+    usable = (bid > 0) & (ask >= bid)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        spread_pct = np.where(usable, (ask - bid) / mid * 100.0, np.inf)
+    return bid, ask, spread_pct, usable & (spread_pct <= MAX_LEG_SPREAD_PCT)
+
+
+def _delta_at(side: OptionSide, prices: np.ndarray) -> np.ndarray:
+    """|delta| interpolated at arbitrary prices (rows without delta are skipped)."""
+    delta = side.column("delta")
+    known = ~np.isnan(delta)
+    if known.sum() < 2:
+        return np.full(prices.shape, np.nan)
+    return np.abs(np.interp(prices, side.strikes[known], delta[known]))
+
+
+def _pairs(n: int, max_steps: int) -> tuple[np.ndarray, np.ndarray]:
+    """All index pairs (i, j) with 1 <= j - i <= max_steps."""
+    steps = np.arange(1, max(1, max_steps) + 1)
+    i = np.repeat(np.arange(n), len(steps))
+    j = i + np.tile(steps, n)
+    keep = j < n
+    return i[keep], j[keep]
+
+
+def _net_greeks(sides: list[OptionSide], rows: list[np.ndarray], ratios: list[int]) -> dict[str, np.ndarray]:
+    """Sum of ratio * greek over legs (missing Greeks count as 0, like _calculate_net_greeks)."""
+    out = {}
+    for name in GREEK_NAMES:
+        total = np.zeros(len(rows[0]))
+        for side, idx, ratio in zip(sides, rows, ratios):
+            total += ratio * np.nan_to_num(side.column(name)[idx], nan=0.0)
+        out[name] = total
+    return out
+
+
+def _finish(
+    legs: np.ndarray,
+    net_credit: np.ndarray,
+    max_profit: np.ndarray,
+    max_loss: np.ndarray,
+    pop: np.ndarray,
+    breakevens: np.ndarray,
+    spread_pcts: list[np.ndarray],
+    greeks: dict[str, np.ndarray],
+    valid: np.ndarray,
+    capital: float,
+) -> dict[str, np.ndarray]:
+    """Common scores, capital filter and compaction to valid candidates."""
+    avg_spread = np.mean(spread_pcts, axis=0)
+    valid = valid & (max_loss > 0) & (max_loss * CONTRACT_MULTIPLIER <= capital) & ~np.isnan(pop)
+    pop = np.clip(pop, 0.0, 1.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        risk_reward = np.where(max_loss > 0, max_profit / max_loss, 0.0)
+    out = {
+        "legs": legs,
+        "net_credit": net_credit,
+        "max_profit": max_profit,
+        "max_loss": max_loss,
+        "risk_reward": risk_reward,
+        "pop": pop,
+        "breakevens": breakevens,
+        "liquidity_score": np.maximum(0.0, 100.0 - avg_spread * 10.0),
+        "edge": pop * max_profit - (1.0 - pop) * max_loss,
+        **greeks,
+    }
+    return {name: values[valid] for name, values in out.items()}
+
+
+def bull_call_spreads(calls: OptionSide, capital: float, max_width_steps: int = 20) -> dict[str, np.ndarray]:
+    """Buy the lower-strike call, sell the higher one. legs = [long, short] call rows."""
+    bid, ask, spread_pct, ok = _quotes(calls)
+    long_, short = _pairs(len(calls), max_width_steps)
+    strikes = calls.strikes
+    width = strikes[short] - strikes[long_]
+    debit = ask[long_] - bid[short]
+    breakeven = strikes[long_] + debit
+    valid = ok[long_] & ok[short] & (debit > 0) & (debit < width * MAX_DEBIT_SHARE)
+    return _finish(
+        legs=np.column_stack([long_, short]),
+        net_credit=-debit,
+        max_profit=width - debit,
+        max_loss=debit,
+        pop=_delta_at(calls, breakeven),
+        breakevens=breakeven[:, None],
+        spread_pcts=[spread_pct[long_], spread_pct[short]],
+        greeks=_net_greeks([calls, calls], [long_, short], [1, -1]),
+        valid=valid,
+        capital=capital,
+    )
+
+
+def bear_put_spreads(puts: OptionSide, capital: float, max_width_steps: int = 20) -> dict[str, np.ndarray]:
+    """Buy the higher-strike put, sell the lower one. legs = [long, short] put rows."""
+    bid, ask, spread_pct, ok = _quotes(puts)
+    short, long_ = _pairs(len(puts), max_width_steps)
+    strikes = puts.strikes
+    width = strikes[long_] - strikes[short]
+    debit = ask[long_] - bid[short]
+    breakeven = strikes[long_] - debit
+    valid = ok[long_] & ok[short] & (debit > 0) & (debit < width * MAX_DEBIT_SHARE)
+    return _finish(
+        legs=np.column_stack([long_, short]),
+        net_credit=-debit,
+        max_profit=width - debit,
+        max_loss=debit,
+        pop=_delta_at(puts, breakeven),
+        breakevens=breakeven[:, None],
+        spread_pcts=[spread_pct[long_], spread_pct[short]],
+        greeks=_net_greeks([puts, puts], [long_, short], [1, -1]),
+        valid=valid,
+        capital=capital,
+    )
+
+
+def iron_condors(
+    calls: OptionSide,
+    puts: OptionSide,
+    capital: float,
+    short_delta: tuple[float, float] = (0.10, 0.35),
+    max_wing_steps: int = 10,
+) -> dict[str, np.ndarray]:
+    """Sell an OTM put and call, buy wings further out. legs = [short call, long call, short put, long put]."""
+    c_bid, c_ask, c_spread, c_ok = _quotes(calls)
+    p_bid, p_ask, p_spread, p_ok = _quotes(puts)
+    low, high = short_delta
+    c_delta, p_delta = calls.column("delta"), puts.column("delta")
+    with np.errstate(invalid="ignore"):
+        short_calls = np.flatnonzero(c_ok & (c_delta >= low) & (c_delta <= high))
+        short_puts = np.flatnonzero(p_ok & (-p_delta >= low) & (-p_delta <= high))
+    steps = np.arange(1, max(1, max_wing_steps) + 1)
+    # Grid: short put x short call x wing steps (flattened)
+    sp = np.repeat(short_puts, len(short_calls) * len(steps))
+    sc = np.tile(np.repeat(short_calls, len(steps)), len(short_puts))
+    step = np.tile(steps, len(short_puts) * len(short_calls))
+    lc, lp = sc + step, sp - step
+    in_range = (lc < len(calls)) & (lp >= 0)
+    sp, sc, lc, lp = sp[in_range], sc[in_range], lc[in_range], lp[in_range]
+
+    c_strikes, p_strikes = calls.strikes, puts.strikes
+    credit = p_bid[sp] - p_ask[lp] + c_bid[sc] - c_ask[lc]
+    width = np.maximum(c_strikes[lc] - c_strikes[sc], p_strikes[sp] - p_strikes[lp])
+    upper = c_strikes[sc] + credit
+    lower = p_strikes[sp] - credit
+    pop = 1.0 - _delta_at(calls, upper) - _delta_at(puts, lower)
+    greeks = _net_greeks([calls, calls, puts, puts], [sc, lc, sp, lp], [-1, 1, -1, 1])
+    valid = (
+        c_ok[lc] & p_ok[lp]
+        & (p_strikes[sp] < c_strikes[sc])
+        & (credit >= width * MIN_CONDOR_CREDIT_SHARE)
+        & (np.abs(greeks["delta"]) < MAX_CONDOR_NET_DELTA)
+    )
+    return _finish(
+        legs=np.column_stack([sc, lc, sp, lp]),
+        net_credit=credit,
+        max_profit=credit,
+        max_loss=width - credit,
+        pop=pop,
+        breakevens=np.column_stack([lower, upper]),
+        spread_pcts=[c_spread[sc], c_spread[lc], p_spread[sp], p_spread[lp]],
+        greeks=greeks,
+        valid=valid,
+        capital=capital,
+    )
+
+
+def pareto_front(*objectives: np.ndarray) -> np.ndarray:
+    """Indices of rows not dominated on all objectives (every objective is maximized).
+
+    Rows are visited in lexicographic order, so the first remaining row is always on
+    the front; it removes everything it dominates (ties included). Cost is
+    O(n x front size).
+    """
+    values = np.column_stack(objectives)
+    if len(values) == 0:
+        return np.empty(0, dtype=int)
+    remaining = np.lexsort(values.T[::-1])[::-1]
+    front = []
+    while len(remaining):
+        best = remaining[0]
+        front.append(best)
+        dominated = np.all(values[remaining] <= values[best], axis=1)
+        remaining = remaining[~dominated]
+    return np.asarray(front, dtype=int)
+
+
+def pareto_best(candidates: dict[str, np.ndarray], limit: int | None = None) -> np.ndarray:
+    """Pareto front on (POP, risk/reward, liquidity), best edge first; indices into candidates."""
+    front = pareto_front(candidates["pop"], candidates["risk_reward"], candidates["liquidity_score"])
+    front = front[np.argsort(-candidates["edge"][front], kind="stable")]
+    return front if limit is None else front[:limit]
+
+
+def candidate(candidates: dict[str, np.ndarray], index: int) -> dict[str, Any]:
+    """One candidate as plain Python values (legs as a list of row indices)."""
+    return {name: values[index].tolist() for name, values in candidates.items()}
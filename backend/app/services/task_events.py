@@ -0,0 +1,123 @@
+"""Append-only task event log.
+
+Task timelines used to live in ``tasks.execution_history`` (a JSONB list) that every
+event read, appended to and wrote back whole, so a multi-agent task with hundreds of
+events rewrote a growing document (and its TOAST chunks) on each update. Events are now
+rows in ``task_events`` keyed by (task_id, seq):
+
+- ``next_event`` assigns the next seq and folds the event into ``tasks.event_summary``
+  (count, last seq, per-type counts, last event, last error), the small materialized
+  view returned by TaskResponse and task lists
+- ``record_event`` does that and adds the row to the task's session, so it is inserted
+  (batched with the session's other pending events) by the caller's next commit
+- ``write_events`` bulk-inserts buffered rows (used by TaskProgress between commits)
+- ``load_events`` pages through a task's events by seq (GET /tasks/{id}?since=seq)
+
+Seqs come from the in-memory summary of the Task object; only one worker runs a task at
+a time, so they stay monotonic per task.
+"""
+
+import logging
+from datetime import datetime, timezone
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import object_session
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.db.models import Task, TaskEvent
+
+logger = logging.getLogger(__name__)
+
+EVENTS_PAGE_SIZE = 500  # Default page size for GET /tasks/{id}
+MESSAGE_MAX_CHARS = 2000
+
+
+def empty_summary() -> dict[str, Any]:
+    return {"count": 0, "last_seq": 0, "by_type": {}, "last_event": None, "last_error": None}
+
+
+def next_event(
+    task: Task,
+    event_type: str,
+    message: str,
+    timestamp: datetime | None = None,
+) -> dict[str, Any]:
+    """Assign the next seq to an event and fold it into task.event_summary (no I/O).
+
+    Returns:
+        Row values for ``task_events`` (task_id, seq, event_type, message, created_at)
+    """
+    created_at = timestamp or datetime.now(timezone.utc)
+    summary = task.event_summary if task.event_summary is not None else empty_summary()
+    seq = summary.get("last_seq", 0) + 1
+    event = {"seq": seq, "type": event_type, "message": message[:MESSAGE_MAX_CHARS], "timestamp": created_at.isoformat()}
+
+    summary["last_seq"] = seq
+    summary["count"] = summary.get("count", 0) + 1
+    by_type = summary.setdefault("by_type", {})
+    by_type[event_type] = by_type.get(event_type, 0) + 1
+    summary["last_event"] = event
+    if event_type == "error":
+        summary["last_error"] = event
+    task.event_summary = summary
+    flag_modified(task, "event_summary")
+
+    return {
+        "task_id": task.id,
+        "seq": seq,
+        "event_type": event_type,
+        "message": event["message"],
+        "created_at": created_at,
+    }
+
+
+def record_event(
+    task: Task,
+    event_type: str,
+    message: str,
+    timestamp: datetime | None = None,
+) -> None:
+    """Append an event; it is written by the next commit of the task's session."""
+    row = next_event(task, event_type, message, timestamp)
+    session = object_session(task)
+    if session is None:
+        logger.warning(f"Task {task.id}: event '{event_type}' recorded on a detached task was not persisted")
+        return
+    session.add(TaskEvent(**row))
+
+
+async def write_events(session: AsyncSession, rows: list[dict[str, Any]]) -> None:
+    """Bulk-insert event rows in the session's transaction (duplicates are skipped)."""
+    if rows:
+        await session.execute(
+            insert(TaskEvent).values(rows).on_conflict_do_nothing(index_elements=["task_id", "seq"])
+        )
+
+
+def event_to_dict(event: TaskEvent) -> dict[str, Any]:
+    return {
+        "seq": event.seq,
+        "type": event.event_type,
+        "message": event.message,
+        "timestamp": event.created_at.isoformat(),
+    }
+
+
+async def load_events(
+    session: AsyncSession,
+    task_id: UUID,
+    since: int = 0,
+    limit: int = EVENTS_PAGE_SIZE,
+) -> list[dict[str, Any]]:
+    """Events of a task with seq > since, oldest first (at most limit)."""
+    result = await session.execute(
+        select(TaskEvent)
+        .where(TaskEvent.task_id == task_id, TaskEvent.seq > since)
+        .order_by(TaskEvent.seq)
+        .limit(limit)
+    )
+    return [event_to_dict(event) for event in result.scalars().all()]
@@ -0,0 +1,116 @@
+"""Large task and report payloads in blob storage (see storage/blob_store.py).
+
+What moves out of Postgres once it reaches BLOB_OFFLOAD_MIN_BYTES:
+- ``tasks.task_metadata`` top-level values (strategy_summary with its enrichment
+  output, option_chain, agent_summaries, ...): replaced in place by
+  ``{"$blob": "sha256:...", "bytes": n}`` references; small keys (stages, progress,
+  symbol, flags) stay inline
+- ``tasks.prompt_used``: body in a blob, ``prompt_ref`` set, column keeps an excerpt
+- ``ai_reports.report_content``: body in a blob, ``content_ref`` set, column keeps an
+  excerpt
+
+Metadata is offloaded when a task is created and again when processing ends (picking
+up enrichment output and prompts); readers resolve references lazily, only on detail
+paths (task processing, GET /tasks/{id}, report detail / PDF). A body that cannot be
+stored stays inline; one that cannot be read falls back to the excerpt.
+"""
+
+import asyncio
+import logging
+from typing import Any
+
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.db.models import AIReport, Task
+from app.services.storage.blob_store import get_blob_store, is_ref
+
+logger = logging.getLogger(__name__)
+
+EXCERPT_CHARS = 2000
+
+
+def _excerpt(text: str) -> str:
+    return text[:EXCERPT_CHARS]
+
+
+async def offload_metadata(metadata: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Copy of metadata with large top-level values replaced by blob references."""
+    store = get_blob_store()
+    if not store.enabled or not metadata:
+        return metadata
+    offloaded = dict(metadata)
+    for key, value in metadata.items():
+        try:
+            offloaded[key] = await store.offload_json(value)
+        except Exception as e:
+            logger.warning(f"Blob offload of metadata '{key}' failed, keeping it inline: {e}")
+    return offloaded
+
+
+async def hydrate_metadata(metadata: dict[str, Any] | None) -> dict[str, Any] | None:
+    """Copy of metadata with blob references resolved (unreadable ones become None)."""
+    if not metadata or not any(is_ref(value) for value in metadata.values()):
+        return metadata
+    store = get_blob_store()
+    keys = [key for key, value in metadata.items() if is_ref(value)]
+    values = await asyncio.gather(*(store.load_json(metadata[key]) for key in keys), return_exceptions=True)
+    hydrated = dict(metadata)
+    for key, value in zip(keys, values):
+        if isinstance(value, BaseException):
+            logger.error(f"Failed to load metadata '{key}' from blob storage: {value}")
+            value = None
+        hydrated[key] = value
+    return hydrated
+
+
+async def offload_task_payloads(task: Task, working_metadata: dict[str, Any] | None = None) -> None:
+    """Move the task's large metadata values and prompt to blob storage (caller commits).
+
+    Args:
+        task: Task attached to the caller's session
+        working_metadata: Hydrated metadata the handler worked on; its values replace
+            references in task_metadata (so e.g. enrichment added to strategy_summary is kept)
+    """
+    store = get_blob_store()
+    if not store.enabled:
+        return
+    metadata = dict(task.task_metadata or {})
+    for key, value in metadata.items():
+        if is_ref(value) and working_metadata and working_metadata.get(key) is not None:
+            metadata[key] = working_metadata[key]
+    offloaded = await offload_metadata(metadata)
+    if offloaded != task.task_metadata:
+        task.task_metadata = offloaded
+        flag_modified(task, "task_metadata")
+
+    prompt = task.prompt_used
+    if prompt and not task.prompt_ref and len(prompt.encode("utf-8")) >= store.min_bytes:
+        try:
+            task.prompt_ref = await store.put_text(prompt)
+            task.prompt_used = _excerpt(prompt)
+        except Exception as e:
+            logger.warning(f"Task {task.id}: blob offload of prompt failed, keeping it inline: {e}")
+
+
+async def offload_report_content(report: AIReport) -> None:
+    """Move a large report body to blob storage before the report is committed."""
+    store = get_blob_store()
+    content = report.report_content
+    if not store.enabled or report.content_ref or not content or len(content.encode("utf-8")) < store.min_bytes:
+        return
+    try:
+        report.content_ref = await store.put_text(content)
+        report.report_content = _excerpt(content)
+    except Exception as e:
+        logger.warning(f"Report {report.id}: blob offload failed, keeping content inline: {e}")
+
+
+async def load_text(inline: str | None, ref: str | None) -> str | None:
+    """Full text of an offloaded column (the inline excerpt when there is no ref or it cannot be read)."""
+    if not ref:
+        return inline
+    try:
+        return await get_blob_store().get_text(ref)
+    except Exception as e:
+        logger.error(f"Failed to load blob {ref}: {e}")
+        return inline
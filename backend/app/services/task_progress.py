@@ -0,0 +1,301 @@
+"""Coalesced task progress: in-memory updates, batched persistence and live events.
+
+Agent progress callbacks used to start one async task per callback, each opening a
+session and rewriting the task row, while clients polled GET /tasks/{id}. A running
+task now owns one ``TaskProgress``:
+
+- progress, current stage and sub-stage status are applied to the handler's own Task
+  object in memory, so they ride along with the handler's next commit (every stage
+  boundary already commits the row); timeline events get their seq at once and are
+  buffered as ``task_events`` rows (see task_events.py)
+- one pump task writes the buffer with a bulk INSERT plus a single UPDATE of the row
+  at most once per TASK_PROGRESS_FLUSH_SECONDS (the UPDATE only while the task is
+  still PROCESSING)
+- every update is published at once on ``tasks:events:<task_id>`` (Redis pub/sub, or
+  in-process without Redis) and served to clients by GET /tasks/{id}/events (SSE)
+
+Event payloads (JSON objects):
+- ``progress``: seq (timeline event), progress (0-100), message, timestamp
+- ``stages``: the task_metadata stages list (stage or sub-stage status changed)
+- ``status``: terminal status (SUCCESS / FAILED), result_ref, error_message
+"""
+
+import asyncio
+import json
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, AsyncIterator, Awaitable, Callable
+from uuid import UUID
+
+from sqlalchemy import update
+from sqlalchemy.orm.attributes import flag_modified
+
+from app.core.config import settings
+from app.services.cache import cache_service
+from app.services.task_events import next_event, write_events
+
+logger = logging.getLogger(__name__)
+
+EVENT_CHANNEL_PREFIX = "tasks:events:"
+QUEUE_SIZE = 64  # Events buffered per client; the oldest are dropped for slow clients
+TERMINAL_STATUSES = ("SUCCESS", "FAILED")
+
+
+class TaskEventBus:
+    """Fans task events out to local subscribers, across replicas via Redis pub/sub."""
+
+    def __init__(self) -> None:
+        self._queues: dict[str, set[asyncio.Queue]] = {}
+        self._listener: asyncio.Task | None = None
+
+    async def subscribe(
+        self,
+        task_id: UUID | str,
+        snapshot: Callable[[], Awaitable[dict[str, Any] | None]],
+        heartbeat: float = 15.0,
+    ) -> AsyncIterator[dict[str, Any] | None]:
+        """
+        Events for task_id: snapshot() first (read after subscribing, so nothing falls in
+        between), then live events until a terminal ``status`` event; None every heartbeat
+        seconds without one (for keepalives).
+        """
+        key = str(task_id)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+        self._queues.setdefault(key, set()).add(queue)
+        self._ensure_listener()
+        try:
+            state = await snapshot()
+            if state is None:
+                return
+            yield state
+            if state.get("status") in TERMINAL_STATUSES:
+                return
+            while True:
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    # Pub/sub is best effort: re-check so a missed status event cannot hang the stream
+                    state = await snapshot()
+                    if state is None:
+                        return
+                    if state.get("status") in TERMINAL_STATUSES:
+                        yield {"type": "status", **{k: state.get(k) for k in ("status", "result_ref", "error_message")}}
+                        return
+                    yield None
+                    continue
+                yield event
+                if event.get("type") == "status":
+                    return
+        finally:
+            queues = self._queues.get(key)
+            if queues is not None:
+                queues.discard(queue)
+                if not queues:
+                    del self._queues[key]
+            if not self._queues:
+                self._stop_listener()
+
+    async def publish(self, task_id: UUID | str, event: dict[str, Any]) -> None:
+        """Send an event to every replica's subscribers (locally when Redis is unavailable). Never raises."""
+        key = str(task_id)
+        if cache_service._redis:
+            try:
+                await cache_service._redis.publish(f"{EVENT_CHANNEL_PREFIX}{key}", json.dumps(event, default=str))
+                return
+            except Exception as e:
+                logger.debug(f"Task {key}: event publish failed, delivering locally: {e}")
+        self.deliver(key, event)
+
+    def deliver(self, key: str, event: dict[str, Any]) -> None:
+        for queue in self._queues.get(key, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+    def _ensure_listener(self) -> None:
+        if self._listener is None and cache_service._redis:
+            self._listener = asyncio.create_task(self._listen())
+
+    def _stop_listener(self) -> None:
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+
+    async def _listen(self) -> None:
+        while True:
+            try:
+                redis = cache_service._redis
+                if not redis:
+                    await asyncio.sleep(5)
+                    continue
+                pubsub = redis.pubsub()
+                await pubsub.psubscribe(f"{EVENT_CHANNEL_PREFIX}*")
+                try:
+                    async for message in pubsub.listen():
+                        if message.get("type") != "pmessage":
+                            continue
+                        channel = message.get("channel")
+                        channel = channel.decode() if isinstance(channel, bytes) else str(channel)
+                        self.deliver(channel[len(EVENT_CHANNEL_PREFIX):], json.loads(message["data"]))
+                finally:
+                    await pubsub.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Task event listener error (retrying): {e}")
+                await asyncio.sleep(5)
+
+    def stats(self) -> dict[str, Any]:
+        return {"tasks": len(self._queues), "subscribers": sum(len(q) for q in self._queues.values())}
+
+    async def shutdown(self) -> None:
+        self._stop_listener()
+
+
+task_event_bus = TaskEventBus()
+
+# Running tasks' progress channels (so stage helpers can notify without threading it through)
+_active: dict[UUID, "TaskProgress"] = {}
+
+
+def progress_for(task_id: UUID) -> "TaskProgress | None":
+    return _active.get(task_id)
+
+
+class TaskProgress:
+    """Progress channel of one running task (see module docstring)."""
+
+    def __init__(self, task: Any, flush_interval: float | None = None) -> None:
+        self.task = task  # The handler session's Task: its in-memory state is authoritative while running
+        self.task_id = task.id
+        self.flush_interval = settings.task_progress_flush_seconds if flush_interval is None else flush_interval
+        self.writes = 0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._outbox: list[dict[str, Any]] = []
+        self._rows: list[dict[str, Any]] = []  # task_events rows not yet inserted
+        self._wake = asyncio.Event()
+        self._closing = False
+        self._pump: asyncio.Task | None = None
+
+    def start(self) -> "TaskProgress":
+        _active[self.task_id] = self
+        self._pump = asyncio.create_task(self._run())
+        return self
+
+    def emit(self, progress: int, message: str, event_type: str = "progress") -> None:
+        """Record progress (timeline event + task_metadata progress/current_stage). Sync, no I/O."""
+        now = datetime.now(timezone.utc)
+        row = next_event(self.task, event_type, f"[{progress}%] {message}", now)
+        self._rows.append(row)
+        metadata = self.task.task_metadata if self.task.task_metadata is not None else {}
+        metadata["progress"] = progress
+        metadata["current_stage"] = message
+        self.task.task_metadata = metadata
+        self._changed({
+            "type": "progress",
+            "seq": row["seq"],
+            "progress": progress,
+            "message": message,
+            "timestamp": now.isoformat(),
+        })
+
+    def set_sub_stage(self, stage_id: str, sub_stage_id: str, status: str) -> None:
+        """Set one sub-stage's status in task_metadata.stages."""
+        for stage in (self.task.task_metadata or {}).get("stages") or []:
+            if stage.get("id") != stage_id:
+                continue
+            for sub in stage.get("sub_stages", []):
+                if sub.get("id") == sub_stage_id:
+                    if sub.get("status") == status:
+                        return
+                    sub["status"] = status
+                    self.stages_changed()
+                    return
+            return
+
+    def stages_changed(self) -> None:
+        """Publish the stages list after the handler (or set_sub_stage) changed it."""
+        stages = (self.task.task_metadata or {}).get("stages")
+        if stages is not None:
+            self._changed({"type": "stages", "stages": stages})
+
+    def _changed(self, event: dict[str, Any]) -> None:
+        # The handler's next commit writes the JSON columns too
+        if self.task.task_metadata is not None:
+            flag_modified(self.task, "task_metadata")
+        self._dirty = True
+        self._outbox.append(json.loads(json.dumps(event, default=str)))  # Snapshot: stages keep mutating
+        self._wake.set()
+
+    async def _run(self) -> None:
+        while True:
+            timeout = None
+            if self._dirty:
+                timeout = max(self._last_flush + self.flush_interval - time.monotonic(), 0.0)
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+            await self._publish_outbox()
+            if self._dirty and (self._closing or time.monotonic() - self._last_flush >= self.flush_interval):
+                await self.flush()
+            if self._closing:
+                return
+
+    async def _publish_outbox(self) -> None:
+        events, self._outbox = self._outbox, []
+        for event in events:
+            await task_event_bus.publish(self.task_id, event)
+
+    async def flush(self) -> None:
+        """Insert buffered events and write progress with one UPDATE (no-op once the task has finished)."""
+        from app.db.models import Task
+        from app.db.session import AsyncSessionLocal
+
+        rows, self._rows = self._rows, []
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        try:
+            async with AsyncSessionLocal() as session:
+                await write_events(session, rows)
+                await session.execute(
+                    update(Task)
+                    .where(Task.id == self.task_id, Task.status == "PROCESSING")
+                    .values(
+                        event_summary=self.task.event_summary,
+                        task_metadata=self.task.task_metadata,
+                        updated_at=datetime.now(timezone.utc),
+                    )
+                )
+                await session.commit()
+            self.writes += 1
+        except Exception as e:
+            self._rows = rows + self._rows
+            self._dirty = True  # Retried on the next interval
+            logger.warning(f"Failed to persist progress for task {self.task_id}: {e}")
+
+    async def close(self) -> None:
+        """Publish pending events and persist anything not yet written, then stop."""
+        _active.pop(self.task_id, None)
+        if self._pump is None:
+            return
+        self._closing = True
+        self._wake.set()
+        try:
+            await self._pump
+        except Exception as e:
+            logger.warning(f"Progress pump for task {self.task_id} failed: {e}")
+        self._pump = None
+
+
+async def publish_status(task: Any) -> None:
+    """Tell live subscribers the task reached a terminal status."""
+    await task_event_bus.publish(task.id, {
+        "type": "status",
+        "status": task.status,
+        "result_ref": task.result_ref,
+        "error_message": task.error_message,
+    })
@@ -0,0 +1,373 @@
+"""Durable background task queue (Redis Streams) and the worker that drains it.
+
+Background tasks used to run with ``loop.create_task`` inside the API process: no
+concurrency cap, lost on redeploy or scale-in, and multi-minute reports competing
+with HTTP requests for the event loop. The API now only enqueues; worker processes
+(``python -m app.worker``) consume:
+
+- one stream per task type (``tasks:stream:<type>``) read by the ``task-workers``
+  consumer group; a worker reads a type only while it has a free slot for it
+  (``TASK_WORKER_CONCURRENCY``, ``type=limit`` pairs; 0 = not handled here)
+- visibility timeout: a worker re-claims its in-flight messages on a heartbeat, so a
+  message idle longer than ``TASK_QUEUE_VISIBILITY_TIMEOUT_SECONDS`` belongs to a
+  dead worker and is recovered (XAUTOCLAIM) and requeued
+- orphan sweep: PROCESSING tasks with no live worker (started in-process before the
+  queue, or whose message was lost) are requeued the same way
+- retries: network errors are retried with RetryConfig backoff via a delayed set;
+  other errors fail the task as before. A task requeued more than
+  RetryConfig.MAX_RETRIES times is failed.
+- a per-task run key (``tasks:running:<id>``) keeps one worker on a task at a time
+
+Requeueing refunds the quota a started run reserved (the rerun reserves it again).
+Without Redis, create_task_async falls back to in-process processing
+(``TASK_QUEUE_INLINE_FALLBACK``) so development setups keep working.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import socket
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Any
+from uuid import UUID
+
+from redis.exceptions import ResponseError
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.constants import RetryConfig
+from app.services.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+STREAM_PREFIX = "tasks:stream:"
+GROUP = "task-workers"
+DELAYED_KEY = "tasks:delayed"
+RUNNING_PREFIX = "tasks:running:"
+SWEEP_LOCK_KEY = "tasks:orphan_sweep_lock"
+
+TASK_TYPES: tuple[str, ...] = (
+    "ai_report",
+    "multi_agent_report",
+    "options_analysis_workflow",
+    "stock_screening_workflow",
+    "generate_strategy_chart",
+)
+# Failures worth another attempt; anything else fails the task on the first run
+RETRYABLE_ERRORS = (ConnectionError, TimeoutError, asyncio.TimeoutError)
+
+# KEYS[1] = delayed zset; ARGV[1] = now. Pops (up to 100) due entries atomically.
+_POP_DUE_LUA = """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, 100)
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+end
+return due
+"""
+
+
+def stream_key(task_type: str) -> str:
+    return f"{STREAM_PREFIX}{task_type}"
+
+
+def running_key(task_id: UUID | str) -> str:
+    return f"{RUNNING_PREFIX}{task_id}"
+
+
+def parse_concurrency(spec: str, default: int) -> dict[str, int]:
+    """Per-type slot counts from "type=limit,..." (known types not listed get default)."""
+    limits = {task_type: max(0, default) for task_type in TASK_TYPES}
+    for part in (spec or "").split(","):
+        name, _, value = part.partition("=")
+        name = name.strip()
+        if not name:
+            continue
+        try:
+            limits[name] = max(0, int(value))
+        except ValueError:
+            logger.warning("Ignoring invalid task concurrency entry %r", part)
+    return limits
+
+
+def retry_delay(attempt: int) -> float:
+    """Seconds before requeue number attempt runs (the handlers' backoff schedule)."""
+    return float(RetryConfig.INITIAL_WAIT_SECONDS * RetryConfig.BACKOFF_MULTIPLIER ** attempt)
+
+
+async def enqueue_task(task_id: UUID | str, task_type: str, attempt: int = 0) -> bool:
+    """Append a task to its stream. False when Redis is unavailable (caller decides the fallback)."""
+    redis = cache_service._redis
+    if redis is None:
+        return False
+    try:
+        await redis.xadd(
+            stream_key(task_type),
+            {"task_id": str(task_id), "task_type": task_type, "attempt": str(attempt)},
+        )
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to enqueue task {task_id} ({task_type}): {e}")
+        return False
+
+
+async def schedule_task(task_id: UUID | str, task_type: str, attempt: int, delay: float) -> bool:
+    """Enqueue after delay seconds (workers promote due entries). False when Redis is unavailable."""
+    redis = cache_service._redis
+    if redis is None:
+        return False
+    try:
+        member = json.dumps([str(task_id), task_type, attempt])
+        await redis.zadd(DELAYED_KEY, {member: time.time() + delay})
+        return True
+    except Exception as e:
+        logger.warning(f"Failed to schedule task {task_id} ({task_type}): {e}")
+        return False
+
+
+async def requeue_task(task_id: UUID, task_type: str, reason: str, delay: bool = False) -> None:
+    """Put an unfinished task back on the queue (failing it once it has been requeued too often)."""
+    from app.api.endpoints.tasks import _mark_task_requeued, _update_task_status_failed
+
+    attempt = await _mark_task_requeued(task_id, task_type, reason)
+    if attempt is None:
+        return  # Missing or already finished
+    if attempt > RetryConfig.MAX_RETRIES:
+        logger.error(f"Task {task_id} requeued {attempt} times, giving up: {reason}")
+        await _update_task_status_failed(task_id, f"{reason} (gave up after {RetryConfig.MAX_RETRIES} retries)")
+        return
+    if delay and await schedule_task(task_id, task_type, attempt, retry_delay(attempt)):
+        return
+    if not await enqueue_task(task_id, task_type, attempt):
+        # The orphan sweep picks the task up again once Redis is back
+        logger.error(f"Task {task_id} could not be requeued (Redis unavailable)")
+
+
+class TaskWorker:
+    """Consumes the task streams with per-type concurrency limits."""
+
+    def __init__(self, concurrency: dict[str, int] | None = None, consumer: str | None = None) -> None:
+        self.concurrency = concurrency or parse_concurrency(
+            settings.task_worker_concurrency, settings.task_worker_default_concurrency
+        )
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.visibility_timeout = max(settings.task_queue_visibility_timeout_seconds, 30)
+        self._active: dict[str, int] = defaultdict(int)
+        self._inflight: dict[str, tuple[str, str]] = {}  # message id -> (task type, task id)
+        self._jobs: set[asyncio.Task] = set()
+        self._stopping = asyncio.Event()
+        self._last_reclaim = 0.0
+        self._last_sweep = 0.0
+
+    @property
+    def _redis(self) -> Any:
+        return cache_service._redis
+
+    @property
+    def task_types(self) -> list[str]:
+        return [task_type for task_type, limit in self.concurrency.items() if limit > 0]
+
+    def free_slots(self, task_type: str) -> int:
+        return self.concurrency.get(task_type, 0) - self._active[task_type]
+
+    def stop(self) -> None:
+        """Stop reading; run() returns once in-flight tasks finish (or are requeued)."""
+        self._stopping.set()
+
+    async def _idle(self, seconds: float) -> None:
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout=seconds)
+        except asyncio.TimeoutError:
+            pass
+
+    async def ensure_groups(self) -> None:
+        for task_type in self.task_types:
+            try:
+                await self._redis.xgroup_create(stream_key(task_type), GROUP, id="0", mkstream=True)
+            except ResponseError as e:
+                if "BUSYGROUP" not in str(e):
+                    raise
+
+    async def run(self) -> None:
+        """Process tasks until stop() is called."""
+        if self._redis is None:
+            raise RuntimeError("Task worker requires Redis")
+        await self.ensure_groups()
+        logger.info(f"Task worker {self.consumer} started: {dict(self.concurrency)}")
+        heartbeat = asyncio.create_task(self._heartbeat_loop())
+        try:
+            while not self._stopping.is_set():
+                try:
+                    await self.poll()
+                except Exception as e:
+                    logger.warning(f"Task worker poll failed: {e}", exc_info=True)
+                    await self._idle(1.0)
+        finally:
+            await self._drain()
+            heartbeat.cancel()
+            logger.info(f"Task worker {self.consumer} stopped")
+
+    async def poll(self, block_ms: int = 2000) -> None:
+        """One worker cycle: promote due retries, recover orphans, start new messages."""
+        now = time.monotonic()
+        await self.promote_due()
+        if now - self._last_reclaim >= self.visibility_timeout / 2:
+            self._last_reclaim = now
+            await self.reclaim()
+        if now - self._last_sweep >= self.visibility_timeout:
+            self._last_sweep = now
+            await self.sweep_orphans()
+
+        streams = {stream_key(t): ">" for t in self.task_types if self.free_slots(t) > 0}
+        if not streams:
+            await self._idle(block_ms / 1000)
+            return
+        # COUNT applies per stream and every listed type has a free slot
+        response = await self._redis.xreadgroup(GROUP, self.consumer, streams, count=1, block=block_ms)
+        for stream, messages in response or []:
+            task_type = stream.removeprefix(STREAM_PREFIX)
+            for message_id, fields in messages:
+                self._start(task_type, message_id, fields)
+
+    async def promote_due(self) -> None:
+        """Move retries whose backoff has elapsed from the delayed set onto their streams."""
+        due = await self._redis.eval(_POP_DUE_LUA, 1, DELAYED_KEY, time.time())
+        for member in due or []:
+            try:
+                task_id, task_type, attempt = json.loads(member)
+            except (TypeError, ValueError):
+                logger.warning(f"Dropping malformed delayed task entry {member!r}")
+                continue
+            await enqueue_task(task_id, task_type, attempt)
+
+    async def reclaim(self) -> None:
+        """Requeue messages left unacknowledged by dead workers (idle past the visibility timeout)."""
+        for task_type in self.task_types:
+            stream = stream_key(task_type)
+            result = await self._redis.xautoclaim(
+                stream, GROUP, self.consumer,
+                min_idle_time=self.visibility_timeout * 1000, start_id="0-0", count=50,
+            )
+            for message_id, fields in result[1]:
+                task_id = (fields or {}).get("task_id")
+                if task_id and await self._redis.exists(running_key(task_id)):
+                    continue  # Still running somewhere; stays pending until its worker acks it
+                await self._ack(stream, message_id)
+                if task_id:
+                    logger.warning(f"Recovered task {task_id} from a stopped worker")
+                    await requeue_task(UUID(task_id), task_type, "Worker stopped before finishing; task requeued")
+
+    async def sweep_orphans(self) -> None:
+        """Requeue PROCESSING tasks that no worker holds (one replica per interval)."""
+        from app.db.models import Task
+        from app.db.session import AsyncSessionLocal
+
+        if not await cache_service.acquire_lock(SWEEP_LOCK_KEY, ttl=max(self.visibility_timeout // 2, 30)):
+            return
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.visibility_timeout)
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(
+                select(Task.id, Task.task_type)
+                .where(Task.status == "PROCESSING", Task.updated_at < cutoff)
+                .limit(100)
+            )
+            orphans = result.all()
+        for task_id, task_type in orphans:
+            if await self._redis.exists(running_key(task_id)):
+                continue
+            logger.warning(f"Recovering orphaned task {task_id} ({task_type})")
+            await requeue_task(task_id, task_type, "Task orphaned (no live worker); requeued")
+
+    async def heartbeat(self) -> None:
+        """Reset idle time of in-flight messages and extend their run keys."""
+        by_type: dict[str, list[str]] = defaultdict(list)
+        for message_id, (task_type, task_id) in list(self._inflight.items()):
+            by_type[task_type].append(message_id)
+        for task_type, message_ids in by_type.items():
+            await self._redis.xclaim(
+                stream_key(task_type), GROUP, self.consumer,
+                min_idle_time=0, message_ids=message_ids, justid=True,
+            )
+        async with self._redis.pipeline(transaction=False) as pipe:
+            for _, task_id in self._inflight.values():
+                pipe.expire(running_key(task_id), self.visibility_timeout)
+            await pipe.execute()
+
+    async def _heartbeat_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.visibility_timeout / 3)
+            try:
+                await self.heartbeat()
+            except Exception as e:
+                logger.warning(f"Task worker heartbeat failed: {e}")
+
+    def _start(self, task_type: str, message_id: str, fields: dict[str, str]) -> None:
+        self._active[task_type] += 1
+        self._inflight[message_id] = (task_type, fields.get("task_id", ""))
+        job = asyncio.create_task(self._process(task_type, message_id, fields))
+        self._jobs.add(job)
+        job.add_done_callback(self._jobs.discard)
+
+    async def _process(self, task_type: str, message_id: str, fields: dict[str, str]) -> None:
+        from app.api.endpoints.tasks import process_task_async
+
+        stream = stream_key(task_type)
+        task_id: UUID | None = None
+        try:
+            task_id = UUID(fields["task_id"])
+            attempt = int(fields.get("attempt") or 0)
+            if not await self._redis.set(running_key(task_id), self.consumer, ex=self.visibility_timeout, nx=True):
+                logger.info(f"Task {task_id} is already running on another worker, dropping duplicate message")
+                return
+            try:
+                await process_task_async(
+                    task_id, task_type, None, final_attempt=attempt >= RetryConfig.MAX_RETRIES
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt < RetryConfig.MAX_RETRIES:
+                    await requeue_task(task_id, task_type, f"Network error, retrying: {e}", delay=True)
+            except Exception:
+                pass  # process_task_async already failed the task and logged the error
+            finally:
+                await self._redis.delete(running_key(task_id))
+        except asyncio.CancelledError:
+            # Shutdown grace period ran out: hand the task to another worker now
+            if task_id is not None:
+                await requeue_task(task_id, task_type, "Worker shut down before finishing; task requeued")
+            raise
+        except (KeyError, ValueError) as e:
+            logger.error(f"Dropping malformed task message {message_id} on {stream}: {e}")
+        finally:
+            self._inflight.pop(message_id, None)
+            self._active[task_type] -= 1
+            await self._ack(stream, message_id)
+
+    async def _ack(self, stream: str, message_id: str) -> None:
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                pipe.xack(stream, GROUP, message_id)
+                pipe.xdel(stream, message_id)
+                await pipe.execute()
+        except Exception as e:
+            # Unacked messages are recovered after the visibility timeout
+            logger.warning(f"Failed to ack task message {message_id} on {stream}: {e}")
+
+    async def _drain(self) -> None:
+        """Give in-flight tasks the shutdown grace period, then cancel (and requeue) the rest."""
+        if not self._jobs:
+            return
+        logger.info(f"Task worker {self.consumer} waiting for {len(self._jobs)} in-flight task(s)")
+        _, pending = await asyncio.wait(set(self._jobs), timeout=settings.task_worker_shutdown_grace_seconds)
+        for job in pending:
+            job.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "consumer": self.consumer,
+            "active": {t: self._active[t] for t in self.task_types},
+            "limits": {t: self.concurrency[t] for t in self.task_types},
+        }
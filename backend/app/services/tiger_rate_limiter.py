@@ -0,0 +1,208 @@
+"""Distributed token bucket with priority classes for Tiger API calls.
+
+Tiger allows RateLimits.TIGER_API_CALLS_PER_MINUTE calls per account, shared by all
+replicas, so the bucket lives in Redis (one Lua script: refill + take, using Redis
+TIME so replica clocks do not matter). When Redis is unavailable each process falls
+back to a local bucket with the same parameters.
+
+Priorities (set with ``tiger_priority(...)`` around a call path, default interactive):
+- INTERACTIVE: user requests (chains, expirations, K-lines, scanner endpoint)
+- BACKGROUND: scheduled radar / scanner jobs
+- PREFETCH: chain prefetch job
+
+Lower priorities may only take a token while a reserve is left for higher ones, and in
+a process they do not compete while a higher-priority call is queued. Calls queue up to
+a per-priority deadline, then fail with 429 instead of hitting Tiger's own limit.
+"""
+
+import asyncio
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Any, Iterator
+
+from fastapi import HTTPException, status
+
+from app.core.constants import RateLimits
+from app.services.cache import CacheService, cache_service
+
+logger = logging.getLogger(__name__)
+
+
+class TigerPriority(IntEnum):
+    """Priority class of a Tiger API call (lower value = more important)."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+    PREFETCH = 2
+
+
+# Tokens that must remain in the bucket for a priority class to take one
+_RESERVE: dict[TigerPriority, int] = {
+    TigerPriority.INTERACTIVE: 0,
+    TigerPriority.BACKGROUND: 2,
+    TigerPriority.PREFETCH: 4,
+}
+# Longest a call may queue for a token (seconds)
+_DEADLINE: dict[TigerPriority, float] = {
+    TigerPriority.INTERACTIVE: 15.0,
+    TigerPriority.BACKGROUND: 60.0,
+    TigerPriority.PREFETCH: 90.0,
+}
+
+_current_priority: ContextVar[TigerPriority] = ContextVar("tiger_priority", default=TigerPriority.INTERACTIVE)
+
+
+@contextmanager
+def tiger_priority(priority: TigerPriority) -> Iterator[None]:
+    """Run Tiger calls made inside this block (and tasks it spawns) at the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+# KEYS[1] = bucket hash; ARGV = capacity, refill tokens per ms, reserve.
+# Returns 0 when a token was taken, else milliseconds until one is available above reserve.
+_TAKE_TOKEN_LUA = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local reserve = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1])
+local ts = tonumber(state[2])
+if tokens == nil or ts == nil then
+  tokens = capacity
+  ts = now
+end
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+local wait = 0
+if tokens >= reserve + 1 then
+  tokens = tokens - 1
+else
+  wait = math.ceil((reserve + 1 - tokens) / rate)
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+redis.call('PEXPIRE', KEYS[1], math.ceil(capacity / rate) * 2)
+return wait
+"""
+
+
+class TigerRateLimiter:
+    """Priority-aware token bucket shared across replicas through Redis."""
+
+    def __init__(
+        self,
+        cache: CacheService,
+        calls_per_minute: int = RateLimits.TIGER_API_CALLS_PER_MINUTE,
+        bucket_key: str = "ratelimit:tiger",
+    ) -> None:
+        self._cache = cache
+        self._capacity = float(calls_per_minute)
+        self._rate_per_ms = calls_per_minute / 60000.0
+        self._bucket_key = bucket_key
+        self._script: Any = None
+        # Local fallback bucket (used while Redis is unavailable)
+        self._local_tokens = self._capacity
+        self._local_ts = time.monotonic()
+        # Metrics
+        self._waiting: dict[TigerPriority, int] = {p: 0 for p in TigerPriority}
+        self._stats: dict[TigerPriority, dict[str, float]] = {
+            p: {"granted": 0, "rejected": 0, "wait_total_s": 0.0, "wait_max_s": 0.0} for p in TigerPriority
+        }
+
+    async def _take_redis(self, reserve: int) -> float | None:
+        """Try to take a token in Redis. Returns seconds to wait (0 = granted), None if Redis is down."""
+        if not await self._cache._ensure_connected():
+            return None
+        try:
+            if self._script is None:
+                self._script = self._cache._redis.register_script(_TAKE_TOKEN_LUA)
+            wait_ms = await self._script(
+                keys=[self._bucket_key], args=[self._capacity, self._rate_per_ms, reserve]
+            )
+            return int(wait_ms) / 1000.0
+        except Exception as e:
+            logger.warning(f"Tiger rate limiter: Redis error, using local bucket: {e}")
+            self._script = None
+            return None
+
+    def _take_local(self, reserve: int) -> float:
+        now = time.monotonic()
+        rate_per_s = self._rate_per_ms * 1000.0
+        self._local_tokens = min(self._capacity, self._local_tokens + (now - self._local_ts) * rate_per_s)
+        self._local_ts = now
+        if self._local_tokens >= reserve + 1:
+            self._local_tokens -= 1
+            return 0.0
+        return (reserve + 1 - self._local_tokens) / rate_per_s
+
+    def _higher_priority_waiting(self, priority: TigerPriority) -> bool:
+        return any(self._waiting[p] for p in TigerPriority if p < priority)
+
+    async def acquire(self, priority: TigerPriority | None = None) -> float:
+        """
+        Wait for a token at the given (or current context) priority.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            HTTPException: 429 if no token became available before the priority's deadline
+        """
+        priority = _current_priority.get() if priority is None else priority
+        reserve = _RESERVE[priority]
+        start = time.monotonic()
+        deadline = start + _DEADLINE[priority]
+        stats = self._stats[priority]
+        self._waiting[priority] += 1
+        try:
+            while True:
+                if self._higher_priority_waiting(priority):
+                    wait = 0.2  # Let queued higher-priority calls go first
+                else:
+                    wait = await self._take_redis(reserve)
+                    if wait is None:
+                        wait = self._take_local(reserve)
+                    if wait <= 0:
+                        waited = time.monotonic() - start
+                        stats["granted"] += 1
+                        stats["wait_total_s"] += waited
+                        stats["wait_max_s"] = max(stats["wait_max_s"], waited)
+                        return waited
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    stats["rejected"] += 1
+                    logger.warning(f"Tiger rate limiter: {priority.name} call gave up after {_DEADLINE[priority]:.0f}s")
+                    raise HTTPException(
+                        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                        detail="Market data provider is busy (Tiger API rate limit). Please retry shortly.",
+                        headers={"Retry-After": "10"},
+                    )
+                await asyncio.sleep(min(max(wait, 0.05), 1.0, remaining))
+        finally:
+            self._waiting[priority] -= 1
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and wait-time metrics per priority class."""
+        out: dict[str, Any] = {}
+        for p in TigerPriority:
+            s = self._stats[p]
+            granted = int(s["granted"])
+            out[p.name.lower()] = {
+                "queued": self._waiting[p],
+                "granted": granted,
+                "rejected": int(s["rejected"]),
+                "avg_wait_s": round(s["wait_total_s"] / granted, 3) if granted else 0.0,
+                "max_wait_s": round(s["wait_max_s"], 3),
+            }
+        return out
+
+
+# Global limiter for all Tiger SDK calls
+tiger_rate_limiter = TigerRateLimiter(cache_service)
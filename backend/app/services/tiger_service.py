@@ -1,13 +1,14 @@
 import asyncio
 import json
 import logging
+import time
 from pathlib import Path
 from typing import Any
 
+import numpy as np
 import pandas as pd  # For DataFrame handling in SDK 3.x
 
 from fastapi import HTTPException, status
-from fastapi.concurrency import run_in_threadpool  # Critical for wrapping sync SDK
 from pybreaker import CircuitBreaker, CircuitBreakerError
 from tenacity import (
     retry,
@@ -28,6 +29,10 @@ from tigeropen.common.consts import SortDirection
 from app.core.config import settings
 from app.core.constants import CacheTTL, RateLimits
 from app.services.cache import cache_service
+from app.services.executors import run_in_executor
+from app.services.option_chain import OptionChain, OptionSide
+from app.services.single_flight import single_flight
+from app.services.tiger_rate_limiter import TigerPriority, tiger_priority, tiger_rate_limiter
 
 logger = logging.getLogger(__name__)
 
@@ -87,6 +92,9 @@ class TigerService:
         - Python SDK uses PKCS#1 format private key
         Docs: https://docs.itigerup.com/docs/prepare
         """
+        # Background stale-while-revalidate refreshes of option chains (by cache key)
+        self._chain_refreshes: dict[str, asyncio.Task] = {}
+        self._chain_refresh_retry_at: dict[str, float] = {}
         if not settings.tiger_use_live_api:
             self._client = None
             logger.info("TigerService: TIGER_USE_LIVE_API=false, using option chain fixture only (no Tiger client).")
@@ -181,23 +189,22 @@ class TigerService:
         wait=wait_exponential(multiplier=1, min=2, max=10),
         reraise=True,
     )
-    @tiger_circuit_breaker
     async def _call_tiger_api_async(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
         """
-        Execute sync SDK methods in a thread pool to avoid blocking the async event loop.
+        Execute sync SDK methods in the Tiger executor to avoid blocking the async event loop.
+
+        The call budget is enforced here, outside the circuit breaker: a limiter 429
+        (queued past its priority deadline) is local back-pressure, not a Tiger
+        failure, and must not count towards opening the breaker.
         """
         if not self._client:
             raise RuntimeError("Tiger Client not initialized")
 
-        try:
-            # Get the method from the client instance
-            method = getattr(self._client, method_name)
-            
-            # Run blocking I/O in thread pool
-            logger.info(f"Calling Tiger API (Thread): {method_name} Args: {args}, Kwargs: {kwargs}")
-            result = await run_in_threadpool(method, *args, **kwargs)
-            return result
+        # Enforce the account-wide call budget (queues by priority, 429 after the deadline)
+        await tiger_rate_limiter.acquire()
 
+        try:
+            return await self._call_tiger_api_guarded(method_name, *args, **kwargs)
         except CircuitBreakerError:
             logger.error(f"Circuit Breaker OPEN. Blocking call to {method_name}")
             raise HTTPException(
@@ -205,6 +212,19 @@ class TigerService:
                 detail="Market data service temporarily unavailable (Circuit Breaker)",
                 headers={"Retry-After": "60"},
             )
+
+    @tiger_circuit_breaker
+    async def _call_tiger_api_guarded(self, method_name: str, *args: Any, **kwargs: Any) -> Any:
+        """Run one SDK call under the circuit breaker (failures here are Tiger failures)."""
+        try:
+            # Get the method from the client instance
+            method = getattr(self._client, method_name)
+            
+            # Run blocking I/O in the dedicated Tiger pool (not the shared default threadpool)
+            logger.info(f"Calling Tiger API (Thread): {method_name} Args: {args}, Kwargs: {kwargs}")
+            result = await run_in_executor("tiger", method, *args, **kwargs)
+            return result
+
         except Exception as e:
             logger.error(f"Tiger API Error in {method_name}: {str(e)}", exc_info=True)
             raise e
@@ -239,6 +259,15 @@ class TigerService:
             expirations = data.get("expirations") or []
             return list(expirations)
         
+        # Coalesce concurrent misses: one Tiger call per symbol across requests and replicas
+        return await single_flight.do(
+            cache_key,
+            lambda: self._fetch_option_expirations(symbol, cache_key, ttl),
+            fill_key=cache_key,
+        )
+
+    async def _fetch_option_expirations(self, symbol: str, cache_key: str, ttl: int) -> list[str]:
+        """Fetch expirations from Tiger and cache them (cache miss path of get_option_expirations)."""
         try:
             # Call Tiger SDK's get_option_expirations method
             expirations_data = await self._call_tiger_api_async(
@@ -305,7 +334,7 @@ class TigerService:
     
     async def get_option_chain(
         self, symbol: str, expiration_date: str, is_pro: bool = False, force_refresh: bool = False
-    ) -> dict[str, Any]:
+    ) -> OptionChain:
         """
         Get option chain with Smart Caching Strategy.
         
@@ -313,7 +342,10 @@ class TigerService:
         Production: set TIGER_USE_LIVE_API=true to call Tiger API.
         
         Cache Strategy (Production Mode):
-        - Base TTL: 10 minutes (600s) for ALL users to conserve API quota
+        - Soft TTL: 10 minutes (600s) for ALL users to conserve API quota
+        - Between soft and hard TTL (30 min): the cached chain is returned immediately with
+          _source="stale" and refreshed by a background task (one per key)
+        - Past the hard TTL (Redis expiry): the request blocks on Tiger
         - Option chains are heavy and don't need second-level updates
         - Manual Refresh: Only fetch fresh data if force_refresh=True
         
@@ -324,7 +356,9 @@ class TigerService:
             force_refresh: If True, bypass cache and fetch fresh data from API
         
         Returns:
-            Dict with calls, puts, and spot_price
+            OptionChain (read-only Mapping over the calls / puts / spot_price dict shape);
+            _source and, for chains from Tiger or the cache, _version (their fetch time,
+            which changes whenever the chain is refetched) are in its meta
         """
         # Dev mode: load from fixture (do not call Tiger)
         if not settings.tiger_use_live_api:
@@ -332,30 +366,36 @@ class TigerService:
             chains = data.get("chains")  # Optional: keyed by "SYMBOL_YYYY-MM-DD"
             key = f"{symbol.upper()}_{expiration_date}"
             if chains and key in chains:
-                out = dict(chains[key])
-                out["_source"] = "fixture"
-                return out
+                return OptionChain.from_dict({**chains[key], "_source": "fixture"})
             option_chain = data.get("option_chain") or {}
-            out = {
-                "calls": list(option_chain.get("calls") or []),
-                "puts": list(option_chain.get("puts") or []),
+            return OptionChain.from_dict({
+                "calls": option_chain.get("calls"),
+                "puts": option_chain.get("puts"),
                 "spot_price": option_chain.get("spot_price") or option_chain.get("underlying_price"),
                 "_source": "fixture",
-            }
-            return out
+            })
 
         # 1. Determine Cache Key & TTL
         cache_key = f"market:chain:{symbol}:{expiration_date}"
-        ttl = CacheTTL.OPTION_CHAIN  # 600s (10 min) to protect Tiger API quota
+        ttl = CacheTTL.OPTION_CHAIN  # 600s (10 min) soft TTL to protect Tiger API quota
 
         # 2. Try Cache First (unless force_refresh is True)
         if ttl > 0 and not force_refresh:
             cached_data = await cache_service.get(cache_key)
-            if cached_data:
+            if cached_data and isinstance(cached_data, dict):
+                # Columnar entries (record lists in entries written before) rebuild without a row parse
+                chain = OptionChain.from_dict(cached_data)
+                cached_at = chain.meta.pop("_cached_at", None)
+                if isinstance(cached_at, (int, float)):
+                    chain.meta["_version"] = cached_at
                 # Add metadata flag if it's served from cache
-                if isinstance(cached_data, dict):
-                    cached_data["_source"] = "cache"
-                return cached_data
+                if isinstance(cached_at, (int, float)) and time.time() - cached_at > ttl:
+                    # Past soft TTL: answer now, refresh behind the response
+                    chain.meta["_source"] = "stale"
+                    self._schedule_chain_refresh(symbol, expiration_date, cache_key, is_pro)
+                else:
+                    chain.meta["_source"] = "cache"
+                return chain
 
         # 2.5 Fallback: Tiger configured but client failed to init (e.g. missing key) → use fixture to avoid log flood
         if not self._client:
@@ -367,18 +407,61 @@ class TigerService:
             chains = data.get("chains")
             key = f"{symbol.upper()}_{expiration_date}"
             if chains and key in chains:
-                out = dict(chains[key])
-                out["_source"] = "fixture_fallback"
-                return out
+                return OptionChain.from_dict({**chains[key], "_source": "fixture_fallback"})
             option_chain = data.get("option_chain") or {}
-            return {
-                "calls": list(option_chain.get("calls") or []),
-                "puts": list(option_chain.get("puts") or []),
+            return OptionChain.from_dict({
+                "calls": option_chain.get("calls"),
+                "puts": option_chain.get("puts"),
                 "spot_price": option_chain.get("spot_price") or option_chain.get("underlying_price"),
                 "_source": "fixture_fallback",
-            }
+            })
+
+        # 3. Cache Miss - Call API once per key (concurrent misses await the same fetch).
+        # Forced refreshes coalesce in-process only: other replicas' cached value is what we bypass.
+        chain = await single_flight.do(
+            cache_key,
+            lambda: self._fetch_option_chain(symbol, expiration_date, cache_key, is_pro),
+            fill_key=cache_key if ttl > 0 else None,
+            distributed=not force_refresh,
+        )
+        # Filled by another replica: the cached entry, whose fetch time is the version.
+        # Each caller gets its own meta; the sides are shared read-only between waiters.
+        chain = OptionChain.coerce(chain).with_meta()
+        if "_cached_at" in chain.meta:
+            chain.meta["_version"] = chain.meta.pop("_cached_at")
+        return chain
 
-        # 3. Cache Miss - Call API with Resilience
+    def _schedule_chain_refresh(self, symbol: str, expiration_date: str, cache_key: str, is_pro: bool) -> None:
+        """Refresh a stale cached chain in the background (at most one task per key)."""
+        if cache_key in self._chain_refreshes:
+            return
+        if time.monotonic() < self._chain_refresh_retry_at.get(cache_key, 0.0):
+            return  # Recent refresh failed: keep serving stale rather than hammering Tiger
+
+        async def _refresh() -> None:
+            try:
+                # Same single-flight key as blocking misses; other replicas see the stale
+                # value under fill_key and skip their own refresh
+                with tiger_priority(TigerPriority.BACKGROUND):  # A stale answer was already served
+                    await single_flight.do(
+                        cache_key,
+                        lambda: self._fetch_option_chain(symbol, expiration_date, cache_key, is_pro),
+                        fill_key=cache_key,
+                    )
+                self._chain_refresh_retry_at.pop(cache_key, None)
+            except Exception as e:
+                self._chain_refresh_retry_at[cache_key] = time.monotonic() + CacheTTL.OPTION_CHAIN_REFRESH_BACKOFF
+                logger.warning(f"Background option chain refresh failed for {cache_key}: {e}")
+
+        task = asyncio.create_task(_refresh())
+        self._chain_refreshes[cache_key] = task
+        task.add_done_callback(lambda _t: self._chain_refreshes.pop(cache_key, None))
+
+    async def _fetch_option_chain(
+        self, symbol: str, expiration_date: str, cache_key: str, is_pro: bool
+    ) -> OptionChain:
+        """Fetch, serialize and cache an option chain from Tiger (cache miss / refresh path of get_option_chain)."""
+        ttl = CacheTTL.OPTION_CHAIN_HARD
         try:
             # Official method signature from Tiger SDK (verified from source code):
             # get_option_chain(self, symbol, expiry, option_filter=None, **kwargs)
@@ -423,87 +506,14 @@ class TigerService:
                         if len(spot_prices) > 0:
                             spot_price_from_df = _normalize_number(spot_prices.iloc[0])
                     
-                    # Separate calls and puts using 'put_call' column
-                    calls_df = chain_data[chain_data['put_call'] == 'CALL'].copy()
-                    puts_df = chain_data[chain_data['put_call'] == 'PUT'].copy()
-                    
-                    # Convert to list of dicts with normalized field names
-                    calls = []
-                    puts = []
-                    
-                    # Process calls
-                    for _, row in calls_df.iterrows():
-                        # Handle strike - may be string or number
-                        strike_value = row.get('strike')
-                        if isinstance(strike_value, str):
-                            # Remove any non-numeric characters except decimal point
-                            strike_value = strike_value.replace(',', '').strip()
-                        strike = _normalize_number(strike_value)
-                        
-                        call_dict = {
-                            "strike": strike,
-                            "bid": _normalize_number(row.get('bid_price'), default=0),
-                            "ask": _normalize_number(row.get('ask_price'), default=0),
-                            "volume": _normalize_number(row.get('volume'), default=0),
-                            "open_interest": _normalize_number(row.get('open_interest'), default=0),
-                        }
-                        # Add Greeks
-                        greeks = {}
-                        for greek_name in ["delta", "gamma", "theta", "vega", "rho"]:
-                            value = _normalize_number(row.get(greek_name))
-                            if value is not None:
-                                call_dict[greek_name] = value
-                                greeks[greek_name] = value
-                        if greeks:
-                            call_dict["greeks"] = greeks
-                        # Add other fields
-                        if pd.notna(row.get('latest_price')):
-                            call_dict["latest_price"] = _normalize_number(row.get('latest_price'))
-                        # Add implied_volatility (critical for AI analysis and risk assessment)
-                        if pd.notna(row.get('implied_vol')):
-                            iv_value = _normalize_number(row.get('implied_vol'))
-                            if iv_value is not None:
-                                call_dict["implied_vol"] = iv_value
-                                call_dict["implied_volatility"] = iv_value  # Also include full name
-                        if call_dict["strike"] is not None and call_dict["strike"] > 0:
-                            calls.append(call_dict)
-                    
-                    # Process puts
-                    for _, row in puts_df.iterrows():
-                        # Handle strike - may be string or number
-                        strike_value = row.get('strike')
-                        if isinstance(strike_value, str):
-                            # Remove any non-numeric characters except decimal point
-                            strike_value = strike_value.replace(',', '').strip()
-                        strike = _normalize_number(strike_value)
-                        
-                        put_dict = {
-                            "strike": strike,
-                            "bid": _normalize_number(row.get('bid_price'), default=0),
-                            "ask": _normalize_number(row.get('ask_price'), default=0),
-                            "volume": _normalize_number(row.get('volume'), default=0),
-                            "open_interest": _normalize_number(row.get('open_interest'), default=0),
-                        }
-                        # Add Greeks
-                        greeks = {}
-                        for greek_name in ["delta", "gamma", "theta", "vega", "rho"]:
-                            value = _normalize_number(row.get(greek_name))
-                            if value is not None:
-                                put_dict[greek_name] = value
-                                greeks[greek_name] = value
-                        if greeks:
-                            put_dict["greeks"] = greeks
-                        # Add other fields
-                        if pd.notna(row.get('latest_price')):
-                            put_dict["latest_price"] = _normalize_number(row.get('latest_price'))
-                        # Add implied_volatility (critical for AI analysis and risk assessment)
-                        if pd.notna(row.get('implied_vol')):
-                            iv_value = _normalize_number(row.get('implied_vol'))
-                            if iv_value is not None:
-                                put_dict["implied_vol"] = iv_value
-                                put_dict["implied_volatility"] = iv_value  # Also include full name
-                        if put_dict["strike"] is not None and put_dict["strike"] > 0:
-                            puts.append(put_dict)
+                    # Separate calls and puts using 'put_call' column; each side is parsed
+                    # column-wise into an OptionChain (no per-row iterrows / per-cell normalization)
+                    put_call = chain_data['put_call']
+                    option_chain = OptionChain(
+                        calls=OptionSide.from_frame(chain_data[put_call == 'CALL']),
+                        puts=OptionSide.from_frame(chain_data[put_call == 'PUT']),
+                    )
+                    calls, puts = option_chain.calls, option_chain.puts
                     
                     # Try to get spot price (prioritize direct field from DataFrame)
                     spot_price = None
@@ -515,30 +525,27 @@ class TigerService:
                     
                     # Method 2: Try to infer from ATM options using delta
                     if (spot_price is None or spot_price <= 0) and len(calls) > 0 and len(puts) > 0:
-                        # Find ATM options (delta closest to 0.5 for calls, -0.5 for puts)
-                        atm_calls = [c for c in calls if c.get('delta') is not None and 0.3 < c.get('delta', 0) < 0.7]
-                        atm_puts = [p for p in puts if p.get('delta') is not None and -0.7 < p.get('delta', 0) < -0.3]
-                        if atm_calls and atm_puts:
+                        # Find ATM options (delta closest to 0.5 for calls, -0.5 for puts; NaN never matches)
+                        call_deltas, put_deltas = calls.column("delta"), puts.column("delta")
+                        atm_calls = np.flatnonzero((call_deltas > 0.3) & (call_deltas < 0.7))
+                        atm_puts = np.flatnonzero((put_deltas > -0.7) & (put_deltas < -0.3))
+                        if len(atm_calls) and len(atm_puts):
                             # Use the option with delta closest to 0.5/-0.5
-                            best_call = min(atm_calls, key=lambda c: abs(c.get('delta', 0) - 0.5))
-                            best_put = min(atm_puts, key=lambda p: abs(abs(p.get('delta', 0)) - 0.5))
-                            if best_call.get('strike') and best_put.get('strike'):
-                                # Average the strikes of ATM options
-                                spot_price = (best_call['strike'] + best_put['strike']) / 2
-                                logger.debug(f"Using ATM inference for {symbol}: ${spot_price:.2f}")
+                            best_call = atm_calls[np.argmin(np.abs(call_deltas[atm_calls] - 0.5))]
+                            best_put = atm_puts[np.argmin(np.abs(np.abs(put_deltas[atm_puts]) - 0.5))]
+                            # Average the strikes of ATM options (rows always have a positive strike)
+                            spot_price = float(calls.strikes[best_call] + puts.strikes[best_put]) / 2
+                            logger.debug(f"Using ATM inference for {symbol}: ${spot_price:.2f}")
                     
                     # Method 3: If delta-based inference failed, use median strike of options with volume
                     if (spot_price is None or spot_price <= 0) and len(calls) > 0 and len(puts) > 0:
                         # Get strikes from options with volume > 0
-                        call_strikes = [c['strike'] for c in calls if c.get('strike') and c.get('volume', 0) > 0]
-                        put_strikes = [p['strike'] for p in puts if p.get('strike') and p.get('volume', 0) > 0]
-                        if call_strikes and put_strikes:
+                        call_strikes = calls.strikes[calls.column("volume") > 0]
+                        put_strikes = puts.strikes[puts.column("volume") > 0]
+                        if len(call_strikes) and len(put_strikes):
                             # Use median of strikes with volume
-                            import statistics
-                            all_strikes = sorted(call_strikes + put_strikes)
-                            if all_strikes:
-                                spot_price = statistics.median(all_strikes)
-                                logger.debug(f"Using median strike inference for {symbol}: ${spot_price:.2f}")
+                            spot_price = float(np.median(np.concatenate([call_strikes, put_strikes])))
+                            logger.debug(f"Using median strike inference for {symbol}: ${spot_price:.2f}")
                     
                     # Method 4: Fallback to get_realtime_price (Sandwich method) - only if all else fails
                     if spot_price is None or spot_price <= 0:
@@ -550,11 +557,8 @@ class TigerService:
                             # If all methods fail, use None
                             spot_price = None
                     
-                    serialized_data = {
-                        "calls": calls,
-                        "puts": puts,
-                        "spot_price": spot_price,
-                    }
+                    option_chain.spot_price = spot_price
+                    serialized_data = option_chain
             elif hasattr(chain_data, '__dict__'):
                 # Object with attributes (SDK 2.x format or custom object)
                 serialized_data = {
@@ -583,11 +587,17 @@ class TigerService:
                     logger.warning(f"Could not serialize chain_data for {symbol}, caching as string")
                     serialized_data = {"raw": str(chain_data)}
 
-            # 4. Set Cache with is_pro flag for correct TTL
+            # 4. Set Cache until the hard TTL; _cached_at drives the soft TTL (stale-while-revalidate).
+            # Stored columnar, so cache readers rebuild the chain without parsing rows.
+            chain = OptionChain.coerce(serialized_data)
+            fetched_at = time.time()
             if ttl > 0:
-                await cache_service.set(cache_key, serialized_data, ttl=ttl, is_pro=is_pro)
+                await cache_service.set(
+                    cache_key, {**chain.to_columnar(), "_cached_at": fetched_at}, ttl=ttl, is_pro=is_pro
+                )
             
-            return serialized_data
+            # The fetch time versions the chain (the cached entry carries it as _cached_at)
+            return chain.with_meta(_version=fetched_at)
 
         except HTTPException:
             # Re-raise HTTP exceptions (like 503 from Circuit Breaker)
@@ -690,6 +700,16 @@ class TigerService:
         if not self._client:
             return []
         
+        # Coalesce concurrent misses / stale refreshes for the same bars request
+        return await single_flight.do(
+            cache_key,
+            lambda: self._fetch_kline_data(symbol, period, limit, cache_key, ttl),
+        )
+
+    async def _fetch_kline_data(
+        self, symbol: str, period: str, limit: int, cache_key: str, ttl: int
+    ) -> list[dict[str, Any]]:
+        """Fetch bars from Tiger and cache them (cache miss path of get_kline_data)."""
         try:
             # Call Tiger SDK's get_bars method
             # Method signature: get_bars(symbols, period, limit, **kwargs)
@@ -831,9 +851,9 @@ class TigerService:
                 is_pro=False,
             )
             
-            # Step C: The Sandwich Method
-            calls = chain_data.get("calls", []) or []
-            if not calls:
+            # Step C: The Sandwich Method (strike-sorted columns: no per-row dict scan)
+            calls = OptionChain.coerce(chain_data).calls
+            if not len(calls):
                 logger.warning(f"No call options found for {symbol} to infer price")
                 return None
             
@@ -851,48 +871,24 @@ class TigerService:
             # For Call options:
             # - ITM: delta > 0.5 (intrinsic value dominates)
             # - OTM: delta < 0.5 (time value dominates)
-            highest_itm_strike = None
-            lowest_otm_strike = None
-            valid_calls_with_delta = 0
-            
-            for call in calls:
-                strike = _normalize_number(call.get("strike") or call.get("strike_price"))
-                if strike is None or strike <= 0:
-                    continue
-                
-                # Extract delta from Greeks (handle nested or flat format)
-                delta = None
-                greeks = call.get("greeks", {})
-                if isinstance(greeks, dict):
-                    delta = _normalize_number(greeks.get("delta"))
-                if delta is None:
-                    delta = _normalize_number(call.get("delta"))
-                
-                # Use delta to determine ITM/OTM
-                # Delta > 0.5 for calls means ITM, < 0.5 means OTM
-                if delta is not None:
-                    valid_calls_with_delta += 1
-                    if delta > 0.5:
-                        # ITM: current price > strike
-                        if highest_itm_strike is None or strike > highest_itm_strike:
-                            highest_itm_strike = strike
-                    elif delta < 0.5:
-                        # OTM: current price < strike
-                        if lowest_otm_strike is None or strike < lowest_otm_strike:
-                            lowest_otm_strike = strike
+            strikes = calls.strikes
+            deltas = calls.column("delta")
+            valid_calls_with_delta = int(np.count_nonzero(~np.isnan(deltas)))
             
             # Edge case: No calls with delta found (market closed or data incomplete)
             if valid_calls_with_delta == 0:
                 logger.warning(f"No call options with delta found for {symbol}. Market may be closed or data incomplete.")
                 # Fallback: Use strike-based estimation (less accurate)
-                strikes = [_normalize_number(c.get("strike") or c.get("strike_price")) for c in calls]
-                strikes = [s for s in strikes if s is not None and s > 0]
-                if strikes:
-                    # Assume price is near the middle of strike range
-                    avg_strike = sum(strikes) / len(strikes)
-                    logger.info(f"Fallback: Estimated price for {symbol} using average strike: ${avg_strike:.2f}")
-                    return avg_strike
-                return None
+                # Assume price is near the middle of strike range
+                avg_strike = float(strikes.mean())
+                logger.info(f"Fallback: Estimated price for {symbol} using average strike: ${avg_strike:.2f}")
+                return avg_strike
+            
+            # Strikes are sorted: the last ITM row and the first OTM row are the boundaries
+            itm = strikes[deltas > 0.5]
+            otm = strikes[deltas < 0.5]
+            highest_itm_strike = float(itm[-1]) if len(itm) else None
+            lowest_otm_strike = float(otm[0]) if len(otm) else None
             
             # Calculate estimated price
             if highest_itm_strike is not None and lowest_otm_strike is not None:
@@ -1222,5 +1218,6 @@ def _normalize_number(value: Any, default: float | None = None) -> float | None:
             pass
     return default
 
+
 # Singleton instance
 tiger_service = TigerService()
\ No newline at end of file
@@ -0,0 +1,153 @@
+"""Cached context of the authenticated user.
+
+get_current_user resolves every request to a UserContext: the handful of User columns
+endpoints read (plan, flags, quota counters). It is cached in the two-tier cache
+(in-process L1 in front of Redis) for USER_CONTEXT_CACHE_TTL seconds and loaded with
+a column-only SELECT on a miss. The full ORM row is loaded only by handlers that
+mutate it (deps.get_current_db_user).
+
+Writers to these columns (payment webhooks, admin edits, quota counters) call
+invalidate_user_context after committing. Invalidation bumps a per-user generation in
+Redis and deletes the entry (other replicas evict their L1 copy via pub/sub); a miss
+only stores what it loaded if the generation did not move meanwhile, so a load that
+raced a write cannot put stale values back.
+"""
+
+import logging
+import uuid
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, fields
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.db.models import User
+from app.services.cache import cache_service
+
+logger = logging.getLogger(__name__)
+
+CONTEXT_KEY_PREFIX = "user:ctx:v1:"  # Bump the version when UserContext fields change
+GENERATION_KEY_PREFIX = "user:gen:"
+GENERATION_TTL = 86400  # Must outlive any context entry
+
+
+@dataclass
+class UserContext:
+    """The authenticated user's columns that endpoints read (attribute-compatible with User)."""
+
+    id: uuid.UUID
+    email: str
+    is_pro: bool
+    is_superuser: bool
+    subscription_id: str | None
+    subscription_type: str | None
+    plan_expiry_date: datetime | None
+    daily_ai_usage: int
+    daily_image_usage: int
+    daily_fundamental_queries_used: int
+    last_quota_reset_date: datetime | None
+    created_at: datetime
+
+    def to_cache(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["id"] = str(self.id)
+        for name in _DATETIME_FIELDS:
+            if data[name] is not None:
+                data[name] = data[name].isoformat()
+        return data
+
+    @classmethod
+    def from_cache(cls, data: Mapping[str, Any]) -> "UserContext":
+        values = {name: data[name] for name in CONTEXT_FIELDS}
+        values["id"] = uuid.UUID(values["id"])
+        for name in _DATETIME_FIELDS:
+            if values[name] is not None:
+                values[name] = datetime.fromisoformat(values[name])
+        return cls(**values)
+
+
+CONTEXT_FIELDS = tuple(f.name for f in fields(UserContext))
+_DATETIME_FIELDS = ("plan_expiry_date", "last_quota_reset_date", "created_at")
+_CONTEXT_COLUMNS = tuple(getattr(User, name) for name in CONTEXT_FIELDS)
+
+
+def _context_key(user_id: uuid.UUID) -> str:
+    return f"{CONTEXT_KEY_PREFIX}{user_id}"
+
+
+def _generation_key(user_id: uuid.UUID) -> str:
+    return f"{GENERATION_KEY_PREFIX}{user_id}"
+
+
+def _entry_ttl(ctx: UserContext, ttl: int) -> int:
+    """Cache TTL, cut short so a Pro plan's expiry is noticed on time."""
+    if ctx.is_pro and ctx.plan_expiry_date:
+        remaining = (ctx.plan_expiry_date - datetime.now(timezone.utc)).total_seconds()
+        ttl = min(ttl, max(1, int(remaining)))
+    return ttl
+
+
+async def _downgrade_if_expired(db: AsyncSession, ctx: UserContext) -> None:
+    """Auto-downgrade an expired Pro plan (safety net for missed webhooks)."""
+    if not (ctx.is_pro and ctx.plan_expiry_date and ctx.plan_expiry_date < datetime.now(timezone.utc)):
+        return
+    ctx.is_pro = False
+    ctx.subscription_type = None
+    try:
+        # Guarded on is_pro so the write happens once per expiry
+        await db.execute(
+            update(User)
+            .where(User.id == ctx.id, User.is_pro.is_(True))
+            .values(is_pro=False, subscription_type=None)
+        )
+        await db.commit()
+        logger.info("Auto-downgraded expired Pro for user %s (expired %s)", ctx.id, ctx.plan_expiry_date)
+    except Exception:
+        await db.rollback()
+
+
+async def get_user_context(db: AsyncSession, user_id: uuid.UUID) -> UserContext | None:
+    """Context of user_id from cache, else from Postgres (None if the user does not exist)."""
+    ttl = settings.user_context_cache_ttl
+    generation = None
+    if ttl > 0:
+        cached = await cache_service.get(_context_key(user_id))
+        if cached is not None:
+            try:
+                return UserContext.from_cache(cached)
+            except (KeyError, TypeError, ValueError) as e:
+                logger.warning(f"Discarding unreadable user context for {user_id}: {e}")
+        generation = await cache_service.get(_generation_key(user_id))
+
+    row = (await db.execute(select(*_CONTEXT_COLUMNS).where(User.id == user_id))).one_or_none()
+    if row is None:
+        return None
+    ctx = UserContext(**row._mapping)
+    await _downgrade_if_expired(db, ctx)
+
+    if ttl > 0 and await cache_service.get(_generation_key(user_id)) == generation:
+        await cache_service.set(_context_key(user_id), ctx.to_cache(), _entry_ttl(ctx, ttl))
+    return ctx
+
+
+async def invalidate_user_context(user_id: uuid.UUID) -> None:
+    """Drop the cached context of user_id; call after committing a write to its columns."""
+    await cache_service.incr(_generation_key(user_id), GENERATION_TTL)
+    await cache_service.delete(_context_key(user_id))
+
+
+def apply_user_fields(user: User | UserContext, values: Mapping[str, Any]) -> None:
+    """Copy freshly written column values (e.g. from UPDATE ... RETURNING) onto a user.
+
+    ORM instances are updated without being marked dirty, so a later flush cannot
+    write the copies back over concurrent updates.
+    """
+    for name, value in values.items():
+        if isinstance(user, User):
+            set_committed_value(user, name, value)
+        else:
+            setattr(user, name, value)
@@ -0,0 +1,52 @@
+"""Background task worker entry point: ``python -m app.worker``.
+
+Consumes the Redis task queue (see app.services.task_queue) in its own process, so
+long reports never share the API's event loop. SIGTERM/SIGINT stop reading; in-flight
+tasks get TASK_WORKER_SHUTDOWN_GRACE_SECONDS to finish and the rest are requeued.
+"""
+
+# Disable tqdm progress bars (FinanceToolkit) before any imports, as in app.main
+import os
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+import asyncio
+import logging
+import signal
+
+from app.core.config import settings
+from app.db.session import close_db, init_db
+from app.services.cache import cache_service
+from app.services.executors import shutdown_executors
+from app.services.task_queue import TaskWorker
+
+logger = logging.getLogger(__name__)
+
+
+async def main() -> None:
+    await init_db()
+    await cache_service.connect()
+    if cache_service._redis is None:
+        await close_db()
+        raise SystemExit("Task worker requires Redis (check REDIS_URL)")
+    await cache_service.start_invalidation_listener()
+
+    worker = TaskWorker()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, worker.stop)
+
+    try:
+        await worker.run()
+    finally:
+        await cache_service.stop_invalidation_listener()
+        await cache_service.disconnect()
+        shutdown_executors()
+        await close_db()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=logging.DEBUG if settings.debug else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    asyncio.run(main())
@@ -28,6 +28,12 @@ if [ $# -ge 1 ] && [ "$1" = "alembic" ]; then
   exec "$@"
 fi
 
+# Task worker (e.g. docker compose "worker" service): the API container runs migrations
+if [ $# -ge 1 ] && [ "$1" = "worker" ]; then
+  echo "Starting task worker..."
+  exec python -m app.worker
+fi
+
 # Normal server start: run migrations then uvicorn
 echo "Running database migrations..."
 if ! alembic upgrade head; then
@@ -0,0 +1,106 @@
+"""
+Benchmark: vectorized Black-Scholes Greeks / implied volatility on large chains.
+
+Builds a synthetic chain (calls + puts, strikes spread around spot, random vols),
+prices it, strips Greeks and IV from a share of the rows and then times:
+
+- bs_greeks on every row (one NumPy call)
+- implied_volatility from the prices (vectorized Newton + bisection, brentq stragglers)
+- OptionChain.fill_greeks (the path StrategyEngine / _ensure_portfolio_greeks use)
+- a per-row scipy brentq loop as the scalar baseline
+
+Usage (from backend directory):
+  python scripts/benchmark_black_scholes.py
+  python scripts/benchmark_black_scholes.py --rows 10000 --missing 0.3 --repeat 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+from scipy.optimize import brentq
+
+from app.services.black_scholes import GREEK_NAMES, IV_LOWER, IV_UPPER, bs_greeks, implied_volatility
+from app.services.option_chain import OptionChain
+
+SPOT = 450.0
+YEARS = 45 / 365
+RATE = 0.04
+
+
+def build_chain(rows: int, missing: float, seed: int = 42) -> tuple[dict, np.ndarray, np.ndarray, np.ndarray]:
+    """Chain dict with Greeks removed from a `missing` share of rows, plus strikes/is_call/prices."""
+    rng = np.random.default_rng(seed)
+    strikes = np.round(np.linspace(SPOT * 0.6, SPOT * 1.4, rows), 2)
+    is_call = np.arange(rows) % 2 == 0
+    vols = rng.uniform(0.12, 0.9, rows)
+    model = bs_greeks(SPOT, strikes, YEARS, vols, is_call, RATE)
+    prices = model["price"]
+    blank = rng.random(rows) < missing
+    calls, puts = [], []
+    for i in range(rows):
+        row = {"strike": float(strikes[i]), "bid": round(prices[i] * 0.99, 4), "ask": round(prices[i] * 1.01, 4)}
+        if not blank[i]:
+            row.update({name: float(model[name][i]) for name in GREEK_NAMES})
+            row["implied_vol"] = float(vols[i])
+        (calls if is_call[i] else puts).append(row)
+    return {"calls": calls, "puts": puts, "spot_price": SPOT}, strikes, is_call, prices
+
+
+def scalar_iv(prices: np.ndarray, strikes: np.ndarray, is_call: np.ndarray) -> list[float]:
+    """Baseline: one brentq solve per row."""
+    out = []
+    for price, strike, call in zip(prices, strikes, is_call):
+        def objective(v: float) -> float:
+            return float(bs_greeks(SPOT, strike, YEARS, v, call, RATE)["price"]) - price
+        try:
+            out.append(brentq(objective, IV_LOWER, IV_UPPER, xtol=1e-8))
+        except ValueError:
+            out.append(float("nan"))
+    return out
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=10000, help="Chain size (calls + puts)")
+    parser.add_argument("--missing", type=float, default=0.3, help="Share of rows without Greeks/IV")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    parser.add_argument("--baseline-rows", type=int, default=1000, help="Rows for the scalar brentq baseline")
+    args = parser.parse_args()
+
+    chain, strikes, is_call, prices = build_chain(args.rows, args.missing)
+    n_base = min(args.baseline_rows, args.rows)
+
+    filled = OptionChain.from_dict(chain).fill_greeks(YEARS, RATE)
+    # fill_greeks works in place, so each timed run gets its own freshly parsed chain
+    parsed = iter([OptionChain.from_dict(chain) for _ in range(args.repeat)])
+    t_greeks = _time(lambda: bs_greeks(SPOT, strikes, YEARS, 0.3, is_call, RATE), args.repeat)
+    t_iv = _time(lambda: implied_volatility(prices, SPOT, strikes, YEARS, is_call, RATE), args.repeat)
+    t_fill = _time(lambda: next(parsed).fill_greeks(YEARS, RATE), args.repeat)
+    t_scalar = _time(lambda: scalar_iv(prices[:n_base], strikes[:n_base], is_call[:n_base]), 1)
+    t_scalar_full = t_scalar * args.rows / n_base
+
+    print(f"Rows: {args.rows} ({int(is_call.sum())} calls), {filled} filled by the model")
+    print(f"  bs_greeks (all rows)           : {t_greeks * 1000:9.2f} ms")
+    print(f"  implied_volatility (all rows)  : {t_iv * 1000:9.2f} ms")
+    print(f"  OptionChain.fill_greeks        : {t_fill * 1000:9.2f} ms")
+    print(f"  scalar brentq IV (extrapolated): {t_scalar_full * 1000:9.2f} ms ({n_base} rows timed)")
+    print(f"  IV speedup                     : {t_scalar_full / t_iv:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: cache codecs for option chain values (size, encode and decode time).
+
+Builds a realistic option chain by tiling the dev fixture (option_chain_fixture.json)
+into N strikes per side, in the exact shape tiger_service caches under
+market:chain:{symbol}:{date}, then measures every available codec against the
+legacy JSON text format. Decode time is what a CacheService.get hit pays.
+
+Usage (from backend directory):
+  python scripts/benchmark_cache_codecs.py
+  python scripts/benchmark_cache_codecs.py --strikes 2000 --repeat 20
+"""
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+from app.services.cache_codecs import available_codecs, decode_value, encode_value
+from app.services.option_chain import OptionChain
+from app.services.tiger_service import _get_option_chain_fixture_path
+
+
+def build_chain(strikes_per_side: int) -> dict:
+    """Tile fixture calls/puts to strikes_per_side rows each (tiger_service cache shape)."""
+    with open(_get_option_chain_fixture_path(), encoding="utf-8") as f:
+        fixture = json.load(f)["option_chain"]
+    rng = random.Random(42)  # Jitter values so compression ratios reflect real (non-repeating) quotes
+    out = {"calls": [], "puts": [], "spot_price": fixture.get("spot_price")}
+    for side in ("calls", "puts"):
+        base = fixture.get(side) or []
+        if not base:
+            continue
+        for i in range(strikes_per_side):
+            row = dict(base[i % len(base)])
+            row["strike"] = float(row["strike"]) + (i // len(base)) * 0.5
+            for key in ("bid", "ask"):
+                row[key] = round(row.get(key, 0) * rng.uniform(0.5, 1.5), 2)
+            for key in ("volume", "open_interest"):
+                row[key] = float(rng.randint(0, 20000))
+            for key in ("delta", "gamma", "theta", "vega", "rho", "implied_vol"):
+                if key in row:
+                    row[key] = round(row[key] * rng.uniform(0.8, 1.2), 6)
+            row["latest_price"] = round((row["bid"] + row["ask"]) / 2, 2)
+            out[side].append(row)
+    # Normalize to the canonical cached shape (flat + nested greeks, both IV keys)
+    return OptionChain.from_dict(out).to_dict()
+
+
+def _best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strikes", type=int, default=1000, help="Strikes per side")
+    parser.add_argument("--repeat", type=int, default=10, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    chain = build_chain(args.strikes)
+    print(f"Option chain: {len(chain['calls'])} calls + {len(chain['puts'])} puts")
+    print(f"{'codec':<14}{'size (KB)':>12}{'ratio':>8}{'encode (ms)':>14}{'decode (ms)':>14}")
+
+    json_size = None
+    for name in available_codecs():
+        encoded = encode_value(chain, name)
+        stored = encoded.encode("utf-8") if isinstance(encoded, str) else encoded  # bytes as read from Redis
+        if decode_value(stored) != chain:
+            raise SystemExit(f"❌ {name}: round trip mismatch")
+        size = len(stored)
+        json_size = json_size or size
+        t_enc = _best_ms(lambda: encode_value(chain, name), args.repeat)
+        t_dec = _best_ms(lambda: decode_value(stored), args.repeat)
+        print(f"{name:<14}{size / 1024:>12.1f}{json_size / size:>7.1f}x{t_enc:>14.2f}{t_dec:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+"""
+Benchmark: Tiger option chain DataFrame -> {calls, puts} dict conversion.
+
+Compares the column-wise conversion used by TigerService.get_option_chain
+(OptionSide.from_frame(...).to_records()) with the previous per-row iterrows loop, on a
+Tiger-shaped DataFrame built by tiling the dev fixture (option_chain_fixture.json)
+up to a realistic chain size (SPY/QQQ monthly chains are several thousand rows).
+
+Usage (from backend directory):
+  python scripts/benchmark_option_chain_conversion.py
+  python scripts/benchmark_option_chain_conversion.py --rows 8000 --repeat 5
+"""
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+import pandas as pd
+
+from app.services.option_chain import OptionSide
+from app.services.tiger_service import _get_option_chain_fixture_path, _normalize_number
+
+
+def _option_frame_to_records(frame: pd.DataFrame) -> list[dict]:
+    """Current implementation: columnar parse, then the memoized dict serialization."""
+    return OptionSide.from_frame(frame).to_records()
+
+
+def _legacy_rows_to_records(frame: pd.DataFrame) -> list[dict]:
+    """Previous implementation (per-row iterrows), kept here as the baseline."""
+    records = []
+    for _, row in frame.iterrows():
+        strike_value = row.get("strike")
+        if isinstance(strike_value, str):
+            strike_value = strike_value.replace(",", "").strip()
+        record = {
+            "strike": _normalize_number(strike_value),
+            "bid": _normalize_number(row.get("bid_price"), default=0),
+            "ask": _normalize_number(row.get("ask_price"), default=0),
+            "volume": _normalize_number(row.get("volume"), default=0),
+            "open_interest": _normalize_number(row.get("open_interest"), default=0),
+        }
+        greeks = {}
+        for greek_name in ["delta", "gamma", "theta", "vega", "rho"]:
+            value = _normalize_number(row.get(greek_name))
+            if value is not None:
+                record[greek_name] = value
+                greeks[greek_name] = value
+        if greeks:
+            record["greeks"] = greeks
+        if pd.notna(row.get("latest_price")):
+            record["latest_price"] = _normalize_number(row.get("latest_price"))
+        if pd.notna(row.get("implied_vol")):
+            iv_value = _normalize_number(row.get("implied_vol"))
+            if iv_value is not None:
+                record["implied_vol"] = iv_value
+                record["implied_volatility"] = iv_value
+        if record["strike"] is not None and record["strike"] > 0:
+            records.append(record)
+    return records
+
+
+def build_tiger_frame(rows: int) -> pd.DataFrame:
+    """Tile fixture calls/puts into a Tiger SDK-shaped DataFrame with ~rows rows."""
+    with open(_get_option_chain_fixture_path(), encoding="utf-8") as f:
+        chain = json.load(f)["option_chain"]
+    spot = chain.get("spot_price") or 0.0
+    base = []
+    for side, put_call in (("calls", "CALL"), ("puts", "PUT")):
+        for opt in chain.get(side) or []:
+            base.append({
+                "put_call": put_call,
+                "strike": opt.get("strike"),
+                "bid_price": opt.get("bid"),
+                "ask_price": opt.get("ask"),
+                "latest_price": (opt.get("bid", 0) + opt.get("ask", 0)) / 2,
+                "volume": opt.get("volume"),
+                "open_interest": opt.get("open_interest"),
+                "delta": opt.get("delta"),
+                "gamma": opt.get("gamma"),
+                "theta": opt.get("theta"),
+                "vega": opt.get("vega"),
+                "rho": opt.get("rho"),
+                "implied_vol": opt.get("implied_vol"),
+                "underlying_price": spot,
+            })
+    if not base:
+        raise SystemExit("Fixture has no options to tile")
+    out = []
+    tiles = max(1, rows // len(base))
+    for t in range(tiles):
+        for opt in base:
+            row = dict(opt)
+            row["strike"] = float(opt["strike"]) + t * 0.5
+            out.append(row)
+    return pd.DataFrame(out)
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=4000, help="Approximate chain size (calls + puts)")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    frame = build_tiger_frame(args.rows)
+    calls_df = frame[frame["put_call"] == "CALL"]
+    puts_df = frame[frame["put_call"] == "PUT"]
+
+    # The columnar path returns rows sorted by strike; Tiger chains already are, the tiled frame is not
+    legacy = tuple(
+        sorted(_legacy_rows_to_records(df), key=lambda r: r["strike"]) for df in (calls_df, puts_df)
+    )
+    columnar = (_option_frame_to_records(calls_df), _option_frame_to_records(puts_df))
+    if legacy != columnar:
+        raise SystemExit("❌ Output mismatch between legacy and columnar conversion")
+
+    t_legacy = _time(lambda: (_legacy_rows_to_records(calls_df), _legacy_rows_to_records(puts_df)), args.repeat)
+    t_columnar = _time(lambda: (_option_frame_to_records(calls_df), _option_frame_to_records(puts_df)), args.repeat)
+
+    print(f"Rows: {len(frame)} ({len(calls_df)} calls, {len(puts_df)} puts), outputs identical ✅")
+    print(f"  iterrows loop : {t_legacy * 1000:9.2f} ms")
+    print(f"  columnar      : {t_columnar * 1000:9.2f} ms")
+    print(f"  speedup       : {t_legacy / t_columnar:9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
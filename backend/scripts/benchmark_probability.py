@@ -0,0 +1,94 @@
+"""
+Benchmark: lognormal POP / expected value over large candidate batches (app/services/probability.py).
+
+Builds --strategies random bull call spreads and iron condors on one underlying
+(Black-Scholes premiums), then times:
+
+- closed_form: exact hold-to-expiration POP / EV for the whole batch
+- monte_carlo: the same batch with a take-profit rule (--take-profit x max profit)
+
+Usage (from backend directory):
+  python scripts/benchmark_probability.py
+  python scripts/benchmark_probability.py --strategies 5000 --paths 2000 --take-profit 0.5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from app.services import payoff, probability
+from app.services.black_scholes import bs_greeks
+
+SPOT = 450.0
+DTE = 45
+VOL = 0.22
+RATE = 0.04
+
+
+def build_strategies(count: int, seed: int = 42) -> list[list[dict]]:
+    """Alternating bull call spreads and iron condors on $1 strikes around SPOT."""
+    rng = np.random.default_rng(seed)
+    years = DTE / 365
+
+    def leg(option_type: str, action: str, strike: float) -> dict:
+        price = float(bs_greeks(SPOT, strike, years, VOL, option_type == "call", RATE)["price"])
+        return {"type": option_type, "action": action, "strike": strike, "premium": price}
+
+    strategies = []
+    for i in range(count):
+        width = float(rng.integers(1, 15))
+        if i % 2:
+            low = SPOT + float(rng.integers(-30, 30))
+            strategies.append([leg("call", "buy", low), leg("call", "sell", low + width)])
+        else:
+            put, call = SPOT - float(rng.integers(5, 40)), SPOT + float(rng.integers(5, 40))
+            strategies.append([
+                leg("put", "buy", put - width), leg("put", "sell", put),
+                leg("call", "sell", call), leg("call", "buy", call + width),
+            ])
+    return strategies
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strategies", type=int, default=2000, help="Candidate strategies in the batch")
+    parser.add_argument("--paths", type=int, default=probability.DEFAULT_PATHS, help="Monte Carlo paths")
+    parser.add_argument("--take-profit", type=float, default=0.5, help="Take-profit fraction of max profit")
+    parser.add_argument("--repeat", type=int, default=3, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    arrays = payoff.leg_arrays(build_strategies(args.strategies))
+    years = DTE / 365
+    exact = probability.closed_form(arrays, SPOT, years, VOL, RATE)
+    managed = probability.monte_carlo(arrays, SPOT, years, VOL, args.take_profit, rate=RATE, paths=args.paths, seed=0)
+    t_exact = _time(lambda: probability.closed_form(arrays, SPOT, years, VOL, RATE), args.repeat)
+    t_mc = _time(
+        lambda: probability.monte_carlo(arrays, SPOT, years, VOL, args.take_profit, rate=RATE, paths=args.paths, seed=0),
+        args.repeat,
+    )
+
+    print(f"Batch: {args.strategies} strategies, spot {SPOT}, {DTE} DTE, vol {VOL}")
+    print(f"  closed_form                 : {t_exact * 1000:9.2f} ms (mean POP {exact['pop'].mean():.3f})")
+    print(
+        f"  monte_carlo ({args.paths} paths, TP {args.take_profit:.0%}): {t_mc * 1000:9.2f} ms "
+        f"(mean POP {managed['pop'].mean():.3f}, exit rate {managed['exit_rate'].mean():.3f})"
+    )
+
+
+if __name__ == "__main__":
+    main()
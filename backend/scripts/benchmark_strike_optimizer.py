@@ -0,0 +1,106 @@
+"""
+Benchmark: exhaustive strike-combination search (app/services/strike_optimizer.py).
+
+Builds a synthetic chain with --strikes strikes per side (Black-Scholes prices with
+a volatility smile, quoted with a small bid/ask spread), then times each template
+(candidate grid + scoring + Pareto front) and the full optimizer path through
+StrategyEngine.generate_strategies(optimize=True).
+
+Usage (from backend directory):
+  python scripts/benchmark_strike_optimizer.py
+  python scripts/benchmark_strike_optimizer.py --strikes 400 --repeat 5
+"""
+import argparse
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+script_dir = Path(__file__).parent
+backend_dir = script_dir.parent
+sys.path.insert(0, str(backend_dir))
+
+import numpy as np
+
+from app.schemas.strategy_recommendation import Outlook, RiskProfile
+from app.services import strike_optimizer
+from app.services.black_scholes import GREEK_NAMES, bs_greeks
+from app.services.option_chain import OptionChain
+from app.services.strategy_engine import StrategyEngine
+
+SPOT = 450.0
+DTE = 45
+RATE = 0.04
+
+
+def build_chain(strikes_per_side: int) -> OptionChain:
+    """Calls and puts on strikes_per_side $1-spaced strikes centred on SPOT."""
+    strikes = SPOT + np.arange(strikes_per_side) - strikes_per_side // 2
+    years = DTE / 365
+    vols = 0.22 + 0.3 * (np.log(strikes / SPOT)) ** 2
+    data = {"spot_price": SPOT, "expiration_date": (date.today() + timedelta(days=DTE)).isoformat()}
+    for side, is_call in (("calls", True), ("puts", False)):
+        model = bs_greeks(SPOT, strikes, years, vols, is_call, RATE)
+        half_spread = np.maximum(0.01, model["price"] * 0.02)
+        rows = []
+        for i, strike in enumerate(strikes):
+            row = {
+                "strike": float(strike),
+                "bid": round(max(0.0, model["price"][i] - half_spread[i]), 2),
+                "ask": round(model["price"][i] + half_spread[i], 2),
+                "implied_vol": float(vols[i]),
+            }
+            row.update({name: float(model[name][i]) for name in GREEK_NAMES})
+            rows.append(row)
+        data[side] = rows
+    return OptionChain.from_dict(data)
+
+
+def _time(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--strikes", type=int, default=400, help="Strikes per side")
+    parser.add_argument("--capital", type=float, default=100000.0, help="Capital for the max-loss filter")
+    parser.add_argument("--repeat", type=int, default=5, help="Repetitions (best time is reported)")
+    args = parser.parse_args()
+
+    chain = build_chain(args.strikes)
+    engine = StrategyEngine()
+    expiration = chain["expiration_date"]
+    templates = {
+        "bull call spreads": lambda: strike_optimizer.bull_call_spreads(chain.calls, args.capital),
+        "bear put spreads": lambda: strike_optimizer.bear_put_spreads(chain.puts, args.capital),
+        "iron condors": lambda: strike_optimizer.iron_condors(chain.calls, chain.puts, args.capital),
+    }
+
+    print(f"Chain: {args.strikes} strikes per side, spot {SPOT}, {DTE} DTE")
+    for label, build in templates.items():
+        candidates = build()
+        front = strike_optimizer.pareto_best(candidates)
+        t_build = _time(build, args.repeat)
+        t_front = _time(lambda: strike_optimizer.pareto_best(candidates), args.repeat)
+        print(
+            f"  {label:<18}: {len(candidates['pop']):7d} valid candidates, Pareto front {len(front):4d} | "
+            f"grid+score {t_build * 1000:7.2f} ms, front {t_front * 1000:6.2f} ms"
+        )
+
+    for outlook in (Outlook.BULLISH, Outlook.BEARISH, Outlook.NEUTRAL):
+        t_engine = _time(
+            lambda: engine.generate_strategies(
+                chain, "SPY", SPOT, outlook, RiskProfile.CONSERVATIVE, args.capital, expiration, optimize=True
+            ),
+            args.repeat,
+        )
+        print(f"  generate_strategies(optimize=True, {outlook.value:<8}): {t_engine * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Tests for summary-mode, keyset-paginated /tasks and /ai/reports listings (DB mocked)."""
+
+import uuid
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.api.endpoints.ai import get_user_reports
+from app.api.endpoints.tasks import list_tasks, symbol_from_metadata
+
+CREATED = datetime(2026, 3, 1, tzinfo=timezone.utc)
+
+
+class FakeResult:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+
+    def all(self):
+        return self.rows
+
+    def scalars(self):
+        return self
+
+
+class FakeDB:
+    def __init__(self, rows) -> None:
+        self.rows = rows
+        self.sql: list[str] = []
+
+    async def execute(self, statement):
+        self.sql.append(str(statement.compile(dialect=postgresql.dialect())))
+        return FakeResult(self.rows)
+
+
+def _task_row(**overrides):
+    row = dict(
+        id=uuid.uuid4(), task_type="ai_report", status="SUCCESS", result_ref=None, error_message=None,
+        symbol="AAPL", event_summary={"count": 3}, model_used="m", started_at=None, retry_count=0,
+        created_at=CREATED, updated_at=CREATED, completed_at=None,
+    )
+    row.update(overrides)
+    return SimpleNamespace(**row)
+
+
+def test_symbol_from_metadata_precedence():
+    assert symbol_from_metadata({"strategy_summary": {"symbol": " aapl "}, "symbol": "MSFT"}) == "AAPL"
+    assert symbol_from_metadata({"strategy_data": {"symbol": "tsla"}}) == "TSLA"
+    assert symbol_from_metadata({"symbol": "nvda"}) == "NVDA"
+    assert symbol_from_metadata({"strategy_summary": "bad", "symbol": "  "}) is None
+    assert symbol_from_metadata(None) is None
+
+
+@pytest.mark.asyncio
+async def test_task_list_selects_summary_columns_with_keyset():
+    db = FakeDB([_task_row()])
+    user = SimpleNamespace(id=uuid.uuid4())
+    before_id = uuid.uuid4()
+    tasks = await list_tasks(
+        user, db, limit=20, skip=0, result_ref=None, before_created_at=CREATED, before_id=before_id, view=None,
+    )
+    sql = db.sql[0]
+    assert "task_metadata" not in sql and "prompt_used" not in sql
+    assert "(tasks.created_at, tasks.id) < (" in sql
+    assert "OFFSET" not in sql
+    assert tasks[0].symbol == "AAPL" and tasks[0].metadata is None and tasks[0].event_summary == {"count": 3}
+
+
+@pytest.mark.asyncio
+async def test_report_list_omits_content_unless_full():
+    row = SimpleNamespace(id=uuid.uuid4(), model_used="m", symbol="AAPL", created_at=CREATED, report_content="# r", content_ref=None)
+    user = SimpleNamespace(id=uuid.uuid4())
+
+    db = FakeDB([row])
+    reports = await get_user_reports(user, db, limit=10, offset=0, before_created_at=None, before_id=None, view="summary")
+    assert "report_content" not in db.sql[0] and "tasks" not in db.sql[0]
+    assert reports[0].report_content is None and reports[0].symbol == "AAPL"
+
+    db = FakeDB([row])
+    reports = await get_user_reports(user, db, limit=10, offset=0, before_created_at=None, before_id=None, view="full")
+    assert "ai_reports.report_content" in db.sql[0]
+    assert reports[0].report_content == "# r"
@@ -52,3 +52,36 @@ def test_market_chain_with_tiger_mock():
     assert len(data["puts"]) == 1
 
     app.dependency_overrides.clear()
+
+
+def test_market_chain_etag_and_gzip():
+    """Versioned chains are sent with an ETag; a matching If-None-Match gets 304."""
+    app.dependency_overrides[get_current_user] = _override_get_current_user
+
+    mock_chain = {
+        "calls": [{"strike": 90.0 + i, "bid": 1.0, "ask": 1.1} for i in range(40)],
+        "puts": [],
+        "spot_price": 101.5,
+        "_source": "cache",
+        "_version": 1700000000.0,
+    }
+    tiger_service.get_option_chain = AsyncMock(return_value=mock_chain)
+
+    client = TestClient(app)
+    params = {"symbol": "AAPL", "expiration_date": "2025-01-17"}
+    headers = {"Authorization": "Bearer test", "Accept-Encoding": "identity"}
+    response = client.get("/api/v1/market/chain", params=params, headers=headers)
+    assert response.status_code == 200
+    assert response.json()["_source"] == "cache"
+    etag = response.headers["etag"]
+
+    not_modified = client.get("/api/v1/market/chain", params=params, headers={**headers, "If-None-Match": etag})
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+
+    zipped = client.get("/api/v1/market/chain", params=params, headers={**headers, "Accept-Encoding": "gzip"})
+    assert zipped.headers["content-encoding"] == "gzip"
+    assert zipped.headers["etag"] != etag
+    assert zipped.json() == response.json()
+
+    app.dependency_overrides.clear()
@@ -0,0 +1,109 @@
+"""Tests for batch strategy recommendations with Tiger service mocked."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from unittest.mock import MagicMock
+
+from app.main import app
+from app.api.deps import get_current_user
+from app.core.config import settings
+from app.services.tiger_service import tiger_service
+
+EXPIRATION = (datetime.now() + timedelta(days=45)).strftime("%Y-%m-%d")
+
+
+def _override_get_current_user():
+    """Return a mock authenticated user."""
+    user = MagicMock()
+    user.id = "test-user-id"
+    user.is_pro = True
+    return user
+
+
+def _chain(spot: float) -> dict:
+    """Two calls around spot: enough for one bull call spread."""
+    return {
+        "calls": [
+            {"strike": spot * 0.95, "bid": spot * 0.069, "ask": spot * 0.070, "implied_vol": 0.25,
+             "greeks": {"delta": 0.65, "gamma": 0.02, "theta": -0.1, "vega": 0.2, "rho": 0.05}},
+            {"strike": spot * 1.05, "bid": spot * 0.025, "ask": spot * 0.026, "implied_vol": 0.25,
+             "greeks": {"delta": 0.30, "gamma": 0.01, "theta": -0.05, "vega": 0.1, "rho": 0.02}},
+        ],
+        "puts": [],
+        "spot_price": spot,
+    }
+
+
+@pytest.fixture
+def client(monkeypatch):
+    chains = {"AAPL": _chain(100.0), "MSFT": _chain(400.0), "NOSPOT": dict(_chain(50.0), spot_price=None)}
+
+    async def _mock_get_option_chain(symbol, expiration_date, is_pro=False, **kwargs):
+        if symbol not in chains:
+            raise HTTPException(status_code=404, detail=f"No option chain for {symbol}")
+        return chains[symbol]
+
+    monkeypatch.setattr(tiger_service, "get_option_chain", _mock_get_option_chain)
+    app.dependency_overrides[get_current_user] = _override_get_current_user
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+
+
+def _post(client, **body):
+    body = {"outlook": "BULLISH", "expiration_date": EXPIRATION, **body}
+    return client.post("/api/v1/market/recommendations/batch", json=body, headers={"Authorization": "Bearer test"})
+
+
+def test_batch_returns_results_in_request_order(client):
+    response = _post(client, symbols=["msft", "NOSPOT", "AAPL", "MISSING", "aapl"])
+
+    assert response.status_code == 200
+    data = response.json()
+    assert [r["symbol"] for r in data["results"]] == ["MSFT", "NOSPOT", "AAPL", "MISSING"]
+    by_symbol = {r["symbol"]: r for r in data["results"]}
+    assert by_symbol["AAPL"]["strategies"] and by_symbol["MSFT"]["strategies"]
+    assert by_symbol["NOSPOT"]["error"] == "Spot price not available for this symbol"
+    assert by_symbol["MISSING"]["error"] == "No option chain for MISSING"
+    assert {s["legs"][0]["symbol"] for s in data["ranked"]} == {"AAPL", "MSFT"}
+
+
+def test_large_batch_streams_ndjson(client, monkeypatch):
+    monkeypatch.setattr(settings, "recommendations_batch_sync_limit", 1)
+    response = _post(client, symbols=["AAPL", "MSFT", "MISSING"], limit=1)
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["symbol"] for line in lines[:-1]) == ["AAPL", "MISSING", "MSFT"]
+    assert len(lines[-1]["ranked"]) == 1
+
+
+def test_free_users_are_limited_to_small_batches(client, monkeypatch):
+    def _free_user():
+        user = _override_get_current_user()
+        user.is_pro = False
+        return user
+
+    app.dependency_overrides[get_current_user] = _free_user
+    monkeypatch.setattr(settings, "recommendations_batch_free_max_symbols", 2)
+
+    assert _post(client, symbols=["AAPL", "aapl", "MSFT"]).status_code == 200
+    response = _post(client, symbols=["AAPL", "MSFT", "NOSPOT"])
+    assert response.status_code == 403
+
+
+@pytest.mark.asyncio
+async def test_one_running_batch_per_user(client):
+    from app.api.endpoints import market
+
+    release = await market._acquire_batch_slot("test-user-id")
+    try:
+        response = _post(client, symbols=["AAPL"])
+        assert response.status_code == 429
+    finally:
+        await release()
+    assert _post(client, symbols=["AAPL"]).status_code == 200
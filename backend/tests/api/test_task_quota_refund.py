@@ -0,0 +1,81 @@
+"""Tests for task quota refunds (DB mocked): only reserved runs, at most once."""
+
+import uuid
+from datetime import date
+
+import pytest
+from sqlalchemy.sql.dml import Update
+
+import app.api.endpoints.ai as ai_module
+import app.api.endpoints.tasks as tasks_module
+from app.api.endpoints.tasks import QUOTA_DAY_METADATA_KEY, _refund_task_quota
+
+TASK_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+
+
+class FakeResult:
+    def __init__(self, value) -> None:
+        self.value = value
+
+    def scalar_one_or_none(self):
+        return self.value
+
+
+class FakeSession:
+    """Holds one task's metadata; an UPDATE clears the recorded quota day."""
+
+    def __init__(self, state: dict) -> None:
+        self.state = state
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, statement):
+        if isinstance(statement, Update):
+            self.state["metadata"] = {
+                k: v for k, v in self.state["metadata"].items() if k != QUOTA_DAY_METADATA_KEY
+            }
+            return FakeResult(None)
+        return FakeResult(dict(self.state["metadata"]))
+
+    async def commit(self) -> None:
+        return None
+
+
+@pytest.fixture
+def refunds(monkeypatch):
+    state = {"metadata": {}}
+    calls = []
+
+    async def refund_quota(user_id, db, kind, amount, day):
+        calls.append((kind, amount, day))
+
+    monkeypatch.setattr(tasks_module, "AsyncSessionLocal", lambda: FakeSession(state))
+    monkeypatch.setattr(ai_module, "refund_quota", refund_quota)
+    return state, calls
+
+
+@pytest.mark.asyncio
+async def test_refund_once_per_reservation(refunds):
+    state, calls = refunds
+    state["metadata"] = {"symbol": "AAPL", QUOTA_DAY_METADATA_KEY: "2026-03-01"}
+
+    await _refund_task_quota(TASK_ID, "ai_report", USER_ID)
+    await _refund_task_quota(TASK_ID, "ai_report", USER_ID)
+
+    assert calls == [("ai", 5, date(2026, 3, 1))]
+    assert state["metadata"] == {"symbol": "AAPL"}
+
+
+@pytest.mark.asyncio
+async def test_no_refund_without_reservation(refunds):
+    state, calls = refunds
+    state["metadata"] = {"symbol": "AAPL"}
+
+    await _refund_task_quota(TASK_ID, "generate_strategy_chart", USER_ID)
+
+    assert calls == []
@@ -0,0 +1,153 @@
+"""Unit tests for the vectorized Black-Scholes / Black-76 module and the Greeks fill."""
+
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+import pytz
+
+from app.schemas.strategy_recommendation import OptionType
+from app.services.black_scholes import (
+    MIN_YEARS,
+    black76_greeks,
+    bs_greeks,
+    implied_volatility,
+    years_to_expiry,
+)
+from app.services.option_chain import OptionChain
+from app.services.strategy_engine import StrategyEngine
+
+
+class TestPricingAndGreeks:
+    """Closed-form values against textbook references and finite differences."""
+
+    def test_reference_prices(self):
+        # Hull: S=K=100, T=1, r=5%, sigma=20% -> call 10.4506, put 5.5735
+        out = bs_greeks(100.0, 100.0, 1.0, 0.2, [True, False], rate=0.05)
+        assert out["price"] == pytest.approx([10.4506, 5.5735], abs=1e-4)
+        # Put-call parity on delta (no dividends): delta_call - delta_put = 1
+        assert out["delta"][0] - out["delta"][1] == pytest.approx(1.0)
+
+    def test_greeks_match_finite_differences(self):
+        spot, strike, years, vol, r = 105.0, 100.0, 0.4, 0.3, 0.03
+        h = 1e-4
+        for is_call in (True, False):
+            base = bs_greeks(spot, strike, years, vol, is_call, r)
+
+            def price(**kw):
+                args = {"spot": spot, "strike": strike, "years": years, "vol": vol, "is_call": is_call, "rate": r}
+                args.update(kw)
+                return float(bs_greeks(**args)["price"])
+
+            assert base["delta"] == pytest.approx((price(spot=spot + h) - price(spot=spot - h)) / (2 * h), rel=1e-5)
+            gamma_fd = (price(spot=spot + 0.01) - 2 * price() + price(spot=spot - 0.01)) / 1e-4
+            assert base["gamma"] == pytest.approx(gamma_fd, rel=1e-3)
+            # Units: vega/rho per 1 point, theta per calendar day (value lost as time passes)
+            assert base["vega"] == pytest.approx((price(vol=vol + h) - price(vol=vol - h)) / (2 * h) / 100, rel=1e-5)
+            assert base["rho"] == pytest.approx((price(rate=r + h) - price(rate=r - h)) / (2 * h) / 100, rel=1e-5)
+            theta_fd = -(price(years=years + h) - price(years=years - h)) / (2 * h) / 365
+            assert base["theta"] == pytest.approx(theta_fd, rel=1e-5)
+
+    def test_black76_on_forward(self):
+        out = black76_greeks(100.0, 100.0, 1.0, 0.2, True, rate=0.05)
+        # Black-76 ATM call = e^{-rT} * F * (2N(sigma/2) - 1)
+        assert float(out["price"]) == pytest.approx(np.exp(-0.05) * 100 * 0.0796557, abs=1e-4)
+        assert float(out["rho"]) == pytest.approx(-float(out["price"]) / 100)
+
+    def test_invalid_inputs_are_nan(self):
+        out = bs_greeks([100.0, 0.0, 100.0], 100.0, [0.5, 0.5, 0.0], [0.2, 0.2, 0.2], "call")
+        assert not np.isnan(out["delta"][0])
+        assert np.isnan(out["delta"][1:]).all()
+
+
+class TestImpliedVolatility:
+    """Vectorized IV solver."""
+
+    def test_round_trip_over_a_chain(self):
+        rng = np.random.default_rng(7)
+        strikes = np.linspace(70.0, 130.0, 2000)
+        is_call = np.arange(2000) % 2 == 0
+        vols = rng.uniform(0.1, 1.2, 2000)
+        model = bs_greeks(100.0, strikes, 0.25, vols, is_call, 0.04)
+        solved = implied_volatility(model["price"], 100.0, strikes, 0.25, is_call, 0.04)
+        # Deep ITM rows with ~zero vega do not pin down a volatility; everything else must round-trip
+        identifiable = model["vega"] > 1e-4
+        assert identifiable.mean() > 0.95
+        assert np.allclose(solved[identifiable], vols[identifiable], atol=1e-6)
+
+    def test_unsolvable_prices_are_nan(self):
+        # Below intrinsic, above the underlying, missing
+        solved = implied_volatility([5.0, 150.0, np.nan, 0.0], 110.0, 100.0, 0.5, True)
+        assert np.isnan(solved).all()
+
+    def test_black76(self):
+        price = black76_greeks(50.0, 55.0, 0.75, 0.35, False, rate=0.02)["price"]
+        solved = implied_volatility(price, 50.0, 55.0, 0.75, False, rate=0.02, black76=True)
+        assert float(solved) == pytest.approx(0.35, abs=1e-8)
+
+
+class TestYearsToExpiry:
+    def test_counts_to_the_close_in_new_york(self):
+        now = pytz.utc.localize(datetime(2026, 1, 15, 21, 0))  # 16:00 ET
+        assert years_to_expiry("2026-01-16", now=now) == pytest.approx(1 / 365)
+        assert years_to_expiry("2026-01-15", now=now) == MIN_YEARS
+        assert years_to_expiry("not-a-date") is None
+
+
+def _row(strike, bid, ask, **extra):
+    return {"strike": strike, "bid": bid, "ask": ask, **extra}
+
+
+class TestGreeksFill:
+    """Model values only fill gaps in Tiger data."""
+
+    def test_fill_keeps_source_values(self):
+        iv_row = _row(100.0, 4.9, 5.1, implied_vol=0.3)
+        real = _row(105.0, 2.0, 2.2, delta=0.42, gamma=0.03, theta=-0.05, vega=0.2, rho=0.05)
+        partial = _row(110.0, 1.0, 1.2, delta=0.2)
+        source = OptionChain.from_dict({"calls": [iv_row, real, partial], "puts": [], "spot_price": 100.0})
+        chain, filled = source.with_filled_greeks(0.25, rate=0.04)
+        assert filled == 2
+        calls = chain["calls"]
+        expected = bs_greeks(100.0, 100.0, 0.25, 0.3, True, 0.04)
+        assert calls[0]["delta"] == pytest.approx(float(expected["delta"]))
+        assert calls[1]["delta"] == 0.42 and calls[1]["theta"] == -0.05
+        assert calls[2]["delta"] == 0.2 and "gamma" in calls[2]
+        # IV solved from the mid is stored alongside
+        assert 0 < calls[2]["implied_vol"] < 1
+
+    def test_rows_without_price_stay_empty(self):
+        source = OptionChain.from_dict({"calls": [_row(100.0, 0.0, 0.0)], "puts": [], "spot_price": 100.0})
+        chain, filled = source.with_filled_greeks(0.25)
+        assert filled == 0 and chain is source
+        assert "delta" not in chain["calls"][0]
+
+    def test_source_chain_is_not_modified(self):
+        source = OptionChain.from_dict({"calls": [_row(100.0, 4.9, 5.1)], "puts": [], "spot_price": None})
+        before = source["calls"]
+        chain, filled = source.with_filled_greeks(0.25, spot_price=100.0)
+        assert filled == 1 and "delta" in chain["calls"][0]
+        assert source["calls"] is before and "delta" not in before[0]
+        assert np.isnan(source.calls.column("delta")).all() and source.spot_price is None
+
+
+class TestStrategyEngineFallback:
+    """Rows missing delta are priced instead of skipped."""
+
+    def test_find_option_uses_model_delta(self):
+        engine = StrategyEngine()
+        chain = {
+            "expiration_date": (date.today() + timedelta(days=30)).isoformat(),
+            "calls": [_row(95.0, 6.4, 6.6), _row(120.0, 0.3, 0.35)],
+            "puts": [],
+        }
+        result = engine._find_option(chain, OptionType.CALL, 0.8, 100.0)
+        assert result is not None and result["strike"] == 95.0
+        assert 0.5 < result["greeks"]["delta"] < 1.0
+
+    def test_create_option_leg_fills_missing_greeks(self):
+        engine = StrategyEngine()
+        leg = engine._create_option_leg(
+            _row(100.0, 4.0, 4.2, implied_vol=0.25), "AAPL", 1, OptionType.PUT, "2099-01-16", 30, 100.0
+        )
+        assert leg.greeks["delta"] < 0 and leg.greeks["vega"] > 0
@@ -0,0 +1,104 @@
+"""Unit tests for content-addressed blob storage and task/report payload offload."""
+
+import json
+import uuid
+
+import pytest
+
+from app.db.models import AIReport, Task
+from app.services import task_payloads
+from app.services.storage import blob_store
+from app.services.storage.blob_store import BlobStore, LocalBlobBackend, blob_key, is_ref
+
+
+async def _inline(name, fn, *args, **kwargs):
+    return fn(*args, **kwargs)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setattr(blob_store, "run_in_executor", _inline)
+    store = BlobStore(LocalBlobBackend(tmp_path), min_bytes=100)
+    monkeypatch.setattr(blob_store, "_blob_store", store)
+    return store
+
+
+@pytest.mark.asyncio
+async def test_put_is_compressed_and_deduplicated(store, tmp_path):
+    data = b"x" * 10_000
+    digest = await store.put(data)
+    assert digest.startswith("sha256:")
+    stored = tmp_path / blob_key(digest)
+    assert stored.stat().st_size < 200
+
+    assert await store.put(data) == digest
+    fresh = BlobStore(LocalBlobBackend(tmp_path), min_bytes=100)  # e.g. another worker
+    assert await fresh.put(data) == digest
+    assert store.stats_counters["puts"] == 1 and fresh.stats_counters["puts"] == 0
+    assert await fresh.get(digest) == data
+
+
+@pytest.mark.asyncio
+async def test_disabled_store_keeps_values_inline():
+    store = BlobStore(None, min_bytes=1)
+    value = {"legs": list(range(100))}
+    assert await store.offload_json(value) is value
+    with pytest.raises(ValueError):
+        await store.put(b"x")
+
+
+@pytest.mark.asyncio
+async def test_metadata_offload_and_hydrate_roundtrip(store):
+    chain = {"calls": [{"strike": s, "bid": 1.0} for s in range(50)]}
+    metadata = {"symbol": "AAPL", "stages": [], "option_chain": chain}
+
+    offloaded = await task_payloads.offload_metadata(metadata)
+    assert offloaded["symbol"] == "AAPL" and offloaded["stages"] == []
+    assert is_ref(offloaded["option_chain"])
+    assert offloaded["option_chain"]["bytes"] == len(json.dumps(chain, sort_keys=True, separators=(",", ":")))
+
+    assert await task_payloads.hydrate_metadata(offloaded) == metadata
+    missing = {**offloaded, "option_chain": {"$blob": "sha256:" + "0" * 64, "bytes": 1}}
+    assert (await task_payloads.hydrate_metadata(missing))["option_chain"] is None
+
+
+@pytest.mark.asyncio
+async def test_task_payloads_keep_worker_changes_and_offload_prompt(store):
+    summary = {"symbol": "AAPL", "legs": list(range(50))}
+    task = Task(id=uuid.uuid4(), task_metadata=await task_payloads.offload_metadata({"strategy_summary": summary}))
+    task.prompt_used = "p" * 5000
+
+    enriched = {**summary, "fundamental_profile": {"pe": 30}}
+    await task_payloads.offload_task_payloads(task, {"strategy_summary": enriched})
+
+    assert (await task_payloads.hydrate_metadata(task.task_metadata))["strategy_summary"] == enriched
+    assert task.prompt_ref and len(task.prompt_used) == task_payloads.EXCERPT_CHARS
+    assert await task_payloads.load_text(task.prompt_used, task.prompt_ref) == "p" * 5000
+
+
+@pytest.mark.asyncio
+async def test_report_content_offload(store):
+    report = AIReport(id=uuid.uuid4(), report_content="# Report\n" + "body " * 1000)
+    full = report.report_content
+    await task_payloads.offload_report_content(report)
+    assert report.content_ref and report.report_content == full[: task_payloads.EXCERPT_CHARS]
+    assert await task_payloads.load_text(report.report_content, report.content_ref) == full
+
+    short = AIReport(id=uuid.uuid4(), report_content="# Short")
+    await task_payloads.offload_report_content(short)
+    assert short.content_ref is None and short.report_content == "# Short"
+
+
+def test_r2_needs_its_own_bucket(monkeypatch):
+    monkeypatch.setattr(blob_store.settings, "blob_storage_backend", "auto")
+    monkeypatch.setattr(blob_store.settings, "blob_r2_bucket_name", "")
+    monkeypatch.setattr(blob_store.settings, "cloudflare_r2_account_id", "acct")
+    monkeypatch.setattr(blob_store.settings, "cloudflare_r2_access_key_id", "key")
+    monkeypatch.setattr(blob_store.settings, "cloudflare_r2_secret_access_key", "secret")
+    monkeypatch.setattr(blob_store.settings, "cloudflare_r2_bucket_name", "public-images")
+    assert blob_store._build_backend() is None  # Never the public image bucket
+
+    monkeypatch.setattr(blob_store.settings, "blob_r2_bucket_name", "private-blobs")
+    backend = blob_store._build_backend()
+    assert isinstance(backend, blob_store.R2BlobBackend)
+    assert backend.r2.bucket_name == "private-blobs"
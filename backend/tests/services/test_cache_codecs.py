@@ -0,0 +1,114 @@
+"""Unit tests for cache value codecs and their use in CacheService."""
+
+import json
+
+import pytest
+
+from app.services.cache import CacheService
+from app.services.cache_codecs import (
+    JSON_CODEC,
+    MAGIC,
+    available_codecs,
+    decode_value,
+    encode_value,
+    resolve_codec,
+)
+
+CHAIN = {
+    "calls": [{"strike": 100.0, "bid": 1.0, "ask": 1.1, "delta": 0.5, "greeks": {"delta": 0.5}}],
+    "puts": [{"strike": 100.0, "bid": 1.2, "ask": 1.3, "implied_vol": 0.0}],
+    "spot_price": 100.5,
+}
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in storing values as a real client would return them."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str):
+        return self.store.get(key)
+
+    async def setex(self, key: str, ttl: int, value):
+        self.store[key] = value.encode("utf-8") if isinstance(value, str) else value
+
+
+@pytest.fixture
+def cache() -> tuple[CacheService, FakeRedis]:
+    service = CacheService()
+    fake = FakeRedis()
+    service._redis = fake
+    service._redis_bin = fake
+    service._prefix_codecs = {}
+    service._l1 = None  # exercise the Redis tier only
+    return service, fake
+
+
+class TestCodecs:
+    """Round trips and legacy compatibility."""
+
+    @pytest.mark.parametrize("name", available_codecs())
+    def test_round_trip(self, name):
+        encoded = encode_value(CHAIN, name)
+        stored = encoded.encode("utf-8") if isinstance(encoded, str) else encoded
+        assert decode_value(stored) == CHAIN
+
+    def test_binary_codecs_are_framed(self):
+        for name in available_codecs():
+            if name != JSON_CODEC:
+                assert encode_value(CHAIN, name)[:len(MAGIC)] == MAGIC
+
+    def test_legacy_values(self):
+        """Plain JSON text and non-JSON strings decode exactly as before."""
+        assert decode_value(json.dumps(CHAIN).encode("utf-8")) == CHAIN
+        assert decode_value(json.dumps(CHAIN)) == CHAIN
+        assert decode_value(b"plain-string") == "plain-string"
+
+    def test_unknown_codec_id_raises(self):
+        with pytest.raises(ValueError):
+            decode_value(MAGIC + bytes([250]) + b"payload")
+
+    def test_resolve_unknown_codec_falls_back(self):
+        assert resolve_codec("json") == "json"
+        assert resolve_codec("does-not-exist") in available_codecs()
+
+
+class TestCacheServiceCodecs:
+    """Per-prefix codec selection in CacheService."""
+
+    @pytest.mark.asyncio
+    async def test_unregistered_prefix_stores_json_text(self, cache):
+        service, fake = cache
+        await service.set("market:profile:AAPL", CHAIN, ttl=60)
+        assert json.loads(fake.store["market:profile:AAPL"]) == CHAIN
+        assert await service.get("market:profile:AAPL") == CHAIN
+
+    @pytest.mark.asyncio
+    async def test_prefix_codec_and_longest_match(self, cache):
+        service, fake = cache
+        service.register_prefix_codec("market:", "json+zlib")
+        service.register_prefix_codec("market:chain:", "msgpack+zstd")
+        await service.set("market:chain:AAPL:2025-01-17", CHAIN, ttl=60)
+        stored = fake.store["market:chain:AAPL:2025-01-17"]
+        assert stored[:len(MAGIC)] == MAGIC
+        assert service._codec_for("market:chain:AAPL:2025-01-17") == resolve_codec("msgpack+zstd")
+        assert service._codec_for("market:kline:AAPL") == "json+zlib"
+        assert await service.get("market:chain:AAPL:2025-01-17") == CHAIN
+
+    @pytest.mark.asyncio
+    async def test_legacy_entry_read_after_codec_switch(self, cache):
+        service, fake = cache
+        fake.store["market:chain:AAPL:2025-01-17"] = json.dumps(CHAIN).encode("utf-8")
+        service.register_prefix_codec("market:chain:", "msgpack+zstd")
+        assert await service.get("market:chain:AAPL:2025-01-17") == CHAIN
+
+    @pytest.mark.asyncio
+    async def test_corrupt_entry_is_a_miss(self, cache):
+        service, fake = cache
+        fake.store["market:chain:X:2025-01-17"] = MAGIC + bytes([250]) + b"garbage"
+        assert await service.get("market:chain:X:2025-01-17") is None
+        assert service._redis is fake  # decode errors do not drop the connection
@@ -0,0 +1,193 @@
+"""Unit tests for the in-process L1 tier of CacheService."""
+
+import asyncio
+import time
+
+import pytest
+
+from app.services.cache import CacheService, LocalCacheTier
+
+CHAIN = {"calls": [{"strike": 100.0, "bid": 1.0}], "puts": [], "spot_price": 100.5}
+CHAIN_KEY = "market:chain:AAPL:2025-01-17"
+
+
+class FakePipeline:
+    """Non-transactional pipeline stand-in (GET/PTTL only)."""
+
+    def __init__(self, redis: "FakeRedis") -> None:
+        self._redis = redis
+        self._ops: list[tuple[str, str]] = []
+
+    async def __aenter__(self) -> "FakePipeline":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    def get(self, key: str) -> None:
+        self._ops.append(("get", key))
+
+    def pttl(self, key: str) -> None:
+        self._ops.append(("pttl", key))
+
+    async def execute(self) -> list:
+        results = []
+        for op, key in self._ops:
+            results.append(await getattr(self._redis, op)(key))
+        self._ops = []
+        return results
+
+
+class FakeRedis:
+    """Minimal async Redis stand-in with TTLs and a publish log."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, bytes] = {}
+        self.ttls: dict[str, int] = {}
+        self.published: list[tuple[str, str]] = []
+        self.stored_when_published: list[bool] = []
+        self.gets = 0
+
+    async def ping(self) -> bool:
+        return True
+
+    async def get(self, key: str):
+        self.gets += 1
+        return self.store.get(key)
+
+    async def pttl(self, key: str) -> int:
+        return self.ttls.get(key, 0) * 1000 if key in self.store else -2
+
+    async def setex(self, key: str, ttl: int, value) -> None:
+        self.store[key] = value.encode("utf-8") if isinstance(value, str) else value
+        self.ttls[key] = ttl
+
+    async def delete(self, key: str) -> None:
+        self.store.pop(key, None)
+
+    async def publish(self, channel: str, message: str) -> None:
+        self.published.append((channel, message))
+        self.stored_when_published.append(message.split(" ", 1)[1] in self.store)
+
+    def pipeline(self, transaction: bool = True) -> FakePipeline:
+        return FakePipeline(self)
+
+
+@pytest.fixture
+def cache() -> tuple[CacheService, FakeRedis]:
+    service = CacheService()
+    fake = FakeRedis()
+    service._redis = fake
+    service._redis_bin = fake
+    service._prefix_codecs = {}
+    service._l1 = LocalCacheTier(CacheService._L1_PREFIX_LIMITS)
+    return service, fake
+
+
+class TestLocalCacheTier:
+    """LRU/TTL behaviour of the tier itself."""
+
+    def test_unconfigured_prefix_is_not_cached(self):
+        tier = LocalCacheTier({"market:chain:": (2, 60)})
+        tier.set("market:profile:AAPL", {"a": 1}, 60)
+        assert tier.get("market:profile:AAPL") == (False, None)
+
+    def test_lru_eviction_per_prefix(self):
+        tier = LocalCacheTier({"market:chain:": (2, 60), "config:": (2, 60)})
+        tier.set("market:chain:A", 1, 60)
+        tier.set("market:chain:B", 2, 60)
+        tier.get("market:chain:A")  # A becomes most recently used
+        tier.set("market:chain:C", 3, 60)
+        tier.set("config:x", 4, 60)
+        assert tier.get("market:chain:B") == (False, None)
+        assert tier.get("market:chain:A") == (True, 1)
+        assert tier.get("config:x") == (True, 4)
+        assert tier.size() == {"market:chain:": 2, "config:": 1}
+
+    def test_ttl_is_capped_by_prefix_limit(self, monkeypatch):
+        tier = LocalCacheTier({"market:chain:": (2, 10)})
+        now = time.monotonic()
+        tier.set("market:chain:A", 1, 3600)
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+        assert tier.get("market:chain:A") == (False, None)
+
+
+class TestCacheServiceL1:
+    """Read-through, coherence and counters in CacheService."""
+
+    @pytest.mark.asyncio
+    async def test_redis_hit_populates_l1(self, cache):
+        service, fake = cache
+        await fake.setex(CHAIN_KEY, 600, '{"calls": [], "puts": []}')
+        assert await service.get(CHAIN_KEY) == {"calls": [], "puts": []}
+        assert await service.get(CHAIN_KEY) == {"calls": [], "puts": []}
+        assert fake.gets == 1
+        stats = service.stats()
+        assert stats["l1"]["hits"] == 1 and stats["l1"]["misses"] == 1
+        assert stats["redis"]["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_l1_ttl_capped_by_remaining_redis_ttl(self, cache, monkeypatch):
+        service, fake = cache
+        await fake.setex(CHAIN_KEY, 5, '{"calls": []}')  # prefix limit is 60s, Redis has 5s left
+        await service.get(CHAIN_KEY)
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 6)
+        assert service._l1.get(CHAIN_KEY) == (False, None)
+
+    @pytest.mark.asyncio
+    async def test_hit_returns_shallow_copy(self, cache):
+        """Top-level annotations (e.g. _source) by one caller do not leak to the next."""
+        service, _ = cache
+        await service.set(CHAIN_KEY, dict(CHAIN), ttl=600)
+        first = await service.get(CHAIN_KEY)
+        first["_source"] = "cache"
+        assert "_source" not in await service.get(CHAIN_KEY)
+
+    @pytest.mark.asyncio
+    async def test_set_and_delete_publish_invalidation(self, cache):
+        service, fake = cache
+        await service.set("config:ai_model", "gemini", ttl=300)
+        assert await service.get("config:ai_model") == "gemini"
+        await service.delete("config:ai_model")
+        assert await service.get("config:ai_model") is None
+        channels = {channel for channel, _ in fake.published}
+        assert channels == {CacheService._INVALIDATION_CHANNEL}
+        assert [m.split(" ", 1)[1] for _, m in fake.published] == ["config:ai_model", "config:ai_model"]
+        # Published only once Redis has the new value / no longer has the key
+        assert fake.stored_when_published == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_non_l1_prefix_reads_redis_every_time(self, cache):
+        service, fake = cache
+        await service.set("market:profile:AAPL", {"name": "Apple"}, ttl=600)
+        await service.get("market:profile:AAPL")
+        await service.get("market:profile:AAPL")
+        assert fake.gets == 2
+        assert fake.published == []
+
+    @pytest.mark.asyncio
+    async def test_remote_invalidation_message(self, cache):
+        """Messages from other instances evict; our own are ignored."""
+        service, fake = cache
+
+        class FakePubSub:
+            async def subscribe(self, channel):
+                return None
+
+            async def listen(self):
+                yield {"type": "subscribe", "data": 1}
+                yield {"type": "message", "data": f"{service._instance_id} config:a"}
+                yield {"type": "message", "data": "other-instance config:b"}
+                raise asyncio.CancelledError
+
+            async def close(self):
+                return None
+
+        service._l1.set("config:a", 1, 60)
+        service._l1.set("config:b", 2, 60)
+        fake.pubsub = FakePubSub
+        with pytest.raises(asyncio.CancelledError):
+            await service._invalidation_loop()
+        assert service._l1.get("config:a") == (True, 1)
+        assert service._l1.get("config:b") == (False, None)
@@ -0,0 +1,101 @@
+"""Unit tests for the option chain prefetch job."""
+
+import time
+
+import pytest
+
+import app.services.chain_prefetcher as prefetcher
+from app.core.constants import CacheTTL
+
+
+class FakeRedis:
+    """Sorted-set subset of the Redis API used for demand tracking."""
+
+    def __init__(self) -> None:
+        self.zsets: dict[str, dict[str, float]] = {}
+
+    async def zrevrange(self, key, start, end, withscores=False):
+        items = sorted(self.zsets.get(key, {}).items(), key=lambda kv: kv[1], reverse=True)
+        return items[start:end + 1]
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self._redis = FakeRedis()
+        self.values: dict[str, object] = {}
+        self.lock_free = True
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def acquire_lock(self, lock_key, ttl=3600):
+        return self.lock_free
+
+
+class FakeTiger:
+    def __init__(self) -> None:
+        self.chain_calls: list[tuple[str, str]] = []
+
+    async def get_option_expirations(self, symbol):
+        return ["2000-01-21", "2099-01-16", "2099-02-20"]
+
+    async def get_option_chain(self, symbol, expiration_date, force_refresh=False):
+        assert force_refresh
+        self.chain_calls.append((symbol, expiration_date))
+        return {}
+
+
+@pytest.fixture
+def env(monkeypatch):
+    cache, tiger = FakeCache(), FakeTiger()
+    monkeypatch.setattr(prefetcher, "cache_service", cache)
+    monkeypatch.setattr(prefetcher, "tiger_service", tiger)
+    monkeypatch.setattr(prefetcher, "is_us_market_hours", lambda: True)
+    monkeypatch.setattr(prefetcher, "FALLBACK_STOCKS", ["MSFT"])
+    monkeypatch.setattr(prefetcher.settings, "enable_chain_prefetch", True)
+    monkeypatch.setattr(prefetcher.settings, "tiger_use_live_api", True)
+    monkeypatch.setattr(prefetcher.settings, "chain_prefetch_budget_share", 1000.0)  # no pacing sleeps
+    monkeypatch.setattr(prefetcher.settings, "chain_prefetch_max_calls", 10)
+    day = prefetcher._demand_key(prefetcher.datetime.now(prefetcher._US_EASTERN))
+    cache._redis.zsets[day] = {"AAPL|2099-01-16": 5.0, "TSLA|2099-01-16": 9.0, "OLD|2000-01-21": 50.0}
+    return cache, tiger
+
+
+class TestPrefetchHotChains:
+    """Candidate selection, freshness checks, budget and locking."""
+
+    @pytest.mark.asyncio
+    async def test_warms_top_requested_then_movers_and_fallback(self, env):
+        cache, tiger = env
+        cache.values[prefetcher.RADAR_MOVERS_KEY] = ["NVDA", "AAPL"]
+        cache.values["market:expirations:NVDA"] = ["2099-01-16"]
+        cache.values["market:expirations:MSFT"] = ["2099-01-16"]
+        await prefetcher.prefetch_hot_chains()
+        # Demand order first (expired contracts skipped), then nearest expiry of movers/fallback
+        assert tiger.chain_calls == [
+            ("TSLA", "2099-01-16"), ("AAPL", "2099-01-16"),
+            ("NVDA", "2099-01-16"), ("MSFT", "2099-01-16"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_fresh_chains_are_skipped(self, env):
+        cache, tiger = env
+        cache.values["market:chain:TSLA:2099-01-16"] = {"_cached_at": time.time()}
+        cache.values["market:chain:AAPL:2099-01-16"] = {"_cached_at": time.time() - CacheTTL.OPTION_CHAIN}
+        await prefetcher.prefetch_hot_chains()
+        assert ("TSLA", "2099-01-16") not in tiger.chain_calls
+        assert ("AAPL", "2099-01-16") in tiger.chain_calls
+
+    @pytest.mark.asyncio
+    async def test_budget_caps_tiger_calls(self, env, monkeypatch):
+        cache, tiger = env
+        monkeypatch.setattr(prefetcher.settings, "chain_prefetch_max_calls", 1)
+        await prefetcher.prefetch_hot_chains()
+        assert tiger.chain_calls == [("TSLA", "2099-01-16")]
+
+    @pytest.mark.asyncio
+    async def test_skips_without_lock(self, env):
+        cache, tiger = env
+        cache.lock_free = False
+        await prefetcher.prefetch_hot_chains()
+        assert tiger.chain_calls == []
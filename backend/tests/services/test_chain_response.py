@@ -0,0 +1,61 @@
+"""Unit tests for pre-serialized chain response bodies."""
+
+import gzip
+import json
+
+from app.services.chain_response import ChainBodyCache, accepts_gzip, etag_matches
+
+
+def _payload(spot: float = 100.0) -> dict:
+    return {"symbol": "AAPL", "calls": [{"strike": 100.0, "bid": 1.0}], "puts": [], "spot_price": spot}
+
+
+class TestChainBodyCache:
+    """Bodies are encoded once per chain version."""
+
+    def test_same_version_reuses_the_body(self):
+        cache, builds = ChainBodyCache(), []
+
+        def build():
+            builds.append(1)
+            return _payload()
+
+        first = cache.get(("AAPL", "2025-01-17", "cache"), 1.0, build)
+        second = cache.get(("AAPL", "2025-01-17", "cache"), 1.0, build)
+        assert first is second and len(builds) == 1
+        assert json.loads(first.body) == _payload()
+        assert gzip.decompress(first.gzipped) == first.body
+
+    def test_new_version_rebuilds_and_changes_the_etag(self):
+        cache = ChainBodyCache()
+        old = cache.get(("AAPL", "2025-01-17", "cache"), 1.0, _payload)
+        new = cache.get(("AAPL", "2025-01-17", "cache"), 2.0, lambda: _payload(101.0))
+        assert new.etag != old.etag
+        # Equal bodies get equal tags whatever their version (replicas agree)
+        assert cache.get(("AAPL", "2025-01-17", "api"), 3.0, _payload).etag == old.etag
+
+    def test_unversioned_chains_are_not_cached(self):
+        cache = ChainBodyCache()
+        cache.get(("AAPL", "2025-01-17", "fixture"), None, _payload)
+        assert cache.stats() == {"hits": 0, "misses": 0, "unversioned": 1, "entries": 0}
+
+    def test_lru_bound(self):
+        cache = ChainBodyCache(max_entries=2)
+        for version in range(3):
+            cache.get(("AAPL", "2025-01-17", "cache"), version, _payload)
+        assert cache.stats()["entries"] == 2
+
+
+class TestHeaders:
+    def test_etag_matches(self):
+        assert etag_matches('"abc"', '"abc"')
+        assert etag_matches('"x", W/"abc"', '"def"', '"abc"')
+        assert etag_matches("*", '"abc"')
+        assert not etag_matches('"abcd"', '"abc"')
+        assert not etag_matches(None, '"abc"')
+
+    def test_accepts_gzip(self):
+        assert accepts_gzip("gzip, deflate, br")
+        assert accepts_gzip("br;q=1.0, *;q=0.5")
+        assert not accepts_gzip("gzip;q=0, br")
+        assert not accepts_gzip(None)
@@ -0,0 +1,134 @@
+"""Unit tests for option chain streaming (local mode: no Redis)."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from app.services import chain_stream
+from app.services.chain_stream import (
+    ChainStreamHub,
+    apply_diff,
+    diff_rows,
+    max_streamed_chains,
+    refresh_interval,
+    side_rows,
+)
+from app.services.option_chain import OptionSide
+
+
+def _chain(version: float, bid: float = 1.0, strikes=(95.0, 100.0), spot: float = 100.0) -> dict:
+    return {
+        "calls": [{"strike": strike, "bid": bid, "ask": bid + 0.1, "delta": 0.5} for strike in strikes],
+        "puts": [],
+        "spot_price": spot,
+        "_version": version,
+    }
+
+
+class TestDiff:
+    """Row diffs carry only changed fields and round-trip."""
+
+    def test_diff_and_apply(self):
+        old = side_rows(OptionSide.from_records(_chain(1)["calls"]))
+        new = side_rows(OptionSide.from_records(_chain(2, bid=1.2, strikes=(100.0, 105.0))["calls"]))
+        diff = diff_rows(old, new)
+        assert diff["removed"] == [95.0]
+        changed = {row["strike"]: row for row in diff["rows"]}
+        assert changed[100.0] == {"strike": 100.0, "bid": 1.2, "ask": pytest.approx(1.3)}
+        assert changed[105.0]["delta"] == 0.5 and "gamma" not in changed[105.0]
+        apply_diff(old, diff)
+        assert old == new
+
+    def test_unchanged_rows_are_skipped(self):
+        rows = side_rows(OptionSide.from_records(_chain(1)["calls"]))
+        assert diff_rows(rows, rows) == {"rows": [], "removed": []}
+
+
+class TestBudget:
+    """Streamed chains share a slice of the Tiger per-minute budget."""
+
+    @pytest.fixture(autouse=True)
+    def budget(self, monkeypatch):
+        monkeypatch.setattr(chain_stream.RateLimits, "TIGER_API_CALLS_PER_MINUTE", 10)
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_budget_share", 0.3)
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_interval_seconds", 15)
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_max_interval_seconds", 120)
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_max_keys", 200)
+
+    def test_interval_scales_with_active_chains(self):
+        # 3 calls/min for streaming: one chain every 20s, four chains every 80s
+        assert refresh_interval(1) == pytest.approx(20.0)
+        assert refresh_interval(4) == pytest.approx(80.0)
+        for active in range(1, max_streamed_chains() + 1):
+            assert active * 60.0 / refresh_interval(active) <= 3.0 + 1e-9
+
+    def test_interval_floor(self, monkeypatch):
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_budget_share", 5.0)
+        assert refresh_interval(1) == 15.0
+
+    def test_max_keys_capped_by_budget(self, monkeypatch):
+        assert max_streamed_chains() == 6  # 3 calls/min, each refreshed at least every 120s
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_max_keys", 2)
+        assert max_streamed_chains() == 2
+
+
+@pytest.fixture
+def hub(monkeypatch):
+    chains = {"current": _chain(1.0)}
+
+    async def get_option_chain(symbol, expiration_date, is_pro=False, force_refresh=False):
+        return dict(chains["current"])
+
+    monkeypatch.setattr(chain_stream.cache_service, "_redis", None)
+    monkeypatch.setattr(chain_stream.tiger_service, "get_option_chain", get_option_chain)
+    return ChainStreamHub(), chains
+
+
+class TestHub:
+    """Subscribers share one channel per chain and get snapshot then deltas."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_then_delta(self, hub):
+        hub, chains = hub
+        frames = await hub.subscribe("aapl", "2099-01-16")
+        other = await hub.subscribe("AAPL", "2099-01-16")
+        snapshot = await asyncio.wait_for(anext(frames), 1)
+        assert snapshot["type"] == "snapshot" and snapshot["version"] == 1.0
+        assert [row["strike"] for row in snapshot["calls"]] == [95.0, 100.0]
+        assert (await asyncio.wait_for(anext(other), 1))["type"] == "snapshot"
+        assert hub.stats() == {"streams": 1, "max_streams": chain_stream.max_streamed_chains(), "subscribers": 2}
+
+        channel = hub._channels["AAPL:2099-01-16"]
+        chains["current"] = _chain(2.0, bid=1.5)
+        await hub.publish(channel.name, await channel.refresh())
+        delta = await asyncio.wait_for(anext(frames), 1)
+        assert delta["type"] == "delta" and (delta["base"], delta["version"]) == (1.0, 2.0)
+        assert [set(row) for row in delta["calls"]["rows"]] == [{"strike", "bid", "ask"}] * 2
+
+        await frames.aclose()
+        await other.aclose()
+        assert hub.stats()["streams"] == 0 and hub.stats()["subscribers"] == 0
+
+    @pytest.mark.asyncio
+    async def test_missed_frame_resyncs(self, hub):
+        hub, chains = hub
+        frames = await hub.subscribe("AAPL", "2099-01-16")
+        await asyncio.wait_for(anext(frames), 1)
+        chains["current"] = _chain(3.0, bid=2.0)
+        hub.deliver("AAPL:2099-01-16", {"type": "delta", "base": 2.0, "version": 3.0})
+        resynced = await asyncio.wait_for(anext(frames), 1)
+        assert resynced["type"] == "snapshot" and resynced["version"] == 3.0
+        assert resynced["calls"][0]["bid"] == 2.0
+        await frames.aclose()
+
+    @pytest.mark.asyncio
+    async def test_stream_limit(self, hub, monkeypatch):
+        hub, _ = hub
+        monkeypatch.setattr(chain_stream.settings, "chain_stream_max_keys", 1)
+        frames = await hub.subscribe("AAPL", "2099-01-16")
+        await asyncio.wait_for(anext(frames), 1)
+        with pytest.raises(HTTPException) as excinfo:
+            await hub.subscribe("MSFT", "2099-01-16")
+        assert excinfo.value.status_code == 503
+        await frames.aclose()
@@ -0,0 +1,121 @@
+"""Unit tests for the named bounded executors."""
+
+import asyncio
+import contextvars
+import pickle
+import threading
+import time
+
+import pytest
+
+from app.services.executors import BoundedExecutor, executor_stats, get_executor
+from app.services.market_data_service import MarketDataService
+
+_request_id: contextvars.ContextVar[str] = contextvars.ContextVar("request_id", default="")
+
+
+class TestBoundedExecutor:
+    """Concurrency limit, metrics and context propagation."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded_and_waits_recorded(self):
+        executor = BoundedExecutor("test", max_workers=2)
+        running = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def work():
+            nonlocal running, peak
+            with lock:
+                running += 1
+                peak = max(peak, running)
+            time.sleep(0.05)
+            with lock:
+                running -= 1
+            return "ok"
+
+        results = await asyncio.gather(*(executor.run(work) for _ in range(6)))
+        assert results == ["ok"] * 6
+        assert peak == 2
+        stats = executor.stats()
+        assert stats["completed"] == 6 and stats["queued"] == 0 and stats["active"] == 0
+        assert stats["saturated"] == 4
+        assert stats["max_wait_s"] >= 0.05
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_failures_are_counted_and_raised(self):
+        executor = BoundedExecutor("test", max_workers=1)
+
+        def boom():
+            raise ValueError("bad")
+
+        with pytest.raises(ValueError):
+            await executor.run(boom)
+        assert executor.stats()["failed"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_timed_out_caller_keeps_slot_until_work_ends(self):
+        executor = BoundedExecutor("test", max_workers=1)
+        release = threading.Event()
+
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(executor.run(release.wait, 5), timeout=0.05)
+        assert executor.stats()["active"] == 1  # Worker is still busy
+        release.set()
+        assert await executor.run(lambda: "next") == "next"
+        assert executor.stats()["active"] == 0
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_context_variables_reach_worker(self):
+        executor = BoundedExecutor("test", max_workers=1)
+        _request_id.set("req-1")
+        assert await executor.run(_request_id.get) == "req-1"
+        executor.shutdown()
+
+    def test_submit_blocking_from_sync_code_is_counted(self):
+        executor = BoundedExecutor("test", max_workers=1)
+        started, release = threading.Event(), threading.Event()
+
+        def busy():
+            started.set()
+            return release.wait(5)
+
+        first = executor.submit_blocking(busy)
+        assert started.wait(1)
+        queued = executor.submit_blocking(lambda: "never")
+        with pytest.raises(TimeoutError):
+            queued.result(timeout=0.01)
+        assert queued.cancel()  # Still queued behind the busy worker
+        release.set()
+        assert first.result(timeout=1) is True
+        assert executor.submit_blocking(lambda: "ok").result(timeout=1) == "ok"
+        stats = executor.stats()
+        assert stats["submitted"] == 3 and stats["completed"] == 2 and stats["failed"] == 1
+        assert stats["queued"] == 0 and stats["active"] == 0 and stats["saturated"] == 1
+        executor.shutdown()
+
+    @pytest.mark.asyncio
+    async def test_process_pool(self):
+        executor = BoundedExecutor("test", max_workers=1, use_processes=True)
+        assert await executor.run(pow, 2, 10) == 1024
+        assert executor.stats()["kind"] == "process"
+        executor.shutdown(wait=True)
+
+
+class TestRegistry:
+    """Named pools used by the services."""
+
+    def test_named_executors(self):
+        assert set(executor_stats()) == {"tiger", "fmp_sync", "toolkit", "cpu", "strategy", "blob"}
+        assert get_executor("tiger").max_workers >= 1
+
+    def test_market_data_service_is_picklable(self):
+        """Bound methods can be shipped to a process pool; lazy clients are dropped."""
+        service = MarketDataService()
+        service._http_client = object()
+        clone = pickle.loads(pickle.dumps(service.get_financial_profile)).__self__
+        assert clone._http_client is None
+        assert clone._fmp_api_key == service._fmp_api_key
@@ -0,0 +1,173 @@
+"""Unit tests for the columnar OptionChain / OptionSide types."""
+
+import json
+
+import pytest
+
+from app.schemas.strategy_recommendation import OptionType
+from app.services.option_chain import OptionChain, OptionSide
+from app.services.strategy_engine import StrategyEngine
+
+
+def _tiger_row(strike: float, delta: float, iv: float = 0.25) -> dict:
+    """Option dict in the exact shape produced by tiger_service.get_option_chain."""
+    greeks = {"delta": delta, "gamma": 0.02, "theta": -0.05, "vega": 0.1, "rho": 0.01}
+    return {
+        "strike": strike, "bid": 1.0, "ask": 1.1, "volume": 10.0, "open_interest": 100.0,
+        **greeks, "greeks": dict(greeks), "latest_price": 1.05,
+        "implied_vol": iv, "implied_volatility": iv,
+    }
+
+
+@pytest.fixture
+def tiger_chain() -> dict:
+    return {
+        "calls": [_tiger_row(95.0, 0.70), _tiger_row(100.0, 0.50), _tiger_row(105.0, 0.30)],
+        "puts": [_tiger_row(95.0, -0.30), _tiger_row(100.0, -0.50), _tiger_row(105.0, -0.70)],
+        "spot_price": 100.2,
+        "_source": "api",
+    }
+
+
+class TestSerialization:
+    """Round trip between the dict/JSON shape and the columnar form."""
+
+    def test_round_trip_is_lossless(self, tiger_chain):
+        """Tiger-shaped chains survive from_dict -> to_dict unchanged (incl. JSON encoding)."""
+        chain = OptionChain.from_dict(tiger_chain)
+        assert chain.to_dict() == tiger_chain
+        assert json.loads(json.dumps(chain.to_dict())) == tiger_chain
+
+    def test_zero_iv_is_preserved(self):
+        """IV of 0 (illiquid strikes) is a value, not a missing field."""
+        chain = OptionChain.from_dict({"calls": [_tiger_row(100.0, 0.5, iv=0.0)], "puts": []})
+        assert chain.to_dict()["calls"][0]["implied_vol"] == 0.0
+
+    def test_aliases_and_nested_greeks(self):
+        """bid_price/strike_price/openInterest and nested greeks are normalized."""
+        side = OptionSide.from_records([
+            {"strike_price": "1,000", "bid_price": 2.0, "ask": 2.2, "openInterest": 7,
+             "greeks": {"delta": 0.4}, "implied_volatility": 0.3, "symbol": "AAPL250117C01000000"},
+            {"strike": None, "bid": 1.0},
+            "not-a-dict",
+        ])
+        records = side.to_records()
+        assert len(records) == 1
+        row = records[0]
+        assert row["strike"] == 1000.0
+        assert row["bid"] == 2.0 and row["ask"] == 2.2
+        assert row["open_interest"] == 7.0 and row["volume"] == 0.0
+        assert row["delta"] == 0.4 and row["greeks"] == {"delta": 0.4}
+        assert row["implied_vol"] == 0.3
+        assert row["symbol"] == "AAPL250117C01000000"
+        assert "symbol" not in side.to_records(include_extras=False)[0]
+
+    def test_mapping_interface(self, tiger_chain):
+        """OptionChain reads like the dict shape for legacy callers."""
+        chain = OptionChain.from_dict(tiger_chain)
+        assert chain["spot_price"] == 100.2
+        assert chain.get("_source") == "api"
+        assert chain.get("missing", "x") == "x"
+        assert "puts" in chain
+        assert chain.get("calls")[1]["strike"] == 100.0
+        assert chain.get("calls") is chain.get("calls")  # memoized
+
+    def test_coerce_is_identity_for_option_chain(self, tiger_chain):
+        chain = OptionChain.from_dict(tiger_chain)
+        assert OptionChain.coerce(chain) is chain
+
+    def test_columnar_round_trip(self, tiger_chain):
+        """The cache shape (column lists) rebuilds the same chain, through a JSON encode too."""
+        tiger_chain["calls"][0]["symbol"] = "AAPL250117C00095000"
+        columnar = OptionChain.from_dict(tiger_chain).to_columnar()
+        assert columnar["calls"]["strike"] == [95.0, 100.0, 105.0] and columnar["_source"] == "api"
+        rebuilt = OptionChain.from_dict(json.loads(json.dumps(columnar)))
+        assert rebuilt.to_dict() == tiger_chain
+        assert rebuilt.with_meta(_source="cache")["_source"] == "cache" and rebuilt["_source"] == "api"
+
+
+class TestLookups:
+    """Strike / delta lookups and range slicing."""
+
+    def test_rows_sorted_by_strike(self):
+        side = OptionSide.from_records([{"strike": 110}, {"strike": 100}, {"strike": 105}])
+        assert side.strikes.tolist() == [100.0, 105.0, 110.0]
+
+    def test_find_strike(self, tiger_chain):
+        calls = OptionChain.from_dict(tiger_chain).calls
+        assert calls.find_strike(100.0) == 1
+        assert calls.find_strike(100.004) == 1
+        assert calls.find_strike(101.0) is None
+
+    def test_nearest_strike(self, tiger_chain):
+        calls = OptionChain.from_dict(tiger_chain).calls
+        assert calls.nearest_strike(0.0) == 0
+        assert calls.nearest_strike(1000.0) == 2
+        assert calls.nearest_strike(103.0) == 2
+        assert calls.nearest_strike(102.5) == 1  # tie -> lower strike
+        assert OptionSide.from_records([]).nearest_strike(100.0) is None
+
+    def test_batched_strike_lookups_match_scalar(self, tiger_chain):
+        calls = OptionChain.from_dict(tiger_chain).calls
+        targets = [0.0, 95.0, 100.004, 101.0, 102.5, 103.0, 1000.0, float("nan")]
+        assert calls.nearest_strikes(targets[:-1]).tolist() == [calls.nearest_strike(t) for t in targets[:-1]]
+        assert calls.find_strikes(targets).tolist() == [-1, 0, 1, -1, -1, -1, -1, -1]
+        single = OptionSide.from_records([{"strike": 100}])
+        assert single.find_strikes([100.0, 90.0]).tolist() == [0, -1]
+        assert OptionSide.from_records([]).find_strikes([100.0]).tolist() == [-1]
+
+    def test_nearest_delta_skips_missing(self):
+        side = OptionSide.from_records([
+            {"strike": 100, "delta": 0.6}, {"strike": 105}, {"strike": 110, "delta": 0.2},
+        ])
+        assert side.nearest_delta(0.45) == 0
+        assert side.nearest_delta(0.1) == 2
+        assert OptionSide.from_records([{"strike": 100}]).nearest_delta(0.5) is None
+
+    def test_slice_strikes_inclusive(self, tiger_chain):
+        chain = OptionChain.from_dict(tiger_chain).slice_strikes(95.0, 100.0)
+        assert chain.calls.strikes.tolist() == [95.0, 100.0]
+        assert [p["strike"] for p in chain["puts"]] == [95.0, 100.0]
+        assert chain["spot_price"] == 100.2
+
+
+class TestConsumers:
+    """Call sites that accept an OptionChain."""
+
+    def test_strategy_engine_find_option(self, tiger_chain):
+        engine = StrategyEngine()
+        chain = OptionChain.from_dict(tiger_chain)
+        short_put = engine._find_option(chain, OptionType.PUT, -0.30, 100.0)
+        assert short_put["strike"] == 95.0
+        assert engine._extract_greek(short_put, "delta") == -0.30
+        assert engine._find_closest_strike(chain, OptionType.CALL, 104.0)["strike"] == 105.0
+
+    def test_ensure_portfolio_greeks(self, tiger_chain):
+        from app.api.endpoints.tasks import _ensure_portfolio_greeks
+
+        summary = {"legs": [
+            {"strike": 100.0, "type": "call", "action": "buy", "quantity": 1},
+            {"strike": 105.0, "type": "call", "action": "sell", "quantity": 1},
+        ]}
+        _ensure_portfolio_greeks(summary, OptionChain.from_dict(tiger_chain))
+        dict_summary = {"legs": [dict(leg) for leg in summary["legs"]]}
+        _ensure_portfolio_greeks(dict_summary, tiger_chain)
+        assert summary["portfolio_greeks"]["delta"] == pytest.approx(0.2)
+        assert summary["portfolio_greeks"] == dict_summary["portfolio_greeks"]
+
+    def test_portfolio_greeks_prefer_leg_values(self, tiger_chain):
+        from app.api.endpoints.tasks import _ensure_portfolio_greeks
+
+        summary = {"legs": [
+            # Leg delta wins; its missing Greeks come from the chain row
+            {"strike": 95.0, "type": "put", "action": "sell", "quantity": 2, "delta": 0.25},
+            {"strike": 97.5, "type": "call", "action": "buy", "quantity": 1},  # not in the chain
+            "not a leg",
+        ]}
+        _ensure_portfolio_greeks(summary, tiger_chain)
+        greeks = summary["portfolio_greeks"]
+        # Sold puts: delta and rho flip sign twice, gamma/theta/vega once
+        assert greeks["delta"] == pytest.approx(0.5)
+        assert greeks["rho"] == pytest.approx(0.02)
+        assert greeks["gamma"] == pytest.approx(-0.04)
+        assert greeks["theta"] == pytest.approx(0.1)
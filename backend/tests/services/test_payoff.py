@@ -0,0 +1,139 @@
+"""Unit tests for the exact expiration payoff engine and its consumers."""
+
+import math
+
+import numpy as np
+import pytest
+
+from app.api.endpoints.tasks import _calculate_strategy_metrics
+from app.schemas.strategy_recommendation import OptionLeg, OptionType
+from app.services import payoff
+from app.services.strategy_engine import StrategyEngine
+
+
+def _leg(option_type, action, strike, premium, quantity=1):
+    return {"type": option_type, "action": action, "strike": strike, "premium": premium, "quantity": quantity}
+
+
+BULL_CALL = [_leg("call", "buy", 100, 4.2), _leg("call", "sell", 105, 2.0)]
+# Uneven wings: 5 wide on the put side, 10 wide on the call side
+IRON_CONDOR = [
+    _leg("put", "buy", 85, 0.5),
+    _leg("put", "sell", 90, 1.5),
+    _leg("call", "sell", 110, 1.6),
+    _leg("call", "buy", 120, 0.4),
+]
+STRANGLE = [_leg("call", "buy", 105, 2.0), _leg("put", "buy", 95, 1.5)]
+COVERED_CALL = [
+    {"type": "stock", "action": "buy", "quantity": 100, "price": 100.0},
+    _leg("call", "sell", 110, 2.0, quantity=100),
+]
+
+
+def _brute_force(legs, prices):
+    """Sampled payoff, the way the frontend computes it."""
+    return payoff.payoff_at(payoff.leg_arrays([legs]), prices)[0]
+
+
+class TestStrategyPayoff:
+    """Exact max profit/loss and breakevens."""
+
+    def test_bull_call_spread(self):
+        result = payoff.strategy_payoff(BULL_CALL)
+        assert result["max_profit"] == pytest.approx(2.8)
+        assert result["max_loss"] == pytest.approx(-2.2)
+        assert result["breakeven_points"] == pytest.approx([102.2])
+        assert result["net_cash_flow"] == pytest.approx(-2.2)
+
+    def test_uneven_iron_condor(self):
+        result = payoff.strategy_payoff(IRON_CONDOR)
+        credit = 1.5 + 1.6 - 0.5 - 0.4
+        assert result["max_profit"] == pytest.approx(credit)
+        # The wider call wing sets the max loss
+        assert result["max_loss"] == pytest.approx(credit - 10)
+        assert result["breakeven_points"] == pytest.approx([90 - credit, 110 + credit])
+
+    def test_unbounded_sides(self):
+        strangle = payoff.strategy_payoff(STRANGLE)
+        assert strangle["max_profit"] == math.inf
+        assert strangle["max_loss"] == pytest.approx(-3.5)
+        assert strangle["breakeven_points"] == pytest.approx([91.5, 108.5])
+        naked = payoff.strategy_payoff([_leg("call", "sell", 110, 2.0)])
+        assert naked["max_loss"] == -math.inf and naked["breakeven_points"] == pytest.approx([112.0])
+
+    def test_stock_legs(self):
+        result = payoff.strategy_payoff(COVERED_CALL)
+        assert result["max_profit"] == pytest.approx(1200.0)
+        # Stock going to zero, less the premium collected
+        assert result["max_loss"] == pytest.approx(-9800.0)
+        assert result["breakeven_points"] == pytest.approx([98.0])
+
+    def test_matches_a_fine_grid(self):
+        prices = np.linspace(0.0, 200.0, 200_001)
+        for legs in (BULL_CALL, IRON_CONDOR, COVERED_CALL):
+            curve = _brute_force(legs, prices)
+            result = payoff.strategy_payoff(legs)
+            assert result["max_profit"] == pytest.approx(curve.max())
+            assert result["max_loss"] == pytest.approx(curve.min())
+            for breakeven in result["breakeven_points"]:
+                assert abs(_brute_force(legs, [breakeven])[0]) < 1e-9
+
+    def test_invalid_legs_are_ignored(self):
+        result = payoff.strategy_payoff([None, {"type": "future"}, _leg("call", "buy", None, 1.0)])
+        assert result == {"max_profit": 0.0, "max_loss": 0.0, "breakeven_points": [], "net_cash_flow": 0.0}
+
+
+class TestBatch:
+    def test_batch_rows_match_single_strategies(self):
+        strategies = [BULL_CALL, IRON_CONDOR, STRANGLE, COVERED_CALL]
+        arrays = payoff.leg_arrays(strategies)
+        assert arrays["kind"].shape == (4, 4)
+        batch = payoff.analyze(arrays)
+        for row, legs in enumerate(strategies):
+            single = payoff.strategy_payoff(legs)
+            assert batch["max_profit"][row] == pytest.approx(single["max_profit"])
+            assert batch["max_loss"][row] == pytest.approx(single["max_loss"])
+            found = batch["breakevens"][row]
+            assert found[~np.isnan(found)].tolist() == pytest.approx(single["breakeven_points"])
+
+    def test_payoff_curve_on_a_grid(self):
+        curves = payoff.payoff_at(payoff.leg_arrays([BULL_CALL, STRANGLE]), [90.0, 100.0, 110.0])
+        assert curves.shape == (2, 3)
+        assert curves[0].tolist() == pytest.approx([-2.2, -2.2, 2.8])
+        assert curves[1].tolist() == pytest.approx([1.5, -3.5, 1.5])
+
+
+class TestConsumers:
+    def test_summary_metrics_replace_sampled_values(self):
+        summary = {"legs": STRANGLE, "strategy_metrics": {"max_profit": 26.5, "max_loss": -3.5, "profit_zones": []}}
+        metrics = payoff.summary_metrics(summary)
+        assert metrics["max_profit"] == math.inf
+        assert metrics["breakeven_points"] == pytest.approx([91.5, 108.5])
+        assert metrics["profit_zones"] == []
+        assert payoff.format_pnl(metrics["max_profit"]) == "Unlimited"
+        assert payoff.finite_or_text(metrics["max_loss"]) == pytest.approx(-3.5)
+
+    def test_summary_without_legs_is_unchanged(self):
+        summary = {"legs": [], "strategy_metrics": {"max_profit": 10.0}}
+        assert payoff.summary_metrics(summary) == {"max_profit": 10.0}
+
+    def test_chart_task_metrics(self):
+        metrics = _calculate_strategy_metrics({"legs": IRON_CONDOR})
+        assert metrics["max_profit"] == pytest.approx(2.2)
+        assert metrics["max_loss"] == pytest.approx(-7.8)
+        assert metrics["margin"] == pytest.approx(780.0)
+        assert metrics["breakeven"] == metrics["breakeven_points"][0] == pytest.approx(87.8)
+
+    def test_engine_uses_execution_prices(self):
+        def leg(option_type, ratio, strike, bid, ask):
+            return OptionLeg(
+                symbol="AAPL", strike=strike, ratio=ratio, type=option_type, bid=bid, ask=ask,
+                expiration_date="2099-01-16", days_to_expiration=30,
+            )
+
+        legs = [leg(OptionType.CALL, 1, 100.0, 4.0, 4.2), leg(OptionType.CALL, -1, 105.0, 2.0, 2.1)]
+        result = StrategyEngine()._calculate_payoff(legs)
+        # Buy at the ask, sell at the bid: debit 2.20
+        assert result["max_loss"] == pytest.approx(2.2)
+        assert result["max_profit"] == pytest.approx(2.8)
+        assert result["breakeven_points"] == pytest.approx([102.2])
@@ -0,0 +1,127 @@
+"""Unit tests for the lognormal POP / expected value engine."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+from scipy.special import ndtr
+
+from app.schemas.strategy_recommendation import Outlook, RiskProfile
+from app.services import payoff, probability
+from app.services.black_scholes import bs_greeks
+from app.services.option_chain import OptionChain
+from app.services.strategy_engine import StrategyEngine
+
+SPOT, YEARS, VOL = 100.0, 45 / 365, 0.25
+
+
+def _price(strike, is_call):
+    return float(bs_greeks(SPOT, strike, YEARS, VOL, is_call)["price"])
+
+
+def _leg(option_type, action, strike):
+    return {"type": option_type, "action": action, "strike": strike, "premium": _price(strike, option_type == "call")}
+
+
+BULL_CALL = [_leg("call", "buy", 100), _leg("call", "sell", 105)]
+IRON_CONDOR = [_leg("put", "buy", 85), _leg("put", "sell", 90), _leg("call", "sell", 110), _leg("call", "buy", 115)]
+STRADDLE = [_leg("call", "buy", 100), _leg("put", "buy", 100)]
+STOCK = [{"type": "stock", "action": "buy", "quantity": 1, "price": SPOT}]
+
+
+def _arrays(*strategies):
+    return payoff.leg_arrays(list(strategies))
+
+
+class TestClosedForm:
+    """Exact lognormal integration, hold to expiration."""
+
+    def test_pop_is_the_probability_beyond_the_breakeven(self):
+        breakeven = payoff.strategy_payoff(BULL_CALL)["breakeven_points"][0]
+        d2 = (np.log(SPOT / breakeven) - 0.5 * VOL**2 * YEARS) / (VOL * np.sqrt(YEARS))
+        result = probability.closed_form(_arrays(BULL_CALL), SPOT, YEARS, VOL)
+        assert result["pop"][0] == pytest.approx(ndtr(d2))
+
+    def test_fairly_priced_legs_have_zero_expectancy(self):
+        result = probability.closed_form(_arrays(BULL_CALL, IRON_CONDOR, STRADDLE, STOCK), SPOT, YEARS, VOL)
+        assert result["expected_value"] == pytest.approx(np.zeros(4), abs=1e-9)
+        # Buying the long leg 0.10 cheaper: the expectancy is the discount
+        cheap = [dict(BULL_CALL[0], premium=BULL_CALL[0]["premium"] - 0.1), BULL_CALL[1]]
+        assert probability.closed_form(_arrays(cheap), SPOT, YEARS, VOL)["expected_value"][0] == pytest.approx(0.1)
+
+    def test_per_strategy_volatility(self):
+        result = probability.closed_form(_arrays(IRON_CONDOR, IRON_CONDOR), SPOT, YEARS, [0.15, 0.45])
+        assert result["pop"][0] > result["pop"][1]
+
+
+class TestMonteCarlo:
+    """Simulated exits."""
+
+    def test_without_rules_matches_closed_form(self):
+        arrays = _arrays(BULL_CALL, IRON_CONDOR, STRADDLE)
+        exact = probability.closed_form(arrays, SPOT, YEARS, VOL)
+        simulated = probability.monte_carlo(arrays, SPOT, YEARS, VOL, paths=20000, seed=3)
+        assert simulated["pop"] == pytest.approx(exact["pop"], abs=0.015)
+        assert simulated["expected_value"] == pytest.approx(exact["expected_value"], abs=0.1)
+        assert (simulated["exit_rate"] == 0).all()
+
+    def test_seed_reproduces(self):
+        arrays = _arrays(IRON_CONDOR)
+        first = probability.monte_carlo(arrays, SPOT, YEARS, VOL, take_profit=0.5, seed=11)
+        second = probability.monte_carlo(arrays, SPOT, YEARS, VOL, take_profit=0.5, seed=11)
+        assert first["pop"][0] == second["pop"][0]
+        assert first["expected_value"][0] == second["expected_value"][0]
+
+    def test_take_profit_raises_pop_of_credit_spreads(self):
+        arrays = _arrays(IRON_CONDOR, STRADDLE)
+        held = probability.closed_form(arrays, SPOT, YEARS, VOL)
+        managed = probability.evaluate(arrays, SPOT, YEARS, VOL, take_profit=0.5, seed=5)
+        assert managed["pop"][0] > held["pop"][0] + 0.05
+        assert 0 < managed["exit_rate"][0] < 1
+        # The straddle's max profit is unbounded: the rule never fires
+        assert managed["exit_rate"][1] == 0
+
+    def test_stop_loss_closes_losing_paths(self):
+        arrays = _arrays(IRON_CONDOR)
+        result = probability.monte_carlo(arrays, SPOT, YEARS, VOL, stop_loss=0.5, seed=5)
+        assert result["exit_rate"][0] > 0
+
+
+class TestAtmVolatility:
+    def test_interpolates_chain_iv(self):
+        chain = OptionChain.from_dict({
+            "calls": [{"strike": 95.0, "implied_vol": 0.30}, {"strike": 105.0, "implied_vol": 0.20}],
+            "puts": [{"strike": 95.0, "implied_vol": 0.32}, {"strike": 105.0, "implied_vol": 0.22}],
+        })
+        assert probability.atm_volatility(chain, 100.0, YEARS) == pytest.approx(0.26)
+
+    def test_solves_from_mids_without_iv(self):
+        rows = [
+            {"strike": strike, "bid": _price(strike, True) - 0.01, "ask": _price(strike, True) + 0.01}
+            for strike in (95.0, 100.0, 105.0)
+        ]
+        chain = OptionChain.from_dict({"calls": rows, "puts": []})
+        assert probability.atm_volatility(chain, SPOT, YEARS) == pytest.approx(VOL, abs=0.005)
+        assert probability.atm_volatility(OptionChain.from_dict({"calls": [], "puts": []}), SPOT, YEARS) is None
+
+
+class TestEngineScoring:
+    def test_generate_strategies_reports_model_pop(self):
+        expiration = (datetime.now() + timedelta(days=45)).strftime("%Y-%m-%d")
+        chain = {
+            "calls": [
+                {"strike": 95.0, "bid": 6.9, "ask": 7.0, "implied_vol": 0.25,
+                 "greeks": {"delta": 0.65, "gamma": 0.02, "theta": -0.1, "vega": 0.2, "rho": 0.05}},
+                {"strike": 105.0, "bid": 2.5, "ask": 2.6, "implied_vol": 0.25,
+                 "greeks": {"delta": 0.30, "gamma": 0.01, "theta": -0.05, "vega": 0.1, "rho": 0.02}},
+            ],
+            "puts": [],
+            "spot_price": 100.0,
+        }
+        strategies = StrategyEngine().generate_strategies(
+            chain, "AAPL", 100.0, Outlook.BULLISH, RiskProfile.CONSERVATIVE, 10000.0, expiration, take_profit=0.5
+        )
+        metrics = strategies[0].metrics
+        # Heuristic POP for this spread was a fixed 0.65
+        assert metrics["pop"] != 0.65 and 0 < metrics["pop"] < 1
+        assert {"expected_value", "take_profit_pop", "take_profit_expected_value", "take_profit_exit_rate"} <= set(metrics)
@@ -0,0 +1,183 @@
+"""Unit tests for the Redis daily quota counters (Redis and Postgres mocked)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import User
+from app.services import quota_counters as counters_module
+from app.services.quota_counters import DIRTY_KEY, QuotaCounters, _seeds, current_usage, quota_day, quota_key
+
+USER_ID = uuid.uuid4()
+
+
+class FakeScript:
+    def __init__(self, redis, lua) -> None:
+        self.redis = redis
+        self.lua = lua
+
+    async def __call__(self, keys, args):
+        self.redis.calls.append((self.lua, keys, args))
+        return self.redis.script_result
+
+
+class FakePipeline:
+    def __init__(self, redis) -> None:
+        self.redis = redis
+        self.keys: list[str] = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    def hmget(self, key, *fields):
+        self.keys.append((key, fields))
+
+    async def execute(self):
+        return [[self.redis.hashes.get(key, {}).get(f) for f in fields] for key, fields in self.keys]
+
+
+class FakeRedis:
+    def __init__(self) -> None:
+        self.calls: list = []
+        self.script_result = [1, 0, 0, 0]
+        self.hashes: dict[str, dict[str, str]] = {}
+        self.dirty: set[str] = set()
+
+    def register_script(self, lua):
+        return FakeScript(self, lua)
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    async def spop(self, key, count):
+        members = sorted(self.dirty)[:count]
+        self.dirty -= set(members)
+        return members
+
+    async def sadd(self, key, *members):
+        self.dirty.update(members)
+
+
+class FakeCache:
+    def __init__(self, redis=None) -> None:
+        self._redis = redis
+
+    async def _ensure_connected(self) -> bool:
+        return self._redis is not None
+
+
+class FakeSession:
+    def __init__(self, executed, fail=False) -> None:
+        self.executed = executed
+        self.fail = fail
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def execute(self, statement, params):
+        if self.fail:
+            raise RuntimeError("db down")
+        self.executed.append((statement, params))
+
+    async def commit(self):
+        pass
+
+
+def _user(**overrides):
+    values = dict(id=USER_ID, daily_ai_usage=3, daily_image_usage=1, daily_fundamental_queries_used=0,
+                  last_quota_reset_date=datetime.now(timezone.utc))
+    values.update(overrides)
+    return User(**values)
+
+
+def test_seeds_use_columns_only_for_the_same_day():
+    today = quota_day()
+    assert _seeds(_user(), today) == [3, 1, 0]
+    assert _seeds(_user(last_quota_reset_date=datetime.now(timezone.utc) - timedelta(days=1)), today) == [0, 0, 0]
+    assert _seeds(_user(last_quota_reset_date=None), today) == [0, 0, 0]
+
+
+def test_current_usage_hides_counters_of_an_earlier_day():
+    assert current_usage(_user())["daily_ai_usage"] == 3
+    stale = _user(last_quota_reset_date=datetime.now(timezone.utc) - timedelta(days=2))
+    assert current_usage(stale) == {"daily_ai_usage": 0, "daily_image_usage": 0, "daily_fundamental_queries_used": 0}
+
+
+@pytest.mark.asyncio
+async def test_without_redis_callers_fall_back():
+    counters = QuotaCounters(FakeCache())
+    assert await counters.reserve(_user(), "ai", 5, 40) is None
+    assert await counters.load_usage(_user()) is False
+    assert await counters.refund(USER_ID, "ai", 5, quota_day()) is False
+    assert await counters.flush() == 0
+
+
+@pytest.mark.asyncio
+async def test_reserve_passes_limit_and_seeds_and_applies_counts():
+    redis = FakeRedis()
+    counters = QuotaCounters(FakeCache(redis))
+    user = _user()
+
+    redis.script_result = [1, 8, 1, 0]
+    assert await counters.reserve(user, "ai", 5, 40) is True
+    _, keys, args = redis.calls[-1]
+    assert keys == [quota_key(quota_day(), USER_ID), DIRTY_KEY]
+    assert args[:3] == ["ai", 5, 40] and args[-3:] == [3, 1, 0]
+    assert user.daily_ai_usage == 8
+
+    redis.script_result = [0, 8, 1, 0]
+    assert await counters.reserve(user, "ai", 40, 40) is False
+    assert await counters.reserve(user, "image", 1) is False  # Unlimited increments pass limit -1
+    assert redis.calls[-1][2][2] == -1
+    assert counters.stats()["granted"] == 1 and counters.stats()["rejected"] == 2
+
+
+@pytest.mark.asyncio
+async def test_refund_targets_the_reservation_day():
+    redis = FakeRedis()
+    counters = QuotaCounters(FakeCache(redis))
+    yesterday = quota_day() - timedelta(days=1)
+
+    redis.script_result = 3
+    assert await counters.refund(USER_ID, "ai", 5, yesterday) is True
+    _, keys, args = redis.calls[-1]
+    assert keys == [quota_key(yesterday, USER_ID), DIRTY_KEY]
+    assert args == ["ai", 5, f"{yesterday:%Y%m%d}:{USER_ID}"]
+
+    redis.script_result = -1  # No hash for that day: the caller refunds in Postgres
+    assert await counters.refund(USER_ID, "ai", 5, yesterday) is False
+    assert counters.stats()["refunds"] == 1
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_dirty_counters_and_requeues_on_failure(monkeypatch):
+    redis = FakeRedis()
+    counters = QuotaCounters(FakeCache(redis))
+    day = quota_day()
+    other = uuid.uuid4()
+    redis.hashes[quota_key(day, USER_ID)] = {"ai": "10", "image": "2", "fundamental": "1"}
+    redis.dirty = {f"{day:%Y%m%d}:{USER_ID}", f"{day:%Y%m%d}:{other}"}  # other's hash expired
+
+    executed = []
+    monkeypatch.setattr(counters_module, "AsyncSessionLocal", lambda: FakeSession(executed))
+    assert await counters.flush() == 1
+    statement, rows = executed[0]
+    assert rows[0]["user_id"] == USER_ID and (rows[0]["ai"], rows[0]["image"], rows[0]["fundamental"]) == (10, 2, 1)
+    assert rows[0]["next_day"] - rows[0]["day_start"] == timedelta(days=1)
+    sql = str(statement.compile(dialect=postgresql.dialect()))
+    assert "users.last_quota_reset_date < %(next_day)s" in sql
+    assert redis.dirty == set()
+
+    redis.dirty = {f"{day:%Y%m%d}:{USER_ID}"}
+    monkeypatch.setattr(counters_module, "AsyncSessionLocal", lambda: FakeSession(executed, fail=True))
+    with pytest.raises(RuntimeError):
+        await counters.flush()
+    assert redis.dirty == {f"{day:%Y%m%d}:{USER_ID}"}
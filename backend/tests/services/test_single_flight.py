@@ -0,0 +1,184 @@
+"""Unit tests for single-flight request coalescing."""
+
+import asyncio
+
+import pytest
+
+from app.services.single_flight import SingleFlight
+
+
+class FakeCache:
+    """In-memory stand-in for the CacheService lock/get/set API."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, object] = {}
+        self.locks: dict[str, str] = {}
+
+    async def acquire_lock(self, lock_key: str, ttl: int = 3600) -> str | None:
+        if lock_key in self.locks:
+            return None
+        self.locks[lock_key] = f"token-{lock_key}"
+        return self.locks[lock_key]
+
+    async def release_lock(self, lock_key: str, token: str) -> None:
+        if self.locks.get(lock_key) == token:
+            del self.locks[lock_key]
+
+    async def lock_held(self, lock_key: str) -> bool:
+        return lock_key in self.locks
+
+    async def get(self, key: str):
+        return self.values.get(key)
+
+    async def set(self, key: str, value, ttl: int, is_pro: bool = False) -> None:
+        self.values[key] = value
+
+
+@pytest.fixture
+def cache() -> FakeCache:
+    return FakeCache()
+
+
+class TestInProcess:
+    """Concurrent callers in one process share one fetch."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_callers_share_one_fetch(self, cache):
+        flight = SingleFlight(cache)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"calls": [], "puts": []}
+
+        results = await asyncio.gather(*(flight.do("market:chain:AAPL:2025-01-17", fetch) for _ in range(20)))
+        assert calls == 1
+        assert all(r == {"calls": [], "puts": []} for r in results)
+        # Each caller gets its own top-level container
+        assert len({id(r) for r in results}) == 20
+        assert flight.stats()["coalesced"] == 19
+        assert flight.inflight() == 0
+
+    @pytest.mark.asyncio
+    async def test_exception_reaches_every_waiter(self, cache):
+        flight = SingleFlight(cache)
+
+        async def fetch():
+            await asyncio.sleep(0.01)
+            raise RuntimeError("upstream down")
+
+        results = await asyncio.gather(*(flight.do("k", fetch) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert cache.locks == {}  # lock released on failure
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_fetch(self, cache):
+        flight = SingleFlight(cache)
+
+        async def fetch():
+            await asyncio.sleep(0.02)
+            return [1, 2]
+
+        first = asyncio.create_task(flight.do("k", fetch))
+        second = asyncio.create_task(flight.do("k", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == [1, 2]
+
+    @pytest.mark.asyncio
+    async def test_sequential_calls_fetch_again(self, cache):
+        flight = SingleFlight(cache)
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return calls
+
+        assert await flight.do("k", fetch) == 1
+        assert await flight.do("k", fetch) == 2
+
+    @pytest.mark.asyncio
+    async def test_expired_leader_keeps_the_next_holders_lock(self, cache):
+        flight = SingleFlight(cache)
+
+        async def fetch():
+            # Our lock expires mid-fetch and another replica takes it
+            cache.locks["singleflight:lock:k"] = "other-replica"
+            return 1
+
+        assert await flight.do("k", fetch) == 1
+        assert cache.locks == {"singleflight:lock:k": "other-replica"}
+
+
+class TestAcrossReplicas:
+    """Waiting on a leader in another process via the Redis lock."""
+
+    @pytest.mark.asyncio
+    async def test_waits_for_remote_fill(self, cache):
+        flight = SingleFlight(cache, poll_interval=0.005)
+        cache.locks["singleflight:lock:market:expirations:AAPL"] = "other-replica"  # held by another replica
+        calls = 0
+
+        async def fetch():
+            nonlocal calls
+            calls += 1
+            return ["local"]
+
+        async def remote_leader():
+            await asyncio.sleep(0.02)
+            cache.values["market:expirations:AAPL"] = ["2025-01-17"]
+            cache.locks.clear()
+
+        result, _ = await asyncio.gather(
+            flight.do("market:expirations:AAPL", fetch, fill_key="market:expirations:AAPL"),
+            remote_leader(),
+        )
+        assert result == ["2025-01-17"]
+        assert calls == 0
+
+    @pytest.mark.asyncio
+    async def test_result_key_used_without_fill_key(self, cache):
+        leader, follower = SingleFlight(cache), SingleFlight(cache, poll_interval=0.005)
+
+        async def slow_fetch():
+            await asyncio.sleep(0.02)
+            return {"sector": "Tech"}
+
+        async def never_called():
+            raise AssertionError("follower must not fetch")
+
+        async def follow():
+            await asyncio.sleep(0.005)
+            return await follower.do("fmp:profile?symbol=AAPL", never_called)
+
+        results = await asyncio.gather(leader.do("fmp:profile?symbol=AAPL", slow_fetch), follow())
+        assert results == [{"sector": "Tech"}, {"sector": "Tech"}]
+
+    @pytest.mark.asyncio
+    async def test_falls_back_when_remote_leader_gives_up(self, cache):
+        flight = SingleFlight(cache, poll_interval=0.005)
+        cache.locks["singleflight:lock:k"] = "other-replica"
+
+        async def fetch():
+            return "local"
+
+        async def remote_leader_fails():
+            await asyncio.sleep(0.01)
+            cache.locks.clear()
+
+        result, _ = await asyncio.gather(flight.do("k", fetch, fill_key="k"), remote_leader_fails())
+        assert result == "local"
+        assert flight.stats()["remote_fallback"] == 1
+
+    @pytest.mark.asyncio
+    async def test_not_distributed_skips_lock(self, cache):
+        flight = SingleFlight(cache)
+        cache.locks["singleflight:lock:k"] = "other-replica"
+
+        async def fetch():
+            return "fresh"
+
+        assert await flight.do("k", fetch, fill_key="k", distributed=False) == "fresh"
@@ -3,6 +3,9 @@
 Tests mathematical correctness, edge cases, and validation logic.
 """
 
+import asyncio
+import time
+
 import pytest
 from datetime import datetime, timedelta
 
@@ -366,6 +369,73 @@ class TestBullCallSpread:
         )
 
 
+def _bull_chain(sell_bid: float) -> dict:
+    """Chain that yields one Bull Call Spread (95/105); risk/reward rises with the sell-leg credit."""
+    return {
+        "calls": [
+            {"strike": 95.0, "bid": 6.9, "ask": 7.0,
+             "greeks": {"delta": 0.65, "gamma": 0.02, "theta": -0.1, "vega": 0.2, "rho": 0.05}},
+            {"strike": 105.0, "bid": sell_bid, "ask": sell_bid + 0.1,
+             "greeks": {"delta": 0.30, "gamma": 0.01, "theta": -0.05, "vega": 0.1, "rho": 0.02}},
+        ],
+        "puts": [],
+        "spot_price": 100.0,
+    }
+
+
+class TestExpirationSearch:
+    """Multi-expiration search: window selection, concurrent fetches and global ranking."""
+
+    def test_select_expirations_prefers_target_dte(self):
+        engine = StrategyEngine()
+        today = datetime.now()
+        expirations = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in (5, 20, 38, 45, 52, 90)]
+        selected = engine.select_expirations(expirations, 14, 60, 3)
+        assert selected == [expirations[2], expirations[3], expirations[4]]
+        assert engine.select_expirations(expirations, 100, 200, 3) == []
+
+    @pytest.mark.asyncio
+    async def test_fetches_concurrently_and_ranks_globally(self):
+        engine = StrategyEngine()
+        today = datetime.now()
+        expirations = [(today + timedelta(days=d)).strftime("%Y-%m-%d") for d in (30, 45, 60)]
+        credits = {expirations[0]: 2.5, expirations[1]: 2.6, expirations[2]: 2.8}
+
+        async def fetch_chain(expiration):
+            await asyncio.sleep(0.2)
+            if expiration == expirations[1]:
+                raise RuntimeError("Tiger timeout")
+            return _bull_chain(credits[expiration])
+
+        start = time.monotonic()
+        strategies = await engine.search_expirations(
+            expirations, fetch_chain, "AAPL", Outlook.BULLISH, RiskProfile.CONSERVATIVE, 10000.0
+        )
+        # Bounded by the slowest fetch, not the sum of three
+        assert time.monotonic() - start < 0.5
+        # The failed expiration is skipped; the rest are ranked together (the cheaper debit has the better expectancy)
+        assert [s.legs[0].expiration_date for s in strategies] == [expirations[2], expirations[0]]
+        assert strategies[0].metrics["risk_reward_ratio"] > strategies[1].metrics["risk_reward_ratio"]
+
+    @pytest.mark.asyncio
+    async def test_auto_runs_every_algorithm(self, monkeypatch):
+        engine = StrategyEngine()
+        expiration = (datetime.now() + timedelta(days=45)).strftime("%Y-%m-%d")
+        seen = []
+
+        def fake_generate(chain, symbol, spot_price, outlook, *args):
+            seen.append(outlook)
+            return []
+
+        monkeypatch.setattr(engine, "generate_strategies", fake_generate)
+
+        async def fetch_chain(expiration):
+            return _bull_chain(2.5)
+
+        await engine.search_expirations([expiration], fetch_chain, "AAPL", Outlook.AUTO, RiskProfile.CONSERVATIVE, 10000.0)
+        assert sorted(o.value for o in seen) == ["BEARISH", "BULLISH", "NEUTRAL", "VOLATILE"]
+
+
 class TestNetGreeks:
     """Test net Greeks calculation."""
 
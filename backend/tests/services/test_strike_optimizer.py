@@ -0,0 +1,108 @@
+"""Unit tests for the vectorized strike-combination optimizer."""
+
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+from app.schemas.strategy_recommendation import Outlook, RiskProfile
+from app.services import strike_optimizer
+from app.services.option_chain import OptionChain, OptionSide
+from app.services.strategy_engine import StrategyEngine
+
+
+def _side(strikes, bids, asks, deltas) -> OptionSide:
+    return OptionSide({
+        "strike": np.asarray(strikes, dtype=float),
+        "bid": np.asarray(bids, dtype=float),
+        "ask": np.asarray(asks, dtype=float),
+        "delta": np.asarray(deltas, dtype=float),
+    })
+
+
+def _calls() -> OptionSide:
+    return _side(
+        [95, 100, 105, 110, 115],
+        [7.00, 4.00, 2.00, 0.95, 0.40],
+        [7.20, 4.20, 2.10, 1.00, 0.42],
+        [0.70, 0.52, 0.33, 0.18, 0.08],
+    )
+
+
+def _puts() -> OptionSide:
+    return _side(
+        [85, 90, 95, 100, 105],
+        [0.45, 0.95, 2.00, 4.00, 7.00],
+        [0.47, 1.00, 2.10, 4.20, 7.20],
+        [-0.08, -0.17, -0.32, -0.48, -0.67],
+    )
+
+
+class TestTemplates:
+    """Candidate grids, scores and engine rules."""
+
+    def test_bull_call_spreads_enumerate_and_score(self):
+        candidates = strike_optimizer.bull_call_spreads(_calls(), capital=10000.0)
+        legs = candidates["legs"].tolist()
+        # 95/100 costs 3.2 on a 5 wide spread (> 50%): dropped; 95/105 (5.2 on 10) too
+        assert [0, 1] not in legs and [0, 2] not in legs
+        i = legs.index([1, 2])  # Buy 100, sell 105: debit 4.20 - 2.00 = 2.20
+        assert candidates["net_credit"][i] == pytest.approx(-2.2)
+        assert candidates["max_loss"][i] == pytest.approx(2.2)
+        assert candidates["max_profit"][i] == pytest.approx(2.8)
+        assert candidates["breakevens"][i][0] == pytest.approx(102.2)
+        # POP = call delta interpolated at the breakeven
+        assert candidates["pop"][i] == pytest.approx(np.interp(102.2, [100, 105], [0.52, 0.33]))
+        assert candidates["delta"][i] == pytest.approx(0.52 - 0.33)
+
+    def test_capital_limits_max_loss(self):
+        candidates = strike_optimizer.bull_call_spreads(_calls(), capital=150.0)
+        assert (candidates["max_loss"] * 100 <= 150.0).all()
+
+    def test_iron_condor_grid_respects_rules(self):
+        calls, puts = _calls(), _puts()
+        candidates = strike_optimizer.iron_condors(calls, puts, capital=10000.0, short_delta=(0.10, 0.35), max_wing_steps=2)
+        assert len(candidates["pop"]) > 0
+        for legs, credit, max_loss in zip(candidates["legs"], candidates["net_credit"], candidates["max_loss"]):
+            sc, lc, sp, lp = legs
+            assert calls.strikes[lc] > calls.strikes[sc] > puts.strikes[sp] > puts.strikes[lp]
+            width = max(calls.strikes[lc] - calls.strikes[sc], puts.strikes[sp] - puts.strikes[lp])
+            assert credit >= width / 3
+            assert max_loss == pytest.approx(width - credit)
+        assert (np.abs(candidates["delta"]) < 0.10).all()
+
+    def test_unquoted_legs_are_skipped(self):
+        calls = _side([100, 105, 110], [4.0, 0.0, 1.0], [4.2, 0.0, 1.05], [0.5, 0.33, 0.18])
+        legs = strike_optimizer.bull_call_spreads(calls, capital=10000.0)["legs"].tolist()
+        assert all(1 not in pair for pair in legs)
+
+
+class TestParetoFront:
+    def test_front_keeps_only_non_dominated_rows(self):
+        pop = np.array([0.9, 0.8, 0.7, 0.6, 0.9])
+        rr = np.array([0.2, 0.5, 0.4, 0.9, 0.1])
+        front = set(strike_optimizer.pareto_front(pop, rr).tolist())
+        # Row 2 is beaten by row 1, row 4 by row 0
+        assert front == {0, 1, 3}
+
+    def test_pareto_best_orders_by_edge(self):
+        candidates = strike_optimizer.bull_call_spreads(_calls(), capital=10000.0)
+        best = strike_optimizer.pareto_best(candidates)
+        edges = candidates["edge"][best]
+        assert (np.diff(edges) <= 0).all()
+        assert len(strike_optimizer.pareto_best(candidates, limit=1)) == 1
+
+
+class TestEngineOptimizeMode:
+    def test_generate_strategies_optimize(self):
+        engine = StrategyEngine()
+        chain = OptionChain(_calls(), _puts(), spot_price=100.0)
+        expiration = (datetime.now() + timedelta(days=45)).strftime("%Y-%m-%d")
+        strategies = engine.generate_strategies(
+            chain, "AAPL", 100.0, Outlook.NEUTRAL, RiskProfile.AGGRESSIVE, 10000.0, expiration, optimize=True
+        )
+        assert 1 <= len(strategies) <= 3
+        strategy = strategies[0]
+        assert strategy.name == "Optimized Iron Condor"
+        assert [leg.ratio for leg in strategy.legs] == [-1, 1, -1, 1]
+        assert strategy.metrics["max_profit"] > 0 and 0 < strategy.metrics["pop"] <= 1
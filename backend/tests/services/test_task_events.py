@@ -0,0 +1,56 @@
+"""Unit tests for the append-only task event log."""
+
+import uuid
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.dialects import postgresql
+
+from app.db.models import Task
+from app.services.task_events import next_event, write_events
+
+
+def test_events_get_sequential_seqs_and_a_summary():
+    task = Task(id=uuid.uuid4(), status="PROCESSING")
+    ts = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    rows = [
+        next_event(task, "start", "Task processing started", ts),
+        next_event(task, "retry", "Retry 1/3"),
+        next_event(task, "error", "Task failed: boom"),
+        next_event(task, "retry", "Retry 2/3"),
+    ]
+    assert [row["seq"] for row in rows] == [1, 2, 3, 4]
+    assert rows[0] == {
+        "task_id": task.id,
+        "seq": 1,
+        "event_type": "start",
+        "message": "Task processing started",
+        "created_at": ts,
+    }
+    summary = task.event_summary
+    assert summary["count"] == 4 and summary["last_seq"] == 4
+    assert summary["by_type"] == {"start": 1, "retry": 2, "error": 1}
+    assert summary["last_event"]["message"] == "Retry 2/3"
+    assert summary["last_error"]["seq"] == 3
+
+
+def test_seq_continues_from_persisted_summary():
+    task = Task(id=uuid.uuid4(), event_summary={"count": 7, "last_seq": 7, "by_type": {"info": 7}})
+    assert next_event(task, "info", "x" * 5000)["seq"] == 8
+    assert len(task.event_summary["last_event"]["message"]) == 2000
+
+
+@pytest.mark.asyncio
+async def test_bulk_insert_skips_duplicates():
+    statements = []
+
+    class Session:
+        async def execute(self, statement):
+            statements.append(statement)
+
+    task = Task(id=uuid.uuid4())
+    await write_events(Session(), [])
+    assert statements == []  # Nothing buffered: no round trip
+    await write_events(Session(), [next_event(task, "info", "a"), next_event(task, "info", "b")])
+    sql = str(statements[0].compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (task_id, seq) DO NOTHING" in sql
@@ -0,0 +1,150 @@
+"""Unit tests for buffered task progress and live task events (local mode: no Redis)."""
+
+import asyncio
+import uuid
+from types import SimpleNamespace
+
+import pytest
+
+from sqlalchemy.sql.dml import Insert
+
+import app.db.session as db_session
+from app.api.endpoints.tasks import _get_multi_agent_stages_initial
+from app.db.models import Task
+from app.services import task_progress
+from app.services.task_progress import TaskEventBus, TaskProgress
+
+
+class FakeSession:
+    def __init__(self, writes: list, events: list) -> None:
+        self.writes = writes
+        self.events = events
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, statement):
+        if isinstance(statement, Insert):
+            self.events.extend({column.key: value for column, value in row.items()} for row in statement._multi_values[0])
+        else:
+            self.writes.append(statement.compile().params)
+
+    async def commit(self):
+        pass
+
+
+@pytest.fixture
+def env(monkeypatch):
+    writes: list = []
+    events: list = []
+    bus = TaskEventBus()
+    monkeypatch.setattr(task_progress.cache_service, "_redis", None)
+    monkeypatch.setattr(task_progress, "task_event_bus", bus)
+    monkeypatch.setattr(db_session, "AsyncSessionLocal", lambda: FakeSession(writes, events))
+    task = Task(
+        id=uuid.uuid4(),
+        status="PROCESSING",
+        task_metadata={"stages": _get_multi_agent_stages_initial()},
+    )
+    return task, bus, writes, events
+
+
+async def _collect(bus: TaskEventBus, task_id, snapshot, received: list) -> None:
+    async for event in bus.subscribe(task_id, snapshot, heartbeat=0.05):
+        received.append(event)
+
+
+class TestTaskProgress:
+    """Callbacks update the task in memory; the row is written in batches."""
+
+    @pytest.mark.asyncio
+    async def test_updates_are_coalesced(self, env):
+        task, bus, writes, events = env
+        progress = TaskProgress(task, flush_interval=60).start()
+        for pct in range(50):
+            progress.emit(pct, f"step {pct}")
+        await asyncio.sleep(0.01)
+        assert writes == []  # Nothing due yet
+        assert task.task_metadata["progress"] == 49
+        assert task.event_summary["count"] == 50
+        await progress.close()
+        assert len(writes) == 1
+        assert writes[0]["task_metadata"]["current_stage"] == "step 49"
+        assert writes[0]["event_summary"]["last_seq"] == 50
+        # All 50 timeline events go out in one bulk insert, in seq order
+        assert [row["seq"] for row in events] == list(range(1, 51))
+        assert events[-1]["message"] == "[49%] step 49"
+        assert task_progress.progress_for(task.id) is None
+
+    @pytest.mark.asyncio
+    async def test_flushes_at_most_once_per_interval(self, env):
+        task, bus, writes, events = env
+        progress = TaskProgress(task, flush_interval=0.05).start()
+        for pct in range(20):
+            progress.emit(pct, "working")
+            await asyncio.sleep(0.01)
+        await progress.close()
+        assert 2 <= len(writes) <= 6
+
+    @pytest.mark.asyncio
+    async def test_sub_stage_changes_publish_stages(self, env):
+        task, bus, writes, events = env
+        received: list = []
+
+        async def snapshot():
+            return {"type": "snapshot", "status": "PROCESSING"}
+
+        listener = asyncio.create_task(_collect(bus, task.id, snapshot, received))
+        await asyncio.sleep(0)
+        progress = TaskProgress(task, flush_interval=60).start()
+        progress.set_sub_stage("phase_a", "greeks", "running")
+        progress.set_sub_stage("phase_a", "greeks", "running")  # Unchanged: no event
+        progress.emit(10, "Phase A: Greeks")
+        await progress.close()
+        await task_progress.publish_status(SimpleNamespace(id=task.id, status="SUCCESS", result_ref="r1", error_message=None))
+        await asyncio.wait_for(listener, timeout=1)
+
+        types = [event["type"] for event in received if event]
+        assert types == ["snapshot", "stages", "progress", "status"]
+        phase_a = next(s for s in received[1]["stages"] if s["id"] == "phase_a")
+        assert next(sub for sub in phase_a["sub_stages"] if sub["id"] == "greeks")["status"] == "running"
+
+    @pytest.mark.asyncio
+    async def test_finished_task_is_not_overwritten(self, env):
+        task, bus, writes, events = env
+        progress = TaskProgress(task, flush_interval=60).start()
+        progress.emit(100, "done")
+        await progress.close()
+        compiled = writes[0]
+        assert compiled["status_1"] == "PROCESSING"  # UPDATE ... WHERE status = 'PROCESSING'
+
+
+class TestEventBus:
+    @pytest.mark.asyncio
+    async def test_finished_task_gets_snapshot_only(self, env):
+        task, bus, *_ = env
+        received: list = []
+
+        async def snapshot():
+            return {"type": "snapshot", "status": "FAILED", "error_message": "boom"}
+
+        await _collect(bus, task.id, snapshot, received)
+        assert [event["type"] for event in received] == ["snapshot"]
+
+    @pytest.mark.asyncio
+    async def test_missed_status_is_found_on_heartbeat(self, env):
+        task, bus, *_ = env
+        states = iter(["PROCESSING", "PROCESSING", "SUCCESS"])
+        received: list = []
+
+        async def snapshot():
+            return {"type": "snapshot", "status": next(states), "result_ref": "r1"}
+
+        await asyncio.wait_for(_collect(bus, task.id, snapshot, received), timeout=1)
+        assert received[0]["type"] == "snapshot"
+        assert None in received  # Keepalive while still running
+        assert received[-1] == {"type": "status", "status": "SUCCESS", "result_ref": "r1", "error_message": None}
+        assert bus.stats() == {"tasks": 0, "subscribers": 0}
@@ -0,0 +1,260 @@
+"""Unit tests for the Redis Streams task queue and worker."""
+
+import asyncio
+import json
+import time
+from uuid import uuid4
+
+import pytest
+
+import app.api.endpoints.tasks as tasks_module
+import app.services.task_queue as task_queue
+from app.core.constants import RetryConfig
+from app.services.task_queue import TaskWorker, parse_concurrency, retry_delay, stream_key
+
+
+class FakePipeline:
+    def __init__(self, redis) -> None:
+        self.redis = redis
+        self.calls = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    def __getattr__(self, name):
+        return lambda *args, **kwargs: self.calls.append((name, args, kwargs))
+
+    async def execute(self):
+        return [await getattr(self.redis, name)(*args, **kwargs) for name, args, kwargs in self.calls]
+
+
+class FakeRedis:
+    """Stream / string / sorted-set subset of the Redis API used by the task queue."""
+
+    def __init__(self) -> None:
+        self.streams: dict[str, list[tuple[str, dict]]] = {}
+        self.delivered: set[str] = set()
+        self.acked: list[str] = []
+        self.strings: dict[str, str] = {}
+        self.delayed: dict[str, float] = {}
+        self.read_streams: list[list[str]] = []
+        self._seq = 0
+
+    async def xadd(self, name, fields):
+        self._seq += 1
+        message_id = f"{self._seq}-0"
+        self.streams.setdefault(name, []).append((message_id, dict(fields)))
+        return message_id
+
+    async def xgroup_create(self, name, groupname, id="0", mkstream=False):
+        self.streams.setdefault(name, [])
+
+    async def xreadgroup(self, groupname, consumername, streams, count=None, block=None):
+        self.read_streams.append(sorted(streams))
+        response = []
+        for name in streams:
+            fresh = [m for m in self.streams.get(name, []) if m[0] not in self.delivered][:count]
+            self.delivered.update(m[0] for m in fresh)
+            if fresh:
+                response.append([name, fresh])
+        return response
+
+    async def xautoclaim(self, name, groupname, consumername, min_idle_time, start_id="0-0", count=None):
+        return ["0-0", [], []]
+
+    async def xclaim(self, *args, **kwargs):
+        return []
+
+    async def xack(self, name, groupname, message_id):
+        self.acked.append(message_id)
+
+    async def xdel(self, name, message_id):
+        self.streams[name] = [m for m in self.streams.get(name, []) if m[0] != message_id]
+
+    async def set(self, key, value, ex=None, nx=False):
+        if nx and key in self.strings:
+            return None
+        self.strings[key] = value
+        return True
+
+    async def delete(self, key):
+        self.strings.pop(key, None)
+
+    async def exists(self, key):
+        return int(key in self.strings)
+
+    async def expire(self, key, ttl):
+        return key in self.strings
+
+    async def zadd(self, key, mapping):
+        self.delayed.update(mapping)
+
+    async def eval(self, script, numkeys, key, now):
+        due = [member for member, score in self.delayed.items() if score <= now]
+        for member in due:
+            del self.delayed[member]
+        return due
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+
+class FakeCache:
+    def __init__(self) -> None:
+        self._redis = FakeRedis()
+
+    async def acquire_lock(self, lock_key, ttl=3600):
+        return False
+
+
+@pytest.fixture
+def queue(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(task_queue, "cache_service", cache)
+    runs, requeued, failed = [], [], []
+    outcomes: dict[str, BaseException] = {}
+
+    async def process_task_async(task_id, task_type, metadata, db=None, final_attempt=True):
+        runs.append((str(task_id), task_type, final_attempt))
+        if str(task_id) in outcomes:
+            raise outcomes[str(task_id)]
+
+    async def mark_task_requeued(task_id, task_type, reason):
+        requeued.append((str(task_id), reason))
+        return sum(1 for t, _ in requeued if t == str(task_id))
+
+    async def update_task_status_failed(task_id, error_message, session=None):
+        failed.append((str(task_id), error_message))
+
+    monkeypatch.setattr(tasks_module, "process_task_async", process_task_async)
+    monkeypatch.setattr(tasks_module, "_mark_task_requeued", mark_task_requeued)
+    monkeypatch.setattr(tasks_module, "_update_task_status_failed", update_task_status_failed)
+    return cache._redis, runs, requeued, failed, outcomes
+
+
+async def _drain(worker: TaskWorker) -> None:
+    await asyncio.gather(*list(worker._jobs))
+
+
+def test_parse_concurrency():
+    limits = parse_concurrency("multi_agent_report=1, ai_report=0,custom=3,bad=x", default=2)
+    assert limits["multi_agent_report"] == 1
+    assert limits["ai_report"] == 0
+    assert limits["custom"] == 3
+    assert limits["generate_strategy_chart"] == 2
+    assert "bad" not in limits
+
+
+def test_retry_delay_uses_retry_config():
+    assert retry_delay(1) == RetryConfig.INITIAL_WAIT_SECONDS * RetryConfig.BACKOFF_MULTIPLIER
+    assert retry_delay(2) > retry_delay(1)
+
+
+@pytest.mark.asyncio
+async def test_enqueue_without_redis_returns_false(monkeypatch):
+    cache = FakeCache()
+    cache._redis = None
+    monkeypatch.setattr(task_queue, "cache_service", cache)
+    assert await task_queue.enqueue_task(uuid4(), "ai_report") is False
+
+
+class TestWorker:
+    """Messages are processed once, acked, and retried with backoff on network errors."""
+
+    @pytest.mark.asyncio
+    async def test_processes_and_acks(self, queue):
+        redis, runs, requeued, failed, _ = queue
+        task_id = uuid4()
+        assert await task_queue.enqueue_task(task_id, "ai_report")
+        worker = TaskWorker(concurrency={"ai_report": 1}, consumer="w1")
+        await worker.ensure_groups()
+        await worker.poll(block_ms=0)
+        await _drain(worker)
+        assert runs == [(str(task_id), "ai_report", False)]
+        assert redis.streams[stream_key("ai_report")] == []
+        assert redis.acked and not redis.strings  # Run key released
+        assert worker.free_slots("ai_report") == 1 and not requeued and not failed
+
+    @pytest.mark.asyncio
+    async def test_per_type_limits_gate_reads(self, queue):
+        redis, runs, *_ = queue
+        worker = TaskWorker(concurrency={"ai_report": 1, "multi_agent_report": 1, "generate_strategy_chart": 0})
+        worker._active["multi_agent_report"] = 1  # Slot busy
+        await worker.poll(block_ms=0)
+        assert redis.read_streams == [[stream_key("ai_report")]]
+
+    @pytest.mark.asyncio
+    async def test_running_task_is_not_started_twice(self, queue):
+        redis, runs, *_ = queue
+        task_id = uuid4()
+        redis.strings[task_queue.running_key(task_id)] = "other-worker"
+        await task_queue.enqueue_task(task_id, "ai_report")
+        worker = TaskWorker(concurrency={"ai_report": 1})
+        await worker.poll(block_ms=0)
+        await _drain(worker)
+        assert runs == [] and len(redis.acked) == 1
+
+    @pytest.mark.asyncio
+    async def test_network_error_is_retried_with_backoff(self, queue):
+        redis, runs, requeued, failed, outcomes = queue
+        task_id = uuid4()
+        outcomes[str(task_id)] = ConnectionError("reset")
+        await task_queue.enqueue_task(task_id, "ai_report")
+        worker = TaskWorker(concurrency={"ai_report": 1})
+        await worker.poll(block_ms=0)
+        await _drain(worker)
+        assert len(requeued) == 1 and not failed
+        (member, due), = redis.delayed.items()
+        assert json.loads(member) == [str(task_id), "ai_report", 1]
+        assert due == pytest.approx(time.time() + retry_delay(1), abs=1.0)
+
+        # Once due, the retry goes back on the stream and runs as attempt 1
+        redis.delayed[member] = 0.0
+        await worker.poll(block_ms=0)
+        await _drain(worker)
+        assert runs[-1] == (str(task_id), "ai_report", False)
+
+    @pytest.mark.asyncio
+    async def test_last_attempt_lets_the_task_fail(self, queue):
+        redis, runs, requeued, failed, outcomes = queue
+        task_id = uuid4()
+        outcomes[str(task_id)] = ConnectionError("reset")
+        await task_queue.enqueue_task(task_id, "ai_report", attempt=RetryConfig.MAX_RETRIES)
+        worker = TaskWorker(concurrency={"ai_report": 1})
+        await worker.poll(block_ms=0)
+        await _drain(worker)
+        assert runs == [(str(task_id), "ai_report", True)]
+        assert not requeued and not redis.delayed
+
+    @pytest.mark.asyncio
+    async def test_requeue_gives_up_after_max_retries(self, queue):
+        redis, runs, requeued, failed, _ = queue
+        task_id = uuid4()
+        for _ in range(RetryConfig.MAX_RETRIES + 1):
+            await task_queue.requeue_task(task_id, "ai_report", "Worker stopped")
+        assert len(redis.streams[stream_key("ai_report")]) == RetryConfig.MAX_RETRIES
+        assert len(failed) == 1 and failed[0][0] == str(task_id)
+
+    @pytest.mark.asyncio
+    async def test_shutdown_requeues_unfinished_tasks(self, queue, monkeypatch):
+        redis, runs, requeued, failed, _ = queue
+        started = asyncio.Event()
+
+        async def slow_process(task_id, task_type, metadata, db=None, final_attempt=True):
+            started.set()
+            await asyncio.sleep(60)
+
+        monkeypatch.setattr(tasks_module, "process_task_async", slow_process)
+        monkeypatch.setattr(task_queue.settings, "task_worker_shutdown_grace_seconds", 0)
+        task_id = uuid4()
+        await task_queue.enqueue_task(task_id, "ai_report")
+        worker = TaskWorker(concurrency={"ai_report": 1})
+        await worker.poll(block_ms=0)
+        await started.wait()
+        await worker._drain()
+        assert requeued and requeued[0][0] == str(task_id)
+        # The unfinished task is back on the stream for another worker
+        assert [fields["task_id"] for _, fields in redis.streams[stream_key("ai_report")]] == [str(task_id)]
@@ -0,0 +1,76 @@
+"""Unit tests for the column-wise Tiger option chain DataFrame conversion."""
+
+import math
+
+import pandas as pd
+
+from app.services.option_chain import OptionSide
+
+
+def _option_frame_to_records(frame: pd.DataFrame) -> list[dict]:
+    """One chain side as TigerService.get_option_chain parses and serializes it."""
+    return OptionSide.from_frame(frame).to_records()
+
+
+class TestOptionFrameToRecords:
+    """Test OptionSide.from_frame(...).to_records() on Tiger SDK DataFrames."""
+
+    def test_full_row_shape(self):
+        """All fields present: flat greeks, greeks sub-dict, latest_price, both IV keys."""
+        frame = pd.DataFrame([{
+            "strike": 100.0, "bid_price": 1.0, "ask_price": 1.2, "volume": 10,
+            "open_interest": 50, "delta": 0.5, "gamma": 0.02, "theta": -0.03,
+            "vega": 0.1, "rho": 0.01, "latest_price": 1.1, "implied_vol": 0.25,
+        }])
+        records = _option_frame_to_records(frame)
+        assert records == [{
+            "strike": 100.0, "bid": 1.0, "ask": 1.2, "volume": 10.0, "open_interest": 50.0,
+            "delta": 0.5, "gamma": 0.02, "theta": -0.03, "vega": 0.1, "rho": 0.01,
+            "greeks": {"delta": 0.5, "gamma": 0.02, "theta": -0.03, "vega": 0.1, "rho": 0.01},
+            "latest_price": 1.1, "implied_vol": 0.25, "implied_volatility": 0.25,
+        }]
+        assert list(records[0].keys())[:5] == ["strike", "bid", "ask", "volume", "open_interest"]
+
+    def test_missing_and_invalid_values(self):
+        """NaN/inf quotes default to 0; NaN greeks and IV are omitted; no greeks sub-dict."""
+        frame = pd.DataFrame([{
+            "strike": 105.0, "bid_price": float("nan"), "ask_price": float("inf"),
+            "volume": None, "open_interest": 3, "delta": float("nan"), "implied_vol": float("nan"),
+        }])
+        records = _option_frame_to_records(frame)
+        assert records == [{"strike": 105.0, "bid": 0.0, "ask": 0.0, "volume": 0.0, "open_interest": 3.0}]
+
+    def test_string_strikes_and_filtering(self):
+        """String strikes with thousands separators are parsed; non-positive/invalid strikes dropped."""
+        frame = pd.DataFrame({
+            "strike": ["1,050", " 99.5 ", "abc", "0", None],
+            "bid_price": [1.0, 2.0, 3.0, 4.0, 5.0],
+        })
+        records = _option_frame_to_records(frame)
+        assert [r["strike"] for r in records] == [99.5, 1050.0]
+        assert [r["bid"] for r in records] == [2.0, 1.0]
+
+    def test_latest_price_invalid_is_omitted(self):
+        """A non-numeric latest_price is treated as missing."""
+        frame = pd.DataFrame({"strike": [100.0, 101.0], "latest_price": ["n/a", 2.5]})
+        records = _option_frame_to_records(frame)
+        assert "latest_price" not in records[0]
+        assert records[1]["latest_price"] == 2.5
+
+    def test_rows_sorted_by_strike(self):
+        """Rows come back sorted by strike (OptionSide keeps strike-sorted columns)."""
+        frame = pd.DataFrame({"strike": [110.0, 100.0, 105.0]})
+        assert [r["strike"] for r in _option_frame_to_records(frame)] == [100.0, 105.0, 110.0]
+
+    def test_empty_frame(self):
+        """Empty frames (or frames without a strike column) produce no records."""
+        assert _option_frame_to_records(pd.DataFrame()) == []
+        assert _option_frame_to_records(pd.DataFrame({"bid_price": [1.0]})) == []
+
+    def test_values_are_python_floats(self):
+        """Values must be plain floats so the chain stays JSON-serializable for Redis."""
+        frame = pd.DataFrame({"strike": [100], "volume": [7], "delta": [0.4]})
+        record = _option_frame_to_records(frame)[0]
+        for key in ("strike", "volume", "delta"):
+            assert type(record[key]) is float
+            assert not math.isnan(record[key])
@@ -0,0 +1,132 @@
+"""Unit tests for stale-while-revalidate option chains in TigerService.get_option_chain."""
+
+import asyncio
+import time
+
+import pytest
+
+import app.services.tiger_service as tiger_module
+from app.core.constants import CacheTTL
+from app.services.option_chain import OptionChain
+from app.services.single_flight import SingleFlight
+from app.services.tiger_service import TigerService
+
+CACHE_KEY = "market:chain:AAPL:2025-01-17"
+
+
+class FakeCache:
+    """In-memory stand-in for the CacheService API used by get_option_chain."""
+
+    def __init__(self) -> None:
+        self.values: dict[str, dict] = {}
+        self.locks: dict[str, str] = {}
+
+    async def get(self, key: str):
+        value = self.values.get(key)
+        return dict(value) if value is not None else None
+
+    async def set(self, key: str, value, ttl: int, is_pro: bool = False) -> None:
+        self.values[key] = value
+
+    async def acquire_lock(self, lock_key: str, ttl: int = 3600) -> str | None:
+        if lock_key in self.locks:
+            return None
+        self.locks[lock_key] = f"token-{lock_key}"
+        return self.locks[lock_key]
+
+    async def release_lock(self, lock_key: str, token: str) -> None:
+        if self.locks.get(lock_key) == token:
+            del self.locks[lock_key]
+
+    async def lock_held(self, lock_key: str) -> bool:
+        return lock_key in self.locks
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(tiger_module.settings, "tiger_use_live_api", False)
+    svc = TigerService()
+    monkeypatch.setattr(tiger_module.settings, "tiger_use_live_api", True)
+    svc._client = object()
+    cache = FakeCache()
+    monkeypatch.setattr(tiger_module, "cache_service", cache)
+    monkeypatch.setattr(tiger_module, "single_flight", SingleFlight(cache))
+    fetches = []
+
+    async def fake_fetch(symbol, expiration_date, cache_key, is_pro):
+        fetches.append(cache_key)
+        chain = {"calls": [], "puts": [], "spot_price": 101.0}
+        await cache.set(cache_key, {**chain, "_cached_at": time.time()}, ttl=CacheTTL.OPTION_CHAIN_HARD)
+        return chain
+
+    svc._fetch_option_chain = fake_fetch
+    return svc, cache, fetches
+
+
+class TestStaleWhileRevalidate:
+    """Soft TTL serves stale and refreshes once; hard TTL (Redis expiry) blocks."""
+
+    @pytest.mark.asyncio
+    async def test_fresh_entry_served_from_cache(self, service):
+        svc, cache, fetches = service
+        cached_at = time.time()
+        cache.values[CACHE_KEY] = {"calls": [], "puts": [], "spot_price": 100.0, "_cached_at": cached_at}
+        chain = await svc.get_option_chain("AAPL", "2025-01-17")
+        assert chain["_source"] == "cache"
+        assert "_cached_at" not in chain
+        assert chain["_version"] == cached_at
+        assert fetches == []
+
+    @pytest.mark.asyncio
+    async def test_stale_entry_returned_and_refreshed_once(self, service):
+        svc, cache, fetches = service
+        stale_at = time.time() - CacheTTL.OPTION_CHAIN - 1
+        cache.values[CACHE_KEY] = {"calls": [], "puts": [], "spot_price": 100.0, "_cached_at": stale_at}
+        chains = await asyncio.gather(*(svc.get_option_chain("AAPL", "2025-01-17") for _ in range(5)))
+        assert all(c["_source"] == "stale" and c["spot_price"] == 100.0 for c in chains)
+        await asyncio.gather(*svc._chain_refreshes.values())
+        assert fetches == [CACHE_KEY]
+        fresh = await svc.get_option_chain("AAPL", "2025-01-17")
+        assert fresh["_source"] == "cache" and fresh["spot_price"] == 101.0
+
+    @pytest.mark.asyncio
+    async def test_legacy_entry_without_timestamp_is_fresh(self, service):
+        svc, cache, fetches = service
+        cache.values[CACHE_KEY] = {"calls": [], "puts": [], "spot_price": 100.0}
+        assert (await svc.get_option_chain("AAPL", "2025-01-17"))["_source"] == "cache"
+        assert fetches == []
+
+    @pytest.mark.asyncio
+    async def test_miss_blocks_on_fetch(self, service):
+        svc, cache, fetches = service
+        chain = await svc.get_option_chain("AAPL", "2025-01-17")
+        assert chain["spot_price"] == 101.0
+        assert "_cached_at" not in chain
+        assert fetches == [CACHE_KEY]
+        assert cache.values[CACHE_KEY]["_cached_at"] > 0
+
+    @pytest.mark.asyncio
+    async def test_columnar_entry_served_as_option_chain(self, service):
+        svc, cache, fetches = service
+        entry = OptionChain.from_dict({"calls": [{"strike": 100.0, "bid": 1.0}], "puts": [], "spot_price": 100.0})
+        cache.values[CACHE_KEY] = {**entry.to_columnar(), "_cached_at": time.time()}
+        chain = await svc.get_option_chain("AAPL", "2025-01-17")
+        assert isinstance(chain, OptionChain) and chain.calls.strikes.tolist() == [100.0]
+        assert chain["_source"] == "cache" and "_cached_at" not in chain
+
+    @pytest.mark.asyncio
+    async def test_failed_refresh_backs_off(self, service):
+        svc, cache, fetches = service
+
+        async def failing_fetch(*args):
+            fetches.append("fail")
+            raise RuntimeError("Tiger down")
+
+        svc._fetch_option_chain = failing_fetch
+        stale_at = time.time() - CacheTTL.OPTION_CHAIN - 1
+        cache.values[CACHE_KEY] = {"calls": [], "puts": [], "_cached_at": stale_at}
+        await svc.get_option_chain("AAPL", "2025-01-17")
+        await asyncio.gather(*svc._chain_refreshes.values())
+        await svc.get_option_chain("AAPL", "2025-01-17")
+        assert svc._chain_refreshes == {}
+        assert fetches == ["fail"]
@@ -0,0 +1,109 @@
+"""Unit tests for the Tiger API token bucket (local fallback path) and priorities."""
+
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+import app.services.tiger_rate_limiter as limiter_module
+from app.services.tiger_rate_limiter import TigerPriority, TigerRateLimiter, tiger_priority
+
+
+class OfflineCache:
+    """Cache stand-in with Redis unavailable (limiter uses its local bucket)."""
+
+    async def _ensure_connected(self) -> bool:
+        return False
+
+
+@pytest.fixture
+def fast_deadlines(monkeypatch):
+    monkeypatch.setattr(limiter_module, "_DEADLINE", {p: 0.3 for p in TigerPriority})
+
+
+class TestLocalBucket:
+    """Token accounting, reserves and deadlines without Redis."""
+
+    @pytest.mark.asyncio
+    async def test_burst_up_to_capacity_then_429(self, fast_deadlines):
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=3)
+        for _ in range(3):
+            assert await limiter.acquire(TigerPriority.INTERACTIVE) < 0.05
+        with pytest.raises(HTTPException) as exc:
+            await limiter.acquire(TigerPriority.INTERACTIVE)
+        assert exc.value.status_code == 429
+        stats = limiter.stats()["interactive"]
+        assert stats["granted"] == 3 and stats["rejected"] == 1 and stats["queued"] == 0
+
+    @pytest.mark.asyncio
+    async def test_lower_priorities_keep_a_reserve(self, fast_deadlines):
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=5)
+        # PREFETCH needs 4 tokens left over, so only one of five is usable by it
+        await limiter.acquire(TigerPriority.PREFETCH)
+        with pytest.raises(HTTPException):
+            await limiter.acquire(TigerPriority.PREFETCH)
+        # Interactive calls can still use the reserve
+        for _ in range(4):
+            await limiter.acquire(TigerPriority.INTERACTIVE)
+
+    @pytest.mark.asyncio
+    async def test_waits_for_refill(self):
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=600)  # one token per 0.1s
+        limiter._local_tokens = 0.0
+        waited = await limiter.acquire(TigerPriority.INTERACTIVE)
+        assert 0.05 < waited < 1.0
+        assert limiter.stats()["interactive"]["max_wait_s"] == pytest.approx(waited, abs=1e-3)
+
+    @pytest.mark.asyncio
+    async def test_queued_higher_priority_goes_first(self):
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=600)
+        limiter._local_tokens = 0.0
+        order: list[str] = []
+
+        async def call(name, priority):
+            await limiter.acquire(priority)
+            order.append(name)
+
+        background = asyncio.create_task(call("background", TigerPriority.BACKGROUND))
+        await asyncio.sleep(0)
+        await call("interactive", TigerPriority.INTERACTIVE)
+        await background
+        assert order == ["interactive", "background"]
+
+
+class TestPriorityContext:
+    """Priority is taken from the surrounding context by default."""
+
+    @pytest.mark.asyncio
+    async def test_context_priority(self, fast_deadlines):
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=10)
+        with tiger_priority(TigerPriority.BACKGROUND):
+            await limiter.acquire()
+        await limiter.acquire()
+        stats = limiter.stats()
+        assert stats["background"]["granted"] == 1
+        assert stats["interactive"]["granted"] == 1
+
+
+class TestBreakerIsolation:
+    """Limiter back-pressure must not open the Tiger circuit breaker."""
+
+    @pytest.mark.asyncio
+    async def test_limiter_timeouts_leave_breaker_closed(self, monkeypatch, fast_deadlines):
+        import app.services.tiger_service as tiger_module
+
+        limiter = TigerRateLimiter(OfflineCache(), calls_per_minute=1)
+        monkeypatch.setattr(tiger_module, "tiger_rate_limiter", limiter)
+        monkeypatch.setattr(tiger_module.settings, "tiger_use_live_api", False)
+        svc = tiger_module.TigerService()
+        svc._client = type("Client", (), {"get_market_status": lambda self, market: "open"})()
+        breaker = tiger_module.tiger_circuit_breaker
+        breaker.close()
+
+        assert await svc._call_tiger_api_async("get_market_status", "US") == "open"
+        for _ in range(breaker.fail_max + 1):
+            with pytest.raises(HTTPException) as exc:
+                await svc._call_tiger_api_async("get_market_status", "US")
+            assert exc.value.status_code == 429
+        assert breaker.current_state == "closed"
+        assert breaker.fail_counter == 0
@@ -0,0 +1,139 @@
+"""Unit tests for the cached authenticated-user context (cache and DB mocked)."""
+
+import uuid
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+from sqlalchemy import inspect
+
+from app.db.models import User
+from app.services import user_context
+from app.services.user_context import (
+    UserContext,
+    apply_user_fields,
+    get_user_context,
+    invalidate_user_context,
+)
+
+USER_ID = uuid.uuid4()
+CREATED = datetime(2026, 1, 5, tzinfo=timezone.utc)
+
+
+class FakeCache:
+    """In-memory stand-in for cache_service (get/set/delete/incr)."""
+
+    def __init__(self) -> None:
+        self.store: dict[str, object] = {}
+        self.ttls: dict[str, int] = {}
+
+    async def get(self, key):
+        return self.store.get(key)
+
+    async def set(self, key, value, ttl):
+        self.store[key] = value
+        self.ttls[key] = ttl
+
+    async def delete(self, key):
+        self.store.pop(key, None)
+
+    async def incr(self, key, ttl):
+        self.store[key] = int(self.store.get(key) or 0) + 1
+        return self.store[key]
+
+
+class FakeResult:
+    def __init__(self, row) -> None:
+        self.row = row
+
+    def one_or_none(self):
+        return self.row
+
+
+class FakeDB:
+    def __init__(self, **overrides) -> None:
+        values = dict(
+            id=USER_ID, email="a@example.com", is_pro=False, is_superuser=False, subscription_id=None,
+            subscription_type=None, plan_expiry_date=None, daily_ai_usage=2, daily_image_usage=0,
+            daily_fundamental_queries_used=1, last_quota_reset_date=CREATED, created_at=CREATED,
+        )
+        values.update(overrides)
+        self.row = SimpleNamespace(_mapping=values)
+        self.statements: list[str] = []
+        self.commits = 0
+        self.on_execute = None
+
+    async def execute(self, statement):
+        self.statements.append(str(statement))
+        if self.on_execute:
+            await self.on_execute()
+        return FakeResult(self.row if statement.is_select else None)
+
+    async def commit(self):
+        self.commits += 1
+
+    async def rollback(self):
+        pass
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = FakeCache()
+    monkeypatch.setattr(user_context, "cache_service", cache)
+    monkeypatch.setattr(user_context.settings, "user_context_cache_ttl", 60)
+    return cache
+
+
+@pytest.mark.asyncio
+async def test_context_is_cached_until_invalidated(cache):
+    db = FakeDB()
+    ctx = await get_user_context(db, USER_ID)
+    assert ctx.daily_ai_usage == 2 and ctx.created_at == CREATED
+    assert "users.email" in db.statements[0] and "users.google_sub" not in db.statements[0]
+
+    assert await get_user_context(db, USER_ID) == ctx
+    assert len(db.statements) == 1  # Served from cache
+
+    await invalidate_user_context(USER_ID)
+    db.row._mapping["daily_ai_usage"] = 7
+    assert (await get_user_context(db, USER_ID)).daily_ai_usage == 7
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_load_racing_a_write_is_not_cached(cache):
+    db = FakeDB()
+    db.on_execute = lambda: invalidate_user_context(USER_ID)  # A writer commits mid-load
+    await get_user_context(db, USER_ID)
+    db.on_execute = None
+    await get_user_context(db, USER_ID)
+    assert len(db.statements) == 2
+
+
+@pytest.mark.asyncio
+async def test_expired_pro_is_downgraded_once(cache):
+    expired = datetime.now(timezone.utc) - timedelta(minutes=1)
+    db = FakeDB(is_pro=True, subscription_type="monthly", plan_expiry_date=expired)
+    ctx = await get_user_context(db, USER_ID)
+    assert not ctx.is_pro and ctx.subscription_type is None
+    assert db.commits == 1 and db.statements[1].startswith("UPDATE users")
+
+
+@pytest.mark.asyncio
+async def test_entry_expires_with_the_plan(cache):
+    expiry = datetime.now(timezone.utc) + timedelta(seconds=20)
+    await get_user_context(FakeDB(is_pro=True, plan_expiry_date=expiry), USER_ID)
+    assert 0 < cache.ttls[f"{user_context.CONTEXT_KEY_PREFIX}{USER_ID}"] <= 20
+
+
+def test_apply_fields_does_not_dirty_orm_user():
+    user = User(id=USER_ID)
+    apply_user_fields(user, {"daily_ai_usage": 3})
+    assert user.daily_ai_usage == 3
+    assert not inspect(user).attrs.daily_ai_usage.history.has_changes()
+
+    ctx = UserContext.from_cache(
+        UserContext(**{**FakeDB().row._mapping, "plan_expiry_date": CREATED}).to_cache()
+    )
+    apply_user_fields(ctx, {"daily_image_usage": 1})
+    assert ctx.daily_image_usage == 1 and ctx.plan_expiry_date == CREATED
@@ -45,7 +45,7 @@ export const DashboardPage: React.FC = () => {
   // Fetch AI reports (enough for stats + pagination)
   const { data: reports, isLoading: isLoadingReports, isError: isReportsError } = useQuery({
     queryKey: ["aiReports"],
-    queryFn: () => aiService.getReports(50, 0),
+    queryFn: () => aiService.getReports(50, 0, "full"),
   })
 
   // Paginated slices for display
@@ -395,7 +395,7 @@ export const DashboardPage: React.FC = () => {
                 <div className="space-y-2">
                   {reportsSlice.map((report: AIReportResponse) => {
                     const symbolMatch = report.report_content?.match(/Symbol:\s*([A-Z]{1,5})/i)
-                    const symbol = symbolMatch?.[1]?.toUpperCase() || report.model_used?.split("/")[0] || "Report"
+                    const symbol = report.symbol || symbolMatch?.[1]?.toUpperCase() || report.model_used?.split("/")[0] || "Report"
                     return (
                       <div
                         key={report.id}
@@ -48,7 +48,7 @@ export const ReportsPage: React.FC = () => {
   // Fetch all reports (with high limit to get all)
   const { data: reports, isLoading, refetch } = useQuery({
     queryKey: ["aiReports", "all"],
-    queryFn: () => aiService.getReports(100, 0),
+    queryFn: () => aiService.getReports(100, 0, "full"),
   })
   const { data: tasks } = useQuery({
     queryKey: ["tasks", "reports"],
@@ -105,6 +105,7 @@ export const ReportsPage: React.FC = () => {
     tasks.forEach((task) => {
       const reportId = task.result_ref
       const symbol =
+        task.symbol ??
         task.metadata?.strategy_summary?.symbol ??
         task.metadata?.strategy_data?.symbol ??
         task.metadata?.symbol
@@ -253,18 +254,9 @@ export const ReportsPage: React.FC = () => {
       let payoffData: Array<{ price: number; profit: number }> = []
 
       try {
-        const tasks = await taskService.getTasks({ limit: 100, skip: 0 })
-        // Find task that matches this report (by result_ref or timestamp)
-        const matchingTask = tasks.find(
-          (task) =>
-            task.task_type === "ai_report" &&
-            task.status === "SUCCESS" &&
-            (task.result_ref === selectedReport.id ||
-              Math.abs(
-                new Date(task.completed_at || task.created_at).getTime() -
-                new Date(selectedReport.created_at).getTime()
-              ) < 60000) // Within 1 minute
-        )
+        // The task that produced this report (result_ref lookups include full metadata)
+        const tasks = await taskService.getTasks({ result_ref: selectedReport.id, limit: 1 })
+        const matchingTask = tasks.find((task) => task.status === "SUCCESS")
 
         if (matchingTask?.metadata) {
           strategyData = matchingTask.metadata.strategy_data
@@ -160,9 +160,13 @@ export const TaskCenter: React.FC = () => {
     toast.success("Tasks refreshed")
   }
 
-  // Extract symbol from task metadata
+  // Extract symbol (listings carry the denormalized symbol; metadata only on full views)
   const extractSymbol = (task: TaskResponse): string => {
     try {
+      if (task.symbol) {
+        return task.symbol
+      }
+
       // Priority 1: Check strategy_summary (new format)
       if (task.metadata?.strategy_summary?.symbol) {
         return task.metadata.strategy_summary.symbol
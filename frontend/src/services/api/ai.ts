@@ -43,6 +43,7 @@ export interface AIModelsResponse {
 
 export interface AIReportResponse {
   id: string
+  /** Only in full listings (view "full") and GET /ai/reports/{id} */
   report_content: string
   model_used: string
   created_at: string
@@ -139,16 +140,17 @@ export const aiService = {
   },
 
   /**
-   * Get user's AI reports (paginated)
+   * Get user's AI reports (paginated). The summary view (default) omits report_content.
    */
   getReports: async (
     limit = 10,
-    offset = 0
+    offset = 0,
+    view: "summary" | "full" = "summary"
   ): Promise<AIReportResponse[]> => {
     const response = await apiClient.get<AIReportResponse[]>(
       "/api/v1/ai/reports",
       {
-        params: { limit, offset },
+        params: { limit, offset, view },
       }
     )
     return response.data
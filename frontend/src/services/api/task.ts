@@ -1,19 +1,32 @@
 import { apiClient } from "./client"
 
 export interface TaskExecutionEvent {
-  type: "start" | "success" | "error" | "retry" | "info" | "progress"
+  seq: number
+  type: "start" | "success" | "error" | "retry" | "info" | "progress" | "requeue"
   message: string
   timestamp: string
 }
 
+export interface TaskEventSummary {
+  count: number
+  last_seq: number
+  by_type: Record<string, number>
+  last_event: TaskExecutionEvent | null
+  last_error: TaskExecutionEvent | null
+}
+
 export interface TaskResponse {
   id: string
   task_type: string
   status: "PENDING" | "PROCESSING" | "SUCCESS" | "FAILED"
   result_ref: string | null
   error_message: string | null
+  /** Omitted (null) in summary listings */
   metadata: Record<string, any> | null
+  symbol?: string | null
+  /** Only on GET /tasks/{id}: events after `since` */
   execution_history?: TaskExecutionEvent[] | null
+  event_summary?: TaskEventSummary | null
   prompt_used?: string | null
   model_used?: string | null
   started_at?: string | null
@@ -28,6 +41,11 @@ export interface TaskListParams {
   skip?: number
   /** Filter by result_ref (e.g. report ID for One-Click Load recommended strategies) */
   result_ref?: string
+  /** Keyset cursor: created_at and id of the last task of the previous page */
+  before_created_at?: string
+  before_id?: string
+  /** "summary" (default; full when filtering by result_ref) omits metadata and prompt_used */
+  view?: "summary" | "full"
 }
 
 export interface TaskCreateRequest {
@@ -53,6 +71,11 @@ export const taskService = {
         limit: params?.limit ?? 20,
         skip: params?.skip ?? 0,
         ...(params?.result_ref != null && { result_ref: params.result_ref }),
+        ...(params?.before_created_at != null && params?.before_id != null && {
+          before_created_at: params.before_created_at,
+          before_id: params.before_id,
+        }),
+        ...(params?.view != null && { view: params.view }),
       },
     })
     return response.data